@@ -0,0 +1,66 @@
+"""
+Circuit breaker for calls to other services.
+
+When a service is degraded, every request that calls it blocks until the call times out. A circuit breaker counts the
+failed calls to a service in the shared cache. Once ``failure_threshold`` calls have failed within ``reset_timeout``
+seconds of each other, the circuit is opened, and callers skip the service until ``reset_timeout`` seconds have passed.
+The next call is then attempted again, and the circuit is closed as soon as a call succeeds.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.core.cache import cache
+
+from ecommerce.core.utils import get_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker(object):
+    """ Circuit breaker whose state is shared by all processes through the cache. """
+
+    def __init__(self, name, failure_threshold, reset_timeout):
+        """
+        Arguments:
+            name (str): Name of the service. Breakers with the same name share their state.
+            failure_threshold (int): Number of failed calls after which the circuit is opened.
+            reset_timeout (int): Number of seconds for which the circuit stays open, and failures are counted.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    @property
+    def failures_cache_key(self):
+        return get_cache_key(resource='circuit_breaker_failures', name=self.name)
+
+    @property
+    def open_cache_key(self):
+        return get_cache_key(resource='circuit_breaker_open', name=self.name)
+
+    def is_open(self):
+        """ Returns True if calls to the service should be skipped. """
+        return bool(cache.get(self.open_cache_key))
+
+    def record_failure(self):
+        """ Counts a failed call, and opens the circuit if too many calls have failed. """
+        if cache.add(self.failures_cache_key, 1, self.reset_timeout):
+            failures = 1
+        else:
+            try:
+                failures = cache.incr(self.failures_cache_key)
+            except ValueError:
+                # The counter expired after it was checked.
+                failures = 1
+                cache.set(self.failures_cache_key, failures, self.reset_timeout)
+
+        if failures >= self.failure_threshold and cache.add(self.open_cache_key, True, self.reset_timeout):
+            logger.warning(
+                'Opened the circuit for [%s] after [%d] failed calls. Calls will be skipped for [%d] seconds.',
+                self.name, failures, self.reset_timeout
+            )
+
+    def record_success(self):
+        """ Closes the circuit, and forgets previously failed calls. """
+        cache.delete_many([self.failures_cache_key, self.open_cache_key])
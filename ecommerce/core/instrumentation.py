@@ -0,0 +1,338 @@
+"""
+Per-request accounting of database queries, cache calls, and outbound HTTP calls.
+
+While a request is handled, its queries are captured by Django's debug cursor, as by ``assertNumQueries``, and calls
+to the configured cache backends, and to ``requests`` sessions (used by ``EdxRestApiClient``, and the Sailthru,
+Segment, and payment clients), are counted and timed. Cache calls are tagged by operation, and HTTP calls by service
+and resource. Only calls made by the thread handling the request are counted.
+
+Measurements of completed requests are aggregated into histograms, per endpoint, in the memory of each process.
+"""
+from __future__ import unicode_literals
+
+import functools
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from urlparse import urlparse
+
+import requests
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+SQL = 'sql'
+CACHE = 'cache'
+HTTP = 'http'
+KINDS = (SQL, CACHE, HTTP,)
+
+CACHE_OPERATIONS = ('get', 'set', 'add', 'delete', 'get_many', 'set_many', 'delete_many', 'incr', 'decr',)
+
+LATENCY_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,)  # Values are in milliseconds.
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000,)
+
+_local = threading.local()
+_install_lock = threading.Lock()
+
+
+def _is_identifier(segment):
+    """ Returns True if the path segment identifies an object, e.g. an ID, a username, or a course ID. """
+    return bool(re.search(r'[\d:+@]', segment)) and not re.match(r'^v\d+$', segment)
+
+
+def get_resource(url):
+    """
+    Returns the resource of the given URL: its path, with identifiers replaced by a placeholder so that calls to the
+    same endpoint are aggregated.
+    """
+    path = urlparse(url).path
+    return '/'.join('{id}' if _is_identifier(segment) else segment for segment in path.split('/'))
+
+
+class RequestMetrics(object):
+    """ Measurements of the request handled by the current thread. """
+
+    def __init__(self, request):
+        self.request = request
+        self.started = time.time()
+        self.latency = None
+        # Keyed by kind, and tag, of call. Values are lists of the number of calls, seconds, and errors.
+        self.calls = {}
+        self.cache_misses = 0
+        self.recording = False
+        self._service_hosts = None
+        self._query_log_offsets = {}
+
+        # Queries are recorded, with their duration, by the debug cursor of each connection.
+        for connection in connections.all():
+            self._query_log_offsets[connection.alias] = (connection.force_debug_cursor, len(connection.queries_log))
+            connection.force_debug_cursor = True
+
+    def record(self, kind, tag, seconds, error=False):
+        measurements = self.calls.setdefault((kind, tag), [0, 0.0, 0])
+        measurements[0] += 1
+        measurements[1] += seconds
+        measurements[2] += int(error)
+
+    def call(self, kind, tag, func, *args, **kwargs):
+        """
+        Calls the given function, and records the call.
+
+        Calls made while another call is recorded, e.g. by a cache backend implementing ``get_many`` with ``get``,
+        are only counted as part of the outer call.
+        """
+        if self.recording:
+            return func(*args, **kwargs)
+
+        self.recording = True
+        started = time.time()
+        error = True
+        try:
+            result = func(*args, **kwargs)
+            error = kind == HTTP and result.status_code >= 500
+            return result
+        finally:
+            self.recording = False
+            self.record(kind, tag, time.time() - started, error=error)
+
+    def get_service(self, url):
+        """ Returns the name of the service called at the given URL, or its host if it is not a known service. """
+        if self._service_hosts is None:
+            self._service_hosts = get_service_hosts(self.request)
+
+        host = urlparse(url).hostname
+        return self._service_hosts.get(host, host)
+
+    def finish(self):
+        """ Stops recording, and counts the queries made while the request was handled. """
+        self.latency = time.time() - self.started
+
+        for connection in connections.all():
+            force_debug_cursor, offset = self._query_log_offsets.get(connection.alias, (False, 0))
+            connection.force_debug_cursor = force_debug_cursor
+
+            queries = list(connection.queries_log)[offset:]
+            if queries:
+                measurements = self.calls.setdefault((SQL, connection.alias), [0, 0.0, 0])
+                measurements[0] += len(queries)
+                measurements[1] += sum(float(query['time']) for query in queries)
+
+    def totals(self, kind):
+        """ Returns the number of calls of the given kind, and the seconds they took. """
+        count, seconds = 0, 0.0
+        for (call_kind, __), measurements in self.calls.items():
+            if call_kind == kind:
+                count += measurements[0]
+                seconds += measurements[1]
+        return count, seconds
+
+    @property
+    def num_queries(self):
+        return self.totals(SQL)[0]
+
+
+def get_service_hosts(request):
+    """ Returns the names of the services called by ecommerce, keyed by host. """
+    hosts = dict(settings.PERFORMANCE_INSTRUMENTATION_SERVICE_HOSTS)
+    urls = {
+        'discovery': [settings.COURSE_CATALOG_API_URL],
+        'enterprise': [getattr(settings, 'ENTERPRISE_API_URL', None), settings.ENTERPRISE_SERVICE_URL],
+    }
+
+    site = getattr(request, 'site', None)
+    site_configuration = getattr(site, 'siteconfiguration', None) if site else None
+    if site_configuration:
+        urls['lms'] = [site_configuration.lms_url_root]
+        urls['discovery'].append(site_configuration.discovery_api_url)
+
+    for service, service_urls in urls.items():
+        for url in service_urls:
+            if url:
+                hosts.setdefault(urlparse(url).hostname, service)
+
+    return hosts
+
+
+def start_request(request):
+    """ Starts recording the calls made by the current thread on behalf of the given request. """
+    metrics = RequestMetrics(request)
+    _local.metrics = metrics
+    return metrics
+
+
+def finish_request():
+    """
+    Stops recording the calls made by the current thread.
+
+    Returns:
+        RequestMetrics: measurements of the request, or None if no request was recorded.
+    """
+    metrics = getattr(_local, 'metrics', None)
+    _local.metrics = None
+
+    if metrics:
+        metrics.finish()
+    return metrics
+
+
+def get_current_metrics():
+    return getattr(_local, 'metrics', None)
+
+
+def _wrap_cache_operation(operation, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        metrics = get_current_metrics()
+        if metrics is None:
+            return method(*args, **kwargs)
+
+        nested = metrics.recording
+        result = metrics.call(CACHE, operation, method, *args, **kwargs)
+        if operation == 'get' and result is None and not nested:
+            metrics.cache_misses += 1
+        return result
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def _wrap_send(method):
+    @functools.wraps(method)
+    def wrapper(session, request, **kwargs):
+        metrics = get_current_metrics()
+        if metrics is None:
+            return method(session, request, **kwargs)
+
+        tag = '{service} {method} {resource}'.format(
+            service=metrics.get_service(request.url), method=request.method, resource=get_resource(request.url)
+        )
+        return metrics.call(HTTP, tag, method, session, request, **kwargs)
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def install():
+    """
+    Instruments the cache backends configured in the CACHES setting, and ``requests`` sessions.
+
+    Calls are only recorded while a request is handled, so instrumented methods only add the cost of looking up the
+    current request otherwise. Installing the instrumentation more than once has no effect.
+    """
+    with _install_lock:
+        backends = {import_string(cache['BACKEND']) for cache in settings.CACHES.values()}
+        for backend in backends:
+            for operation in CACHE_OPERATIONS:
+                method = getattr(backend, operation)
+                if not getattr(method, 'instrumented', False):
+                    setattr(backend, operation, _wrap_cache_operation(operation, method))
+
+        if not getattr(requests.Session.send, 'instrumented', False):
+            requests.Session.send = _wrap_send(requests.Session.send)
+
+
+class Histogram(object):
+    """ Counts observed values in buckets, each bucket counting the values up to its bound. """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self):
+        labels = ['{}'.format(bound) for bound in self.bounds] + ['+Inf']
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'buckets': OrderedDict(zip(labels, self.counts)),
+        }
+
+
+class MetricsRegistry(object):
+    """ Aggregates the measurements of the requests handled by this process. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = now()
+            self.endpoints = {}
+            self.calls = {CACHE: {}, HTTP: {}}
+
+    def record(self, endpoint, metrics, over_budget):
+        """
+        Arguments:
+            endpoint (str): name of the endpoint which handled the request
+            metrics (RequestMetrics): measurements of the request
+            over_budget (list): names of the budgets exceeded by the request
+        """
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = {
+                    'requests': 0,
+                    'over_budget': {},
+                    'latency_ms': Histogram(LATENCY_BUCKETS),
+                    'queries': Histogram(COUNT_BUCKETS),
+                    'totals': {kind: {'count': 0, 'seconds': 0.0} for kind in KINDS},
+                }
+
+            stats['requests'] += 1
+            for budget in over_budget:
+                stats['over_budget'][budget] = stats['over_budget'].get(budget, 0) + 1
+            stats['latency_ms'].observe(metrics.latency * 1000)
+            stats['queries'].observe(metrics.num_queries)
+
+            for (kind, tag), (count, seconds, errors) in metrics.calls.items():
+                stats['totals'][kind]['count'] += count
+                stats['totals'][kind]['seconds'] += seconds
+
+                if kind in self.calls:
+                    call_stats = self.calls[kind].get(tag)
+                    if call_stats is None:
+                        call_stats = self.calls[kind][tag] = {'count': 0, 'errors': 0, 'seconds': 0.0}
+                    call_stats['count'] += count
+                    call_stats['errors'] += errors
+                    call_stats['seconds'] += seconds
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'started': self.started.isoformat(),
+                'endpoints': {
+                    endpoint: {
+                        'requests': stats['requests'],
+                        'over_budget': dict(stats['over_budget']),
+                        'latency_ms': stats['latency_ms'].as_dict(),
+                        'queries': stats['queries'].as_dict(),
+                        'totals': {
+                            kind: {'count': totals['count'], 'seconds': round(totals['seconds'], 3)}
+                            for kind, totals in stats['totals'].items()
+                        },
+                    }
+                    for endpoint, stats in self.endpoints.items()
+                },
+                'calls': {
+                    kind: {
+                        tag: dict(call_stats, seconds=round(call_stats['seconds'], 3))
+                        for tag, call_stats in calls.items()
+                    }
+                    for kind, calls in self.calls.items()
+                },
+            }
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,140 @@
+"""
+Middleware for the core app
+
+Note:
+    The performance instrumentation middleware should be the first middleware, so that the queries and calls made by
+    the other middleware are accounted for. The profiling middleware should be added after
+    "django.contrib.auth.middleware.AuthenticationMiddleware", since only staff users may request profiles.
+"""
+from __future__ import unicode_literals
+
+import logging
+import threading
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from ecommerce.core import instrumentation, profiling
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceInstrumentationMiddleware(object):
+    """
+    Middleware that counts, and times, the database queries, cache calls, and outbound HTTP calls made while handling
+    each request.
+
+    Measurements are logged, and aggregated by ``ecommerce.core.instrumentation.registry``. Requests exceeding their
+    query or latency budget are logged as warnings. The middleware is only used if the
+    PERFORMANCE_INSTRUMENTATION_ENABLED setting is True.
+    """
+
+    def __init__(self):
+        if not settings.PERFORMANCE_INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+
+        instrumentation.install()
+
+    def process_request(self, request):
+        instrumentation.start_request(request)
+
+    def process_response(self, request, response):
+        metrics = instrumentation.finish_request()
+        if metrics is None:
+            return response
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.view_name if resolver_match else None
+        endpoint = '{method} {view}'.format(method=request.method, view=view_name or '(unresolved)')
+
+        over_budget = self.get_exceeded_budgets(view_name, metrics)
+        instrumentation.registry.record(endpoint, metrics, over_budget)
+        self.log(endpoint, request, response, metrics, over_budget)
+
+        return response
+
+    def get_exceeded_budgets(self, view_name, metrics):
+        """ Returns the names of the budgets exceeded by the request. Budgets set to None are not enforced. """
+        budgets = {
+            'queries': settings.PERFORMANCE_QUERY_BUDGET,
+            'latency': settings.PERFORMANCE_LATENCY_BUDGET,
+        }
+        budgets.update(settings.PERFORMANCE_ENDPOINT_BUDGETS.get(view_name, {}))
+
+        measurements = {'queries': metrics.num_queries, 'latency': metrics.latency}
+        return sorted(
+            budget for budget, limit in budgets.items()
+            if limit is not None and measurements[budget] > limit
+        )
+
+    def log(self, endpoint, request, response, metrics, over_budget):
+        fields = [
+            ('endpoint', endpoint),
+            ('path', request.path),
+            ('status', response.status_code),
+            ('latency_ms', int(metrics.latency * 1000)),
+        ]
+        for kind in instrumentation.KINDS:
+            count, seconds = metrics.totals(kind)
+            fields += [('{}_count'.format(kind), count), ('{}_ms'.format(kind), int(seconds * 1000))]
+        fields.append(('cache_misses', metrics.cache_misses))
+
+        http_calls = sorted(
+            (tag, measurements[0]) for (kind, tag), measurements in metrics.calls.items()
+            if kind == instrumentation.HTTP
+        )
+        fields.append(('http_calls', ','.join('{}={}'.format(tag, count) for tag, count in http_calls)))
+        fields.append(('over_budget', ','.join(over_budget)))
+
+        message = ' '.join('{}=[{}]'.format(name, value) for name, value in fields)
+        if over_budget:
+            logger.warning('Request exceeded its performance budget: %s', message)
+        else:
+            logger.info('Request performance: %s', message)
+
+
+class ProfilingMiddleware(object):
+    """
+    Middleware that profiles requests with a sampling profiler, and saves their profiles.
+
+    Requests are only profiled if they are selected by ``ecommerce.core.profiling.get_profiling_trigger``, which,
+    with the default settings, selects none. Profiling starts once the view of the request is resolved, and requests
+    handled by views marked with the profiling_exempt decorator are never profiled.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):  # pylint: disable=unused-argument
+        request.profiler = None
+
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        if getattr(view_func, 'profiling_exempt', False) or getattr(view_class, 'profiling_exempt', False):
+            return
+
+        trigger = profiling.get_profiling_trigger(request)
+        if trigger:
+            request.profiler = profiling.SamplingProfiler(
+                threading.current_thread().ident, settings.PROFILING_SAMPLE_INTERVAL
+            )
+            request.profiling_trigger = trigger
+            request.profiler.start()
+
+    def process_response(self, request, response):
+        profiler = getattr(request, 'profiler', None)
+        if profiler is None:
+            return response
+
+        request.profiler = None
+        profiler.stop()
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        try:
+            profiling.save_profile(profiler, {
+                'method': request.method,
+                'path': request.path,
+                'view': resolver_match.view_name if resolver_match else None,
+                'status': response.status_code,
+                'trigger': request.profiling_trigger,
+            })
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Failed to save the profile of the request to [%s].', request.path)
+
+        return response
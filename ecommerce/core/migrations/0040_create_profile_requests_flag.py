@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+# The flag is only checked if the PROFILING_FLAG_NAME setting is set to its name.
+FLAG_NAME = 'profile_requests'
+
+
+def create_flag(apps, schema_editor):
+    Flag = apps.get_model('waffle', 'Flag')
+    note = 'This flag determines if requests are profiled, and their profiles listed in the dashboard.'
+    Flag.objects.get_or_create(name=FLAG_NAME, defaults={'note': note})
+
+
+def delete_flag(apps, schema_editor):
+    Flag = apps.get_model('waffle', 'Flag')
+    Flag.objects.filter(name=FLAG_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('core', '0039_auto_20170716_2212'),
+        ('waffle', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_flag, reverse_code=delete_flag),
+    ]
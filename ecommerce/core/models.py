@@ -21,9 +21,9 @@ from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
 from ecommerce.core.url_utils import get_lms_url
-from ecommerce.core.utils import log_message_and_raise_validation_error
+from ecommerce.core.utils import TimeoutSession, log_message_and_raise_validation_error
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
-from ecommerce.extensions.payment.helpers import get_processor_class, get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import get_processor_class_by_name, get_processor_classes
 
 log = logging.getLogger(__name__)
 
@@ -230,8 +230,7 @@ class SiteConfiguration(models.Model):
 
     def _all_payment_processors(self):
         """ Returns all processor classes declared in settings. """
-        all_processors = [get_processor_class(path) for path in settings.PAYMENT_PROCESSORS]
-        return all_processors
+        return get_processor_classes()
 
     def get_payment_processors(self):
         """
@@ -372,6 +371,11 @@ class SiteConfiguration(models.Model):
 
         return access_token
 
+    def _get_api_client(self, url, **kwargs):
+        """ Returns a client of the API at the given URL, authenticated as this site's service user, whose timeout is
+        applied to its requests. """
+        return EdxRestApiClient(url, jwt=self.access_token, session=TimeoutSession(), **kwargs)
+
     @cached_property
     def discovery_api_client(self):
         """
@@ -383,13 +387,13 @@ class SiteConfiguration(models.Model):
 
         # TODO Once the change is verified remove the switch and COURSE_CATALOG_API_URL from settings.
         if waffle.switch_is_active('use_multi_tenant_discovery_api_urls') and self.discovery_api_url:
-            return EdxRestApiClient(self.discovery_api_url, jwt=self.access_token)
-        return EdxRestApiClient(settings.COURSE_CATALOG_API_URL, jwt=self.access_token)
+            return self._get_api_client(self.discovery_api_url)
+        return self._get_api_client(settings.COURSE_CATALOG_API_URL)
 
     @cached_property
     def embargo_api_client(self):
         """ Returns the URL for the embargo API """
-        return EdxRestApiClient(self.build_lms_url('/api/embargo/v1'), jwt=self.access_token)
+        return self._get_api_client(self.build_lms_url('/api/embargo/v1'), timeout=settings.EMBARGO_API_TIMEOUT)
 
     @cached_property
     def enterprise_api_client(self):
@@ -403,7 +407,7 @@ class SiteConfiguration(models.Model):
             EdxRestApiClient: The client to access the Enterprise service.
 
         """
-        return EdxRestApiClient(self.enterprise_api_url, jwt=self.access_token)
+        return self._get_api_client(self.enterprise_api_url)
 
     @cached_property
     def user_api_client(self):
@@ -413,15 +417,15 @@ class SiteConfiguration(models.Model):
         Returns:
             EdxRestApiClient: The client to access the LMS user API service.
         """
-        return EdxRestApiClient(self.build_lms_url('/api/user/v1/'), jwt=self.access_token)
+        return self._get_api_client(self.build_lms_url('/api/user/v1/'))
 
     @cached_property
     def commerce_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/commerce/v1/'), jwt=self.access_token)
+        return self._get_api_client(self.build_lms_url('/api/commerce/v1/'))
 
     @cached_property
     def credit_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/credit/v1/'), jwt=self.access_token)
+        return self._get_api_client(self.build_lms_url('/api/credit/v1/'))
 
 
 class User(AbstractUser):
@@ -513,6 +517,8 @@ class User(AbstractUser):
         Check if a user has verified his/her identity.
         Calls the LMS verification status API endpoint and returns the verification status information.
         The status information is stored in cache, if the user is verified, until the verification expires.
+        Otherwise, it is stored for VERIFICATION_STATUS_NEGATIVE_CACHE_TIMEOUT seconds, so that learners who
+        reload pages while they are not verified do not call the LMS on every request.
 
         Args:
             site (Site): The site object from which the LMS account API endpoint is created.
@@ -520,30 +526,41 @@ class User(AbstractUser):
         Returns:
             True if the user is verified, false otherwise.
         """
-        try:
-            cache_key = 'verification_status_{username}'.format(username=self.username)
-            cache_key = hashlib.md5(cache_key).hexdigest()
-            verification = cache.get(cache_key)
-            if not verification:
-                api = EdxRestApiClient(
-                    site.siteconfiguration.build_lms_url('api/user/v1/'),
-                    oauth_access_token=self.access_token
-                )
-                response = api.accounts(self.username).verification_status().get()
-
-                verification = response.get('is_verified', False)
-                if verification:
-                    cache_timeout = int((parse(response.get('expiration_datetime')) - now()).total_seconds())
-                    cache.set(cache_key, verification, cache_timeout)
+        cache_key = 'verification_status_{username}'.format(username=self.username)
+        cache_key = hashlib.md5(cache_key).hexdigest()
+        verification = cache.get(cache_key)
+        if verification is not None:
             return verification
+
+        try:
+            api = EdxRestApiClient(
+                site.siteconfiguration.build_lms_url('api/user/v1/'),
+                oauth_access_token=self.access_token,
+                session=TimeoutSession(),
+                timeout=settings.VERIFICATION_STATUS_API_TIMEOUT
+            )
+            response = api.accounts(self.username).verification_status().get()
         except HttpNotFoundError:
             log.debug('No verification data found for [%s]', self.username)
-            return False
+            response = {}
         except (ConnectionError, SlumberBaseException, Timeout):
             msg = 'Failed to retrieve verification status details for [{username}]'.format(username=self.username)
             log.warning(msg)
             return False
 
+        # The client returns the body of responses which are not JSON as is.
+        if not isinstance(response, dict):
+            log.warning('Failed to parse the verification status details of [%s].', self.username)
+            return False
+
+        verification = response.get('is_verified', False)
+        if verification:
+            cache_timeout = int((parse(response.get('expiration_datetime')) - now()).total_seconds())
+        else:
+            cache_timeout = settings.VERIFICATION_STATUS_NEGATIVE_CACHE_TIMEOUT
+        cache.set(cache_key, verification, cache_timeout)
+        return verification
+
     def deactivate_account(self, site_configuration):
         """Deactive the user's account.
 
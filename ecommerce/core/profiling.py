@@ -0,0 +1,197 @@
+"""
+Sampling profiler for individual requests.
+
+While a profiled request is handled, a background thread samples the stack of the thread handling it at a fixed
+interval. Sampling only reads the stack of the profiled thread, so, unlike deterministic profilers such as cProfile,
+the code being profiled is not slowed down by each function call.
+
+Profiles are written to the PROFILING_DIRECTORY in the folded stack format (one line per distinct stack, with its
+frames separated by semicolons, followed by the number of samples), which is read by flamegraph.pl, speedscope, and
+most other flame graph tools. Each profile is accompanied by a JSON file describing the profiled request.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import io
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+import waffle
+from django.conf import settings
+
+PROFILE_EXTENSION = '.folded'
+METADATA_EXTENSION = '.json'
+PROFILE_NAME_PATTERN = r'[0-9T]+-[0-9a-f]{8}'
+
+
+class SamplingProfiler(object):
+    """ Samples the stack of a thread until it is stopped. """
+
+    def __init__(self, thread_id, interval):
+        """
+        Arguments:
+            thread_id (int): identifier of the thread to profile
+            interval (float): seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.started = None
+        self.duration = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def num_samples(self):
+        return sum(self.stacks.values())
+
+    def start(self):
+        self.started = time.time()
+        self._thread = threading.Thread(target=self._run, name='profiler-{}'.format(self.thread_id))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        self.duration = time.time() - self.started
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # pylint: disable=protected-access
+            if frame is not None:
+                self.stacks[self.get_stack(frame)] += 1
+
+    def get_stack(self, frame):
+        """ Returns the folded stack of the given frame, from the outermost frame to the given frame. """
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append('{name} ({filename}:{line})'.format(
+                name=code.co_name, filename=code.co_filename, line=code.co_firstlineno
+            ))
+            frame = frame.f_back
+
+        # Semicolons separate frames.
+        return ';'.join(reversed(frames)).replace('\n', ' ') if frames else ''
+
+    def dumps(self):
+        """ Returns the samples in the folded stack format. """
+        return ''.join('{} {}\n'.format(stack, count) for stack, count in sorted(self.stacks.items()))
+
+
+def profiling_exempt(view):
+    """
+    Marks a view, or view class, as never profiled.
+
+    Checking whether a request should be profiled may read the waffle flag from the database, which views that must
+    respond while the database is unavailable, such as the health check, cannot afford.
+    """
+    view.profiling_exempt = True
+    return view
+
+
+def get_profiling_trigger(request):
+    """
+    Returns the reason the request should be profiled, or None if it should not be.
+
+    Requests are profiled if staff users send the PROFILING_HEADER, if they are sampled at the PROFILING_SAMPLE_RATE,
+    or if the PROFILING_FLAG_NAME waffle flag is active for them. The flag is not checked if PROFILING_FLAG_NAME is
+    not set, so that requests do not read it.
+    """
+    header = 'HTTP_' + settings.PROFILING_HEADER.upper().replace('-', '_')
+    if request.META.get(header) and request.user.is_staff:
+        return 'header'
+
+    if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+        return 'sample'
+
+    if settings.PROFILING_FLAG_NAME and waffle.flag_is_active(request, settings.PROFILING_FLAG_NAME):
+        return 'flag'
+
+    return None
+
+
+def _write(path, content):
+    # Files are written under a temporary name, then renamed, so that incomplete profiles are never listed.
+    temporary_path = path + '.tmp'
+    with io.open(temporary_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.rename(temporary_path, path)
+
+
+def save_profile(profiler, metadata):
+    """
+    Writes the samples of the profiler, and the metadata of the profiled request, to the PROFILING_DIRECTORY, and
+    deletes the oldest profiles beyond PROFILING_MAX_PROFILES.
+
+    Returns:
+        str: name of the profile
+    """
+    directory = settings.PROFILING_DIRECTORY
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    created = datetime.datetime.utcfromtimestamp(profiler.started)
+    name = '{}-{}'.format(created.strftime('%Y%m%dT%H%M%S%f'), uuid.uuid4().hex[:8])
+    metadata = dict(
+        metadata,
+        name=name,
+        created=created.isoformat(),
+        duration=round(profiler.duration, 3),
+        samples=profiler.num_samples,
+    )
+
+    _write(os.path.join(directory, name + PROFILE_EXTENSION), profiler.dumps())
+    _write(os.path.join(directory, name + METADATA_EXTENSION), json.dumps(metadata).decode('utf-8'))
+
+    for old_name in get_profile_names()[settings.PROFILING_MAX_PROFILES:]:
+        for extension in (PROFILE_EXTENSION, METADATA_EXTENSION):
+            try:
+                os.remove(os.path.join(directory, old_name + extension))
+            except OSError:
+                # The profile was deleted by another process.
+                pass
+
+    return name
+
+
+def get_profile_names():
+    """ Returns the names of the saved profiles, from the most recent to the oldest. """
+    directory = settings.PROFILING_DIRECTORY
+    if not os.path.isdir(directory):
+        return []
+
+    pattern = re.compile(r'^({}){}$'.format(PROFILE_NAME_PATTERN, re.escape(METADATA_EXTENSION)))
+    matches = (pattern.match(filename) for filename in os.listdir(directory))
+    return sorted((match.group(1) for match in matches if match), reverse=True)
+
+
+def get_profiles(limit=None):
+    """ Returns the metadata of the most recent profiles. """
+    profiles = []
+    for name in get_profile_names()[:limit]:
+        try:
+            with io.open(os.path.join(settings.PROFILING_DIRECTORY, name + METADATA_EXTENSION), encoding='utf-8') as f:
+                profiles.append(json.load(f))
+        except (IOError, ValueError):
+            # The profile was deleted, or is being written, by another process.
+            continue
+
+    return profiles
+
+
+def get_profile_path(name):
+    """ Returns the path of the samples of the named profile, or None if there is no such profile. """
+    if not re.match(r'^{}$'.format(PROFILE_NAME_PATTERN), name):
+        return None
+
+    path = os.path.join(settings.PROFILING_DIRECTORY, name + PROFILE_EXTENSION)
+    return path if os.path.exists(path) else None
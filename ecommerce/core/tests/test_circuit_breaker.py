@@ -0,0 +1,46 @@
+from django.core.cache import cache
+
+from ecommerce.core.circuit_breaker import CircuitBreaker
+from ecommerce.tests.testcases import TestCase
+
+
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        super(CircuitBreakerTests, self).setUp()
+        self.circuit_breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=60)
+
+    def test_opened_after_failures(self):
+        """ Verify the circuit is opened once the failure threshold is reached. """
+        self.assertFalse(self.circuit_breaker.is_open())
+
+        self.circuit_breaker.record_failure()
+        self.assertFalse(self.circuit_breaker.is_open())
+
+        self.circuit_breaker.record_failure()
+        self.assertTrue(self.circuit_breaker.is_open())
+
+    def test_closed_after_success(self):
+        """ Verify a successful call closes the circuit, and resets the count of failures. """
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_success()
+        self.assertFalse(self.circuit_breaker.is_open())
+
+        self.circuit_breaker.record_failure()
+        self.assertFalse(self.circuit_breaker.is_open())
+
+    def test_closed_after_reset_timeout(self):
+        """ Verify the circuit is closed once the reset timeout has passed. """
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+
+        # Simulate the expiration of the circuit's state.
+        cache.delete_many([self.circuit_breaker.failures_cache_key, self.circuit_breaker.open_cache_key])
+        self.assertFalse(self.circuit_breaker.is_open())
+
+    def test_shared_state(self):
+        """ Verify breakers with the same name share their state. """
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+        self.assertTrue(CircuitBreaker('test', failure_threshold=2, reset_timeout=60).is_open())
+        self.assertFalse(CircuitBreaker('other', failure_threshold=2, reset_timeout=60).is_open())
@@ -0,0 +1,131 @@
+from __future__ import unicode_literals
+
+import ddt
+import requests
+import responses
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from ecommerce.core import instrumentation
+from ecommerce.tests.testcases import TestCase
+
+User = get_user_model()
+
+
+@ddt.ddt
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        super(InstrumentationTests, self).setUp()
+        instrumentation.install()
+
+        request = RequestFactory().get('/')
+        request.site = self.site
+        self.metrics = instrumentation.start_request(request)
+        self.addCleanup(instrumentation.finish_request)
+
+    def get_calls(self, kind):
+        return {
+            tag: measurements[0] for (call_kind, tag), measurements in self.metrics.calls.items() if call_kind == kind
+        }
+
+    @ddt.data(
+        ('http://lms.test/api/enrollment/v1/enrollment', '/api/enrollment/v1/enrollment'),
+        ('http://lms.test/api/user/v1/accounts/edx01?fields=id', '/api/user/v1/accounts/{id}'),
+        ('http://lms.test/api/courses/v1/courses/course-v1:edX+DemoX+Demo/', '/api/courses/v1/courses/{id}/'),
+    )
+    @ddt.unpack
+    def test_get_resource(self, url, expected):
+        """ Verify identifiers are replaced by a placeholder, but API versions are not. """
+        self.assertEqual(instrumentation.get_resource(url), expected)
+
+    def test_sql(self):
+        """ Verify the queries made while recording are counted. """
+        User.objects.count()
+        User.objects.count()
+        instrumentation.finish_request()
+
+        self.assertEqual(self.metrics.num_queries, 2)
+        self.assertIsNotNone(self.metrics.latency)
+
+    def test_cache(self):
+        """ Verify cache calls are counted by operation, along with misses. """
+        cache.set('instrumented', 1)
+        cache.get('instrumented')
+        cache.get('missing')
+        cache.get_many(['instrumented', 'missing'])
+
+        self.assertEqual(self.get_calls(instrumentation.CACHE), {'set': 1, 'get': 2, 'get_many': 1})
+        self.assertEqual(self.metrics.cache_misses, 1)
+
+    @responses.activate
+    @override_settings(PERFORMANCE_INSTRUMENTATION_SERVICE_HOSTS={'api.sailthru.com': 'sailthru'})
+    def test_http(self):
+        """ Verify HTTP calls are counted by service and resource, along with server errors. """
+        lms_url = self.site.siteconfiguration.build_lms_url('/api/user/v1/accounts/{}')
+        for username in ('a1', 'b2'):
+            responses.add(responses.GET, lms_url.format(username), json={})
+        responses.add(responses.POST, 'https://api.sailthru.com/send', status=500)
+
+        requests.get(lms_url.format('a1'))
+        requests.get(lms_url.format('b2'))
+        requests.post('https://api.sailthru.com/send')
+
+        self.assertEqual(self.get_calls(instrumentation.HTTP), {
+            'lms GET /api/user/v1/accounts/{id}': 2,
+            'sailthru POST /send': 1,
+        })
+        self.assertEqual(self.metrics.calls[(instrumentation.HTTP, 'sailthru POST /send')][2], 1)
+
+    def test_not_recorded_outside_requests(self):
+        """ Verify calls made outside of requests are not recorded. """
+        instrumentation.finish_request()
+        cache.get('instrumented')
+        self.assertEqual(self.metrics.calls, {})
+
+    def test_install_idempotent(self):
+        """ Verify installing the instrumentation again does not count calls twice. """
+        instrumentation.install()
+        cache.get('instrumented')
+        self.assertEqual(self.get_calls(instrumentation.CACHE), {'get': 1})
+
+
+class HistogramTests(TestCase):
+    def test_observe(self):
+        """ Verify values are counted in the first bucket whose bound they do not exceed. """
+        histogram = instrumentation.Histogram((1, 10))
+        for value in (0, 1, 5, 11):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.as_dict(), {
+            'count': 4,
+            'sum': 17,
+            'buckets': {'1': 2, '10': 1, '+Inf': 1},
+        })
+
+
+class MetricsRegistryTests(TestCase):
+    def test_record(self):
+        """ Verify measurements are aggregated by endpoint, and by call. """
+        registry = instrumentation.MetricsRegistry()
+        metrics = instrumentation.RequestMetrics(RequestFactory().get('/'))
+        metrics.record(instrumentation.CACHE, 'get', 0.001)
+        metrics.record(instrumentation.HTTP, 'lms GET /api', 0.2, error=True)
+        metrics.finish()
+
+        registry.record('GET health', metrics, ['latency'])
+        registry.record('GET health', metrics, [])
+
+        data = registry.as_dict()
+        endpoint = data['endpoints']['GET health']
+        self.assertEqual(endpoint['requests'], 2)
+        self.assertEqual(endpoint['over_budget'], {'latency': 1})
+        self.assertEqual(endpoint['queries']['count'], 2)
+        self.assertEqual(endpoint['totals'][instrumentation.HTTP], {'count': 2, 'seconds': 0.4})
+        self.assertEqual(
+            data['calls'][instrumentation.HTTP], {'lms GET /api': {'count': 2, 'errors': 2, 'seconds': 0.4}}
+        )
+
+        registry.reset()
+        self.assertEqual(registry.as_dict()['endpoints'], {})
@@ -0,0 +1,111 @@
+from __future__ import unicode_literals
+
+import shutil
+import tempfile
+
+import mock
+from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
+from testfixtures import LogCapture
+
+from ecommerce.core import instrumentation, profiling
+from ecommerce.tests.testcases import TestCase
+
+LOGGER_NAME = 'ecommerce.core.middleware'
+
+
+@override_settings(PERFORMANCE_INSTRUMENTATION_ENABLED=True)
+class PerformanceInstrumentationMiddlewareTests(TestCase):
+    def setUp(self):
+        super(PerformanceInstrumentationMiddlewareTests, self).setUp()
+        instrumentation.registry.reset()
+        self.addCleanup(instrumentation.registry.reset)
+
+    def assert_logged(self, logs, level, prefix):
+        records = [record for record in logs.records if record.name == LOGGER_NAME]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].levelname, level)
+        self.assertTrue(records[0].getMessage().startswith(prefix))
+        return records[0].getMessage()
+
+    def test_request_recorded(self):
+        """ Verify the measurements of each request are logged, and aggregated by endpoint. """
+        with LogCapture(LOGGER_NAME) as logs:
+            self.client.get(reverse('health'))
+
+        endpoint = instrumentation.registry.as_dict()['endpoints']['GET health']
+        self.assertEqual(endpoint['requests'], 1)
+        num_queries = endpoint['totals'][instrumentation.SQL]['count']
+        self.assertGreater(num_queries, 0)
+
+        message = self.assert_logged(logs, 'INFO', 'Request performance: endpoint=[GET health]')
+        self.assertIn('sql_count=[{}]'.format(num_queries), message)
+        self.assertIn('over_budget=[]', message)
+
+    @override_settings(PERFORMANCE_QUERY_BUDGET=0)
+    def test_query_budget(self):
+        """ Verify requests making more queries than their budget are logged as warnings. """
+        with LogCapture(LOGGER_NAME) as logs:
+            self.client.get(reverse('health'))
+
+        message = self.assert_logged(logs, 'WARNING', 'Request exceeded its performance budget')
+        self.assertIn('over_budget=[queries]', message)
+        self.assertEqual(instrumentation.registry.as_dict()['endpoints']['GET health']['over_budget'], {'queries': 1})
+
+    @override_settings(PERFORMANCE_QUERY_BUDGET=0, PERFORMANCE_ENDPOINT_BUDGETS={'health': {'queries': None}})
+    def test_endpoint_budget(self):
+        """ Verify endpoint budgets override the default budgets. """
+        with LogCapture(LOGGER_NAME) as logs:
+            self.client.get(reverse('health'))
+
+        self.assert_logged(logs, 'INFO', 'Request performance')
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION_ENABLED=False)
+    def test_disabled(self):
+        """ Verify nothing is recorded if the instrumentation is disabled. """
+        self.client.get(reverse('health'))
+        self.assertEqual(instrumentation.registry.as_dict()['endpoints'], {})
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        super(ProfilingMiddlewareTests, self).setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        overridden_settings = self.settings(PROFILING_DIRECTORY=directory)
+        overridden_settings.enable()
+        self.addCleanup(overridden_settings.disable)
+
+        user = self.create_user(is_staff=True)
+        self.client.login(username=user.username, password=self.password)
+        self.path = reverse('performance_metrics')
+
+    def test_not_profiled(self):
+        """ Verify requests are not profiled by default. """
+        self.client.get(self.path)
+        self.assertEqual(profiling.get_profiles(), [])
+
+    def test_profiled(self):
+        """ Verify the profiles of profiled requests are saved. """
+        self.client.get(self.path, HTTP_X_PROFILE_REQUEST='1')
+
+        profile = profiling.get_profiles()[0]
+        self.assertDictContainsSubset({
+            'method': 'GET', 'path': self.path, 'view': 'performance_metrics', 'status': 200, 'trigger': 'header'
+        }, profile)
+        self.assertIsNotNone(profiling.get_profile_path(profile['name']))
+
+    def test_exempt(self):
+        """ Verify requests handled by exempt views are never profiled. """
+        self.client.get(reverse('health'), HTTP_X_PROFILE_REQUEST='1')
+        self.assertEqual(profiling.get_profiles(), [])
+
+    def test_save_failure(self):
+        """ Verify responses are returned even if their profile cannot be saved. """
+        with mock.patch.object(profiling, 'save_profile', side_effect=OSError):
+            with LogCapture(LOGGER_NAME) as logs:
+                response = self.client.get(self.path, HTTP_X_PROFILE_REQUEST='1')
+
+        self.assertEqual(response.status_code, 200)
+        logs.check((LOGGER_NAME, 'ERROR', 'Failed to save the profile of the request to [{}].'.format(self.path)))
@@ -5,10 +5,11 @@ import httpretty
 import mock
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.test import override_settings
 from edx_rest_api_client.auth import SuppliedJwtAuth
-from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectionError, Timeout
 
 from ecommerce.core.models import BusinessClient, SiteConfiguration, User
 from ecommerce.core.tests import toggle_switch
@@ -148,15 +149,46 @@ class UserTests(CourseCatalogTestMixin, LmsApiMockMixin, TestCase):
         self.assertTrue(user.is_verified(self.site))
 
     @httpretty.activate
-    def test_user_verification_status_not_cached(self):
-        """ Verify the user verification status values is not cached when user is not verified. """
+    def test_user_verification_status_negatively_cached(self):
+        """ Verify the user verification status value is cached briefly when user is not verified. """
         user = self.create_user()
         self.mock_verification_status_api(self.site, user, is_verified=False)
         self.assertFalse(user.is_verified(self.site))
 
-        httpretty.disable()
+        self.mock_verification_status_api(self.site, user, is_verified=True)
         self.assertFalse(user.is_verified(self.site))
 
+        with override_settings(VERIFICATION_STATUS_NEGATIVE_CACHE_TIMEOUT=0):
+            cache.clear()
+            self.mock_verification_status_api(self.site, user, is_verified=False)
+            self.assertFalse(user.is_verified(self.site))
+            self.mock_verification_status_api(self.site, user, is_verified=True)
+            self.assertTrue(user.is_verified(self.site))
+
+    def test_user_verification_status_timeout(self):
+        """ Verify the verification status API is called with a timeout, and that failures are not cached. """
+        user = self.create_user()
+        with mock.patch('requests.Session.request', side_effect=Timeout) as mock_request:
+            self.assertFalse(user.is_verified(self.site))
+            self.assertFalse(user.is_verified(self.site))
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_request.call_args[1]['timeout'], settings.VERIFICATION_STATUS_API_TIMEOUT)
+
+    @httpretty.activate
+    def test_user_verification_status_invalid_response(self):
+        """ Verify users are not verified, and nothing is cached, if the response is not valid JSON. """
+        user = self.create_user()
+        url = self.site.siteconfiguration.build_lms_url(
+            'api/user/v1/accounts/{username}/verification_status/'.format(username=user.username)
+        )
+        httpretty.register_uri(httpretty.GET, url, status=200, body='<html></html>', content_type='text/html')
+
+        self.assertFalse(user.is_verified(self.site))
+
+        self.mock_verification_status_api(self.site, user)
+        self.assertTrue(user.is_verified(self.site))
+
     @httpretty.activate
     def test_deactivation(self):
         """Verify the deactivation endpoint is called for the user."""
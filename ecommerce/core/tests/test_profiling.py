@@ -0,0 +1,139 @@
+from __future__ import unicode_literals
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from waffle.models import Flag
+
+from ecommerce.core import profiling
+from ecommerce.tests.testcases import TestCase
+
+
+class SamplingProfilerTests(TestCase):
+    def test_sampling(self):
+        """ Verify the stack of the profiled thread is sampled, from its outermost frame, until it is stopped. """
+        frame = sys._getframe()  # pylint: disable=protected-access
+        profiler = profiling.SamplingProfiler(threading.current_thread().ident, 0.001)
+
+        # The profiler samples twice, then is stopped.
+        with mock.patch.object(profiler._stopped, 'wait', side_effect=[False, False, True]):  # pylint: disable=protected-access
+            with mock.patch('sys._current_frames', return_value={profiler.thread_id: frame}):
+                profiler._run()  # pylint: disable=protected-access
+
+        stack = profiler.get_stack(frame)
+        self.assertEqual(dict(profiler.stacks), {stack: 2})
+        self.assertTrue(stack.split(';')[-1].startswith('test_sampling ('))
+
+    def test_start_stop(self):
+        """ Verify the profiler samples from a background thread, and records how long it ran. """
+        profiler = profiling.SamplingProfiler(threading.current_thread().ident, 0.001)
+        profiler.start()
+        profiler.stop()
+
+        self.assertFalse(profiler._thread.is_alive())  # pylint: disable=protected-access
+        self.assertGreaterEqual(profiler.duration, 0)
+
+    def test_dumps(self):
+        """ Verify samples are written in the folded stack format. """
+        profiler = profiling.SamplingProfiler(threading.current_thread().ident, 0.001)
+        profiler.stacks.update({'a;b': 2, 'a': 1})
+        self.assertEqual(profiler.dumps(), 'a 1\na;b 2\n')
+
+
+class ProfilingTriggerTests(TestCase):
+    def setUp(self):
+        super(ProfilingTriggerTests, self).setUp()
+        self.request = RequestFactory().get('/')
+        self.request.user = AnonymousUser()
+
+    def test_not_profiled(self):
+        """ Verify requests are not profiled with the default settings. """
+        self.assertIsNone(profiling.get_profiling_trigger(self.request))
+
+    def test_header(self):
+        """ Verify requests are profiled if staff users send the profiling header. """
+        self.request.META['HTTP_X_PROFILE_REQUEST'] = '1'
+        self.assertIsNone(profiling.get_profiling_trigger(self.request))
+
+        self.request.user = self.create_user(is_staff=True)
+        self.assertEqual(profiling.get_profiling_trigger(self.request), 'header')
+
+    @override_settings(PROFILING_SAMPLE_RATE=1)
+    def test_sample(self):
+        """ Verify requests are sampled at the sample rate. """
+        self.assertEqual(profiling.get_profiling_trigger(self.request), 'sample')
+
+    def test_flag(self):
+        """ Verify requests are profiled if the waffle flag is active for them, once the flag is named. """
+        Flag.objects.update_or_create(name='profile_requests', defaults={'everyone': True})
+        self.assertIsNone(profiling.get_profiling_trigger(self.request))
+
+        with override_settings(PROFILING_FLAG_NAME='profile_requests'):
+            self.assertEqual(profiling.get_profiling_trigger(self.request), 'flag')
+
+    def test_flag_not_read(self):
+        """ Verify the waffle flag is not read if it is not named. """
+        with self.assertNumQueries(0):
+            self.assertIsNone(profiling.get_profiling_trigger(self.request))
+
+
+class ProfileStorageTests(TestCase):
+    def setUp(self):
+        super(ProfileStorageTests, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        overridden_settings = self.settings(PROFILING_DIRECTORY=os.path.join(self.directory, 'profiles'))
+        overridden_settings.enable()
+        self.addCleanup(overridden_settings.disable)
+
+    def save_profile(self, started):
+        profiler = profiling.SamplingProfiler(threading.current_thread().ident, 0.001)
+        profiler.stacks.update({'a;b': 1})
+        profiler.started = started
+        profiler.duration = 0.1
+        return profiling.save_profile(profiler, {'path': '/basket/'})
+
+    def test_save_profile(self):
+        """ Verify profiles are saved with their metadata, and listed from the most recent. """
+        self.assertEqual(profiling.get_profiles(), [])
+
+        first = self.save_profile(1000)
+        second = self.save_profile(2000)
+        self.assertEqual(profiling.get_profile_names(), [second, first])
+
+        profile = profiling.get_profiles(limit=1)[0]
+        self.assertEqual(profile['name'], second)
+        self.assertEqual(profile['path'], '/basket/')
+        self.assertEqual(profile['samples'], 1)
+
+        with open(profiling.get_profile_path(second)) as f:
+            self.assertEqual(f.read(), 'a;b 1\n')
+
+    @override_settings(PROFILING_MAX_PROFILES=2)
+    def test_oldest_profiles_deleted(self):
+        """ Verify the oldest profiles are deleted once the maximum number of profiles is reached. """
+        names = [self.save_profile(started) for started in (1000, 2000, 3000)]
+
+        self.assertEqual(profiling.get_profile_names(), [names[2], names[1]])
+        self.assertIsNone(profiling.get_profile_path(names[0]))
+        self.assertEqual(len(os.listdir(os.path.join(self.directory, 'profiles'))), 4)
+
+    def test_get_profile_path_invalid_name(self):
+        """ Verify only the paths of profiles are returned. """
+        name = self.save_profile(1000)
+        with open(os.path.join(self.directory, 'secret'), 'w') as f:
+            json.dump({}, f)
+
+        self.assertIsNotNone(profiling.get_profile_path(name))
+        self.assertIsNone(profiling.get_profile_path('../secret'))
+        self.assertIsNone(profiling.get_profile_path('20170101T000000-00000000'))
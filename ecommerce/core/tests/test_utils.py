@@ -0,0 +1,50 @@
+import threading
+
+import mock
+
+from ecommerce.core.utils import map_concurrently
+from ecommerce.tests.testcases import TestCase
+
+
+class MapConcurrentlyTests(TestCase):
+    def setUp(self):
+        super(MapConcurrentlyTests, self).setUp()
+        self.threads = []
+
+    def double(self, item):
+        self.threads.append(threading.current_thread())
+        return item * 2
+
+    @mock.patch('ecommerce.core.utils.connection')
+    def test_map_concurrently(self, mock_connection):
+        """ Verify items are processed by worker threads, which close their database connections. """
+        items = range(6)
+        started = threading.Event()
+        waited = []
+
+        def double(item):
+            # The first item waits for the second to start, which only happens if workers run at the same time.
+            if item == 0:
+                waited.append(started.wait(5))
+            elif item == 1:
+                started.set()
+            return self.double(item)
+
+        results = map_concurrently(double, items, 3)
+
+        self.assertEqual(results, [item * 2 for item in items])
+        self.assertEqual(waited, [True])
+        self.assertNotIn(threading.current_thread(), self.threads)
+        self.assertEqual(mock_connection.close.call_count, len(items))
+
+    @mock.patch('ecommerce.core.utils.connection')
+    def test_map_serially(self, mock_connection):
+        """ Verify items are processed in the calling thread if a single worker is allowed. """
+        self.assertEqual(map_concurrently(self.double, [1, 2], 1), [2, 4])
+        self.assertEqual(set(self.threads), {threading.current_thread()})
+        self.assertFalse(mock_connection.close.called)
+
+    def test_map_no_items(self):
+        """ Verify nothing is done if no items are given. """
+        self.assertEqual(map_concurrently(self.double, [], 3), [])
+        self.assertEqual(self.threads, [])
@@ -10,6 +10,7 @@ from django.db import DatabaseError
 from django.test.utils import override_settings
 from rest_framework import status
 
+from ecommerce.core import instrumentation
 from ecommerce.core.constants import Status
 from ecommerce.tests.testcases import TestCase
 
@@ -88,3 +89,20 @@ class AutoAuthTests(TestCase):
 class LogoutViewTests(LogoutViewTestMixin, TestCase):
     def get_redirect_url(self):
         return self.site.siteconfiguration.build_lms_url('logout')
+
+
+class PerformanceMetricsViewTests(TestCase):
+    path = reverse('performance_metrics')
+
+    def test_staff_only(self):
+        """ Verify the view is only accessible to staff users. """
+        self.client.login(username=self.create_user().username, password=self.password)
+        self.assertEqual(self.client.get(self.path).status_code, 404)
+
+    def test_get(self):
+        """ Verify the metrics aggregated by the process are returned. """
+        self.client.login(username=self.create_user(is_staff=True).username, password=self.password)
+        response = self.client.get(self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(json.loads(response.content)), set(instrumentation.registry.as_dict()))
@@ -2,10 +2,16 @@ from __future__ import unicode_literals
 
 import hashlib
 import logging
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 from urlparse import parse_qs, urlparse
 
+import requests
 import six
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.http import HttpRequest
+from threadlocals.threadlocals import get_current_request, set_thread_variable
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +54,21 @@ def get_cache_key(**kwargs):
     return hashlib.md5(key).hexdigest()
 
 
+class TimeoutSession(requests.Session):
+    """
+    Session applying its ``timeout`` attribute to the requests made without a timeout.
+
+    EdxRestApiClient sets the timeout it is given on the session of the client, which requests ignores. Clients given
+    an instance of this session apply it.
+    """
+    timeout = None
+
+    def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super(TimeoutSession, self).request(method, url, **kwargs)
+
+
 def traverse_pagination(response, endpoint):
     """
     Traverse a paginated API response.
@@ -73,3 +94,61 @@ def traverse_pagination(response, endpoint):
         next_page = response.get('next')
 
     return results
+
+
+@contextmanager
+def current_site(site):
+    """
+    Installs a thread-local request for the given site, for code run outside of the request/response cycle, e.g. by
+    management commands and worker threads.
+
+    Helpers building LMS URLs, offer conditions, and order utilities read the site from the current request. The
+    previous request of the thread is restored on exit.
+
+    Arguments:
+        site (Site): site of the request
+
+    Yields:
+        HttpRequest: the installed request
+    """
+    request = HttpRequest()
+    request.site = site
+    previous_request = get_current_request()
+
+    set_thread_variable('request', request)
+    try:
+        yield request
+    finally:
+        set_thread_variable('request', previous_request)
+
+
+def map_concurrently(func, items, max_workers):
+    """
+    Calls a function with each of the given items, in at most `max_workers` threads.
+
+    Items are processed in the calling thread if `max_workers` is 1, or if there is at most one item. Worker threads
+    open their own database connections, which are closed once each item has been processed.
+
+    Arguments:
+        func (callable): function called with each item
+        items (list): items to process
+        max_workers (int): maximum number of items processed concurrently
+
+    Returns:
+        list: the result of each call, in the order of the given items
+    """
+    if max_workers == 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    def call(item):
+        try:
+            return func(item)
+        finally:
+            connection.close()
+
+    pool = ThreadPool(min(max_workers, len(items)))
+    try:
+        return pool.map(call, items)
+    finally:
+        pool.close()
+        pool.join()
@@ -12,12 +12,17 @@ from django.shortcuts import redirect
 from django.utils.decorators import method_decorator
 from django.views.generic import View
 
+from ecommerce.core import instrumentation
 from ecommerce.core.constants import Status
+from ecommerce.core.profiling import profiling_exempt
+from ecommerce.extensions.basket.decorators import basket_exempt
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
+@basket_exempt
+@profiling_exempt
 @transaction.non_atomic_requests
 def health(_):
     """Allows a load balancer to verify that the ecommerce front-end service is up.
@@ -97,6 +102,13 @@ class StaffOnlyMixin(object):
         return super(StaffOnlyMixin, self).dispatch(request, *args, **kwargs)
 
 
+class PerformanceMetricsView(StaffOnlyMixin, View):
+    """ Returns the performance measurements aggregated by this process, as JSON. """
+
+    def get(self, request):  # pylint: disable=unused-argument
+        return JsonResponse(instrumentation.registry.as_dict())
+
+
 class LogoutView(EdxOpenIdConnectLogoutView):
     """ Logout view that redirects the user to the LMS logout page. """
 
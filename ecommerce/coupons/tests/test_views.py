@@ -34,6 +34,7 @@ Catalog = get_model('catalogue', 'Catalog')
 Course = get_model('courses', 'Course')
 Product = get_model('catalogue', 'Product')
 Order = get_model('order', 'Order')
+OrderDiscount = get_model('order', 'OrderDiscount')
 OrderLineVouchers = get_model('voucher', 'OrderLineVouchers')
 StockRecord = get_model('partner', 'StockRecord')
 Voucher = get_model('voucher', 'Voucher')
@@ -130,7 +131,10 @@ class VoucherIsValidTests(CourseCatalogTestMixin, TestCase):
 
     def assert_error_messages(self, voucher, product, user, error_msg):
         """ Assert the proper error message is returned. """
-        voucher.offers.first().record_usage(discount={'freq': 1, 'discount': 1})
+        offer = voucher.offers.first()
+        # Orders record the usage of their offers once their discounts have been created.
+        OrderDiscount.objects.create(order=OrderFactory(), offer_id=offer.id, amount=1, frequency=1)
+        offer.record_usage(discount={'freq': 1, 'discount': 1})
         self.request.user = user
         valid, msg = voucher_is_valid(voucher=voucher, products=[product], request=self.request)
         self.assertFalse(valid)
@@ -570,7 +574,8 @@ class CouponRedeemViewTests(CouponMixin, CourseCatalogTestMixin, LmsApiMockMixin
         self.mock_account_api(self.request, self.user.username, data={'is_active': True})
         self.mock_access_token_response()
         self.create_coupon_and_get_code()
-        with mock.patch.object(UserAlreadyPlacedOrder, 'user_already_placed_order', return_value=True):
+        with mock.patch.object(UserAlreadyPlacedOrder, 'get_already_purchased_products',
+                               side_effect=lambda user, products: products):
             response = self.client.get(self.redeem_url_with_params())
             msg = 'You have already purchased {course} seat.'.format(course=self.course.name)
             self.assertEqual(response.context['error'], msg)
@@ -0,0 +1,77 @@
+""" This command saves, and publishes to the LMS, courses in bulk. """
+from __future__ import unicode_literals
+
+import json
+import logging
+import os
+
+from django.contrib.sites.models import Site
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.courses.publication import publish_courses
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Save, and publish to the LMS, courses in bulk."""
+
+    help = 'Save, and publish to the LMS, courses and their seats in bulk. Courses are published concurrently.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses_file',
+                            action='store',
+                            dest='courses_file',
+                            default=None,
+                            help='Path to a JSON file containing a list of courses, in the format accepted by the '
+                                 'atomic publication endpoint.')
+        parser.add_argument('--site',
+                            action='store',
+                            dest='site_domain',
+                            default=None,
+                            help='Domain for the ecommerce site providing the courses.')
+        parser.add_argument('--max_workers',
+                            action='store',
+                            dest='max_workers',
+                            default=None,
+                            type=int,
+                            help='Maximum number of courses published concurrently.')
+
+    def handle(self, *args, **options):
+        courses_file = options['courses_file']
+        if not courses_file or not os.path.exists(courses_file):
+            raise CommandError('Pass the correct absolute path to courses file as --courses_file argument.')
+
+        try:
+            site = Site.objects.get(domain=options['site_domain'])
+        except Site.DoesNotExist:
+            raise CommandError('Pass the domain of an existing site as --site argument.')
+
+        with open(courses_file, 'r') as file_handler:
+            try:
+                courses = json.load(file_handler)
+            except ValueError:
+                raise CommandError('The courses file does not contain valid JSON.')
+
+        if not isinstance(courses, list) or not all(isinstance(course, dict) for course in courses):
+            raise CommandError('The courses file must contain a list of courses.')
+
+        logger.info('Publishing [%d] courses.', len(courses))
+
+        results = publish_courses(
+            site, site.siteconfiguration.partner, courses, max_workers=options['max_workers']
+        )
+
+        failed = 0
+        for result in results:
+            if result['success']:
+                logger.info('Course [%s] was %s and published.', result['id'],
+                            'created' if result['created'] else 'updated')
+            else:
+                failed += 1
+                logger.error('Failed to publish course [%s]: %s', result['id'], result['message'])
+
+        if failed:
+            logger.error('Completed publishing courses. %d of %d failed.', failed, len(results))
+        else:
+            logger.info('All %d courses successfully published.', len(results))
@@ -0,0 +1,57 @@
+"""
+Bulk publication of courses.
+
+Each course is saved, and published to the LMS, exactly as it is by the atomic publication endpoint: its seats are
+created or updated in a transaction that is rolled back if publication fails, so that ecommerce and the LMS stay in
+sync. Courses are independent of one another, so they are saved and published concurrently, by at most
+``settings.COURSE_PUBLICATION_MAX_WORKERS`` threads, which also bounds the number of concurrent calls to the LMS.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.conf import settings
+
+from ecommerce.core.utils import map_concurrently
+from ecommerce.extensions.api.serializers import AtomicPublicationSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def _save_and_publish_course(site, partner, data):
+    """ Saves, and publishes, a single course, and summarizes the result. """
+    result = {'id': data.get('id'), 'created': False, 'success': False, 'message': None}
+
+    try:
+        serializer = AtomicPublicationSerializer(data=data, context={'site': site, 'partner': partner})
+        if not serializer.is_valid():
+            result['message'] = serializer.errors
+            return result
+
+        created, failure, message = serializer.save()
+        result.update({'created': created, 'success': failure is None, 'message': message})
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('Failed to save and publish course [%s].', result['id'])
+        result['message'] = 'An unexpected error occurred.'
+
+    return result
+
+
+def publish_courses(site, partner, courses, max_workers=None):
+    """
+    Saves, and publishes to the LMS, many courses and their seats.
+
+    Arguments:
+        site (Site): site the courses belong to
+        partner (Partner): partner owning the stock records of the seats
+        courses (list): one dict per course, in the format accepted by the atomic publication endpoint
+        max_workers (int): maximum number of courses saved and published concurrently. Defaults to the
+            COURSE_PUBLICATION_MAX_WORKERS setting.
+
+    Returns:
+        list: one dict per course, in the given order, with the course's ID, a boolean indicating if the course was
+            created, a boolean indicating if the course was saved and published successfully, and the validation
+            errors or publication message, if any. Courses which failed have not been saved.
+    """
+    max_workers = max_workers or settings.COURSE_PUBLICATION_MAX_WORKERS
+    return map_concurrently(lambda data: _save_and_publish_course(site, partner, data), courses, max_workers)
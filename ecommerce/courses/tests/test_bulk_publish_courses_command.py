@@ -0,0 +1,53 @@
+from __future__ import unicode_literals
+
+import json
+import tempfile
+
+import mock
+from django.core.management import CommandError, call_command
+
+from ecommerce.tests.testcases import TestCase
+
+PUBLISH_COURSES_PATH = 'ecommerce.courses.management.commands.bulk_publish_courses.publish_courses'
+
+
+class BulkPublishCoursesTests(TestCase):
+    command = 'bulk_publish_courses'
+
+    def setUp(self):
+        super(BulkPublishCoursesTests, self).setUp()
+        self.courses = [{'id': 'a/b/c'}, {'id': 'd/e/f'}]
+
+    def call_command_with_file(self, content, **kwargs):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json') as courses_file:
+            courses_file.write(content)
+            courses_file.flush()
+            call_command(self.command, courses_file=courses_file.name, **kwargs)
+
+    def test_missing_courses_file(self):
+        """ Verify an error is raised if the courses file does not exist. """
+        with self.assertRaises(CommandError):
+            call_command(self.command, courses_file='/tmp/does-not-exist.json', site_domain=self.site.domain)
+
+    def test_unknown_site(self):
+        """ Verify an error is raised if the site does not exist. """
+        with self.assertRaises(CommandError):
+            self.call_command_with_file(json.dumps(self.courses), site_domain='unknown.example.com')
+
+    def test_invalid_courses_file(self):
+        """ Verify an error is raised if the courses file does not contain a list of courses. """
+        for content in ('not json', json.dumps({'id': 'a/b/c'}), json.dumps(['a/b/c'])):
+            with self.assertRaises(CommandError):
+                self.call_command_with_file(content, site_domain=self.site.domain)
+
+    def test_publish_courses(self):
+        """ Verify the courses listed in the file are published for the partner of the site. """
+        results = [
+            {'id': 'a/b/c', 'created': True, 'success': True, 'message': None},
+            {'id': 'd/e/f', 'created': False, 'success': False, 'message': 'Failed.'},
+        ]
+
+        with mock.patch(PUBLISH_COURSES_PATH, return_value=results) as mock_publish_courses:
+            self.call_command_with_file(json.dumps(self.courses), site_domain=self.site.domain, max_workers=2)
+
+        mock_publish_courses.assert_called_once_with(self.site, self.partner, self.courses, max_workers=2)
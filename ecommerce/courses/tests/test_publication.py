@@ -0,0 +1,87 @@
+from __future__ import unicode_literals
+
+from multiprocessing.pool import ThreadPool
+
+import mock
+
+from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.tests import toggle_switch
+from ecommerce.courses.models import Course
+from ecommerce.courses.publication import publish_courses
+from ecommerce.courses.publishers import LMSPublisher
+from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
+from ecommerce.tests.testcases import TestCase
+
+
+class PublishCoursesTests(CourseCatalogTestMixin, TestCase):
+    def setUp(self):
+        super(PublishCoursesTests, self).setUp()
+        toggle_switch('publish_course_modes_to_lms', True)
+
+    def get_course_data(self, course_id):
+        return {
+            'id': course_id,
+            'name': 'Test Course',
+            'create_or_activate_enrollment_code': False,
+            'products': [
+                {
+                    'product_class': SEAT_PRODUCT_CLASS_NAME,
+                    'expires': None,
+                    'price': 10.00,
+                    'attribute_values': [
+                        {'name': 'certificate_type', 'value': 'verified'},
+                        {'name': 'id_verification_required', 'value': True},
+                    ],
+                },
+            ],
+        }
+
+    def test_publish_courses(self):
+        """ Verify each course is saved and published, and only the courses that failed are rolled back. """
+        courses = [self.get_course_data('a/b/c'), self.get_course_data('d/e/f')]
+
+        with mock.patch.object(LMSPublisher, 'publish') as mock_publish:
+            mock_publish.side_effect = lambda course: 'Failed.' if course.id == 'd/e/f' else None
+            results = publish_courses(self.site, self.partner, courses)
+
+        self.assertEqual(results, [
+            {'id': 'a/b/c', 'created': True, 'success': True, 'message': None},
+            {'id': 'd/e/f', 'created': False, 'success': False, 'message': 'Failed.'},
+        ])
+        course = Course.objects.get(id='a/b/c')
+        self.assertEqual(course.site, self.site)
+        self.assertEqual(course.seat_products.get().stockrecords.get().partner, self.partner)
+        self.assertFalse(Course.objects.filter(id='d/e/f').exists())
+
+    def test_publish_courses_invalid(self):
+        """ Verify courses failing validation are reported, and not saved. """
+        data = self.get_course_data('a/b/c')
+        data.pop('name')
+
+        with mock.patch.object(LMSPublisher, 'publish') as mock_publish:
+            results = publish_courses(self.site, self.partner, [data])
+
+        self.assertFalse(mock_publish.called)
+        self.assertFalse(results[0]['success'])
+        self.assertIn('name', results[0]['message'])
+        self.assertFalse(Course.objects.filter(id='a/b/c').exists())
+
+    def test_publish_courses_concurrently(self):
+        """ Verify courses are saved and published by a bounded thread pool, and results keep the given order. """
+        courses = [self.get_course_data(course_id) for course_id in ('a/b/c', 'd/e/f', 'g/h/i')]
+
+        def save_and_publish_course(site, partner, data):
+            self.assertEqual((site, partner), (self.site, self.partner))
+            return {'id': data['id'], 'created': True, 'success': True, 'message': None}
+
+        with mock.patch('ecommerce.core.utils.ThreadPool', wraps=ThreadPool) as mock_pool:
+            with mock.patch('ecommerce.courses.publication._save_and_publish_course',
+                            side_effect=save_and_publish_course):
+                results = publish_courses(self.site, self.partner, courses, max_workers=2)
+
+        mock_pool.assert_called_once_with(2)
+        self.assertEqual([result['id'] for result in results], ['a/b/c', 'd/e/f', 'g/h/i'])
+
+    def test_publish_no_courses(self):
+        """ Verify nothing is done if no courses are given. """
+        self.assertEqual(publish_courses(self.site, self.partner, []), [])
@@ -1,9 +1,11 @@
 import hashlib
+from collections import defaultdict
 
 from django.conf import settings
 from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 from edx_rest_api_client.client import EdxRestApiClient
+from oscar.core.loading import get_model
 
 from ecommerce.core.url_utils import get_lms_url
 
@@ -25,6 +27,32 @@ def mode_for_seat(product):
     return mode
 
 
+def prefetch_product_attributes(products):
+    """
+    Loads the attributes of the given products with a single query.
+
+    Reading ``product.attr`` otherwise loads the attributes of each product with a query per product.
+
+    Arguments:
+        products (list of Product)
+    """
+    ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+
+    products = [product for product in products if not product.attr.initialised]
+    if not products:
+        return
+
+    attribute_values = defaultdict(list)
+    product_ids = set(product.id for product in products)
+    for value in ProductAttributeValue.objects.filter(product_id__in=product_ids).select_related('attribute'):
+        attribute_values[value.product_id].append(value)
+
+    for product in products:
+        for value in attribute_values[product.id]:
+            setattr(product.attr, value.attribute.code, value.value)
+        product.attr.initialised = True
+
+
 def get_course_info_from_lms(course_key):
     """ Get course information from LMS via the course api and cache """
     api = EdxRestApiClient(get_lms_url('api/courses/v1/'))
@@ -0,0 +1,149 @@
+"""
+Directory of the credit providers of each site.
+
+The credit checkout page, the receipt page, and the credit receipt email all look up providers in the LMS Credit API,
+although providers rarely change. Instead, all providers of a site are fetched with a single call, and kept in the
+shared cache and in the memory of each process for ``settings.CREDIT_PROVIDER_CACHE_TIMEOUT`` seconds.
+
+Once a directory has expired, it is still served from memory while a background thread fetches it again, so lookups
+never wait for the LMS once a process has loaded the directory of a site. If the LMS cannot be reached, the expired
+directory continues to be served, and the refresh is retried after ``REFRESH_RETRY_INTERVAL`` seconds.
+"""
+from __future__ import unicode_literals
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from edx_rest_api_client.client import EdxRestApiClient
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
+
+from ecommerce.core.utils import get_cache_key
+
+logger = logging.getLogger(__name__)
+
+REFRESH_RETRY_INTERVAL = 60  # Value is in seconds.
+
+# Directories, keyed by site ID. Each value is a tuple of the providers, keyed by ID, and the time at which they
+# expire.
+_directories = {}
+_directories_lock = threading.Lock()
+
+# IDs of the sites whose directories are being refreshed.
+_refreshing = set()
+
+
+def get_directory_cache_key(site_configuration):
+    return get_cache_key(site_domain=site_configuration.site.domain, resource='credit_provider_directory')
+
+
+def fetch_credit_providers(site_configuration, access_token):
+    """
+    Fetches all credit providers from the LMS Credit API.
+
+    Arguments:
+        site_configuration (SiteConfiguration): Configuration of the site whose LMS is called.
+        access_token (str): JWT access token
+
+    Returns:
+        dict: Credit providers, keyed by ID.
+
+    Raises:
+        ConnectionError, SlumberBaseException, Timeout: If the providers could not be fetched.
+    """
+    providers = EdxRestApiClient(
+        site_configuration.build_lms_url('api/credit/v1/'),
+        oauth_access_token=access_token
+    ).providers.get()
+
+    return {provider['id']: provider for provider in providers}
+
+
+def _store(site_id, providers, fetched):
+    with _directories_lock:
+        _directories[site_id] = (providers, fetched + settings.CREDIT_PROVIDER_CACHE_TIMEOUT)
+
+
+def refresh_credit_provider_directory(site_configuration, cache_key, access_token):
+    """
+    Loads the directory of the site from the shared cache if another process has refreshed it, or from the LMS.
+
+    Returns:
+        dict: Credit providers, keyed by ID.
+
+    Raises:
+        ConnectionError, SlumberBaseException, Timeout: If the providers could not be fetched.
+    """
+    entry = cache.get(cache_key)
+    if entry is not None and entry[1] + settings.CREDIT_PROVIDER_CACHE_TIMEOUT > time.time():
+        providers, fetched = entry
+    else:
+        providers = fetch_credit_providers(site_configuration, access_token)
+        fetched = time.time()
+        cache.set(cache_key, (providers, fetched), settings.CREDIT_PROVIDER_CACHE_TIMEOUT)
+
+    _store(site_configuration.site_id, providers, fetched)
+    return providers
+
+
+def _refresh_in_background(site_configuration, cache_key, access_token):
+    site_id = site_configuration.site_id
+
+    with _directories_lock:
+        if site_id in _refreshing:
+            return
+        _refreshing.add(site_id)
+
+    def refresh():
+        try:
+            refresh_credit_provider_directory(site_configuration, cache_key, access_token)
+        except (ConnectionError, SlumberBaseException, Timeout):
+            logger.warning('Failed to refresh the credit providers of site [%d]. Retrying in [%d] seconds.',
+                           site_id, REFRESH_RETRY_INTERVAL)
+            with _directories_lock:
+                entry = _directories.get(site_id)
+                if entry is not None:
+                    _directories[site_id] = (entry[0], time.time() + REFRESH_RETRY_INTERVAL)
+        finally:
+            with _directories_lock:
+                _refreshing.discard(site_id)
+
+    thread = threading.Thread(target=refresh, name='credit-provider-directory-refresh')
+    thread.daemon = True
+    thread.start()
+
+
+def get_credit_provider_directory(site_configuration, access_token):
+    """
+    Returns the credit providers of the given site.
+
+    Arguments:
+        site_configuration (SiteConfiguration): Configuration of the site whose providers are returned.
+        access_token (str): JWT access token used if the providers must be fetched.
+
+    Returns:
+        dict: Credit providers, keyed by ID, or None if they could not be fetched.
+    """
+    cache_key = get_directory_cache_key(site_configuration)
+    entry = _directories.get(site_configuration.site_id)
+
+    if entry is not None:
+        providers, expires = entry
+        if expires <= time.time():
+            _refresh_in_background(site_configuration, cache_key, access_token)
+        return providers
+
+    try:
+        return refresh_credit_provider_directory(site_configuration, cache_key, access_token)
+    except (ConnectionError, SlumberBaseException, Timeout):
+        logger.exception('Failed to retrieve the credit providers of site [%d].', site_configuration.site_id)
+        return None
+
+
+def clear_credit_provider_directories():
+    """ Discards the directories held by this process. """
+    with _directories_lock:
+        _directories.clear()
@@ -0,0 +1,80 @@
+from __future__ import unicode_literals
+
+import json
+import time
+
+import httpretty
+import mock
+from django.core.cache import cache
+
+from ecommerce.credit import directory
+from ecommerce.credit.directory import (
+    clear_credit_provider_directories, get_credit_provider_directory, get_directory_cache_key
+)
+from ecommerce.tests.testcases import TestCase
+
+JSON = 'application/json'
+
+
+class CreditProviderDirectoryTests(TestCase):
+    def setUp(self):
+        super(CreditProviderDirectoryTests, self).setUp()
+        self.providers = [
+            {'id': 'ASU', 'display_name': 'Arizona State University'},
+            {'id': 'HGW', 'display_name': 'Hogwarts'},
+        ]
+
+    def mock_providers_api(self, body, status=200):
+        httpretty.register_uri(
+            httpretty.GET,
+            self.site.siteconfiguration.build_lms_url('api/credit/v1/providers/'),
+            body=json.dumps(body),
+            status=status,
+            content_type=JSON
+        )
+
+    def get_directory(self):
+        return get_credit_provider_directory(self.site.siteconfiguration, self.access_token)
+
+    @httpretty.activate
+    def test_directory_cached(self):
+        """ Verify all providers are fetched with a single call, and kept in memory and in the shared cache. """
+        self.mock_providers_api(self.providers)
+        expected = {provider['id']: provider for provider in self.providers}
+
+        self.assertEqual(self.get_directory(), expected)
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+        httpretty.reset()
+        self.assertEqual(self.get_directory(), expected)
+
+        # Other processes load the directory from the shared cache.
+        clear_credit_provider_directories()
+        self.assertEqual(self.get_directory(), expected)
+
+    @httpretty.activate
+    def test_directory_unavailable(self):
+        """ Verify None is returned, and nothing is cached, if the providers cannot be fetched. """
+        self.mock_providers_api([], status=500)
+        self.assertIsNone(self.get_directory())
+        self.assertIsNone(cache.get(get_directory_cache_key(self.site.siteconfiguration)))
+
+    @httpretty.activate
+    def test_expired_directory_refreshed_in_background(self):
+        """ Verify expired directories are served while they are refreshed in the background. """
+        self.mock_providers_api(self.providers[:1])
+        self.get_directory()
+        cache.clear()
+
+        with mock.patch.object(directory, 'time') as mock_time:
+            mock_time.time.return_value = time.time() + 24 * 60 * 60
+
+            with mock.patch.object(directory, '_refresh_in_background') as mock_refresh:
+                self.assertEqual(self.get_directory().keys(), ['ASU'])
+                self.assertEqual(mock_refresh.call_count, 1)
+
+            self.mock_providers_api(self.providers)
+            directory.refresh_credit_provider_directory(
+                self.site.siteconfiguration, get_directory_cache_key(self.site.siteconfiguration), self.access_token
+            )
+            self.assertEqual(sorted(self.get_directory().keys()), ['ASU', 'HGW'])
@@ -15,6 +15,7 @@ from slumber.exceptions import SlumberHttpBaseException
 
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
+from ecommerce.credit.directory import get_credit_provider_directory
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
 from ecommerce.extensions.offer.utils import format_benefit_value
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
@@ -169,17 +170,29 @@ class Checkout(TemplateView):
     def _get_providers_from_lms(self, credit_seats):
         """ Helper method for getting provider info from LMS.
 
+        Providers are looked up in the credit provider directory of the site. If any of them are missing from the
+        directory, they are all retrieved from LMS.
+
         Arguments:
             credit_seats (Products): List of credit_seats objects.
 
         Returns:
             Response from LMS as json, containing list of providers.
         """
+        provider_ids = []
+        for seat in credit_seats:
+            if seat.attr.credit_provider and seat.attr.credit_provider not in provider_ids:
+                provider_ids.append(seat.attr.credit_provider)
+
+        directory = get_credit_provider_directory(self.request.site.siteconfiguration, self.request.user.access_token)
+        if directory is None:
+            return None
 
-        provider_ids = ",".join([seat.attr.credit_provider for seat in credit_seats if seat.attr.credit_provider])
+        if all(provider_id in directory for provider_id in provider_ids):
+            return [directory[provider_id] for provider_id in provider_ids]
 
         try:
-            return self.credit_api_client.providers.get(provider_ids=provider_ids)
+            return self.credit_api_client.providers.get(provider_ids=",".join(provider_ids))
         except SlumberHttpBaseException:
             logger.exception('An error occurred while retrieving credit provider details.')
             return None
@@ -0,0 +1,32 @@
+"""
+Middleware for analytics app
+
+Note:
+    This middleware should be added after "threadlocals.middleware.ThreadLocalMiddleware", which makes the request
+    available to the models that defer events.
+"""
+from ecommerce.extensions.analytics.utils import fire_basket_line_events, silence_exceptions
+
+
+class SegmentEventMiddleware(object):
+    """
+    Middleware that fires the Segment events deferred while handling a request, once the response has been computed.
+    """
+
+    def process_request(self, request):
+        request.deferred_segment_events = []
+
+    def process_response(self, request, response):
+        events = getattr(request, 'deferred_segment_events', None)
+
+        # The request may remain the current request of this thread, so events tracked after this point must not be
+        # deferred.
+        request.deferred_segment_events = None
+
+        if events:
+            self.fire_events(events)
+        return response
+
+    @silence_exceptions('Failed to fire deferred Segment events.')
+    def fire_events(self, events):
+        fire_basket_line_events(events)
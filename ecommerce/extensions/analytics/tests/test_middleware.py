@@ -0,0 +1,56 @@
+import mock
+from django.http import HttpResponse
+from django.test import RequestFactory
+from oscar.test import factories
+from threadlocals.threadlocals import set_thread_variable
+
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.analytics.middleware import SegmentEventMiddleware
+from ecommerce.extensions.test.factories import create_basket
+from ecommerce.tests.testcases import TestCase
+
+
+class SegmentEventMiddlewareTests(TestCase):
+    def setUp(self):
+        super(SegmentEventMiddlewareTests, self).setUp()
+        self.middleware = SegmentEventMiddleware()
+        self.request = RequestFactory().get('/')
+        self.basket = create_basket(owner=factories.UserFactory(), site=self.site, empty=True)
+        self.seat = CourseFactory().create_or_update_seat('verified', True, 100, self.partner)
+
+        set_thread_variable('request', self.request)
+        self.addCleanup(set_thread_variable, 'request', None)
+
+    def test_events_deferred(self):
+        """ Verify basket events are deferred until the response has been computed, and fired in one batch. """
+        self.middleware.process_request(self.request)
+
+        with mock.patch('ecommerce.extensions.analytics.utils.track_segment_event') as mock_track:
+            self.basket.add_product(self.seat)
+            self.basket.flush()
+            self.assertFalse(mock_track.called)
+
+            with mock.patch('ecommerce.extensions.analytics.utils.prefetch_products_for_segment') as mock_prefetch:
+                response = HttpResponse()
+                self.assertEqual(self.middleware.process_response(self.request, response), response)
+                self.assertEqual(mock_prefetch.call_count, 1)
+
+            self.assertEqual([call[0][2] for call in mock_track.call_args_list], ['Product Added', 'Product Removed'])
+
+    def test_events_fired_after_response(self):
+        """ Verify events tracked after the response has been computed are fired immediately. """
+        self.middleware.process_request(self.request)
+        self.middleware.process_response(self.request, HttpResponse())
+
+        with mock.patch('ecommerce.extensions.analytics.utils.track_segment_event') as mock_track:
+            self.basket.add_product(self.seat)
+            self.assertEqual(mock_track.call_count, 1)
+
+    def test_failure_silenced(self):
+        """ Verify failures to fire events do not affect the response. """
+        self.middleware.process_request(self.request)
+        self.basket.add_product(self.seat)
+
+        with mock.patch('ecommerce.extensions.analytics.utils.track_segment_event', side_effect=Exception):
+            response = HttpResponse()
+            self.assertEqual(self.middleware.process_response(self.request, response), response)
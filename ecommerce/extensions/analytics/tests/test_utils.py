@@ -2,17 +2,24 @@ import json
 import mock
 from analytics import Client
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from oscar.core.loading import get_model
 from oscar.test import factories
 
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.analytics.utils import (
-    parse_tracking_context, prepare_analytics_data, track_segment_event, translate_basket_line_for_segment
+    fire_basket_line_events, parse_tracking_context, prepare_analytics_data, track_segment_event,
+    translate_basket_line_for_segment
 )
 from ecommerce.extensions.basket.tests.mixins import BasketMixin
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
+from ecommerce.extensions.partner.strategy import DefaultStrategy
 from ecommerce.extensions.test.factories import create_basket
 from ecommerce.tests.testcases import TestCase
 
+Basket = get_model('basket', 'Basket')
+
 
 class UtilsTest(CourseCatalogTestMixin, BasketMixin, TestCase):
     """ Tests for the analytics utils. """
@@ -125,3 +132,29 @@ class UtilsTest(CourseCatalogTestMixin, BasketMixin, TestCase):
         course.delete()
         expected['name'] = seat.title
         self.assertEqual(translate_basket_line_for_segment(line), expected)
+
+    def _fire_removed_events(self, num_seats):
+        """ Fires 'Product Removed' events for a basket with the given number of seats, and returns the queries. """
+        basket = create_basket(owner=factories.UserFactory(), site=self.site, empty=True)
+        for __ in range(num_seats):
+            basket.add_product(CourseFactory().create_or_update_seat('verified', True, 100, self.partner))
+
+        basket = Basket.objects.get(id=basket.id)
+        basket.strategy = DefaultStrategy()
+        lines = list(basket.all_lines())
+        with mock.patch.object(Client, 'track') as mock_track:
+            with CaptureQueriesContext(connection) as queries:
+                fire_basket_line_events([(self.site, basket.owner, 'Product Removed', lines, {})])
+
+        self.assertEqual(mock_track.call_count, num_seats)
+        for line, call in zip(lines, mock_track.call_args_list):
+            self.assertEqual(call[0][2], translate_basket_line_for_segment(line))
+
+        return len(queries)
+
+    def test_fire_basket_line_events(self):
+        """ Verify the products of all lines are prefetched, so the number of queries does not grow with the lines. """
+        self.site.siteconfiguration.segment_key = 'fake_key'
+        self.site.siteconfiguration.save()
+
+        self.assertEqual(self._fire_removed_events(1), self._fire_removed_events(3))
@@ -2,7 +2,10 @@ import json
 import logging
 from functools import wraps
 
-from ecommerce.courses.utils import mode_for_seat
+from django.db.models import prefetch_related_objects
+from threadlocals.threadlocals import get_current_request
+
+from ecommerce.courses.utils import mode_for_seat, prefetch_product_attributes
 
 logger = logging.getLogger(__name__)
 
@@ -171,3 +174,59 @@ def translate_basket_line_for_segment(line):
         'quantity': line.quantity,
         'category': line.product.get_product_class().name,
     }
+
+
+def prefetch_products_for_segment(products):
+    """ Loads the courses, product classes, stock records, and attributes read by translate_basket_line_for_segment.
+
+    The related objects of all products are loaded with a fixed number of queries, rather than a few queries per
+    product.
+
+    Args:
+        products (list of Product)
+    """
+    products = list(products)
+    if not products:
+        return
+
+    prefetch_related_objects(products, 'course', 'product_class', 'parent__product_class', 'stockrecords')
+
+    prefetch_product_attributes(products)
+
+
+def track_basket_line_events(basket, event, lines, **extra_properties):
+    """ Fire a Segment event for each of the given basket lines.
+
+    Within a request handled by SegmentEventMiddleware, the events are deferred, and fired in a single batch once the
+    response has been computed. Otherwise, they are fired immediately.
+
+    Args:
+        basket (Basket): Basket whose site and owner are used to fire the events.
+        event (str): Event name.
+        lines (list of BasketLine): Lines to translate into event properties.
+        **extra_properties: Properties added to the properties of each line.
+    """
+    deferred_events = getattr(get_current_request(), 'deferred_segment_events', None)
+    events = [(basket.site, basket.owner, event, list(lines), extra_properties)]
+
+    if deferred_events is None:
+        fire_basket_line_events(events)
+    else:
+        deferred_events.extend(events)
+
+
+def fire_basket_line_events(events):
+    """ Fire batches of basket line events.
+
+    The products of all lines are prefetched once before the lines are translated.
+
+    Args:
+        events (list): Tuples of the site, user, event name, basket lines, and extra properties of each batch.
+    """
+    prefetch_products_for_segment([line.product for __, __, __, lines, __ in events for line in lines])
+
+    for site, user, event, lines, extra_properties in events:
+        for line in lines:
+            properties = translate_basket_line_for_segment(line)
+            properties.update(extra_properties)
+            track_segment_event(site, user, event, properties)
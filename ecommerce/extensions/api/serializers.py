@@ -17,8 +17,9 @@ from rest_framework.reverse import reverse
 from ecommerce.core.constants import COURSE_ID_REGEX, ENROLLMENT_CODE_SWITCH, ISO_8601_FORMAT, SEAT_PRODUCT_CLASS_NAME
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.courses.models import Course
+from ecommerce.extensions.offer.counters import get_num_applications
+from ecommerce.extensions.voucher.summaries import get_coupon_summary
 from ecommerce.invoice.models import Invoice
-from ecommerce.programs.constants import BENEFIT_PROXY_CLASS_MAP
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,7 @@ Product = get_model('catalogue', 'Product')
 Partner = get_model('partner', 'Partner')
 ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 ProductCategory = get_model('catalogue', 'ProductCategory')
+Range = get_model('offer', 'Range')
 Refund = get_model('refund', 'Refund')
 Selector = get_class('partner.strategy', 'Selector')
 StockRecord = get_model('partner', 'StockRecord')
@@ -363,6 +365,10 @@ class AtomicPublicationSerializer(serializers.Serializer):  # pylint: disable=ab
 
         return self.partner
 
+    def get_site(self):
+        """Return the site given in the context, or the site of the request."""
+        return self.context.get('site') or self.context['request'].site
+
     def save(self):
         """Save and publish Course and associated products."
 
@@ -389,7 +395,7 @@ class AtomicPublicationSerializer(serializers.Serializer):  # pylint: disable=ab
 
             # Explicitly delimit operations which will be rolled back if an exception is raised.
             with transaction.atomic():
-                site = self.context['request'].site
+                site = self.get_site()
                 course, created = Course.objects.get_or_create(id=course_id, site=site)
                 course.name = course_name
                 course.verification_deadline = course_verification_deadline
@@ -532,15 +538,16 @@ class CouponListSerializer(serializers.ModelSerializer):
     code = serializers.SerializerMethodField()
 
     def get_category(self, obj):
-        category = ProductCategory.objects.filter(product=obj).first().category
-        return CategorySerializer(category).data
+        summary = get_coupon_summary(obj)
+        return {'id': summary.category_id, 'name': summary.category_name}
 
     def get_client(self, obj):
-        return Invoice.objects.get(order__lines__product=obj).business_client.name
+        return get_coupon_summary(obj).client
 
     def get_code(self, obj):
-        if is_custom_code(obj):
-            return retrieve_voucher(obj).code
+        summary = get_coupon_summary(obj)
+        if not summary.is_enrollment_code:
+            return summary.code
 
     class Meta(object):
         model = Product
@@ -574,71 +581,64 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
     voucher_type = serializers.SerializerMethodField()
 
     def get_benefit_type(self, obj):
-        return retrieve_benefit(obj).type or BENEFIT_PROXY_CLASS_MAP[retrieve_benefit(obj).proxy_class]
+        return get_coupon_summary(obj).benefit_type
 
     def get_benefit_value(self, obj):
-        return retrieve_benefit(obj).value
+        return get_coupon_summary(obj).benefit_value
 
     def get_catalog_query(self, obj):
-        offer_range = retrieve_range(obj)
-        return offer_range.catalog_query if offer_range else None
+        return get_coupon_summary(obj).catalog_query
 
     def get_course_catalog(self, obj):
-        offer_range = retrieve_range(obj)
-        return offer_range.course_catalog if offer_range else None
+        return get_coupon_summary(obj).course_catalog
 
     def get_category(self, obj):
-        category = ProductCategory.objects.filter(product=obj).first().category
-        return CategorySerializer(category).data
+        summary = get_coupon_summary(obj)
+        return {'id': summary.category_id, 'name': summary.category_name}
 
     def get_coupon_type(self, obj):
-        if is_enrollment_code(obj):
+        if get_coupon_summary(obj).is_enrollment_code:
             return _('Enrollment code')
         return _('Discount code')
 
     def get_client(self, obj):
-        return Invoice.objects.get(order__lines__product=obj).business_client.name
+        return get_coupon_summary(obj).client
 
     def get_code(self, obj):
-        if retrieve_quantity(obj) == 1:
-            return retrieve_voucher(obj).code
+        return get_coupon_summary(obj).code
 
     def get_code_status(self, obj):
-        start_date = retrieve_start_date(obj)
-        end_date = retrieve_end_date(obj)
+        summary = get_coupon_summary(obj)
         current_datetime = timezone.now()
-        in_time_interval = start_date < current_datetime < end_date
+        in_time_interval = summary.start_datetime < current_datetime < summary.end_datetime
         return _('ACTIVE') if in_time_interval else _('INACTIVE')
 
     def get_course_seat_types(self, obj):
+        summary = get_coupon_summary(obj)
         seat_types = []
-        offer_range = retrieve_range(obj)
 
-        if offer_range:
-            course_seat_types = offer_range.course_seat_types or ''
+        if summary.range_id:
+            course_seat_types = summary.course_seat_types or ''
             seat_types = course_seat_types.split(',')
 
         return seat_types
 
     def get_email_domains(self, obj):
-        offer = retrieve_offer(obj)
-        return offer.email_domains
+        return get_coupon_summary(obj).email_domains
 
     def get_end_date(self, obj):
-        return retrieve_end_date(obj)
+        return get_coupon_summary(obj).end_datetime
 
     def get_enterprise_customer(self, obj):
         """ Get the Enterprise Customer UUID attached to a coupon. """
-        offer_range = retrieve_range(obj)
-        return offer_range.enterprise_customer if offer_range else None
+        return get_coupon_summary(obj).enterprise_customer
 
     def get_last_edited(self, obj):
-        history = obj.history.latest()
-        return history.history_user.username, history.history_date
+        summary = get_coupon_summary(obj)
+        return summary.last_edited_by, summary.last_edited
 
     def get_max_uses(self, obj):
-        offer = retrieve_offer(obj)
-        return offer.max_global_applications
+        return get_coupon_summary(obj).max_uses
 
     def get_note(self, obj):
         try:
@@ -647,12 +647,11 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
             return None
 
     def get_num_uses(self, obj):
-        offer = retrieve_offer(obj)
-        return offer.num_applications
+        return get_num_applications(get_coupon_summary(obj).offer_id)
 
     def get_program_uuid(self, obj):
         """ Get the Program UUID attached to the coupon. """
-        return retrieve_offer(obj).condition.program_uuid
+        return get_coupon_summary(obj).program_uuid
 
     def get_payment_information(self, obj):
         """
@@ -660,30 +659,29 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
         Currently only invoices are supported, in the event of adding another
         payment processor append it to the response dictionary.
         """
-        invoice = Invoice.objects.filter(order__lines__product=obj).first()
+        invoice = Invoice.objects.filter(id=get_coupon_summary(obj).invoice_id).first()
         response = {'Invoice': InvoiceSerializer(invoice).data}
         return response
 
     def get_quantity(self, obj):
-        return retrieve_quantity(obj)
+        return get_coupon_summary(obj).quantity
 
     def get_start_date(self, obj):
-        return retrieve_start_date(obj)
+        return get_coupon_summary(obj).start_datetime
 
     def get_seats(self, obj):
-        offer_range = retrieve_range(obj)
+        offer_range = Range.objects.filter(id=get_coupon_summary(obj).range_id).first()
         request = self.context['request']
 
-        if offer_range and offer_range.catalog:
-            stockrecords = offer_range.catalog.stock_records.all()
-            seats = Product.objects.filter(id__in=[sr.product.id for sr in stockrecords])
+        if offer_range and offer_range.catalog_id:
+            seats = Product.objects.filter(stockrecords__catalogs=offer_range.catalog_id).distinct()
             serializer = ProductSerializer(seats, many=True, context={'request': request})
             return serializer.data
 
         return {}
 
     def get_voucher_type(self, obj):
-        return retrieve_voucher_usage(obj)
+        return get_coupon_summary(obj).voucher_type
 
     class Meta(object):
         model = Product
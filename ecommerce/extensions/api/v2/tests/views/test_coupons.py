@@ -9,8 +9,11 @@ from uuid import uuid4
 import ddt
 import httpretty
 import pytz
+from django.core.management import call_command
 from django.core.urlresolvers import reverse
-from django.test import RequestFactory
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 from oscar.apps.catalogue.categories import create_from_breadcrumbs
 from oscar.core.loading import get_class, get_model
@@ -37,7 +40,9 @@ Benefit = get_model('offer', 'Benefit')
 Catalog = get_model('catalogue', 'Catalog')
 Category = get_model('catalogue', 'Category')
 Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
 Course = get_model('courses', 'Course')
+CouponOfferUpdate = get_model('voucher', 'CouponOfferUpdate')
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
 ProductCategory = get_model('catalogue', 'ProductCategory')
@@ -490,6 +495,21 @@ class CouponViewSetFunctionalTest(CouponMixin, CourseCatalogTestMixin, CourseCat
         self.assertEqual(coupon_data['category']['name'], self.data['category']['name'])
         self.assertEqual(coupon_data['client'], self.data['client'])
 
+    def test_list_coupons_queries(self):
+        """The number of queries made by the list endpoint should not depend on the number of coupons."""
+        self.client.get(COUPONS_LINK)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(COUPONS_LINK)
+        num_queries = len(context)
+
+        for title in ('Tešt čoupon 2', 'Tešt čoupon 3'):
+            self.create_coupon(partner=self.partner, title=title)
+        self.client.get(COUPONS_LINK)
+
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(COUPONS_LINK)
+        self.assertEqual(len(json.loads(response.content)['results']), 3)
+
     def test_list_and_details_endpoint_return_custom_code(self):
         """Test that the list and details endpoints return the correct code."""
         self.data.update({
@@ -733,6 +753,41 @@ class CouponViewSetFunctionalTest(CouponMixin, CourseCatalogTestMixin, CourseCat
             self.assertEqual(voucher.offers.first().benefit.value, benefit_value)
             self.assertEqual(voucher.offers.first().max_global_applications, max_uses)
 
+    def test_update_coupon_benefit_value_queued(self):
+        """ Verify the offers of coupons with many vouchers are replaced by the queued update command. """
+        vouchers = self.coupon.attr.coupon_vouchers.vouchers.all()
+        offer = vouchers.first().offers.first()
+
+        with override_settings(COUPON_OFFER_UPDATE_ASYNC_THRESHOLD=vouchers.count() - 1):
+            CouponViewSet().update_coupon_offer(benefit_value=Decimal(54), vouchers=vouchers, coupon=self.coupon)
+
+        update = CouponOfferUpdate.objects.get(coupon=self.coupon)
+        self.assertEqual(update.offer.benefit.value, Decimal(54))
+        self.assertEqual(vouchers.first().offers.first(), offer)
+
+        call_command('process_coupon_offer_updates')
+        for voucher in vouchers:
+            self.assertEqual(voucher.offers.first(), update.offer)
+
+    def test_update_coupon_queued_offer_data(self):
+        """ Verify offer fields updated along with the benefit value are kept when the queued update is processed. """
+        vouchers = self.coupon.attr.coupon_vouchers.vouchers.all()
+        path = reverse('api:v2:coupons-detail', kwargs={'pk': self.coupon.id})
+        data = {
+            'id': self.coupon.id,
+            'benefit_value': 54,
+            'email_domains': 'example.com',
+        }
+
+        with override_settings(COUPON_OFFER_UPDATE_ASYNC_THRESHOLD=vouchers.count() - 1):
+            self.client.put(path, json.dumps(data), 'application/json')
+
+        call_command('process_coupon_offer_updates')
+        for voucher in vouchers:
+            offer = voucher.offers.first()
+            self.assertEqual(offer.benefit.value, Decimal(54))
+            self.assertEqual(offer.email_domains, 'example.com')
+
     def test_update_coupon_client(self):
         baskets = Basket.objects.filter(lines__product_id=self.coupon.id)
         basket = baskets.first()
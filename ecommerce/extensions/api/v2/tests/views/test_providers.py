@@ -30,14 +30,10 @@ class ProvidersViewSetTest(TestCase):
         }
 
     def mock_provider_api(self):
-        provider_url = '{lms_url}{provider}/'.format(
-            lms_url=self.site.siteconfiguration.build_lms_url('api/credit/v1/providers/'),
-            provider=self.provider
-        )
         httpretty.register_uri(
             httpretty.GET,
-            provider_url,
-            body=json.dumps(self.data),
+            self.site.siteconfiguration.build_lms_url('api/credit/v1/providers/'),
+            body=json.dumps([self.data]),
             content_type='application/json'
         )
 
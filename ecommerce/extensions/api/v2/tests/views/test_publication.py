@@ -3,6 +3,7 @@ from copy import deepcopy
 from datetime import datetime
 from decimal import Decimal
 
+import ddt
 import mock
 import pytz
 from django.core.urlresolvers import reverse
@@ -26,6 +27,7 @@ EXPIRES = datetime(year=1992, month=4, day=24, tzinfo=pytz.utc)
 EXPIRES_STRING = EXPIRES.strftime(ISO_8601_FORMAT)
 
 
+@ddt.ddt
 class AtomicPublicationTests(CourseCatalogTestMixin, TestCase):
     def setUp(self):
         super(AtomicPublicationTests, self).setUp()
@@ -33,6 +35,7 @@ class AtomicPublicationTests(CourseCatalogTestMixin, TestCase):
         self.course_id = 'BadgerX/B101/2015'
         self.course_name = 'Dances with Badgers'
         self.create_path = reverse('api:v2:publication:create')
+        self.bulk_path = reverse('api:v2:publication:bulk')
         self.update_path = reverse('api:v2:publication:update', kwargs={'course_id': self.course_id})
         self.data = {
             'id': self.course_id,
@@ -288,6 +291,54 @@ class AtomicPublicationTests(CourseCatalogTestMixin, TestCase):
             self.assertEqual(response.status_code, 200)
             self.assert_course_saved(self.course_id, expected=updated_data)
 
+    def test_bulk_publication(self):
+        """Verify that many Courses can be saved and published, and that only failed Courses are rolled back."""
+        failing_course_id = 'BadgerX/B102/2015'
+        failing_data = deepcopy(self.data)
+        failing_data['id'] = failing_course_id
+        error_msg = 'Test publication failed.'
+
+        with mock.patch.object(LMSPublisher, 'publish') as mock_publish:
+            mock_publish.side_effect = lambda course: error_msg if course.id == failing_course_id else None
+            response = self.client.post(
+                self.bulk_path, json.dumps({'courses': [self.data, failing_data]}), JSON_CONTENT_TYPE
+            )
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.data, [
+            {'id': self.course_id, 'created': True, 'success': True, 'message': None},
+            {'id': failing_course_id, 'created': False, 'success': False, 'message': error_msg},
+        ])
+        self.assert_course_saved(self.course_id, expected=self.data)
+        self.assert_course_does_not_exist(failing_course_id)
+
+        with mock.patch.object(LMSPublisher, 'publish', return_value=None):
+            response = self.client.post(
+                self.bulk_path, json.dumps({'courses': [self.data, failing_data]}), JSON_CONTENT_TYPE
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['created'] for result in response.data], [False, True])
+        self.assert_course_saved(failing_course_id, expected=failing_data)
+
+    def test_bulk_publication_invalid_course(self):
+        """Verify that Courses failing validation are reported, and not saved."""
+        self.data['id'] = 'Not an ID'
+
+        with mock.patch.object(LMSPublisher, 'publish') as mock_publish:
+            response = self.client.post(self.bulk_path, json.dumps({'courses': [self.data]}), JSON_CONTENT_TYPE)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(response.data[0]['success'])
+        self.assertIn('id', response.data[0]['message'])
+        self.assertFalse(mock_publish.called)
+
+    @ddt.data({}, {'courses': []}, {'courses': 'BadgerX/B101/2015'}, {'courses': ['BadgerX/B101/2015']})
+    def test_bulk_publication_invalid_data(self, data):
+        """Verify that submitting anything other than a list of Courses yields a 400."""
+        response = self.client.post(self.bulk_path, json.dumps(data), JSON_CONTENT_TYPE)
+        self.assertEqual(response.status_code, 400)
+
     def test_invalid_course_id(self):
         """Verify that attempting to save a course with a bad ID yields a 400."""
         self.data['id'] = 'Not an ID'
@@ -4,6 +4,7 @@ import ddt
 import httpretty
 import mock
 from django.core.urlresolvers import reverse
+from django.test import override_settings
 from oscar.core.loading import get_model
 from rest_framework import status
 
@@ -17,6 +18,7 @@ from ecommerce.extensions.test.factories import create_order
 from ecommerce.tests.mixins import JwtMixin, ThrottlingMixin
 from ecommerce.tests.testcases import TestCase
 
+QueuedRefund = get_model('refund', 'QueuedRefund')
 Refund = get_model('refund', 'Refund')
 
 
@@ -252,3 +254,83 @@ class RefundProcessViewTests(ThrottlingMixin, TestCase):
         self.refund.save()
         response = self.put(action)
         self.assertEqual(response.status_code, 200)
+
+
+@ddt.ddt
+class RefundBulkProcessViewTests(ThrottlingMixin, TestCase):
+    path = reverse('api:v2:refunds:bulk_process')
+
+    def setUp(self):
+        super(RefundBulkProcessViewTests, self).setUp()
+
+        self.user = self.create_user(is_staff=True)
+        self.client.login(username=self.user.username, password=self.password)
+        self.refunds = RefundFactory.create_batch(3, user=self.user)
+        self.refund_ids = [refund.id for refund in self.refunds]
+
+    def post(self, action, refund_ids):
+        data = json.dumps({'action': action, 'refund_ids': refund_ids})
+        return self.client.post(self.path, data, JSON_CONTENT_TYPE)
+
+    def test_staff_only(self):
+        """ The view should only be accessible to staff users. """
+        user = self.create_user(is_staff=False)
+        self.client.login(username=user.username, password=self.password)
+        response = self.post('approve', self.refund_ids)
+        self.assertEqual(response.status_code, 403)
+
+    @ddt.data(
+        ('reject', [1]),
+        ('approve', None),
+        ('approve', []),
+        ('approve', ['abc']),
+    )
+    @ddt.unpack
+    def test_invalid_data(self, action, refund_ids):
+        """ The view should return HTTP 400 if the action, or list of refund IDs, is invalid. """
+        response = self.post(action, refund_ids)
+        self.assertEqual(response.status_code, 400)
+
+    @ddt.data(('approve', REFUND.COMPLETE), ('deny', REFUND.DENIED))
+    @ddt.unpack
+    def test_success(self, action, expected_status):
+        """ If all refunds are processed, the view should return HTTP 200 and a summary of each refund. """
+        with mock.patch('ecommerce.extensions.refund.models.Refund._issue_credit', return_value=None):
+            with mock.patch('ecommerce.extensions.refund.models.Refund._revoke_lines', autospec=True) as mock_revoke:
+                mock_revoke.side_effect = lambda refund: refund.set_status(REFUND.COMPLETE)
+                response = self.post(action, self.refund_ids)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            [{'id': refund_id, 'success': True, 'status': expected_status} for refund_id in self.refund_ids]
+        )
+
+    @override_settings(REFUND_BULK_PROCESSING_MAX_SYNC_REFUNDS=2)
+    def test_queued(self):
+        """ If too many refunds are to be processed, the view should queue them, and return HTTP 202. """
+        with mock.patch('ecommerce.extensions.api.v2.views.refunds.process_refunds') as mock_process_refunds:
+            response = self.post('deny', self.refund_ids)
+
+        self.assertFalse(mock_process_refunds.called)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data, [{'id': refund_id, 'queued': True} for refund_id in self.refund_ids])
+        self.assertEqual(
+            list(QueuedRefund.objects.order_by('id').values_list('refund_id', 'action', 'requested_by')),
+            [(refund_id, 'deny', self.user.id) for refund_id in self.refund_ids]
+        )
+
+    def test_partial_failure(self):
+        """ If any refund fails to be processed, the view should return HTTP 500 and a summary of each refund. """
+        self.refunds[1].status = REFUND.COMPLETE
+        self.refunds[1].save()
+        missing_refund_id = max(self.refund_ids) + 1
+
+        response = self.post('deny', self.refund_ids + [missing_refund_id])
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.data, [
+            {'id': self.refund_ids[0], 'success': True, 'status': REFUND.DENIED},
+            {'id': self.refund_ids[1], 'success': False, 'status': REFUND.COMPLETE},
+            {'id': self.refund_ids[2], 'success': True, 'status': REFUND.DENIED},
+            {'id': missing_refund_id, 'success': False, 'status': None},
+        ])
@@ -225,6 +225,45 @@ class VoucherViewSetTests(CourseCatalogMockMixin, CourseCatalogTestMixin, LmsApi
         self.assertIn(valid_seat, products)
         self.assertNotIn(expired_seat, products)
 
+    @ddt.data(1, 3)
+    def test_retrieve_course_objects_queries(self, num_courses):
+        """ Verify products, their stock records, and their attributes are loaded with a fixed number of queries. """
+        seats = [
+            CourseFactory().create_or_update_seat('verified', True, 100, partner=self.partner)
+            for __ in range(num_courses)
+        ]
+        course_discovery_results = [{'key': seat.course_id, 'enrollment_end': None} for seat in seats]
+
+        with self.assertNumQueries(3):
+            products, stock_records = VoucherViewSet().retrieve_course_objects(
+                course_discovery_results, 'verified'
+            )
+            for product in products:
+                self.assertEqual(product.attr.certificate_type, 'verified')
+                self.assertEqual(product.course.id, product.course_id)
+
+        self.assertEqual(set(products), set(seats))
+        self.assertEqual(set(stock_records.keys()), set(seat.id for seat in seats))
+
+    def test_offers_page_cached(self):
+        """ Verify pages of offers are cached until the voucher changes. """
+        voucher = VoucherFactory(code='OFFERSPAGE')
+        voucher.offers.add(ConditionalOfferFactory(
+            benefit=BenefitFactory(range=RangeFactory(catalog_query='*:*', course_seat_types='verified'))
+        ))
+        url = self.build_offers_url(voucher)
+        offers_data = {'next': None, 'results': [{'id': 'course-v1:test+test+test'}]}
+
+        with mock.patch.object(VoucherViewSet, 'get_offers', return_value=offers_data) as mock_get_offers:
+            for __ in range(2):
+                response = self.client.get(url)
+                self.assertEqual(response.data, offers_data)
+            self.assertEqual(mock_get_offers.call_count, 1)
+
+            voucher.save()
+            self.client.get(url)
+            self.assertEqual(mock_get_offers.call_count, 2)
+
 
 @ddt.ddt
 @httpretty.activate
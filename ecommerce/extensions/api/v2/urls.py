@@ -44,6 +44,7 @@ PAYMENT_URLS = [
 
 REFUND_URLS = [
     url(r'^$', refund_views.RefundCreateView.as_view(), name='create'),
+    url(r'^process/$', refund_views.RefundBulkProcessView.as_view(), name='bulk_process'),
     url(r'^(?P<pk>[\d]+)/process/$', refund_views.RefundProcessView.as_view(), name='process'),
 ]
 
@@ -58,6 +59,7 @@ CHECKOUT_URLS = [
 
 ATOMIC_PUBLICATION_URLS = [
     url(r'^$', publication_views.AtomicPublicationView.as_view(), name='create'),
+    url(r'^bulk/$', publication_views.BulkAtomicPublicationView.as_view(), name='bulk'),
     url(
         r'^{course_id}$'.format(course_id=COURSE_ID_PATTERN),
         publication_views.AtomicPublicationView.as_view(),
@@ -15,12 +15,14 @@ from ecommerce.core.constants import DEFAULT_CATALOG_PAGE_SIZE
 from ecommerce.coupons.utils import get_catalog_course_runs
 from ecommerce.courses.utils import get_course_catalogs
 from ecommerce.extensions.api import serializers
+from ecommerce.extensions.basket.decorators import basket_exempt
 
 Catalog = get_model('catalogue', 'Catalog')
 Product = get_model('catalogue', 'Product')
 logger = logging.getLogger(__name__)
 
 
+@basket_exempt
 class CatalogViewSet(NestedViewSetMixin, ReadOnlyModelViewSet):
     serializer_class = serializers.CatalogSerializer
     permission_classes = (IsAuthenticated, IsAdminUser,)
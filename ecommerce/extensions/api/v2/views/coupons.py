@@ -5,6 +5,7 @@ import logging
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from oscar.core.loading import get_model
@@ -24,7 +25,8 @@ from ecommerce.extensions.catalogue.utils import create_coupon_product, get_or_c
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.payment.processors.invoice import InvoicePayment
 from ecommerce.extensions.voucher.models import CouponVouchers
-from ecommerce.extensions.voucher.utils import update_voucher_offer
+from ecommerce.extensions.voucher.summaries import invalidate_coupon_summaries
+from ecommerce.extensions.voucher.utils import queue_coupon_offer_update, replace_voucher_offers, update_voucher_offer
 from ecommerce.invoice.models import Invoice
 from ecommerce.programs.constants import BENEFIT_PROXY_CLASS_MAP
 
@@ -34,6 +36,7 @@ Catalog = get_model('catalogue', 'Catalog')
 Category = get_model('catalogue', 'Category')
 Condition = get_model('offer', 'Condition')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
+CouponOfferUpdate = get_model('voucher', 'CouponOfferUpdate')
 logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
@@ -54,7 +57,7 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         return Product.objects.filter(
             product_class__name=COUPON_PRODUCT_CLASS_NAME,
             stockrecords__partner=self.request.site.siteconfiguration.partner
-        )
+        ).select_related('coupon_summary')
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -371,6 +374,11 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
             self.update_offer_data(request.data, vouchers, coupon.id)
             self.update_invoice_data(coupon, request.data)
 
+            # The updates above are made with QuerySet.update(), which does not send the signals that invalidate the
+            # summary of the coupon.
+            invalidate_coupon_summaries(coupon_id=coupon.id)
+            coupon = self.get_object()
+
             serializer = self.get_serializer(coupon)
             return Response(serializer.data)
         except ValidationError as error:
@@ -435,9 +443,11 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
             max_uses=voucher_offer.max_global_applications,
             program_uuid=program_uuid
         )
-        for voucher in vouchers.all():
-            voucher.offers.clear()
-            voucher.offers.add(new_offer)
+        voucher_ids = list(vouchers.values_list('id', flat=True))
+        if len(voucher_ids) > settings.COUPON_OFFER_UPDATE_ASYNC_THRESHOLD:
+            queue_coupon_offer_update(coupon, new_offer)
+        else:
+            replace_voucher_offers(voucher_ids, new_offer.id)
 
     def update_coupon_client(self, baskets, client_username):
         """
@@ -482,7 +492,14 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
                         raise ValueError
                 except ValueError:
                     raise ValidationError('max_global_applications field must be a positive number.')
-            ConditionalOffer.objects.filter(vouchers__in=vouchers.all()).update(**offer_data)
+            # Offers queued to replace those of the vouchers are updated too, so that relinking the vouchers does not
+            # undo the update.
+            queued_offer_ids = CouponOfferUpdate.objects.filter(
+                coupon_id=coupon_id, status__in=(CouponOfferUpdate.PENDING, CouponOfferUpdate.PROCESSING)
+            ).values('offer_id')
+            ConditionalOffer.objects.filter(
+                Q(vouchers__in=vouchers.all()) | Q(id__in=queued_offer_ids)
+            ).update(**offer_data)
 
     def destroy(self, request, pk):  # pylint: disable=unused-argument
         try:
@@ -11,11 +11,13 @@ from ecommerce.core.constants import COURSE_ID_REGEX
 from ecommerce.courses.models import Course
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
+from ecommerce.extensions.basket.decorators import basket_exempt
 
 Product = get_model('catalogue', 'Product')
 ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 
 
+@basket_exempt
 class CourseViewSet(NonDestroyableModelViewSet):
     product_attribute_value_prefetch = Prefetch(
         'products__attribute_values',
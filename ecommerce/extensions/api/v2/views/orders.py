@@ -12,12 +12,14 @@ from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.filters import OrderFilter
 from ecommerce.extensions.api.permissions import IsStaffOrOwner
 from ecommerce.extensions.api.throttles import ServiceUserThrottle
+from ecommerce.extensions.basket.decorators import basket_exempt
 
 logger = logging.getLogger(__name__)
 
 Order = get_model('order', 'Order')
 
 
+@basket_exempt
 class OrderViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_field = 'number'
     permission_classes = (IsAuthenticated, IsStaffOrOwner, DjangoModelPermissions,)
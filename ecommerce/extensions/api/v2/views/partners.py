@@ -4,10 +4,12 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 
 from ecommerce.extensions.api import serializers
+from ecommerce.extensions.basket.decorators import basket_exempt
 
 Partner = get_model('partner', 'Partner')
 
 
+@basket_exempt
 class PartnerViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Partner.objects.all()
     serializer_class = serializers.PartnerSerializer
@@ -4,11 +4,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework_extensions.cache.decorators import cache_response
 
 from ecommerce.extensions.api import serializers
+from ecommerce.extensions.basket.decorators import basket_exempt
 
 PAYMENT_PROCESSOR_CACHE_KEY = 'PAYMENT_PROCESSOR_LIST'
 PAYMENT_PROCESSOR_CACHE_TIMEOUT = 60 * 30
 
 
+@basket_exempt
 class PaymentProcessorListView(generics.ListAPIView):
     """List the available payment processors
 
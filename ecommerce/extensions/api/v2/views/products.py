@@ -8,10 +8,12 @@ from rest_framework_extensions.mixins import NestedViewSetMixin
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.filters import ProductFilter
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
+from ecommerce.extensions.basket.decorators import basket_exempt
 
 Product = get_model('catalogue', 'Product')
 
 
+@basket_exempt
 class ProductViewSet(NestedViewSetMixin, NonDestroyableModelViewSet):
     serializer_class = serializers.ProductSerializer
     filter_backends = (filters.DjangoFilterBackend,)
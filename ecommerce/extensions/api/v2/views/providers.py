@@ -5,11 +5,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from ecommerce.extensions.api.serializers import ProviderSerializer
+from ecommerce.extensions.basket.decorators import basket_exempt
 from ecommerce.extensions.checkout.utils import get_credit_provider_details
 
 logger = logging.getLogger(__name__)
 
 
+@basket_exempt
 class ProviderViewSet(APIView):
     """Gets the credit provider data from LMS"""
     def get(self, request):
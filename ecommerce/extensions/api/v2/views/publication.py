@@ -1,12 +1,19 @@
 """HTTP endpoints for course publication."""
+from django.db import transaction
+from django.utils.decorators import method_decorator
 from rest_framework import generics, status
+from rest_framework.exceptions import ParseError
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from ecommerce.courses.publication import publish_courses
 from ecommerce.extensions.api import serializers
+from ecommerce.extensions.basket.decorators import basket_exempt
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 
 
+@basket_exempt
 class AtomicPublicationView(generics.CreateAPIView, generics.UpdateAPIView):
     """Attempt to save and publish a Course and associated products.
 
@@ -42,3 +49,35 @@ class AtomicPublicationView(generics.CreateAPIView, generics.UpdateAPIView):
                 content = serializer.data
                 content['message'] = message if message else None
                 return Response(content, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+@basket_exempt
+class BulkAtomicPublicationView(APIView):
+    """Save and publish many Courses and their associated products.
+
+    The view expects POST data containing a list of `courses`, each in the format accepted by AtomicPublicationView.
+    Courses are saved and published concurrently, with bounded parallelism. Each course is saved and published
+    atomically: if either fails, the operation is rolled back for that course only.
+
+    The view returns a list with the ID, creation flag, and result of publication of each course. HTTP status will be
+    200 if all courses were published successfully; otherwise, HTTP status will be 500.
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser,)
+
+    @method_decorator(transaction.non_atomic_requests)
+    def dispatch(self, request, *args, **kwargs):
+        return super(BulkAtomicPublicationView, self).dispatch(request, *args, **kwargs)
+
+    def post(self, request):
+        courses = request.data.get('courses')
+
+        if not courses or not isinstance(courses, list) or not all(isinstance(course, dict) for course in courses):
+            raise ParseError('courses must be a list of courses.')
+
+        results = publish_courses(request.site, get_partner_for_site(request), courses)
+
+        http_status = status.HTTP_200_OK
+        if not all(result['success'] for result in results):
+            http_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        return Response(results, status=http_status)
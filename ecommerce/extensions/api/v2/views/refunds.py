@@ -1,20 +1,29 @@
 """HTTP endpoints for interacting with refunds."""
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.decorators import method_decorator
 from oscar.core.loading import get_model
 from rest_framework import generics, status
 from rest_framework.exceptions import ParseError
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.exceptions import BadRequestException
 from ecommerce.extensions.api.permissions import CanActForUser
-from ecommerce.extensions.refund.api import create_refunds, find_orders_associated_with_course
+from ecommerce.extensions.basket.decorators import basket_exempt
+from ecommerce.extensions.refund.api import (
+    REFUND_ACTIONS, create_refunds, find_orders_associated_with_course, process_refund, process_refunds,
+    queue_refunds
+)
 
 Refund = get_model('refund', 'Refund')
 User = get_user_model()
 
 
+@basket_exempt
 class RefundCreateView(generics.CreateAPIView):
     """Creates refunds.
 
@@ -53,12 +62,8 @@ class RefundCreateView(generics.CreateAPIView):
         except User.DoesNotExist:
             raise BadRequestException('User "{}" does not exist.'.format(username))
 
-        refunds = []
-
-        # We can only create refunds if the user has orders.
-        if user.orders.exists():
-            orders = find_orders_associated_with_course(user, course_id)
-            refunds = create_refunds(orders, course_id)
+        orders = find_orders_associated_with_course(user, course_id)
+        refunds = create_refunds(orders, course_id)
 
         # Return HTTP 201 if we created refunds.
         if refunds:
@@ -69,6 +74,7 @@ class RefundCreateView(generics.CreateAPIView):
         return Response([], status=status.HTTP_200_OK)
 
 
+@basket_exempt
 class RefundProcessView(generics.UpdateAPIView):
     """Process--approve or deny--refunds.
 
@@ -83,24 +89,66 @@ class RefundProcessView(generics.UpdateAPIView):
     serializer_class = serializers.RefundSerializer
 
     def update(self, request, *args, **kwargs):
-        APPROVE = 'approve'
-        DENY = 'deny'
-        APPROVE_PAYMENT_ONLY = 'approve_payment_only'
-
         action = request.data.get('action', '').lower()
 
-        if action not in (APPROVE, DENY, APPROVE_PAYMENT_ONLY):
+        if action not in REFUND_ACTIONS:
             raise ParseError('The action [{}] is not valid.'.format(action))
 
         refund = self.get_object()
-        result = False
-
-        if action in (APPROVE, APPROVE_PAYMENT_ONLY):
-            revoke_fulfillment = action == APPROVE
-            result = refund.approve(revoke_fulfillment=revoke_fulfillment)
-        elif action == DENY:
-            result = refund.deny()
+        result = process_refund(refund, action)
 
         http_status = status.HTTP_200_OK if result else status.HTTP_500_INTERNAL_SERVER_ERROR
         serializer = self.get_serializer(refund)
         return Response(serializer.data, status=http_status)
+
+
+@basket_exempt
+class RefundBulkProcessView(APIView):
+    """Process--approve or deny--many refunds.
+
+    The view expects POST data containing an `action` (approve, approve_payment_only, or deny) and a list of
+    `refund_ids`. Refunds are processed concurrently, with bounded parallelism for each payment processor.
+
+    The view returns a list with the ID, status, and result of processing of each refund. HTTP status will be 200 if
+    all refunds were processed successfully; otherwise, HTTP status will be 500.
+
+    Requests for more than REFUND_BULK_PROCESSING_MAX_SYNC_REFUNDS refunds are not processed while the request is
+    handled. Their refunds are queued, to be processed by the process_refunds management command, and the view
+    returns HTTP 202 with a list of the IDs of the queued refunds.
+
+    Only staff users are permitted to use this view.
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser,)
+
+    @method_decorator(transaction.non_atomic_requests)
+    def dispatch(self, request, *args, **kwargs):
+        return super(RefundBulkProcessView, self).dispatch(request, *args, **kwargs)
+
+    def post(self, request):
+        action = request.data.get('action', '').lower()
+        refund_ids = request.data.get('refund_ids')
+
+        if action not in REFUND_ACTIONS:
+            raise ParseError('The action [{}] is not valid.'.format(action))
+
+        try:
+            refund_ids = [int(refund_id) for refund_id in refund_ids]
+        except (TypeError, ValueError):
+            raise ParseError('refund_ids must be a list of refund IDs.')
+
+        if not refund_ids:
+            raise ParseError('refund_ids must be a list of refund IDs.')
+
+        if len(set(refund_ids)) > settings.REFUND_BULK_PROCESSING_MAX_SYNC_REFUNDS:
+            queued_refund_ids = queue_refunds(refund_ids, action, user=request.user)
+            return Response(
+                [{'id': refund_id, 'queued': True} for refund_id in queued_refund_ids], status=status.HTTP_202_ACCEPTED
+            )
+
+        results = process_refunds(refund_ids, action)
+
+        http_status = status.HTTP_200_OK
+        if not all(result['success'] for result in results):
+            http_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        return Response(results, status=http_status)
@@ -4,10 +4,12 @@ from rest_framework.permissions import DjangoModelPermissionsOrAnonReadOnly
 from rest_framework.response import Response
 
 from ecommerce.extensions.api import serializers
+from ecommerce.extensions.basket.decorators import basket_exempt
 
 StockRecord = get_model('partner', 'StockRecord')
 
 
+@basket_exempt
 class StockRecordViewSet(viewsets.ModelViewSet):
     permission_classes = (DjangoModelPermissionsOrAnonReadOnly,)
     serializer_class = serializers.StockRecordSerializer
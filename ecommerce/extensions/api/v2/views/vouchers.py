@@ -1,9 +1,13 @@
 """HTTP endpoints for interacting with vouchers."""
 import logging
+from collections import defaultdict
 from urlparse import urlparse
 
 import django_filters
 from dateutil import parser
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from django.utils.timezone import now
 from opaque_keys.edx.keys import CourseKey
@@ -16,12 +20,14 @@ from slumber.exceptions import SlumberBaseException
 
 from ecommerce.core.constants import DEFAULT_CATALOG_PAGE_SIZE
 from ecommerce.core.url_utils import get_lms_url
+from ecommerce.core.utils import get_cache_key
+from ecommerce.coupons.utils import fetch_course_catalog, get_catalog_course_runs
 from ecommerce.courses.models import Course
-from ecommerce.courses.utils import get_course_info_from_lms
-from ecommerce.coupons.utils import get_range_catalog_query_results
+from ecommerce.courses.utils import get_course_info_from_lms, prefetch_product_attributes
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.permissions import IsOffersOrIsAuthenticatedAndStaff
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
+from ecommerce.extensions.voucher.snapshots import get_voucher_snapshot_versions
 
 logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
@@ -76,6 +82,11 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             logger.error('Voucher with code %s not found.', code)
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
+        cache_key = self.get_offers_cache_key(request, voucher)
+        offers_data = cache.get(cache_key) if cache_key else None
+        if offers_data is not None:
+            return Response(data=offers_data)
+
         try:
             offers_data = self.get_offers(request, voucher)
         except (ConnectionError, SlumberBaseException, Timeout):
@@ -93,36 +104,77 @@ class VoucherViewSet(NonDestroyableModelViewSet):
                 path=request.path,
                 query=next_page_query,
             )
+
+        if cache_key:
+            cache.set(cache_key, offers_data, settings.VOUCHER_OFFERS_CACHE_TIMEOUT)
         return Response(data=offers_data)
 
+    def get_offers_cache_key(self, request, voucher):
+        """
+        Returns the cache key of the requested page of offers of the voucher, or None if the page must not be cached.
+
+        Credit offers depend on the eligibility and purchases of the user, so they are not cached. Staff users can see
+        expired seats, so their pages are cached separately. Keys include the version of the voucher snapshots, which
+        is bumped whenever a voucher, or its offer, benefit, range, or products, change.
+        """
+        offer = voucher.offers.select_related('benefit__range').first()
+        if offer is None:
+            return None
+
+        course_seat_types = offer.benefit.range.course_seat_types
+        if course_seat_types == 'credit':
+            return None
+
+        return get_cache_key(
+            resource='voucher_offers',
+            voucher_id=voucher.id,
+            offset=request.GET.get('offset'),
+            limit=request.GET.get('limit', DEFAULT_CATALOG_PAGE_SIZE),
+            course_seat_types=course_seat_types,
+            is_staff=getattr(request.user, 'is_staff', False),
+            version=get_voucher_snapshot_versions(voucher.id)
+        )
+
     def retrieve_course_objects(self, results, course_seat_types):
-        """ Helper method to retrieve all the courses, products and stock records
+        """ Helper method to retrieve all the products and stock records
         from course IDs in course catalog response results. Professional courses
         which have a set enrollment end date and which has passed are omitted.
 
+        Products are loaded with their course, parent, stock records, and attributes,
+        with a fixed number of queries.
+
         Args:
             results(dict): Course catalog response results.
             course_seat_types(str): Comma-separated list of accepted seat types.
 
         Returns:
-            Querysets of products and stock records retrieved from results.
+            A list of products, ordered by seat type, and a dict of their stock records, keyed by product ID.
         """
-        all_course_ids = []
-        nonexpired_course_ids = []
-        for result in results:
-            all_course_ids.append(result['key'])
-            if not result['enrollment_end'] or \
-                    (result['enrollment_end'] and parser.parse(result['enrollment_end']) > now()):
-                nonexpired_course_ids.append(result['key'])
-
-        products = []
-        for seat_type in course_seat_types.split(','):
-            products.extend(Product.objects.filter(
-                course_id__in=nonexpired_course_ids if seat_type == 'professional' else all_course_ids,
-                attributes__name='certificate_type',
-                attribute_values__value_text=seat_type
-            ))
-        stock_records = StockRecord.objects.filter(product__in=products)
+        seat_types = course_seat_types.split(',')
+        nonexpired_course_ids = set(
+            result['key'] for result in results
+            if not result['enrollment_end'] or parser.parse(result['enrollment_end']) > now()
+        )
+
+        products = list(Product.objects.filter(
+            course_id__in=[result['key'] for result in results],
+            attribute_values__attribute__name='certificate_type',
+            attribute_values__value_text__in=seat_types
+        ).select_related('course', 'parent').prefetch_related('stockrecords'))
+        prefetch_product_attributes(products)
+
+        products_by_seat_type = defaultdict(list)
+        for product in products:
+            seat_type = product.attr.certificate_type
+            if seat_type == 'professional' and product.course_id not in nonexpired_course_ids:
+                continue
+            products_by_seat_type[seat_type].append(product)
+
+        products = [product for seat_type in seat_types for product in products_by_seat_type[seat_type]]
+        stock_records = {
+            stock_record.product_id: stock_record
+            for product in products for stock_record in product.stockrecords.all()
+        }
         return products, stock_records
 
     def get_offers_from_query(self, request, voucher, catalog_query):
@@ -150,46 +202,54 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             offset=request.GET.get('offset'),
         )
         next_page = response['next']
+        course_runs = {result['key']: result for result in response['results']}
         products, stock_records = self.retrieve_course_objects(response['results'], course_seat_types)
         contains_verified_course = (course_seat_types == 'verified')
+
+        if course_seat_types == 'credit':
+            purchased_product_ids = set(
+                Order.objects.filter(user=request.user, lines__product__in=products).values_list(
+                    'lines__product_id', flat=True
+                )
+            )
+            credit_seat_counts = dict(
+                Product.objects.filter(
+                    parent_id__in=set(product.parent_id for product in products),
+                    attribute_values__attribute__name='credit_provider'
+                ).values('parent_id').annotate(count=Count('id')).order_by().values_list('parent_id', 'count')
+            )
+            credit_eligibility = {}
+
         for product in products:
+            stock_record = stock_records.get(product.id)
+
             # Omit unavailable seats from the offer results so that one seat does not cause an
             # error message for every seat in the query result.
-            if not request.strategy.fetch_for_product(product).availability.is_available_to_buy:
+            if not request.strategy.fetch_for_product(product, stock_record).availability.is_available_to_buy:
                 logger.info('%s is unavailable to buy. Omitting it from the results.', product)
                 continue
 
             course_id = product.course_id
-            course_catalog_data = next(
-                (result for result in response['results'] if result['key'] == course_id),
-                None
-            )
+            course_catalog_data = course_runs.get(course_id)
             if course_seat_types == 'credit':
                 # Omit credit seats for which the user is not eligible or which the user already bought.
-                if request.user.is_eligible_for_credit(product.course_id):
-                    if Order.objects.filter(user=request.user, lines__product=product).exists():
-                        continue
-                else:
+                if course_id not in credit_eligibility:
+                    credit_eligibility[course_id] = request.user.is_eligible_for_credit(course_id)
+                if not credit_eligibility[course_id] or product.id in purchased_product_ids:
                     continue
-                credit_seats = Product.objects.filter(parent=product.parent, attributes__name='credit_provider')
 
-                if credit_seats.count() > 1:
+                if credit_seat_counts.get(product.parent_id, 0) > 1:
                     multiple_credit_providers = True
                     credit_provider_price = None
                 else:
                     multiple_credit_providers = False
-                    credit_provider_price = StockRecord.objects.get(product=product).price_excl_tax
+                    credit_provider_price = stock_record.price_excl_tax if stock_record else None
 
-            try:
-                stock_record = stock_records.get(product__id=product.id)
-            except StockRecord.DoesNotExist:
-                stock_record = None
+            if stock_record is None:
                 logger.error('Stock Record for product %s not found.', product.id)
 
-            try:
-                course = Course.objects.get(id=course_id)
-            except Course.DoesNotExist:  # pragma: no cover
-                course = None
+            course = product.course
+            if course is None:  # pragma: no cover
                 logger.error('Course %s not found.', course_id)
 
             if course_catalog_data and course and stock_record:
@@ -0,0 +1,9 @@
+def basket_exempt(view):
+    """
+    Marks a view, or view class, as never needing the session basket.
+
+    The basket middleware does not attach a basket to requests handled by these views, so the basket cannot be loaded
+    (and offers cannot be applied) by accident.
+    """
+    view.basket_exempt = True
+    return view
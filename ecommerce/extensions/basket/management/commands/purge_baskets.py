@@ -0,0 +1,139 @@
+"""
+Management command that purges baskets, and basket lines, which are no longer needed.
+
+Ordered baskets, baskets abandoned for a given number of days, and lines whose basket no longer exists can be
+purged. Progress is saved to a checkpoint file after each batch, so that an interrupted purge resumes where it stopped.
+"""
+from __future__ import unicode_literals
+
+import json
+import os
+
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.extensions.basket.purge import (
+    PURGE_ORDERED, PURGE_ORPHANED_LINES, PURGE_TARGETS, get_purge_queryset, purge_target
+)
+
+
+class Command(BaseCommand):
+    help = 'Delete ordered baskets, abandoned baskets, or orphaned basket lines.'
+
+    # Commands purging a single target set this, instead of accepting the --target argument.
+    target = None
+
+    def add_arguments(self, parser):
+        if not self.target:
+            parser.add_argument('-t', '--target',
+                                action='store',
+                                dest='target',
+                                default=PURGE_ORDERED,
+                                choices=PURGE_TARGETS,
+                                help='Rows to delete.')
+            parser.add_argument('-d', '--days',
+                                action='store',
+                                dest='days',
+                                default=30,
+                                type=int,
+                                help='Age, in days, after which open baskets are considered abandoned.')
+        # Batched deletion prevents the entire table from locking up as the command executes.
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Maximum size of each batch of rows to be deleted.')
+        parser.add_argument('-l', '--target-latency',
+                            action='store',
+                            dest='target_latency',
+                            default=1.0,
+                            type=float,
+                            help='Seconds each batch should take to delete. Slower batches are made smaller.')
+        # Sleeping between each batch deletion gives MySQL time to process other connections.
+        parser.add_argument('-s', '--sleep-seconds',
+                            action='store',
+                            dest='sleep_seconds',
+                            default=3,
+                            type=float,
+                            help='Maximum seconds to sleep between each batch deletion. Each batch is followed by '
+                                 'a pause as long as the batch took to delete.')
+        parser.add_argument('-c', '--checkpoint-file',
+                            action='store',
+                            dest='checkpoint_file',
+                            default=None,
+                            help='Path to a file to which progress is saved, and from which it is resumed.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually delete the rows.')
+
+    def _read_checkpoint(self, path):
+        if not path or not os.path.exists(path):
+            return {}
+
+        try:
+            with open(path, 'r') as checkpoint_file:
+                return json.load(checkpoint_file)
+        except ValueError:
+            raise CommandError('The checkpoint file [{}] is not valid.'.format(path))
+
+    def _write_checkpoint(self, path, checkpoint):
+        if path:
+            with open(path, 'w') as checkpoint_file:
+                json.dump(checkpoint, checkpoint_file)
+
+    def handle(self, *args, **options):
+        target = self.target or options['target']
+        noun = 'basket lines' if target == PURGE_ORPHANED_LINES else 'baskets'
+        queryset = get_purge_queryset(target, days=options.get('days'))
+
+        checkpoint_path = options['checkpoint_file']
+        checkpoint = self._read_checkpoint(checkpoint_path)
+        start_after = checkpoint.get(target, 0)
+        if start_after:
+            queryset = queryset.filter(pk__gt=start_after)
+
+        count = queryset.count()
+
+        if not options['commit']:
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have deleted [{count}] {noun}.'.format(count=count, noun=noun)
+            self.stderr.write(msg)
+            return
+
+        if not count:
+            self.stderr.write('No {noun} to delete.'.format(noun=noun))
+            return
+
+        if start_after:
+            self.stderr.write('Resuming after ID [{}].'.format(start_after))
+        self.stderr.write('Deleting [{count}] {noun}.'.format(count=count, noun=noun))
+
+        deleted = 0
+        batches = purge_target(
+            target,
+            days=options.get('days'),
+            batch_size=options['batch_size'],
+            start_after=start_after,
+            target_latency=options['target_latency'],
+            max_sleep_seconds=options['sleep_seconds']
+        )
+        for batch in batches:
+            deleted += batch['count']
+            checkpoint[target] = batch['last_id']
+            self._write_checkpoint(checkpoint_path, checkpoint)
+
+            self.stderr.write(
+                'Deleted [{batch_count}] {noun} through ID [{last_id}] in [{latency:.2f}] seconds. '
+                '[{deleted}] of [{count}] deleted.'.format(
+                    batch_count=batch['count'], noun=noun, last_id=batch['last_id'], latency=batch['latency'],
+                    deleted=deleted, count=count
+                )
+            )
+
+        # The purge is complete, so the next one starts from the beginning.
+        checkpoint.pop(target, None)
+        self._write_checkpoint(checkpoint_path, checkpoint)
+
+        self.stderr.write('All {noun} deleted.'.format(noun=noun))
@@ -1,10 +1,112 @@
+import copy
+
+from django.utils.functional import SimpleLazyObject, empty
 from oscar.apps.basket.middleware import BasketMiddleware as OscarBasketMiddleware
+from oscar.apps.basket.middleware import selector
 from oscar.core.loading import get_model
 
 Basket = get_model('basket', 'basket')
 
+# Basket attributes whose values depend upon the offers applied to the basket. Accessing any of these
+# triggers the (deferred) application of offers.
+OFFER_DEPENDENT_ATTRIBUTES = frozenset([
+    'all_lines',
+    'applied_offers',
+    'grouped_voucher_discounts',
+    'has_shipping_discounts',
+    'num_items_with_discount',
+    'num_items_without_discount',
+    'offer_applications',
+    'offer_discounts',
+    'post_order_actions',
+    'shipping_discounts',
+    'voucher_discounts',
+])
+
+
+class LazyBasket(SimpleLazyObject):
+    """
+    Lazily-loaded basket, whose offers are applied only when an offer-dependent attribute is first accessed.
+
+    Loading the basket does not apply offers. Reading the basket's ID, status, or vouchers, for example, does not
+    require offers to be applied, and is cheaper without them. Callers that reset, and re-apply, offers themselves
+    (e.g. when a voucher is added) do not trigger the deferred application of offers.
+    """
+
+    def __init__(self, load_basket, apply_offers):
+        self.__dict__['_apply_offers'] = apply_offers
+        self.__dict__['_offers_pending'] = True
+        super(LazyBasket, self).__init__(load_basket)
+
+    def __getattr__(self, name):
+        if self._wrapped is empty:
+            self._setup()
+
+        if self._offers_pending:
+            if name == 'reset_offer_applications':
+                self.__dict__['_offers_pending'] = False
+            elif name in OFFER_DEPENDENT_ATTRIBUTES or name.startswith('total_'):
+                self.__dict__['_offers_pending'] = False
+                self._apply_offers(self._wrapped)
+
+        return getattr(self._wrapped, name)
+
+    def __copy__(self):
+        if self._wrapped is empty:
+            return type(self)(self._setupfunc, self._apply_offers)
+        return copy.copy(self._wrapped)
+
+    def __deepcopy__(self, memo):
+        if self._wrapped is empty:
+            result = type(self)(self._setupfunc, self._apply_offers)
+            memo[id(self)] = result
+            return result
+        return copy.deepcopy(self._wrapped, memo)
+
 
 class BasketMiddleware(OscarBasketMiddleware):
+    def process_request(self, request):
+        # Keep track of cookies that need to be deleted (which can only be done
+        # when we're processing the response instance).
+        request.cookies_to_delete = []
+
+        request.strategy = selector.strategy(request=request, user=request.user)
+
+        # We lazily load the basket so use a private variable to hold the
+        # cached instance.
+        request._basket_cache = None  # pylint: disable=protected-access
+
+        def load_basket():
+            basket = self.get_basket(request)
+            basket.strategy = request.strategy
+            return basket
+
+        def apply_offers(basket):
+            self.apply_offers_to_basket(request, basket)
+
+        def load_basket_hash():
+            basket = self.get_basket(request)
+            if basket.id:
+                return self.get_basket_hash(basket.id)
+
+        # Neither the basket, nor its hash, are loaded until they are accessed.
+        request.basket = LazyBasket(load_basket, apply_offers)
+        request.basket_hash = SimpleLazyObject(load_basket_hash)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):  # pylint: disable=unused-argument
+        """ Removes the basket from requests handled by views marked with the basket_exempt decorator. """
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+
+        if getattr(view_func, 'basket_exempt', False) or getattr(view_class, 'basket_exempt', False):
+            del request.basket
+            del request.basket_hash
+
+    def process_template_response(self, request, response):
+        if not hasattr(request, 'basket'):
+            return response
+
+        return super(BasketMiddleware, self).process_template_response(request, response)
+
     def get_cookie_key(self, request):
         """
         Returns the cookie name to use for storing a cookie basket.
@@ -3,7 +3,7 @@ from django.utils.translation import ugettext_lazy as _
 from oscar.apps.basket.abstract_models import AbstractBasket
 from oscar.core.loading import get_class
 
-from ecommerce.extensions.analytics.utils import track_segment_event, translate_basket_line_for_segment
+from ecommerce.extensions.analytics.utils import track_basket_line_events
 
 
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
@@ -50,9 +50,9 @@ class Basket(AbstractBasket):
 
     def flush(self):
         """Remove all products in basket and fire Segment 'Product Removed' Analytic event for each"""
-        for line in self.all_lines():
-            properties = translate_basket_line_for_segment(line)
-            track_segment_event(self.site, self.owner, 'Product Removed', properties)
+        lines = list(self.all_lines())
+        if lines:
+            track_basket_line_events(self, 'Product Removed', lines)
         super(Basket, self).flush()  # pylint: disable=bad-super-call
 
     def add_product(self, product, quantity=1, options=None):
@@ -61,9 +61,7 @@ class Basket(AbstractBasket):
         Performs AbstractBasket add_product method and fires Google Analytics 'Product Added' event.
         """
         line, created = super(Basket, self).add_product(product, quantity, options)  # pylint: disable=bad-super-call
-        properties = translate_basket_line_for_segment(line)
-        properties['cart_id'] = self.id
-        track_segment_event(self.site, self.owner, 'Product Added', properties)
+        track_basket_line_events(self, 'Product Added', [line], cart_id=self.id)
         return line, created
 
     def clear_vouchers(self):
@@ -0,0 +1,200 @@
+"""
+Batched purging of baskets and basket lines.
+
+Baskets have little value once their order is placed, or once they have been abandoned, and their lines and
+attributes take up most of the space used by the basket tables. Rows are purged in batches of IDs, read with keyset
+pagination so that each batch only touches existing rows. Each batch is deleted in its own transaction with one
+statement per table, without loading the rows, or the rows referencing them, into memory.
+
+Batches are throttled based on how long they take to delete: slow batches halve the size of the next batch, fast
+batches double it (up to the requested size), and each batch is followed by a pause proportional to its duration, so
+that the database has time to serve other connections and replicas have time to catch up.
+
+Orphaned lines are not read with an anti-join against the basket table, which scans both tables for every batch.
+Instead, every line is read with keyset pagination, and the lines of each batch whose basket still exists are skipped.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import time
+
+from django.db import models, transaction
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+
+Basket = get_model('basket', 'Basket')
+Line = get_model('basket', 'Line')
+
+PURGE_ORDERED = 'ordered'
+PURGE_ABANDONED = 'abandoned'
+PURGE_ORPHANED_LINES = 'orphaned_lines'
+PURGE_TARGETS = (PURGE_ORDERED, PURGE_ABANDONED, PURGE_ORPHANED_LINES,)
+
+# Baskets in these statuses are no longer used once they are old enough. Frozen baskets are excluded, since their
+# payment may still be in progress.
+ABANDONED_BASKET_STATUSES = (Basket.OPEN, Basket.MERGED, Basket.SAVED,)
+
+
+def get_purge_queryset(target, days=None):
+    """
+    Returns the queryset of the rows to purge.
+
+    Arguments:
+        target (str): one of ordered, abandoned, or orphaned_lines
+        days (int): age, in days, after which baskets are considered abandoned
+
+    Returns:
+        QuerySet
+    """
+    if target == PURGE_ORDERED:
+        # Only select those baskets linked to an order, and those not linked to an invoice.
+        # TODO: Simplify this query when the foreign key to Basket is removed from Invoice.
+        return Basket.objects.filter(order__isnull=False, invoice__isnull=True).distinct()
+
+    if target == PURGE_ABANDONED:
+        if days is None:
+            raise ValueError('The age of abandoned baskets must be specified.')
+
+        cutoff = now() - datetime.timedelta(days=days)
+        # Old baskets may still be in use: lines are added to the basket of a user for as long as it stays open.
+        # Lines record no modification date, so baskets with lines added since the cutoff are kept.
+        return Basket.objects.filter(
+            status__in=ABANDONED_BASKET_STATUSES,
+            date_created__lt=cutoff,
+            order__isnull=True,
+            invoice__isnull=True
+        ).exclude(
+            lines__date_created__gte=cutoff
+        ).distinct()
+
+    if target == PURGE_ORPHANED_LINES:
+        # Lines left behind by deletions which bypassed the database's foreign key constraints. This queryset is
+        # used to count and list them; purge_target() finds them batch by batch.
+        return Line.objects.exclude(basket_id__in=Basket.objects.values('id'))
+
+    raise ValueError('The purge target [{}] is not valid.'.format(target))
+
+
+def select_orphaned_lines(ids):
+    """
+    Returns the IDs of the given lines whose basket no longer exists.
+
+    Arguments:
+        ids (list): IDs of basket lines
+
+    Returns:
+        list: the IDs of the orphaned lines, in the given order
+    """
+    basket_ids = dict(Line.objects.filter(id__in=ids).values_list('id', 'basket_id'))
+    existing_basket_ids = set(
+        Basket.objects.filter(id__in=set(basket_ids.values())).values_list('id', flat=True)
+    )
+    return [line_id for line_id in ids if basket_ids.get(line_id) not in existing_basket_ids]
+
+
+def _get_dependent_relations(model):
+    # Model._meta is Django's documented API for introspecting models.
+    return [
+        relation for relation in model._meta.get_fields(include_hidden=True)  # pylint: disable=protected-access
+        if relation.auto_created and not relation.concrete and (relation.one_to_many or relation.one_to_one)
+    ]
+
+
+def delete_rows(model, ids):
+    """
+    Deletes the rows of the given model with the given IDs, along with the rows of the tables referencing them.
+
+    Rows referencing the deleted rows are deleted, or their references are nulled, following the on_delete behavior
+    of their foreign keys, with one statement per table. Unlike QuerySet.delete(), no rows are loaded, and no signals
+    are sent.
+
+    Arguments:
+        model (Model): model of the rows to delete
+        ids (list): primary keys of the rows to delete
+    """
+    # The base managers are used, as they select every row, as Django's Collector does. QuerySet.delete() fetches every
+    # row, and the rows referencing it, to send delete signals, so rows are deleted with QuerySet._raw_delete(), which
+    # the Collector uses to delete rows without signals or dependent rows.
+    for relation in _get_dependent_relations(model):
+        related_model = relation.related_model
+        related = related_model._base_manager.filter(  # pylint: disable=protected-access
+            **{relation.field.name + '__in': ids}
+        )
+
+        if relation.on_delete == models.CASCADE:
+            if _get_dependent_relations(related_model):
+                delete_rows(related_model, list(related.order_by().values_list('pk', flat=True)))
+            else:
+                related._raw_delete(related.db)  # pylint: disable=protected-access
+        elif relation.on_delete == models.SET_NULL:
+            related.update(**{relation.field.name: None})
+        elif relation.on_delete != models.DO_NOTHING:
+            raise ValueError('Rows of [{}] cannot be purged, since [{}.{}] does not cascade.'.format(
+                model._meta.label, related_model._meta.label, relation.field.name  # pylint: disable=protected-access
+            ))
+
+    rows = model._base_manager.filter(pk__in=ids)  # pylint: disable=protected-access
+    rows._raw_delete(rows.db)  # pylint: disable=protected-access
+
+
+def purge(queryset, batch_size=1000, start_after=0, target_latency=1.0, max_sleep_seconds=3, select_ids=None):
+    """
+    Deletes the rows selected by the given queryset, in batches of increasing IDs.
+
+    Arguments:
+        queryset (QuerySet): rows to delete
+        batch_size (int): maximum number of rows read in each batch
+        start_after (int): only rows with a greater ID are deleted, e.g. to resume a purge from its last batch
+        target_latency (float): seconds each batch should take to delete. Batches are shrunk when slower.
+        max_sleep_seconds (float): maximum number of seconds to sleep between batches
+        select_ids (callable): function given the IDs of each batch read from the queryset, returning those to
+            delete. All rows of each batch are deleted if not given.
+
+    Yields:
+        dict: one per batch, with the number of rows deleted, the ID of the last row read, and the seconds taken to
+            delete the batch.
+    """
+    max_batch_size = batch_size
+    last_id = start_after
+
+    while True:
+        ids = list(queryset.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+
+        last_id = ids[-1]
+        if select_ids is not None:
+            ids = select_ids(ids)
+
+        started = time.time()
+        if ids:
+            with transaction.atomic():
+                delete_rows(queryset.model, ids)
+        latency = time.time() - started
+
+        yield {'count': len(ids), 'last_id': last_id, 'latency': latency}
+
+        if latency > target_latency:
+            batch_size = max(1, batch_size // 2)
+        elif latency < target_latency / 2.0:
+            batch_size = min(max_batch_size, batch_size * 2)
+
+        time.sleep(min(max_sleep_seconds, latency))
+
+
+def purge_target(target, days=None, **kwargs):
+    """
+    Deletes the rows of the given purge target, in batches of increasing IDs.
+
+    Arguments:
+        target (str): one of ordered, abandoned, or orphaned_lines
+        days (int): age, in days, after which baskets are considered abandoned
+        **kwargs: options of purge()
+
+    Returns:
+        generator: yielding one dict per batch, as purge() does
+    """
+    if target == PURGE_ORPHANED_LINES:
+        return purge(Line.objects.all(), select_ids=select_orphaned_lines, **kwargs)
+
+    return purge(get_purge_queryset(target, days=days), **kwargs)
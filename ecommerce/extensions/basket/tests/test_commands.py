@@ -1,9 +1,13 @@
 from __future__ import unicode_literals
 
+import datetime
+import json
+import tempfile
 from StringIO import StringIO
 
 from django.contrib.sites.models import Site
 from django.core.management import CommandError, call_command
+from django.utils.timezone import now
 from oscar.core.loading import get_model
 from oscar.test import factories
 
@@ -78,6 +82,57 @@ class DeleteOrderedBasketsCommandTests(TestCase):
         self.assertEqual(out.getvalue().strip(), 'No baskets to delete.')
 
 
+class PurgeBasketsCommandTests(TestCase):
+    command = 'purge_baskets'
+
+    def setUp(self):
+        super(PurgeBasketsCommandTests, self).setUp()
+        self.abandoned_baskets = [factories.BasketFactory() for __ in range(0, 3)]
+        Basket.objects.update(date_created=now() - datetime.timedelta(days=31))
+        self.open_baskets = [factories.BasketFactory() for __ in range(0, 2)]
+
+    def test_without_commit(self):
+        """ Verify the command does not delete rows if the commit flag is not set. """
+        out = StringIO()
+        call_command(self.command, target='orphaned_lines', commit=False, stderr=out)
+
+        expected = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                   'would have deleted [0] basket lines.'
+        self.assertEqual(out.getvalue().strip(), expected)
+
+    def test_abandoned_baskets(self):
+        """ Verify the command deletes baskets older than the given number of days, and reports its progress. """
+        out = StringIO()
+        call_command(self.command, target='abandoned', days=30, batch_size=2, sleep_seconds=0, commit=True,
+                     stderr=out)
+
+        self.assertEqual(list(Basket.objects.all()), self.open_baskets)
+
+        lines = out.getvalue().strip().splitlines()
+        self.assertEqual(lines[0], 'Deleting [3] baskets.')
+        self.assertTrue(lines[1].startswith(
+            'Deleted [2] baskets through ID [{}]'.format(self.abandoned_baskets[1].id)
+        ))
+        self.assertTrue(lines[2].endswith('[3] of [3] deleted.'))
+        self.assertEqual(lines[3], 'All baskets deleted.')
+
+    def test_checkpoint(self):
+        """ Verify the command resumes after the ID saved in the checkpoint file, and clears it once complete. """
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json') as checkpoint_file:
+            json.dump({'abandoned': self.abandoned_baskets[0].id}, checkpoint_file)
+            checkpoint_file.flush()
+
+            out = StringIO()
+            call_command(self.command, target='abandoned', checkpoint_file=checkpoint_file.name, sleep_seconds=0,
+                         commit=True, stderr=out)
+
+            with open(checkpoint_file.name) as f:
+                self.assertEqual(json.load(f), {})
+
+        self.assertEqual(list(Basket.objects.all()), self.abandoned_baskets[:1] + self.open_baskets)
+        self.assertTrue(out.getvalue().startswith('Resuming after ID [{}].'.format(self.abandoned_baskets[0].id)))
+
+
 class AddSiteToBasketsBasketsCommandTests(TestCase):
     command = 'add_site_to_baskets'
 
@@ -1,10 +1,17 @@
+import mock
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils.functional import empty
 from oscar.core.loading import get_model
 from oscar.test.factories import BasketFactory
 
 from ecommerce.extensions.basket import middleware
+from ecommerce.extensions.basket.decorators import basket_exempt
+from ecommerce.extensions.test.factories import create_basket
 from ecommerce.tests.testcases import TestCase
 
 Basket = get_model('basket', 'Basket')
@@ -89,3 +96,82 @@ class BasketMiddlewareTests(TestCase):
         """ Verify the method returns a site-specific key. """
         expected = '{base}_{site_id}'.format(base=settings.OSCAR_BASKET_COOKIE_OPEN, site_id=self.site.id)
         self.assertEqual(self.middleware.get_cookie_key(self.request), expected)
+
+    def test_process_request_is_lazy(self):
+        """ Verify the middleware does not query the database until the basket is accessed. """
+        request = RequestFactory().get('/')
+        request.user = self.create_user()
+        request.site = self.site
+
+        with self.assertNumQueries(0):
+            self.middleware.process_request(request)
+
+        self.assertIs(request.basket._wrapped, empty)  # pylint: disable=protected-access
+
+    def create_request_with_basket(self):
+        """ Returns a request, processed by the middleware, for a user with a non-empty basket. """
+        request = RequestFactory().get('/')
+        request.user = self.create_user()
+        request.site = self.site
+        create_basket(owner=request.user, site=self.site)
+        self.middleware.process_request(request)
+        return request
+
+    def test_offers_applied_lazily(self):
+        """ Verify offers are only applied, once, when an offer-dependent attribute of the basket is accessed. """
+        request = self.create_request_with_basket()
+
+        with mock.patch.object(middleware.BasketMiddleware, 'apply_offers_to_basket') as mock_apply_offers:
+            self.assertIsNotNone(request.basket.id)
+            self.assertIsNotNone(request.basket.strategy)
+            self.assertFalse(mock_apply_offers.called)
+
+            __ = request.basket.total_incl_tax
+            __ = request.basket.offer_discounts
+            mock_apply_offers.assert_called_once_with(request, request.basket._wrapped)  # pylint: disable=protected-access
+
+    def test_offers_not_applied_after_reset(self):
+        """ Verify offers are not applied by the middleware if the caller resets, and re-applies, the offers. """
+        request = self.create_request_with_basket()
+
+        with mock.patch.object(middleware.BasketMiddleware, 'apply_offers_to_basket') as mock_apply_offers:
+            request.basket.reset_offer_applications()
+            __ = request.basket.total_incl_tax
+            self.assertFalse(mock_apply_offers.called)
+
+    def test_process_view_basket_exempt(self):
+        """ Verify the basket is removed from requests handled by views marked as basket-exempt. """
+        view = basket_exempt(lambda request: None)
+        self.middleware.process_view(self.request, view, [], {})
+        self.assertFalse(hasattr(self.request, 'basket'))
+        self.assertFalse(hasattr(self.request, 'basket_hash'))
+
+    def test_process_view_basket_exempt_class(self):
+        """ Verify the basket is removed from requests handled by class-based views marked as basket-exempt. """
+        view = mock.Mock(spec=['view_class'], view_class=basket_exempt(type(str('ExemptView'), (object,), {})))
+        self.middleware.process_view(self.request, view, [], {})
+        self.assertFalse(hasattr(self.request, 'basket'))
+
+    def test_process_view(self):
+        """ Verify the basket remains on requests handled by views that are not basket-exempt. """
+        self.middleware.process_view(self.request, lambda request: None, [], {})
+        self.assertTrue(hasattr(self.request, 'basket'))
+
+    def assert_no_basket_queries(self, path):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path)
+
+        self.assertEqual(response.status_code, 200)
+        basket_queries = [query['sql'] for query in context.captured_queries if 'basket_' in query['sql']]
+        self.assertEqual(basket_queries, [])
+
+    def test_health_no_basket_queries(self):
+        """ Verify the health check does not load a basket. """
+        self.assert_no_basket_queries(reverse('health'))
+
+    def test_api_no_basket_queries(self):
+        """ Verify API endpoints that do not need a basket do not load one. """
+        user = self.create_user(is_staff=True)
+        BasketFactory(owner=user, site=self.site)
+        self.client.login(username=user.username, password=self.password)
+        self.assert_no_basket_queries(reverse('api:v2:partner-list'))
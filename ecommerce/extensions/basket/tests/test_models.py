@@ -161,7 +161,7 @@ class BasketTests(BasketMixin, TestCase):
         course = CourseFactory()
         basket = create_basket(empty=True)
         seat = course.create_or_update_seat('verified', True, 100, self.partner)
-        with mock.patch('ecommerce.extensions.basket.models.track_segment_event') as mock_track:
+        with mock.patch('ecommerce.extensions.analytics.utils.track_segment_event') as mock_track:
             basket.add_product(seat)
             properties = translate_basket_line_for_segment(basket.lines.first())
             properties['cart_id'] = basket.id
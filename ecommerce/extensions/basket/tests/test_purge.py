@@ -0,0 +1,150 @@
+from __future__ import unicode_literals
+
+import datetime
+
+import mock
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from factory.fuzzy import FuzzyText
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.extensions.basket.purge import (
+    PURGE_ABANDONED, PURGE_ORDERED, PURGE_ORPHANED_LINES, delete_rows, get_purge_queryset, purge, purge_target,
+    select_orphaned_lines
+)
+from ecommerce.extensions.basket.tests.mixins import BasketMixin
+from ecommerce.extensions.payment.models import PaymentProcessorResponse
+from ecommerce.extensions.test.factories import create_order
+from ecommerce.invoice.models import Invoice
+from ecommerce.tests.testcases import TestCase
+
+Basket = get_model('basket', 'Basket')
+BasketAttribute = get_model('basket', 'BasketAttribute')
+BasketAttributeType = get_model('basket', 'BasketAttributeType')
+Line = get_model('basket', 'Line')
+LineAttribute = get_model('basket', 'LineAttribute')
+Order = get_model('order', 'Order')
+
+
+class PurgeTests(BasketMixin, TestCase):
+    def setUp(self):
+        super(PurgeTests, self).setUp()
+        self.option = factories.OptionFactory()
+        self.attribute_type = BasketAttributeType.objects.create(name='purge')
+
+    def create_full_basket(self, status=Basket.OPEN):
+        """ Returns a basket with a line, a line attribute, a basket attribute, and a voucher. """
+        basket = self.create_basket(None, None)
+        LineAttribute.objects.create(line=basket.lines.first(), option=self.option, value='value')
+        BasketAttribute.objects.create(basket=basket, attribute_type=self.attribute_type, value_text='value')
+        basket.vouchers.add(factories.VoucherFactory(code=FuzzyText().fuzz(), name=FuzzyText().fuzz()))
+        # Lines cannot be added to baskets which are not open.
+        Basket.objects.filter(id=basket.id).update(status=status)
+        return basket
+
+    def create_abandoned_basket(self, days=31, status=Basket.OPEN, line_days=None):
+        basket = self.create_full_basket(status=status)
+        Basket.objects.filter(id=basket.id).update(date_created=now() - datetime.timedelta(days=days))
+        Line.objects.filter(basket=basket).update(
+            date_created=now() - datetime.timedelta(days=days if line_days is None else line_days)
+        )
+        return basket
+
+    def assert_basket_deleted(self, basket_id):
+        self.assertFalse(Basket.objects.filter(id=basket_id).exists())
+        self.assertFalse(Line.objects.filter(basket_id=basket_id).exists())
+        self.assertFalse(LineAttribute.objects.filter(line__basket_id=basket_id).exists())
+        self.assertFalse(BasketAttribute.objects.filter(basket_id=basket_id).exists())
+        self.assertFalse(Basket.vouchers.through.objects.filter(basket_id=basket_id).exists())
+
+    def test_delete_rows(self):
+        """ Verify the rows referencing the deleted baskets are deleted, or their references nulled. """
+        basket = self.create_full_basket()
+        order = create_order(basket=basket)
+        response = PaymentProcessorResponse.objects.create(basket=basket, processor_name='test')
+        other_basket = self.create_full_basket()
+
+        with self.assertNumQueries(10):
+            delete_rows(Basket, [basket.id])
+
+        self.assert_basket_deleted(basket.id)
+        self.assertIsNone(Order.objects.get(id=order.id).basket)
+        self.assertIsNone(PaymentProcessorResponse.objects.get(id=response.id).basket)
+        self.assertEqual(other_basket.lines.count(), 1)
+
+    def test_ordered_baskets(self):
+        """ Verify ordered baskets are selected, unless they are invoiced. """
+        order = create_order()
+        invoiced_order = create_order()
+        Invoice.objects.create(basket=invoiced_order.basket, order=invoiced_order)
+        factories.BasketFactory()
+
+        self.assertEqual(list(get_purge_queryset(PURGE_ORDERED)), [order.basket])
+
+    def test_abandoned_baskets(self):
+        """ Verify old baskets which are not ordered, invoiced, frozen, or recently added to, are selected. """
+        abandoned = [
+            self.create_abandoned_basket(),
+            self.create_abandoned_basket(status=Basket.MERGED),
+        ]
+        self.create_abandoned_basket(days=29)
+        self.create_abandoned_basket(line_days=29)
+        self.create_abandoned_basket(status=Basket.FROZEN)
+        create_order(basket=self.create_abandoned_basket())
+
+        self.assertEqual(list(get_purge_queryset(PURGE_ABANDONED, days=30).order_by('id')), abandoned)
+
+        with self.assertRaises(ValueError):
+            get_purge_queryset(PURGE_ABANDONED)
+
+    def test_orphaned_lines(self):
+        """ Verify lines whose basket no longer exists are selected. """
+        basket = self.create_full_basket()
+        orphaned_basket = self.create_full_basket()
+        orphaned_lines = list(orphaned_basket.lines.all())
+        # Deleting the basket without its lines leaves them orphaned, as deletions bypassing foreign keys do.
+        baskets = Basket.objects.filter(id=orphaned_basket.id)
+        baskets._raw_delete(baskets.db)  # pylint: disable=protected-access
+
+        self.assertEqual(list(get_purge_queryset(PURGE_ORPHANED_LINES)), orphaned_lines)
+        self.assertEqual(
+            select_orphaned_lines(list(Line.objects.order_by('id').values_list('id', flat=True))),
+            [line.id for line in orphaned_lines]
+        )
+
+        # Lines are read by ID, rather than with an anti-join against the basket table.
+        with CaptureQueriesContext(connection) as queries:
+            batches = list(purge_target(PURGE_ORPHANED_LINES, batch_size=1))
+        self.assertFalse([query for query in queries.captured_queries if 'NOT' in query['sql']])
+        self.assertEqual([batch['count'] for batch in batches], [0, 1])
+        self.assertEqual(Line.objects.count(), basket.lines.count())
+        self.assertFalse(LineAttribute.objects.filter(line__in=orphaned_lines).exists())
+
+    def test_invalid_target(self):
+        """ Verify ValueError is raised if the target is invalid. """
+        self.assertRaises(ValueError, get_purge_queryset, 'everything')
+
+    @mock.patch('ecommerce.extensions.basket.purge.time')
+    def test_purge(self, mock_time):
+        """ Verify rows are deleted in batches of increasing IDs, resized and spaced based on their latency. """
+        baskets = [self.create_abandoned_basket() for __ in range(6)]
+        basket_ids = [basket.id for basket in baskets]
+        # Each batch takes the number of seconds set here: the first is slow, the others fast.
+        mock_time.time.side_effect = [0, 2, 0, 0.1, 0, 0.1, 0, 0.1]
+
+        batches = list(purge(
+            get_purge_queryset(PURGE_ABANDONED, days=30), batch_size=2, start_after=basket_ids[0],
+            target_latency=1, max_sleep_seconds=1.5
+        ))
+
+        self.assertEqual(batches, [
+            {'count': 2, 'last_id': basket_ids[2], 'latency': 2},
+            {'count': 1, 'last_id': basket_ids[3], 'latency': 0.1},
+            {'count': 2, 'last_id': basket_ids[5], 'latency': 0.1},
+        ])
+        self.assertEqual([call[0][0] for call in mock_time.sleep.call_args_list], [1.5, 0.1, 0.1])
+        self.assertEqual(list(Basket.objects.all()), baskets[:1])
+        for basket_id in basket_ids[1:]:
+            self.assert_basket_deleted(basket_id)
@@ -351,7 +351,8 @@ class BasketUtilsTests(CourseCatalogTestMixin, TestCase):
         toggle_switch(ENROLLMENT_CODE_SWITCH, True)
         course.create_or_update_seat('verified', False, 10, self.partner, create_enrollment_code=True)
         enrollment_code = Product.objects.get(product_class__name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
-        with mock.patch.object(UserAlreadyPlacedOrder, 'user_already_placed_order', return_value=True):
+        with mock.patch.object(UserAlreadyPlacedOrder, 'get_already_purchased_products',
+                               side_effect=lambda user, products: products):
             basket = prepare_basket(self.request, [enrollment_code])
             self.assertIsNotNone(basket)
 
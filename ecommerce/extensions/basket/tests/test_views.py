@@ -287,7 +287,8 @@ class BasketMultipleItemsViewTests(CourseCatalogTestMixin, CourseCatalogMockMixi
         qs = urllib.urlencode({'sku': [product.stockrecords.first().partner_sku for product in [product1, product2]]},
                               True)
         url = '{root}?{qs}'.format(root=self.path, qs=qs)
-        with mock.patch.object(UserAlreadyPlacedOrder, 'user_already_placed_order', return_value=True):
+        with mock.patch.object(UserAlreadyPlacedOrder, 'get_already_purchased_products',
+                               side_effect=lambda user, products: products):
             response = self.client.get(url)
             self.assertEqual(response.status_code, 200)
             self.assertEqual(response.context['error'], 'You have already purchased these products')
@@ -299,7 +300,7 @@ class BasketMultipleItemsViewTests(CourseCatalogTestMixin, CourseCatalogMockMixi
         products = ProductFactory.create_batch(3, stockrecords__partner=self.partner)
         qs = urllib.urlencode({'sku': [product.stockrecords.first().partner_sku for product in products]}, True)
         url = '{root}?{qs}'.format(root=self.path, qs=qs)
-        with mock.patch.object(UserAlreadyPlacedOrder, 'user_already_placed_order', return_value=False):
+        with mock.patch.object(UserAlreadyPlacedOrder, 'get_already_purchased_products', return_value=[]):
             response = self.client.get(url)
             self.assertEqual(response.status_code, 303)
 
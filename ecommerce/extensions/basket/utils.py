@@ -59,9 +59,14 @@ def prepare_basket(request, products, voucher=None):
             )
             return basket
 
+    # Enrollment codes may be purchased repeatedly, so they are not checked.
+    purchased_products = UserAlreadyPlacedOrder.get_already_purchased_products(
+        request.user,
+        [product for product in products if not product.is_enrollment_code_product]
+    )
+
     for product in products:
-        if product.is_enrollment_code_product or \
-                not UserAlreadyPlacedOrder.user_already_placed_order(request.user, product):
+        if product not in purchased_products:
             basket.add_product(product, 1)
             # Call signal handler to notify listeners that something has been added to the basket
             basket_addition.send(sender=basket_addition, product=product, user=request.user, request=request,
@@ -26,6 +26,7 @@ from ecommerce.extensions.offer.utils import format_benefit_value
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 from ecommerce.extensions.payment.constants import CLIENT_SIDE_CHECKOUT_FLAG_NAME
 from ecommerce.extensions.payment.forms import PaymentForm
+from ecommerce.extensions.payment.helpers import get_processor
 
 Benefit = get_model('offer', 'Benefit')
 logger = logging.getLogger(__name__)
@@ -282,7 +283,7 @@ class BasketSummaryView(BasketView):
         payment_processor_class = site_configuration.get_client_side_payment_processor_class()
 
         if payment_processor_class:
-            payment_processor = payment_processor_class(self.request.site)
+            payment_processor = get_processor(self.request.site, payment_processor_class.NAME)
             current_year = datetime.today().year
 
             return {
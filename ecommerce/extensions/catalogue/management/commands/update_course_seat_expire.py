@@ -1,17 +1,21 @@
 from __future__ import unicode_literals
 
 import logging
+import threading
 import time
+from multiprocessing.pool import ThreadPool
 
 from dateutil import parser
 from django.core.management import BaseCommand, CommandError
 from edx_rest_api_client.client import EdxRestApiClient
+from oscar.core.loading import get_model
 from slumber.exceptions import HttpClientError
 
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
 
 logger = logging.getLogger(__name__)
+Product = get_model('catalogue', 'Product')
 
 
 class Command(BaseCommand):
@@ -22,9 +26,12 @@ class Command(BaseCommand):
     ch = logging.StreamHandler()
     ch.setLevel(logging.DEBUG)
     logger.addHandler(ch)
-    enrollment_date_not_found = set()
+    seats_to_update = ['honor', 'audit', 'no-id-professional', 'professional']
+    page_size = 50
     pause_time = 5
     max_tries = 5
+    # Maximum number of seats updated by each UPDATE statement.
+    update_batch_size = 1000
 
     def add_arguments(self, par):
         par.add_argument('--commit',
@@ -32,87 +39,182 @@ class Command(BaseCommand):
                          dest='commit',
                          default=False,
                          help='Save the data to the database. If this is not set, '
-                              'expires date will not be updated')
+                              'expires date will not be updated, and the changes are only reported.')
+        par.add_argument('--max_workers',
+                         action='store',
+                         dest='max_workers',
+                         default=4,
+                         type=int,
+                         help='Maximum number of pages of courses fetched concurrently from the LMS.')
 
     def handle(self, *args, **options):
-        seats_to_update = ['honor', 'audit', 'no-id-professional', 'professional']
         save_to_db = options.get('commit', False)
-        courses_enrollment_info = self._get_courses_enrollment_info()
+
+        started = time.time()
+        courses_enrollment_info = self._get_courses_enrollment_info(options.get('max_workers') or 1)
+        logger.info(
+            'Fetched enrollment information of [%d] courses in [%.2f] seconds.',
+            len(courses_enrollment_info), time.time() - started
+        )
 
         if not courses_enrollment_info:
             msg = 'No course enrollment information found.'
             logger.error(msg)
             raise CommandError(msg)
 
-        courses = Course.objects.all().order_by('id')
-        logger.info('[%d] courses found for update.', courses.count())
+        course_ids = list(Course.objects.order_by('id').values_list('id', flat=True))
+        logger.info('[%d] courses found for update.', len(course_ids))
 
-        for course in courses:
-            enrollment_end_date = courses_enrollment_info.get(course.id)
+        expiration_dates = {}
+        for course_id in course_ids:
+            enrollment_end_date = courses_enrollment_info.get(course_id)
 
             # Only proceed if course enrollment information is present
             if not enrollment_end_date:
-                logger.error('Enrollment missing for course [%s]', course.id)
+                logger.error('Enrollment missing for course [%s]', course_id)
                 continue
 
-            if save_to_db:
-                course_seats = course.seat_products.filter(
-                    attributes__name='certificate_type',
-                    attribute_values__value_text__in=seats_to_update
-                )
-                expires = parser.parse(enrollment_end_date)
-                course_seats.update(expires=expires)
-                logger.info(
-                    'Updated expiration date for [%s] seats: [%s]',
-                    course.id,
-                    ', '.join([str(seat.id) for seat in course_seats]),
-                )
-
-    def _get_courses_enrollment_info(self):
+            expiration_dates[course_id] = parser.parse(enrollment_end_date)
+
+        started = time.time()
+        seats_by_expires = self._get_seats_to_update(expiration_dates)
+
+        if save_to_db:
+            for expires, seat_ids in sorted(seats_by_expires.items()):
+                for start in range(0, len(seat_ids), self.update_batch_size):
+                    Product.objects.filter(id__in=seat_ids[start:start + self.update_batch_size]).update(
+                        expires=expires
+                    )
+                logger.info('Updated expiration date of [%d] seats to [%s].', len(seat_ids), expires)
+
+            logger.info(
+                'Updated [%d] seats in [%.2f] seconds.',
+                sum(len(seat_ids) for seat_ids in seats_by_expires.values()), time.time() - started
+            )
+
+    def _get_seats_to_update(self, expiration_dates):
         """
-        Retrieve the enrollment information for all the courses.
+        Find the seats whose expiration date differs from the enrollment end date of their course.
+
+        The changes are reported for each course. Seats are grouped by their new expiration date, so that all seats
+        expiring at the same time can be updated together.
+
+        Arguments:
+            expiration_dates (dict): New expiration dates, keyed by course ID.
 
         Returns:
-            Dictionary representing the key-value pair (course_key, enrollment_end) of course.
+            Dictionary mapping each new expiration date to a list of the IDs of the seats to be updated.
         """
-        def _parse_response(api_response):
-            response_data = api_response.get('results', [])
-
-            # Map course_id with enrollment end date.
-            courses_enrollment = dict(
-                (course_info['course_id'], course_info['enrollment_end'])
-                for course_info in response_data
+        course_ids = sorted(expiration_dates)
+        changes = {}
+
+        for start in range(0, len(course_ids), self.update_batch_size):
+            seats = Product.objects.filter(
+                course_id__in=course_ids[start:start + self.update_batch_size],
+                structure=Product.CHILD,
+                attribute_values__attribute__name='certificate_type',
+                attribute_values__value_text__in=self.seats_to_update
+            ).values_list('id', 'course_id', 'expires').order_by('course_id', 'id')
+
+            for seat_id, course_id, expires in seats:
+                if expires != expiration_dates[course_id]:
+                    changes.setdefault(course_id, []).append((seat_id, expires))
+
+        seats_by_expires = {}
+        for course_id in sorted(changes):
+            expires = expiration_dates[course_id]
+            logger.info(
+                'Expiration date of [%s] seats changes to [%s]: [%s]',
+                course_id,
+                expires,
+                ', '.join('{} (was {})'.format(seat_id, previous) for seat_id, previous in changes[course_id]),
             )
-            return courses_enrollment, api_response['pagination'].get('next', None)
+            seats_by_expires.setdefault(expires, []).extend(seat_id for seat_id, __ in changes[course_id])
 
-        querystring = {'page_size': 50}
-        api = EdxRestApiClient(get_lms_url('api/courses/v1/'))
-        course_enrollments = {}
+        return seats_by_expires
 
-        page = 0
+    def _get_page(self, api, page, backoff):
+        """
+        Retrieve a page of courses, retrying when the API is rate-limited.
+
+        Rate-limited requests are retried after the delay requested by the API, or after a delay which doubles with
+        each attempt. The delay is shared by all workers, so that none of them calls the API before it has elapsed.
+        """
         throttling_attempts = 0
-        next_page = True
-        while next_page:
-            page += 1
-            querystring['page'] = page
+        while True:
+            with backoff['lock']:
+                delay = backoff['resume_at'] - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
             try:
-                response = api.courses().get(**querystring)
-                throttling_attempts = 0
+                return api.courses().get(page=page, page_size=self.page_size)
             except HttpClientError as exc:
                 # this is a known limitation; If we get HTTP429, we need to pause execution for a few seconds
                 # before re-requesting the data. raise any other errors
                 if exc.response.status_code == 429 and throttling_attempts < self.max_tries:
+                    pause_time = self._get_retry_after(exc.response) or self.pause_time * 2 ** throttling_attempts
                     logger.warning(
-                        'API calls are being rate-limited. Waiting for [%d] seconds before retrying...',
-                        self.pause_time
+                        'API calls are being rate-limited. Waiting for [%d] seconds before retrying...', pause_time
                     )
-                    time.sleep(self.pause_time)
-                    page -= 1
+                    with backoff['lock']:
+                        backoff['resume_at'] = max(backoff['resume_at'], time.time() + pause_time)
                     throttling_attempts += 1
                     logger.info('Retrying [%d]...', throttling_attempts)
                     continue
                 else:
                     raise
-            enrollment_info, next_page = _parse_response(response)
-            course_enrollments.update(enrollment_info)
+
+    def _get_retry_after(self, response):
+        try:
+            return int(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
+    def _get_courses_enrollment_info(self, max_workers):
+        """
+        Retrieve the enrollment information for all the courses.
+
+        The first page reports the number of pages, which are then fetched concurrently by at most `max_workers`
+        threads. If the number of pages is not reported, pages are fetched one after the other.
+
+        Returns:
+            Dictionary representing the key-value pair (course_key, enrollment_end) of course.
+        """
+        def _parse_response(api_response):
+            response_data = api_response.get('results', [])
+
+            # Map course_id with enrollment end date.
+            courses_enrollment = dict(
+                (course_info['course_id'], course_info['enrollment_end'])
+                for course_info in response_data
+            )
+            return courses_enrollment, api_response['pagination'].get('next', None)
+
+        api = EdxRestApiClient(get_lms_url('api/courses/v1/'))
+        backoff = {'lock': threading.Lock(), 'resume_at': 0}
+
+        response = self._get_page(api, 1, backoff)
+        course_enrollments, next_page = _parse_response(response)
+        num_pages = response['pagination'].get('num_pages')
+
+        if num_pages:
+            pages = range(2, num_pages + 1)
+            if pages:
+                pool = ThreadPool(min(max_workers, len(pages)))
+                try:
+                    responses = pool.map(lambda page: self._get_page(api, page, backoff), pages)
+                finally:
+                    pool.close()
+                    pool.join()
+
+                for response in responses:
+                    course_enrollments.update(_parse_response(response)[0])
+        else:
+            page = 1
+            while next_page:
+                page += 1
+                enrollment_info, next_page = _parse_response(self._get_page(api, page, backoff))
+                course_enrollments.update(enrollment_info)
+
         return course_enrollments
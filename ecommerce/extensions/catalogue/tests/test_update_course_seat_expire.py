@@ -4,11 +4,14 @@ from __future__ import unicode_literals
 import datetime
 import json
 import logging
+from multiprocessing.pool import ThreadPool
 
 import ddt
 import httpretty
 import mock
 from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from pytz import UTC
 from slumber.exceptions import HttpClientError
 from testfixtures import LogCapture
@@ -66,6 +69,16 @@ class UpdateSeatExpireDateTests(CourseCatalogTestMixin, TestCase):
             content_type=JSON
         )
 
+    def assert_logged(self, log_capture, expected):
+        """ Verify the expected messages have been logged, in order, ignoring timing messages. """
+        actual = [record for record in log_capture.actual() if ' seconds.' not in record[2]]
+        self.assertEqual(actual, expected)
+
+    def get_seat_changes_message(self, course, seats, expires):
+        return 'Expiration date of [{}] seats changes to [{}]: [{}]'.format(
+            course.id, expires, ', '.join('{} (was {})'.format(seat.id, seat.expires) for seat in seats)
+        )
+
     @httpretty.activate
     def test_update_course_with_commit(self):
         """ Verify all course seats are updated successfully, when commit option is provided. """
@@ -84,16 +97,18 @@ class UpdateSeatExpireDateTests(CourseCatalogTestMixin, TestCase):
             (
                 LOGGER_NAME,
                 'INFO',
-                'Updated expiration date for [{}] seats: [{}]'.format(
-                    self.course.id,
-                    ', '.join([str(seat.id) for seat in seats_expected_to_update])
-                )
+                self.get_seat_changes_message(self.course, seats_expected_to_update.order_by('id'), self.expire_date)
+            ),
+            (
+                LOGGER_NAME,
+                'INFO',
+                'Updated expiration date of [2] seats to [{}].'.format(self.expire_date)
             ),
         ]
 
         with LogCapture(LOGGER_NAME) as lc:
             call_command('update_course_seat_expire', commit=True)
-            lc.check(*expected)
+            self.assert_logged(lc, expected)
 
         # Verify course seats have been updated
         for seat in seats_expected_to_update:
@@ -107,7 +122,7 @@ class UpdateSeatExpireDateTests(CourseCatalogTestMixin, TestCase):
 
     @httpretty.activate
     def test_update_course_without_commit(self):
-        """ Verify all course seats are not updated with commit option is not provided. """
+        """ Verify course seats are not updated, but their changes are reported, without the commit option. """
         seats_expected_to_update = self.course.seat_products.filter(
             attributes__name='certificate_type',
             attribute_values__value_text__in=self.seats_to_update
@@ -120,11 +135,16 @@ class UpdateSeatExpireDateTests(CourseCatalogTestMixin, TestCase):
                 'INFO',
                 '[1] courses found for update.'
             ),
+            (
+                LOGGER_NAME,
+                'INFO',
+                self.get_seat_changes_message(self.course, seats_expected_to_update.order_by('id'), self.expire_date)
+            ),
         ]
 
         with LogCapture(LOGGER_NAME) as lc:
             call_command('update_course_seat_expire', commit=False)
-            lc.check(*expected)
+            self.assert_logged(lc, expected)
 
         # Verify course seats have not been updated
         for seat in seats_expected_to_update:
@@ -178,7 +198,7 @@ class UpdateSeatExpireDateTests(CourseCatalogTestMixin, TestCase):
 
         with LogCapture(LOGGER_NAME) as lc:
             call_command('update_course_seat_expire')
-            lc.check(*expected)
+            self.assert_logged(lc, expected)
 
     @httpretty.activate
     @mock.patch(
@@ -191,7 +211,7 @@ class UpdateSeatExpireDateTests(CourseCatalogTestMixin, TestCase):
         new_callable=mock.PropertyMock,
         return_value=1
     )
-    def test_update_course_with_exception(self, mock_max_tries, mock_pause_time):
+    def test_update_course_with_exception(self, mock_pause_time, mock_max_tries):
         """
         Verify that management command logs throttling errors when rate-limit to API
         exceeds.
@@ -215,4 +235,50 @@ class UpdateSeatExpireDateTests(CourseCatalogTestMixin, TestCase):
                 lc.check(*expected)
 
         self.assertEqual(mock_max_tries.call_count, 2)
-        self.assertEqual(mock_pause_time.call_count, 2)
+        self.assertEqual(mock_pause_time.call_count, 1)
+
+    @httpretty.activate
+    @mock.patch('ecommerce.extensions.catalogue.management.commands.update_course_seat_expire.time.sleep')
+    def test_update_course_with_retry_after(self, mock_sleep):
+        """ Verify rate-limited requests are retried after the delay requested by the API. """
+        url = get_lms_url('/api/courses/v1/courses/')
+        httpretty.register_uri(httpretty.GET, url, responses=[
+            httpretty.Response(body='{}', status=429, content_type=JSON, adding_headers={'Retry-After': '30'}),
+            httpretty.Response(body=json.dumps(self.course_info), status=200, content_type=JSON),
+        ])
+
+        call_command('update_course_seat_expire', commit=True)
+
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertTrue(29 < mock_sleep.call_args[0][0] <= 30)
+        self.assertEqual(Product.objects.get(id=self.honor_seat.id).expires, self.expire_date)
+
+    def test_update_courses_concurrently(self):
+        """ Verify pages are fetched concurrently, and seats expiring at the same time are updated together. """
+        courses = [self.course] + [CourseFactory() for __ in range(2)]
+        for course in courses[1:]:
+            course.create_or_update_seat('honor', False, 0, self.partner)
+
+        # httpretty is not thread-safe, so pages are served by a fake which the worker threads may call concurrently.
+        requested_pages = []
+
+        def get_page(_command, _api, page, _backoff):
+            requested_pages.append(page)
+            return {
+                'pagination': {'num_pages': len(courses)},
+                'results': [{'enrollment_end': unicode(self.expire_date), 'course_id': courses[page - 1].id}],
+            }
+
+        command_path = 'ecommerce.extensions.catalogue.management.commands.update_course_seat_expire'
+        with mock.patch(command_path + '.Command._get_page', autospec=True, side_effect=get_page):
+            with mock.patch(command_path + '.ThreadPool', wraps=ThreadPool) as mock_pool:
+                with CaptureQueriesContext(connection) as queries:
+                    call_command('update_course_seat_expire', commit=True, max_workers=2)
+
+        mock_pool.assert_called_once_with(2)
+        self.assertEqual(sorted(requested_pages), [1, 2, 3])
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 1)
+
+        for course in courses:
+            seat = course.seat_products.get(attribute_values__value_text='honor')
+            self.assertEqual(seat.expires, self.expire_date)
@@ -1,16 +1,23 @@
 import logging
 
 import waffle
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from oscar.core.loading import get_class
+from oscar.core.loading import get_class, get_model
 
 from ecommerce.courses.utils import mode_for_seat
 from ecommerce.extensions.analytics.utils import silence_exceptions, track_segment_event
-from ecommerce.extensions.checkout.utils import get_credit_provider_details, get_receipt_page_url
+from ecommerce.extensions.checkout.utils import (
+    get_credit_provider_details, get_receipt_page_url, invalidate_receipt_cache
+)
 from ecommerce.notifications.notifications import send_notification
 
 logger = logging.getLogger(__name__)
 post_checkout = get_class('checkout.signals', 'post_checkout')
+Line = get_model('order', 'Line')
+Order = get_model('order', 'Order')
+OrderDiscount = get_model('order', 'OrderDiscount')
+Source = get_model('payment', 'Source')
 
 # Number of orders currently supported for the email notifications
 ORDER_LINE_COUNT = 1
@@ -86,3 +93,21 @@ def send_course_purchase_email(sender, order=None, **kwargs):  # pylint: disable
 
         else:
             logger.info('Currently support receipt emails for order with one item.')
+
+
+@receiver(post_save, sender=Order, dispatch_uid='checkout.invalidate_receipt_on_order_save')
+@receiver(post_delete, sender=Order, dispatch_uid='checkout.invalidate_receipt_on_order_delete')
+def invalidate_receipt_on_order_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Discard the cached receipt of an order when the order changes. """
+    invalidate_receipt_cache(instance.number)
+
+
+@receiver(post_save, sender=Line, dispatch_uid='checkout.invalidate_receipt_on_line_save')
+@receiver(post_delete, sender=Line, dispatch_uid='checkout.invalidate_receipt_on_line_delete')
+@receiver(post_save, sender=OrderDiscount, dispatch_uid='checkout.invalidate_receipt_on_discount_save')
+@receiver(post_delete, sender=OrderDiscount, dispatch_uid='checkout.invalidate_receipt_on_discount_delete')
+@receiver(post_save, sender=Source, dispatch_uid='checkout.invalidate_receipt_on_source_save')
+@receiver(post_delete, sender=Source, dispatch_uid='checkout.invalidate_receipt_on_source_delete')
+def invalidate_receipt_on_order_detail_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Discard the cached receipt of an order when its lines, discounts, or payment sources change. """
+    invalidate_receipt_cache(instance.order.number)
@@ -30,9 +30,41 @@ class UtilTests(TestCase):
         """
         return 'api/credit/v1/providers/{credit_provider_id}/'.format(credit_provider_id=credit_provider_id)
 
+    def mock_credit_provider_directory(self, body, status=200):
+        """ Mocks the LMS Credit API endpoint listing all providers. """
+        httpretty.register_uri(
+            httpretty.GET,
+            self.site.siteconfiguration.build_lms_url('api/credit/v1/providers/'),
+            body=json.dumps(body),
+            status=status,
+            content_type="application/json"
+        )
+
     @httpretty.activate
     def test_get_credit_provider_details(self):
-        """ Check that credit provider details are returned. """
+        """ Check that credit provider details are returned from the directory of providers. """
+        provider = dict(self.body, id=self.credit_provider_id)
+        self.mock_credit_provider_directory([provider])
+        provider_data = get_credit_provider_details(
+            self.access_token,
+            self.credit_provider_id,
+            self.site.siteconfiguration
+        )
+        self.assertDictEqual(provider_data, provider)
+
+        # Subsequent lookups do not call LMS.
+        httpretty.reset()
+        provider_data = get_credit_provider_details(
+            self.access_token,
+            self.credit_provider_id,
+            self.site.siteconfiguration
+        )
+        self.assertDictEqual(provider_data, provider)
+
+    @httpretty.activate
+    def test_get_credit_provider_details_missing_from_directory(self):
+        """ Check that providers missing from the directory are retrieved individually. """
+        self.mock_credit_provider_directory([])
         httpretty.register_uri(
             httpretty.GET,
             self.site.siteconfiguration.build_lms_url(self.get_credit_provider_details_url(self.credit_provider_id)),
@@ -49,11 +81,7 @@ class UtilTests(TestCase):
     @httpretty.activate
     def test_get_credit_provider_details_unavailable_request(self):
         """ Check that None is returned on Bad Request response. """
-        httpretty.register_uri(
-            httpretty.GET,
-            self.site.siteconfiguration.build_lms_url(self.get_credit_provider_details_url(self.credit_provider_id)),
-            status=400
-        )
+        self.mock_credit_provider_directory([], status=400)
         provider_data = get_credit_provider_details(
             self.access_token,
             self.credit_provider_id,
@@ -5,6 +5,7 @@ import ddt
 import httpretty
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.test import override_settings
 from oscar.core.loading import get_model
 from oscar.test import newfactories as factories
 
@@ -16,7 +17,9 @@ from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
 from ecommerce.tests.mixins import LmsApiMockMixin
 from ecommerce.tests.testcases import TestCase
 
+Line = get_model('order', 'Line')
 Order = get_model('order', 'Order')
+PaymentNotification = get_model('payment', 'PaymentNotification')
 
 
 class FreeCheckoutViewTests(TestCase):
@@ -206,6 +209,55 @@ class ReceiptResponseViewTests(CourseCatalogMockMixin, LmsApiMockMixin, RefundTe
         response = self._get_receipt_response(order_number)
         self.assertEqual(response.status_code, 404)
 
+    def test_get_receipt_for_pending_order(self):
+        """ The view should display a pending message if the order is queued for placement. """
+        order_number = 'EDX-100001'
+        PaymentNotification.objects.create(
+            processor_name='cybersource',
+            transaction_id='123456',
+            order_number=order_number,
+            site=self.site,
+            notification={}
+        )
+
+        response = self._get_receipt_response(order_number)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'edx/checkout/receipt_pending.html')
+
+        # Failed notifications are still pending until they are out of attempts.
+        notifications = PaymentNotification.objects.filter(order_number=order_number)
+        notifications.update(status=PaymentNotification.FAILED, attempts=1)
+        response = self._get_receipt_response(order_number)
+        self.assertTemplateUsed(response, 'edx/checkout/receipt_pending.html')
+
+        notifications.update(attempts=settings.PAYMENT_NOTIFICATION_MAX_ATTEMPTS)
+        response = self._get_receipt_response(order_number)
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(RECEIPT_PENDING_MAX_POLLS=2)
+    def test_get_receipt_for_pending_order_polls(self):
+        """ The pending page should refresh itself a limited number of times, then refer the learner to support. """
+        order_number = 'EDX-100001'
+        PaymentNotification.objects.create(
+            processor_name='cybersource',
+            transaction_id='123456',
+            order_number=order_number,
+            site=self.site,
+            notification={}
+        )
+
+        response = self.client.get(self.path, {'order_number': order_number})
+        self.assertFalse(response.context['timed_out'])
+        self.assertIn('poll=1', response.context['next_poll_url'])
+
+        response = self.client.get(self.path, {'order_number': order_number, 'poll': 1})
+        self.assertIn('poll=2', response.context['next_poll_url'])
+
+        response = self.client.get(self.path, {'order_number': order_number, 'poll': 2})
+        self.assertTrue(response.context['timed_out'])
+        self.assertEqual(response.context['payment_support_email'], self.site.siteconfiguration.payment_support_email)
+        self.assertNotIn('next_poll_url', response.context)
+
     def test_get_payment_method_no_source(self):
         """ Payment method should be None when an Order has no Payment source. """
         order = self.create_order()
@@ -299,3 +351,18 @@ class ReceiptResponseViewTests(CourseCatalogMockMixin, LmsApiMockMixin, RefundTe
         self.assertEqual(response.status_code, 200)
         order_value_string = 'data-total-amount="{}"'.format(order.total_incl_tax)
         self.assertContains(response, order_value_string)
+
+    @httpretty.activate
+    def test_order_details_cached_until_order_changes(self):
+        """ Verify the rendered order details are cached, and discarded when the order changes. """
+        order = self._create_order_for_receipt(self.user)
+        line = order.lines.first()
+        self.assertContains(self._get_receipt_response(order.number), line.description)
+
+        # Updates that bypass signals are not reflected until the cached details expire.
+        Line.objects.filter(id=line.id).update(description='Updated description')
+        self.assertNotContains(self._get_receipt_response(order.number), 'Updated description')
+
+        line.description = 'Saved description'
+        line.save()
+        self.assertContains(self._get_receipt_response(order.number), 'Saved description')
@@ -1,27 +1,45 @@
 import logging
+import time
 import urllib
 
 from babel.numbers import format_currency as default_format_currency
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.utils.translation import get_language, to_locale
 from edx_rest_api_client.client import EdxRestApiClient
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberHttpBaseException
 
+from ecommerce.core.utils import get_cache_key
+from ecommerce.credit.directory import get_credit_provider_directory
+
 logger = logging.getLogger(__name__)
 
 
 def get_credit_provider_details(access_token, credit_provider_id, site_configuration):
     """ Returns the credit provider details from LMS.
 
+    Providers are looked up in the credit provider directory of the site. Providers added since the directory was
+    fetched are retrieved individually.
+
     Args:
         access_token (str): JWT access token
-        credit_provider_id (str): Identifier for the provider
+        credit_provider_id (str): Identifier for the provider. If empty, all providers are returned.
         site_configuration (SiteConfiguration): Ecommerce Site Configuration
 
     Returns: dict
     """
+    providers = get_credit_provider_directory(site_configuration, access_token)
+    if providers is None:
+        return None
+
+    if not credit_provider_id:
+        return providers.values()
+
+    if credit_provider_id in providers:
+        return providers[credit_provider_id]
+
     try:
         return EdxRestApiClient(
             site_configuration.build_lms_url('api/credit/v1/'),
@@ -55,6 +73,38 @@ def get_receipt_page_url(site_configuration, order_number=None, override_url=Non
     )
 
 
+def get_receipt_cache_version_key(order_number):
+    return get_cache_key(resource='order_receipt_version', order_number=order_number)
+
+
+def get_receipt_cache_version(order_number):
+    """ Returns the version of the cached receipt of the given order. The version changes whenever the order changes.
+
+    Args:
+        order_number (str): Order number
+
+    Returns:
+        int
+    """
+    cache_key = get_receipt_cache_version_key(order_number)
+    version = cache.get(cache_key)
+    if version is None:
+        # Versions are seeded with the current time, so that receipts cached for a discarded version are not reused.
+        version = int(time.time() * 1000)
+        cache.add(cache_key, version, settings.RECEIPT_CACHE_TIMEOUT)
+        version = cache.get(cache_key, version)
+    return version
+
+
+def invalidate_receipt_cache(order_number):
+    """ Discards the cached receipt of the given order.
+
+    Args:
+        order_number (str): Order number
+    """
+    cache.delete(get_receipt_cache_version_key(order_number))
+
+
 def format_currency(currency, amount, format=None, locale=None):  # pylint: disable=redefined-builtin
     locale = locale or to_locale(get_language())
     format = format or getattr(settings, 'OSCAR_CURRENCY_FORMAT', None)
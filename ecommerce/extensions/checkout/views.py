@@ -3,7 +3,9 @@ from __future__ import unicode_literals
 
 from decimal import Decimal
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.db.models import Prefetch
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
@@ -12,13 +14,16 @@ from django.views.generic import RedirectView, TemplateView
 from oscar.apps.checkout.views import *  # pylint: disable=wildcard-import, unused-wildcard-import
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.courses.utils import prefetch_product_attributes
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
-from ecommerce.extensions.checkout.utils import get_receipt_page_url
+from ecommerce.extensions.checkout.utils import get_receipt_cache_version, get_receipt_page_url
 
 Applicator = get_class('offer.utils', 'Applicator')
 Basket = get_model('basket', 'Basket')
+Line = get_model('order', 'Line')
 Order = get_model('order', 'Order')
+PaymentNotification = get_model('payment', 'PaymentNotification')
 
 
 class FreeCheckoutView(EdxOrderPlacementMixin, RedirectView):
@@ -136,6 +141,13 @@ class ReceiptResponseView(ThankYouView):
         try:
             return super(ReceiptResponseView, self).get(request, *args, **kwargs)
         except Http404:
+            if self.order_is_pending():
+                # Payment has been received, but the order has not yet been placed. The page
+                # refreshes itself until the order is available, or until it has refreshed
+                # RECEIPT_PENDING_MAX_POLLS times, after which the learner is asked to contact support.
+                self.template_name = 'edx/checkout/receipt_pending.html'
+                return self.render_to_response(context=self.get_pending_context_data())
+
             self.template_name = 'edx/checkout/receipt_not_found.html'
             context = {
                 'order_history_url': request.site.siteconfiguration.build_lms_url('account/settings'),
@@ -147,9 +159,10 @@ class ReceiptResponseView(ThankYouView):
         order = context[self.context_object_name]
         context.update({
             'payment_method': self.get_payment_method(order),
-            'display_credit_messaging': self.order_contains_credit_seat(order),
+            'receipt_cache_timeout': settings.RECEIPT_CACHE_TIMEOUT,
+            'receipt_cache_version': get_receipt_cache_version(order.number),
         })
-        context.update(self.get_order_verification_context(order))
+        context.update(self.get_order_lines_context(order))
         return context
 
     def get_object(self):
@@ -162,10 +175,46 @@ class ReceiptResponseView(ThankYouView):
         if not user.is_staff:
             kwargs['user'] = user
 
-        return get_object_or_404(Order, **kwargs)
+        # The lines, their products, and the payment sources of the order are loaded in a single pass, since they
+        # are read by the context and by the template.
+        queryset = Order.objects.select_related('billing_address', 'user').prefetch_related(
+            Prefetch('lines', queryset=Line.objects.select_related('product__course', 'product__product_class')),
+            'sources__source_type',
+        )
+        order = get_object_or_404(queryset, **kwargs)
+        prefetch_product_attributes([line.product for line in order.lines.all() if line.product])
+
+        return order
+
+    def order_is_pending(self):
+        """ Returns True if a queued payment notification is awaiting placement of the requested order. """
+        return PaymentNotification.objects.awaiting_placement().filter(
+            order_number=self.request.GET.get('order_number'),
+            site=self.request.site
+        ).exists()
+
+    def get_pending_context_data(self):
+        try:
+            poll = int(self.request.GET.get('poll', 0))
+        except ValueError:
+            poll = 0
+
+        if poll >= settings.RECEIPT_PENDING_MAX_POLLS:
+            return {
+                'timed_out': True,
+                'payment_support_email': self.request.site.siteconfiguration.payment_support_email,
+            }
+
+        query = self.request.GET.copy()
+        query['poll'] = poll + 1
+        return {
+            'timed_out': False,
+            'next_poll_url': '{path}?{query}'.format(path=self.request.path, query=query.urlencode()),
+        }
 
     def get_payment_method(self, order):
-        source = order.sources.first()
+        # Sources are read through all(), rather than first(), so that prefetched sources are used.
+        source = next(iter(order.sources.all()), None)
         if source:
             if source.card_type:
                 return '{type} {number}'.format(
@@ -175,30 +224,29 @@ class ReceiptResponseView(ThankYouView):
             return source.source_type.name
         return None
 
-    def order_contains_credit_seat(self, order):
+    def get_order_lines_context(self, order):
+        """ Returns the credit and verification details of the order, which are derived from its lines. """
+        display_credit_messaging = False
+        verified_course_id = None
+
         for line in order.lines.all():
-            if getattr(line.product.attr, 'credit_provider', None):
-                return True
-        return False
+            product = line.product
 
-    def get_order_verification_context(self, order):
-        context = {}
-        verified_course_id = None
+            if getattr(product.attr, 'credit_provider', None):
+                display_credit_messaging = True
+
+            if not verified_course_id and getattr(product.attr, 'id_verification_required', False):
+                verified_course_id = product.attr.course_key
+
+        context = {'display_credit_messaging': display_credit_messaging}
         request = self.request
         site = request.site
 
         # NOTE: Only display verification and credit completion details to the user who actually placed the order.
-        if request.user == order.user:
-            for line in order.lines.all():
-                product = line.product
-
-                if not verified_course_id and getattr(product.attr, 'id_verification_required', False):
-                    verified_course_id = product.attr.course_key
-
-            if verified_course_id:
-                context.update({
-                    'verification_url': site.siteconfiguration.build_lms_url('verify_student/reverify'),
-                    'user_verified': request.user.is_verified(site),
-                })
+        if verified_course_id and request.user == order.user:
+            context.update({
+                'verification_url': site.siteconfiguration.build_lms_url('verify_student/reverify'),
+                'user_verified': request.user.is_verified(site),
+            })
 
         return context
@@ -13,6 +13,7 @@ AUTH_URLS = [url(r'^logout/$', LogoutView.as_view(), name='logout'), ] + auth_ur
 class DashboardApplication(app.DashboardApplication):
     index_view = get_class('dashboard.views', 'ExtendedIndexView')
     refunds_app = get_class('dashboard.refunds.app', 'application')
+    profiles_app = get_class('dashboard.profiles.app', 'application')
 
     def get_urls(self):
         urls = [
@@ -31,6 +32,7 @@ class DashboardApplication(app.DashboardApplication):
             url(r'^comms/', include(self.comms_app.urls)),
             url(r'^shipping/', include(self.shipping_app.urls)),
             url(r'^refunds/', include(self.refunds_app.urls)),
+            url(r'^profiles/', include(self.profiles_app.urls)),
         ]
         urls += AUTH_URLS
         return self.post_process_urls(urls)
@@ -0,0 +1,21 @@
+from django.conf.urls import url
+from oscar.core.application import Application
+from oscar.core.loading import get_class
+
+
+class ProfilesDashboardApplication(Application):
+    name = 'profiles'
+    default_permissions = ['is_staff', ]
+
+    profile_list_view = get_class('dashboard.profiles.views', 'ProfileListView')
+    profile_download_view = get_class('dashboard.profiles.views', 'ProfileDownloadView')
+
+    def get_urls(self):
+        urls = [
+            url(r'^$', self.profile_list_view.as_view(), name='list'),
+            url(r'^(?P<name>[^/]+)/$', self.profile_download_view.as_view(), name='download'),
+        ]
+        return self.post_process_urls(urls)
+
+
+application = ProfilesDashboardApplication()
@@ -0,0 +1,70 @@
+import shutil
+import tempfile
+import threading
+
+from django.core.urlresolvers import reverse
+
+from ecommerce.core import profiling
+from ecommerce.tests.testcases import TestCase
+
+
+class ProfileViewTestMixin(object):
+    def setUp(self):
+        super(ProfileViewTestMixin, self).setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        overridden_settings = self.settings(PROFILING_DIRECTORY=directory)
+        overridden_settings.enable()
+        self.addCleanup(overridden_settings.disable)
+
+        profiler = profiling.SamplingProfiler(threading.current_thread().ident, 0.001)
+        profiler.stacks.update({'a;b': 1})
+        profiler.started = 1000
+        profiler.duration = 0.1
+        self.profile_name = profiling.save_profile(profiler, {'method': 'GET', 'path': '/basket/'})
+
+        self.user = self.create_user(is_staff=True)
+
+    def test_staff_permissions_required(self):
+        """ The view should only be accessible by staff users. """
+        non_staff_user = self.create_user(is_staff=False)
+        self.client.login(username=non_staff_user.username, password=self.password)
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 302)  # Redirect to logon page
+
+        self.client.login(username=self.user.username, password=self.password)
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+
+
+class ProfileListViewTests(ProfileViewTestMixin, TestCase):
+    path = reverse('dashboard:profiles:list')
+
+    def test_list(self):
+        """ The view should list the most recent profiles. """
+        self.client.login(username=self.user.username, password=self.password)
+        response = self.client.get(self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([profile['name'] for profile in response.context['profiles']], [self.profile_name])
+
+
+class ProfileDownloadViewTests(ProfileViewTestMixin, TestCase):
+    @property
+    def path(self):
+        return reverse('dashboard:profiles:download', kwargs={'name': self.profile_name})
+
+    def test_download(self):
+        """ The view should return the samples of the profile. """
+        self.client.login(username=self.user.username, password=self.password)
+        response = self.client.get(self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'a;b 1\n')
+
+    def test_not_found(self):
+        """ The view should return a 404 if the profile does not exist. """
+        self.client.login(username=self.user.username, password=self.password)
+        response = self.client.get(reverse('dashboard:profiles:download', kwargs={'name': 'unknown'}))
+        self.assertEqual(response.status_code, 404)
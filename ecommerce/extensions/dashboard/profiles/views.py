@@ -0,0 +1,30 @@
+import os
+
+from django.http import FileResponse, Http404
+from django.views.generic import TemplateView, View
+
+from ecommerce.core import profiling
+
+
+class ProfileListView(TemplateView):
+    """ Dashboard view to list the most recent request profiles. """
+    template_name = 'dashboard/profiles/profile_list.html'
+    limit = 100
+
+    def get_context_data(self, **kwargs):
+        context = super(ProfileListView, self).get_context_data(**kwargs)
+        context['profiles'] = profiling.get_profiles(limit=self.limit)
+        return context
+
+
+class ProfileDownloadView(View):
+    """ Dashboard view to download the samples of a request profile, in the folded stack format. """
+
+    def get(self, request, name):  # pylint: disable=unused-argument
+        path = profiling.get_profile_path(name)
+        if not path:
+            raise Http404
+
+        response = FileResponse(open(path, 'rb'), content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = 'attachment; filename="{}"'.format(os.path.basename(path))
+        return response
@@ -0,0 +1,36 @@
+from itertools import chain
+
+from oscar.apps.offer.applicator import Applicator as OscarApplicator
+
+from ecommerce.extensions.offer.index import get_candidate_offer_ids, get_offer_index
+
+
+class Applicator(OscarApplicator):
+    def get_offers(self, basket, user=None, request=None):
+        """
+        Return all offers to apply to the basket.
+
+        Unlike Oscar's implementation, only the site offers that may apply to the lines of the basket are returned.
+        """
+        site_offers = self.get_site_offers(basket)
+        basket_offers = self.get_basket_offers(basket, user)
+        user_offers = self.get_user_offers(user)
+        session_offers = self.get_session_offers(request)
+
+        offers = chain(session_offers, basket_offers, user_offers, site_offers)
+        return sorted(offers, key=lambda o: o.priority, reverse=True)
+
+    def get_site_offers(self, basket=None):  # pylint: disable=arguments-differ
+        """
+        Return site offers that are available to all users.
+
+        If a basket is given, only the offers listed by the site's offer index as candidates for the basket are
+        returned.
+        """
+        offers = super(Applicator, self).get_site_offers()
+
+        site = getattr(basket, 'site', None)
+        if site is None:
+            return offers
+
+        return offers.filter(id__in=get_candidate_offer_ids(get_offer_index(site), basket))
@@ -0,0 +1,151 @@
+"""
+Shared counters of offer applications.
+
+Oscar increments the usage counts of an offer, and of its voucher, on their database rows whenever an order is placed.
+Codes shared by thousands of learners make these rows a point of lock contention, and global application limits are
+enforced by reading the counts back from the same rows.
+
+Instead, the number of applications of each offer is counted in the shared cache. A counter is seeded from the order
+discounts of the offer, incremented atomically as orders are placed, and checked before the database. The counts
+stored on the offer and voucher rows are reconciled from order discounts and voucher applications by
+``reconcile_offer_usage``, which is run periodically by the ``reconcile_offer_usage`` management command.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from oscar.core.loading import get_model
+
+from ecommerce.core.utils import get_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+def get_application_counter_key(offer_id):
+    return get_cache_key(resource='offer_applications', offer_id=offer_id)
+
+
+def count_applications(offer_id):
+    """ Returns the number of times the offer has been applied to orders, as recorded by order discounts. """
+    OrderDiscount = get_model('order', 'OrderDiscount')
+    total = OrderDiscount.objects.filter(offer_id=offer_id).aggregate(total=Sum('frequency'))['total']
+    return total or 0
+
+
+def get_num_applications(offer_id):
+    """
+    Returns the number of times the offer has been applied to orders.
+
+    The count is read from the shared counter of the offer. If the counter is not set, it is seeded from the order
+    discounts of the offer. Counters expire after ``settings.OFFER_APPLICATION_COUNTER_TIMEOUT`` seconds, and are then
+    re-seeded, which corrects any drift.
+    """
+    cache_key = get_application_counter_key(offer_id)
+    num_applications = cache.get(cache_key)
+
+    if num_applications is None:
+        num_applications = count_applications(offer_id)
+        if not cache.add(cache_key, num_applications, settings.OFFER_APPLICATION_COUNTER_TIMEOUT):
+            # Another process seeded the counter first.
+            num_applications = cache.get(cache_key, num_applications)
+
+    return num_applications
+
+
+def increment_num_applications(offer_id, frequency):
+    """
+    Atomically adds applications to the shared counter of the offer.
+
+    Applications are recorded once the order discounts of their order have been created, so a counter seeded here
+    already includes them, and is not incremented.
+
+    Returns:
+        int: The number of times the offer has been applied to orders, including these applications.
+    """
+    cache_key = get_application_counter_key(offer_id)
+
+    try:
+        return cache.incr(cache_key, frequency)
+    except ValueError:
+        # The counter is not set.
+        num_applications = count_applications(offer_id)
+        if cache.add(cache_key, num_applications, settings.OFFER_APPLICATION_COUNTER_TIMEOUT):
+            return num_applications
+
+    try:
+        # Another process seeded the counter first, from order discounts which did not include these applications.
+        return cache.incr(cache_key, frequency)
+    except ValueError:
+        # The cache is unavailable.
+        return num_applications
+
+
+def reconcile_offer_usage(offer_ids):
+    """
+    Writes the usage counts of the given offers, and of their vouchers, to the database.
+
+    Counts are computed from order discounts and voucher applications. Only rows whose counts have changed are updated.
+
+    Arguments:
+        offer_ids (list): IDs of the offers to reconcile.
+
+    Returns:
+        int: Number of offer and voucher rows updated.
+    """
+    ConditionalOffer = get_model('offer', 'ConditionalOffer')
+    OrderDiscount = get_model('order', 'OrderDiscount')
+    Voucher = get_model('voucher', 'Voucher')
+    VoucherApplication = get_model('voucher', 'VoucherApplication')
+
+    offer_usage = {
+        usage.pop('offer_id'): usage
+        for usage in OrderDiscount.objects.filter(offer_id__in=offer_ids).values('offer_id').annotate(
+            num_applications=Sum('frequency'),
+            num_orders=Count('order_id', distinct=True),
+            total_discount=Sum('amount')
+        ).order_by()
+    }
+
+    updated = 0
+    for offer in ConditionalOffer.objects.filter(id__in=offer_ids).only(
+            'id', 'num_applications', 'num_orders', 'total_discount'):
+        usage = offer_usage.get(offer.id, {'num_applications': 0, 'num_orders': 0, 'total_discount': 0})
+        updated += _update_if_changed(ConditionalOffer, offer, usage)
+
+    # Single-use vouchers record their usage on their rows when they are redeemed, so only other vouchers are
+    # reconciled.
+    vouchers = Voucher.objects.filter(offers__id__in=offer_ids).exclude(usage=Voucher.SINGLE_USE).distinct()
+    voucher_ids = list(vouchers.values_list('id', flat=True))
+
+    voucher_orders = dict(
+        VoucherApplication.objects.filter(voucher_id__in=voucher_ids).values('voucher_id').annotate(
+            num_orders=Count('order_id', distinct=True)
+        ).order_by().values_list('voucher_id', 'num_orders')
+    )
+    voucher_discounts = dict(
+        OrderDiscount.objects.filter(voucher_id__in=voucher_ids).values('voucher_id').annotate(
+            total_discount=Sum('amount')
+        ).order_by().values_list('voucher_id', 'total_discount')
+    )
+
+    for voucher in Voucher.objects.filter(id__in=voucher_ids).only('id', 'num_orders', 'total_discount'):
+        usage = {
+            'num_orders': voucher_orders.get(voucher.id, 0),
+            'total_discount': voucher_discounts.get(voucher.id) or 0,
+        }
+        updated += _update_if_changed(Voucher, voucher, usage)
+
+    return updated
+
+
+def _update_if_changed(model, instance, usage):
+    if all(getattr(instance, field) == value for field, value in usage.items()):
+        return 0
+
+    # QuerySet.update() does not send signals, so reconciling counts does not invalidate any caches.
+    model.objects.filter(id=instance.id).update(**usage)
+    logger.info('Reconciled the usage of %s [%d]: %s.', model.__name__, instance.id, usage)
+    return 1
@@ -0,0 +1,171 @@
+"""
+Index of the site offers that may apply to a basket.
+
+Oscar's Applicator evaluates the condition of every active site offer against every line of a basket. Most offers
+can only be satisfied by a handful of products, so the index maps each product, product class, seat type, and SKU
+to the offers whose conditions may be satisfied by it. The Applicator only evaluates those candidate offers.
+
+The index is a superset: offers that cannot be indexed (e.g. ranges with categories, or custom conditions) are
+always candidates. Conditions are still evaluated for every candidate, so the index never changes which offers
+are applied.
+"""
+from __future__ import unicode_literals
+
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from oscar.core.loading import get_model
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
+
+from ecommerce.core.utils import get_cache_key
+
+logger = logging.getLogger(__name__)
+
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+
+OFFER_INDEX_VERSION_KEY = 'offer_index_version'
+
+
+def get_offer_index_version():
+    """ Returns the current version of the offer index. Indexes built for previous versions are ignored. """
+    version = cache.get(OFFER_INDEX_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(OFFER_INDEX_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_offer_index():
+    """ Invalidates the offer indexes of all sites. """
+    try:
+        cache.incr(OFFER_INDEX_VERSION_KEY)
+    except ValueError:
+        # The version has been evicted, or was never set.
+        cache.set(OFFER_INDEX_VERSION_KEY, 1, None)
+
+
+def _get_program_skus(condition, site_configuration):
+    try:
+        return condition.proxy().get_applicable_skus(site_configuration)
+    except (ConnectionError, SlumberBaseException, Timeout, KeyError):
+        logger.warning('Unable to retrieve the SKUs of program [%s]. Its offers will be evaluated for all baskets.',
+                       condition.program_uuid)
+        return None
+
+
+def build_offer_index(site):
+    """
+    Builds the offer index for the given site.
+
+    Arguments:
+        site (Site): Site whose baskets will be evaluated against the index.
+
+    Returns:
+        dict: Lists of offer IDs for each product ID, product class ID, and SKU. Offers with dynamic catalog ranges
+            are listed with the seat types of their ranges. Offers that could not be indexed are listed as wildcards.
+    """
+    products = defaultdict(set)
+    product_classes = defaultdict(set)
+    skus = defaultdict(set)
+    seat_types = []
+    wildcards = set()
+
+    offers = ConditionalOffer.objects.filter(
+        offer_type=ConditionalOffer.SITE,
+        status=ConditionalOffer.OPEN
+    ).select_related('condition__range')
+
+    for offer in offers:
+        condition = offer.condition
+        _range = condition.range
+
+        if condition.program_uuid:
+            program_skus = _get_program_skus(condition, site.siteconfiguration)
+            if program_skus is None:
+                wildcards.add(offer.id)
+            for sku in program_skus or []:
+                skus[sku].add(offer.id)
+            continue
+
+        if (condition.proxy_class or not _range or _range.proxy_class or _range.includes_all_products or
+                _range.included_categories.exists()):
+            wildcards.add(offer.id)
+            continue
+
+        for product_id in _range.included_products.values_list('id', flat=True):
+            products[product_id].add(offer.id)
+
+        for product_class_id in _range.classes.values_list('id', flat=True):
+            product_classes[product_class_id].add(offer.id)
+
+        if _range.catalog_id:
+            for product_id in _range.catalog_product_ids():
+                products[product_id].add(offer.id)
+
+        if (_range.catalog_query or _range.course_catalog) and _range.course_seat_types:
+            seat_types.append((offer.id, _range.course_seat_types))
+
+    def as_lists(mapping):
+        return {key: sorted(value) for key, value in mapping.items()}
+
+    return {
+        'products': as_lists(products),
+        'product_classes': as_lists(product_classes),
+        'skus': as_lists(skus),
+        'seat_types': seat_types,
+        'wildcards': sorted(wildcards),
+    }
+
+
+def get_offer_index(site):
+    """ Returns the cached offer index for the given site, building it if necessary. """
+    cache_key = get_cache_key(
+        site_domain=site.domain,
+        resource='offer_index',
+        version=get_offer_index_version()
+    )
+    index = cache.get(cache_key)
+
+    if index is None:
+        index = build_offer_index(site)
+        cache.set(cache_key, index, settings.OFFER_INDEX_CACHE_TIMEOUT)
+
+    return index
+
+
+def get_candidate_offer_ids(index, basket):
+    """
+    Returns the IDs of the indexed offers that may apply to the given basket.
+
+    Arguments:
+        index (dict): Offer index built by ``build_offer_index``.
+        basket (Basket): Basket whose lines are looked up in the index.
+
+    Returns:
+        set
+    """
+    offer_ids = set(index['wildcards'])
+
+    for line in basket.all_lines():
+        product = line.product
+        offer_ids.update(index['products'].get(product.id, []))
+        if product.parent_id:
+            offer_ids.update(index['products'].get(product.parent_id, []))
+
+        offer_ids.update(index['product_classes'].get(product.get_product_class().id, []))
+
+        if line.stockrecord:
+            offer_ids.update(index['skus'].get(line.stockrecord.partner_sku, []))
+
+        if index['seat_types']:
+            certificate_type = getattr(product.attr, 'certificate_type', None)
+            for offer_id, course_seat_types in index['seat_types']:
+                # Mirrors the check performed by Range.contains_product. Products without a seat type cannot be
+                # ruled out without the Catalog Service.
+                if certificate_type is None or certificate_type.lower() in course_seat_types:
+                    offer_ids.add(offer_id)
+
+    return offer_ids
@@ -0,0 +1,58 @@
+""" This command writes the usage counts of offers, and of their vouchers, to the database. """
+from __future__ import unicode_literals
+
+import datetime
+import logging
+
+from django.core.management import BaseCommand
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.offer.counters import reconcile_offer_usage
+
+logger = logging.getLogger(__name__)
+OrderDiscount = get_model('order', 'OrderDiscount')
+
+
+class Command(BaseCommand):
+    """Reconcile the usage counts of offers, and of their vouchers, with their order discounts."""
+
+    help = ('Write the usage counts of offers, and of their vouchers, to the database. Offers applied to orders '
+            'placed within the given number of minutes are reconciled. This command should be run periodically.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes',
+                            action='store',
+                            dest='minutes',
+                            default=60,
+                            type=int,
+                            help='Reconcile offers applied to orders placed within this many minutes.')
+        parser.add_argument('--all',
+                            action='store_true',
+                            dest='all',
+                            default=False,
+                            help='Reconcile every offer that has been applied to an order.')
+        parser.add_argument('--batch_size',
+                            action='store',
+                            dest='batch_size',
+                            default=500,
+                            type=int,
+                            help='Number of offers reconciled at a time.')
+
+    def handle(self, *args, **options):
+        discounts = OrderDiscount.objects.filter(offer_id__isnull=False)
+        if not options['all']:
+            discounts = discounts.filter(
+                order__date_placed__gte=now() - datetime.timedelta(minutes=options['minutes'])
+            )
+
+        offer_ids = sorted(set(discounts.values_list('offer_id', flat=True)))
+        batch_size = options['batch_size']
+        logger.info('Reconciling the usage of [%d] offers.', len(offer_ids))
+
+        updated = 0
+        for start in range(0, len(offer_ids), batch_size):
+            updated += reconcile_offer_usage(offer_ids[start:start + batch_size])
+
+        logger.info('Reconciled the usage of [%d] offers. [%d] offers and vouchers were updated.',
+                    len(offer_ids), updated)
@@ -0,0 +1,47 @@
+from __future__ import unicode_literals
+
+import datetime
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+from oscar.test.factories import OrderFactory
+
+from ecommerce.extensions.test.factories import prepare_voucher
+from ecommerce.tests.testcases import TestCase
+
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+OrderDiscount = get_model('order', 'OrderDiscount')
+Voucher = get_model('voucher', 'Voucher')
+
+
+class ReconcileOfferUsageTests(TestCase):
+    command = 'reconcile_offer_usage'
+
+    def setUp(self):
+        super(ReconcileOfferUsageTests, self).setUp()
+        voucher, __ = prepare_voucher(usage=Voucher.MULTI_USE)
+        self.offer = voucher.offers.first()
+
+        self.order = OrderFactory()
+        OrderDiscount.objects.create(order=self.order, offer_id=self.offer.id, amount=Decimal(10), frequency=1)
+
+    def assert_num_applications(self, expected):
+        self.assertEqual(ConditionalOffer.objects.get(id=self.offer.id).num_applications, expected)
+
+    def test_recent_orders(self):
+        """ Verify offers applied to recently placed orders are reconciled. """
+        call_command(self.command, batch_size=1)
+        self.assert_num_applications(1)
+
+    def test_old_orders(self):
+        """ Verify offers applied to orders placed before the window are only reconciled with --all. """
+        self.order.date_placed = now() - datetime.timedelta(days=1)
+        self.order.save()
+
+        call_command(self.command, minutes=60)
+        self.assert_num_applications(0)
+
+        call_command(self.command, all=True)
+        self.assert_num_applications(1)
@@ -1,19 +1,25 @@
 from __future__ import unicode_literals
 
+import logging
 import re
 
 from django.conf import settings
 from django.core.cache import cache
 from django.db import models
+from django.db.models import F
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.offer.abstract_models import (
     AbstractBenefit, AbstractCondition, AbstractConditionalOffer, AbstractRange
 )
+from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberBaseException
 from threadlocals.threadlocals import get_current_request
 
 from ecommerce.core.utils import get_cache_key, log_message_and_raise_validation_error
+from ecommerce.extensions.offer.counters import get_num_applications, increment_num_applications
+
+logger = logging.getLogger(__name__)
 
 
 class Benefit(AbstractBenefit):
@@ -148,6 +154,66 @@ class ConditionalOffer(AbstractConditionalOffer):
             return False
         return super(ConditionalOffer, self).is_condition_satisfied(basket)  # pylint: disable=bad-super-call
 
+    def get_num_applications(self):
+        """
+        Returns the number of times this offer has been applied to orders.
+
+        Unlike ``num_applications``, which is only periodically reconciled, the count is read from a shared counter
+        that is incremented as orders are placed.
+        """
+        return get_num_applications(self.id)
+
+    def get_max_applications(self, user=None):
+        """
+        In addition to Oscar's limits, the global application limit is checked against
+        the shared application counter of this offer.
+
+        Offers with a maximum discount are checked against the total discount stored on their row, which is kept up to
+        date by ``record_usage``, rather than the value loaded with this instance, which may be stale.
+        """
+        if self.max_discount:
+            self.total_discount = ConditionalOffer.objects.filter(id=self.id).values_list(
+                'total_discount', flat=True
+            ).first() or 0
+
+        max_applications = super(ConditionalOffer, self).get_max_applications(user)  # pylint: disable=bad-super-call
+
+        if self.max_global_applications and max_applications:
+            max_applications = min(
+                max_applications,
+                max(0, self.max_global_applications - self.get_num_applications())
+            )
+
+        return max_applications
+
+    def record_usage(self, discount):
+        """
+        Record an application of this offer.
+
+        The shared application counter of this offer is incremented, rather than the row of the offer, which would
+        be locked by every concurrent order using the offer. The counts stored on the row are reconciled from order
+        discounts by the reconcile_offer_usage management command.
+
+        Offers with a maximum discount are the exception: their total discount is atomically incremented on their row,
+        so that the maximum is enforced as soon as it is reached.
+        """
+        self.num_applications += discount['freq']
+        self.total_discount += discount['discount']
+        self.num_orders += 1
+
+        if self.max_discount:
+            ConditionalOffer.objects.filter(id=self.id).update(
+                total_discount=F('total_discount') + discount['discount']
+            )
+
+        num_applications = increment_num_applications(self.id, discount['freq'])
+        if self.max_global_applications and num_applications > self.max_global_applications:
+            logger.warning(
+                'ConditionalOffer [%d] has been applied [%d] times, exceeding its limit of [%d] applications.',
+                self.id, num_applications, self.max_global_applications
+            )
+    record_usage.alters_data = True
+
 
 def validate_credit_seat_type(course_seat_types):
     if not isinstance(course_seat_types, basestring):
@@ -167,6 +233,22 @@ def validate_credit_seat_type(course_seat_types):
         )
 
 
+def _iterate_in_chunks(queryset, chunk_size):
+    """ Yields the objects of the queryset, ordered by ID, loading at most chunk_size objects per query. """
+    queryset = queryset.order_by('id')
+    last_id = None
+
+    while True:
+        chunk = queryset if last_id is None else queryset.filter(id__gt=last_id)
+        chunk = list(chunk[:chunk_size])
+        for obj in chunk:
+            yield obj
+
+        if len(chunk) < chunk_size:
+            break
+        last_id = chunk[-1].id
+
+
 class Range(AbstractRange):
     UPDATABLE_RANGE_FIELDS = [
         'catalog_query',
@@ -175,6 +257,8 @@ class Range(AbstractRange):
         'enterprise_customer',
     ]
     ALLOWED_SEAT_TYPES = ['credit', 'professional', 'verified']
+    # IDs of the products of the catalog, loaded by the first lookup made by this instance.
+    _catalog_product_ids = None
     catalog = models.ForeignKey(
         'catalogue.Catalog', blank=True, null=True, related_name='ranges', on_delete=models.CASCADE
     )
@@ -295,17 +379,101 @@ class Range(AbstractRange):
                 # therefor an OR is used to check for both possibilities.
                 return ((response['course_runs'][product.course_id]) or
                         super(Range, self).contains_product(product))  # pylint: disable=bad-super-call
-        elif self.catalog:
+        elif self.catalog_id:
             return (
-                product.id in self.catalog.stock_records.values_list('product', flat=True) or
+                self.catalog_contains_product_id(product.id) or
                 super(Range, self).contains_product(product)  # pylint: disable=bad-super-call
             )
         return super(Range, self).contains_product(product)  # pylint: disable=bad-super-call
 
     contains = contains_product
 
+    @staticmethod
+    def _catalog_stock_records():
+        return get_model('catalogue', 'Catalog').stock_records.through
+
+    @staticmethod
+    def get_catalog_product_ids_cache_key(catalog_id):
+        return get_cache_key(resource='catalog_product_ids', catalog_id=catalog_id)
+
+    def catalog_product_ids(self):
+        """
+        Returns the IDs of the products in this range's catalog.
+
+        The IDs are cached for ``settings.RANGE_CATALOG_CACHE_TIMEOUT`` seconds, and the cache is invalidated when
+        stock records are added to, or removed from, the catalog.
+
+        Returns:
+            frozenset
+        """
+        if self._catalog_product_ids is None:
+            cache_key = self.get_catalog_product_ids_cache_key(self.catalog_id)
+            product_ids = cache.get(cache_key)
+
+            if product_ids is None:
+                product_ids = frozenset(
+                    self._catalog_stock_records().objects.filter(
+                        catalog_id=self.catalog_id
+                    ).values_list('stockrecord__product_id', flat=True)
+                )
+                cache.set(cache_key, product_ids, settings.RANGE_CATALOG_CACHE_TIMEOUT)
+
+            self._catalog_product_ids = product_ids
+
+        return self._catalog_product_ids
+
+    def catalog_contains_product_id(self, product_id):
+        """
+        Assert if this range's catalog contains the product with the given ID.
+
+        If the IDs of the catalog's products are cached, they are used. Otherwise, a single indexed query checks for
+        the product, rather than loading the IDs of every product in the catalog.
+        """
+        product_ids = self._catalog_product_ids
+        if product_ids is None:
+            product_ids = cache.get(self.get_catalog_product_ids_cache_key(self.catalog_id))
+
+        if product_ids is not None:
+            self._catalog_product_ids = product_ids
+            return product_id in product_ids
+
+        return self._catalog_stock_records().objects.filter(
+            catalog_id=self.catalog_id,
+            stockrecord__product_id=product_id
+        ).exists()
+
     def num_products(self):
-        return len(self.all_products())
+        """ Returns the number of products in this range, without loading the products. """
+        if (self.catalog_query or self.course_catalog) and self.course_seat_types:
+            return 0
+
+        num_products = super(Range, self).all_products().count()  # pylint: disable=bad-super-call
+        if self.catalog_id:
+            num_products += self._catalog_stock_records().objects.filter(catalog_id=self.catalog_id).count()
+        return num_products
+
+    def iter_products(self, chunk_size=500):
+        """
+        Yields the products in this range without loading them all at once.
+
+        Products of the catalog are yielded first, followed by the products selected by Oscar's rules (i.e. included
+        products and classes), each ordered by ID. Each chunk of products is loaded by a separate query.
+
+        Arguments:
+            chunk_size (int): Number of products loaded by each query.
+        """
+        if (self.catalog_query or self.course_catalog) and self.course_seat_types:
+            return
+
+        if self.catalog_id:
+            StockRecord = get_model('partner', 'StockRecord')
+            stock_records = StockRecord.objects.filter(catalogs__id=self.catalog_id).select_related('product')
+            for stock_record in _iterate_in_chunks(stock_records, chunk_size):
+                yield stock_record.product
+
+        products = super(Range, self).all_products()  # pylint: disable=bad-super-call
+        for product in _iterate_in_chunks(products, chunk_size):
+            yield product
 
     def all_products(self):
         if (self.catalog_query or self.course_catalog) and self.course_seat_types:
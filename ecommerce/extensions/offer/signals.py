@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.offer.index import invalidate_offer_index
+
+Benefit = get_model('offer', 'Benefit')
+Catalog = get_model('catalogue', 'Catalog')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Range = get_model('offer', 'Range')
+RangeProduct = get_model('offer', 'RangeProduct')
+StockRecord = get_model('partner', 'StockRecord')
+
+# Proxy models (e.g. program conditions, and percentage benefits) are sent as the sender of their own signals, so
+# receivers check the type of the instance instead of the sender.
+INDEXED_MODELS = (Benefit, Condition, ConditionalOffer, Range, RangeProduct,)
+
+
+@receiver(post_save, dispatch_uid='offer.invalidate_offer_index_on_save')
+@receiver(post_delete, dispatch_uid='offer.invalidate_offer_index_on_delete')
+def invalidate_offer_index_on_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate the offer index when an offer, or its condition, benefit, or range, changes. """
+    if isinstance(instance, INDEXED_MODELS):
+        invalidate_offer_index()
+
+
+@receiver(m2m_changed, sender=Range.classes.through, dispatch_uid='offer.index_range_classes')
+@receiver(m2m_changed, sender=Range.included_categories.through, dispatch_uid='offer.index_range_categories')
+@receiver(m2m_changed, sender=Catalog.stock_records.through, dispatch_uid='offer.index_catalog_stock_records')
+def invalidate_offer_index_on_membership_change(sender, action, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate the offer index when the product classes, categories, or catalog stock records of a range change.
+
+    Included products are saved as RangeProduct instances, whose changes are handled above.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_offer_index()
+
+
+def _invalidate_catalog_product_ids(catalog_ids):
+    cache.delete_many([Range.get_catalog_product_ids_cache_key(catalog_id) for catalog_id in catalog_ids])
+
+
+@receiver(m2m_changed, sender=Catalog.stock_records.through, dispatch_uid='offer.invalidate_catalog_product_ids')
+def invalidate_catalog_product_ids_on_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """ Invalidate the cached product IDs of catalogs whose stock records change. """
+    # pylint: disable=unused-argument
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            _invalidate_catalog_product_ids([instance.id])
+    elif action in ('post_add', 'post_remove'):
+        _invalidate_catalog_product_ids(pk_set)
+    elif action == 'pre_clear':
+        # The stock record's catalogs are unknown once they have been cleared.
+        _invalidate_catalog_product_ids(instance.catalogs.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=StockRecord, dispatch_uid='offer.invalidate_catalog_product_ids_on_delete')
+def invalidate_catalog_product_ids_on_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate the cached product IDs of the catalogs of a deleted stock record. """
+    _invalidate_catalog_product_ids(instance.catalogs.values_list('id', flat=True))
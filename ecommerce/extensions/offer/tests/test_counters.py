@@ -0,0 +1,113 @@
+from __future__ import unicode_literals
+
+from decimal import Decimal
+
+from oscar.core.loading import get_model
+from oscar.test.factories import OrderFactory, UserFactory
+
+from ecommerce.extensions.offer.counters import get_num_applications, reconcile_offer_usage
+from ecommerce.extensions.test.factories import VoucherFactory, prepare_voucher
+from ecommerce.tests.testcases import TestCase
+
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+OrderDiscount = get_model('order', 'OrderDiscount')
+Voucher = get_model('voucher', 'Voucher')
+
+
+class OfferCounterTests(TestCase):
+    def setUp(self):
+        super(OfferCounterTests, self).setUp()
+        self.voucher, __ = prepare_voucher(usage=Voucher.MULTI_USE, max_usage=2)
+        self.offer = self.voucher.offers.first()
+
+    def redeem(self, user=None):
+        """ Records the usage of the voucher, and of its offer, in a new order, as Oscar does when placing orders. """
+        user = user or UserFactory()
+        order = OrderFactory(user=user)
+        discount = {'offer': self.offer, 'voucher': self.voucher, 'freq': 1, 'discount': Decimal(10)}
+        OrderDiscount.objects.create(
+            order=order, offer_id=self.offer.id, voucher_id=self.voucher.id, amount=Decimal(10), frequency=1
+        )
+        self.offer.record_usage(discount)
+        self.voucher.record_usage(order, user)
+        self.voucher.record_discount(discount)
+        return order
+
+    def test_counter_seeded_from_order_discounts(self):
+        """ Verify the counter is seeded from the order discounts of the offer, and incremented as it is applied. """
+        OrderDiscount.objects.create(order=OrderFactory(), offer_id=self.offer.id, amount=Decimal(10), frequency=1)
+        self.assertEqual(get_num_applications(self.offer.id), 1)
+
+        self.redeem()
+        self.assertEqual(self.offer.get_num_applications(), 2)
+
+    def test_cold_counter(self):
+        """ Verify applications recorded while the counter is not set are counted once, as the counter is seeded from
+        order discounts which include them. """
+        self.redeem()
+        self.assertEqual(get_num_applications(self.offer.id), 1)
+
+        self.redeem()
+        self.assertEqual(get_num_applications(self.offer.id), 2)
+        self.assertEqual(ConditionalOffer.objects.get(id=self.offer.id).get_max_applications(), 0)
+
+    def test_max_global_applications(self):
+        """ Verify the global application limit is enforced with the counter, without updating the offer row. """
+        self.assertEqual(self.offer.get_max_applications(), 2)
+
+        self.redeem()
+        self.redeem()
+
+        offer = ConditionalOffer.objects.get(id=self.offer.id)
+        self.assertEqual(offer.num_applications, 0)
+        self.assertEqual(offer.get_max_applications(), 0)
+        self.assertFalse(offer.is_available())
+
+        voucher = Voucher.objects.get(id=self.voucher.id)
+        self.assertEqual(voucher.num_orders, 0)
+        self.assertEqual(voucher.applications.count(), 2)
+
+    def test_max_discount(self):
+        """ Verify the maximum discount of an offer is enforced with the total discount stored on its row, even by
+        instances loaded before the discounts were given. """
+        ConditionalOffer.objects.filter(id=self.offer.id).update(max_discount=Decimal(15))
+        self.offer.refresh_from_db()
+        stale_offer = ConditionalOffer.objects.get(id=self.offer.id)
+        self.assertEqual(stale_offer.get_max_applications(), 2)
+
+        self.redeem()
+        self.assertEqual(ConditionalOffer.objects.get(id=self.offer.id).total_discount, Decimal(10))
+        self.assertEqual(stale_offer.get_max_applications(), 1)
+
+        self.redeem()
+        self.assertEqual(ConditionalOffer.objects.get(id=self.offer.id).total_discount, Decimal(20))
+        self.assertEqual(stale_offer.get_max_applications(), 0)
+
+    def test_single_use_voucher(self):
+        """ Verify single-use vouchers record their usage on their rows. """
+        voucher = VoucherFactory(usage=Voucher.SINGLE_USE)
+        user = UserFactory()
+        voucher.record_usage(OrderFactory(user=user), user)
+        voucher.record_discount({'discount': Decimal(10)})
+
+        voucher = Voucher.objects.get(id=voucher.id)
+        self.assertEqual(voucher.num_orders, 1)
+        self.assertEqual(voucher.total_discount, Decimal(10))
+
+    def test_reconcile_offer_usage(self):
+        """ Verify the counts of offers and vouchers are written to the database, and only when they change. """
+        self.redeem()
+        self.redeem()
+
+        self.assertEqual(reconcile_offer_usage([self.offer.id]), 2)
+
+        offer = ConditionalOffer.objects.get(id=self.offer.id)
+        self.assertEqual(offer.num_applications, 2)
+        self.assertEqual(offer.num_orders, 2)
+        self.assertEqual(offer.total_discount, Decimal(20))
+
+        voucher = Voucher.objects.get(id=self.voucher.id)
+        self.assertEqual(voucher.num_orders, 2)
+        self.assertEqual(voucher.total_discount, Decimal(20))
+
+        self.assertEqual(reconcile_offer_usage([self.offer.id]), 0)
@@ -0,0 +1,112 @@
+from __future__ import unicode_literals
+
+import mock
+from oscar.core.loading import get_model
+from oscar.test import factories
+from slumber.exceptions import HttpNotFoundError
+
+from ecommerce.extensions.offer.applicator import Applicator
+from ecommerce.extensions.offer.index import build_offer_index, get_candidate_offer_ids, get_offer_index
+from ecommerce.extensions.test.factories import ConditionalOfferFactory, ProgramOfferFactory, create_basket
+from ecommerce.tests.testcases import TestCase
+
+Catalog = get_model('catalogue', 'Catalog')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+
+GET_APPLICABLE_SKUS_PATH = 'ecommerce.programs.conditions.ProgramCourseRunSeatsCondition.get_applicable_skus'
+
+
+class OfferIndexTests(TestCase):
+    def setUp(self):
+        super(OfferIndexTests, self).setUp()
+        self.basket = create_basket(owner=self.create_user(), site=self.site)
+        self.line = self.basket.all_lines()[0]
+        self.product = self.line.product
+
+    def create_offer(self, _range=None, **kwargs):
+        _range = _range or factories.RangeFactory()
+        kwargs.setdefault('offer_type', ConditionalOffer.SITE)
+        return ConditionalOfferFactory(condition__range=_range, condition__value=1, benefit__range=_range, **kwargs)
+
+    def test_build_offer_index(self):
+        """ Verify offers are indexed by the products, product classes, SKUs, and seat types of their conditions. """
+        product_offer = self.create_offer(_range=factories.RangeFactory(products=[self.product]))
+
+        class_range = factories.RangeFactory()
+        class_range.classes.add(self.product.get_product_class())
+        class_offer = self.create_offer(_range=class_range)
+
+        catalog = Catalog.objects.create(partner=self.partner)
+        catalog.stock_records.add(self.line.stockrecord)
+        catalog_offer = self.create_offer(_range=factories.RangeFactory(catalog=catalog))
+
+        all_products_offer = self.create_offer(_range=factories.RangeFactory(includes_all_products=True))
+        program_offer = ProgramOfferFactory()
+
+        # Suspended, and voucher, offers are never applied as site offers.
+        self.create_offer(_range=factories.RangeFactory(products=[self.product]), status=ConditionalOffer.SUSPENDED)
+        self.create_offer(_range=factories.RangeFactory(products=[self.product]), offer_type=ConditionalOffer.VOUCHER)
+
+        with mock.patch(GET_APPLICABLE_SKUS_PATH, return_value={'SKU-1'}):
+            index = build_offer_index(self.site)
+
+        self.assertEqual(index['products'], {self.product.id: sorted([product_offer.id, catalog_offer.id])})
+        self.assertEqual(index['product_classes'], {self.product.get_product_class().id: [class_offer.id]})
+        self.assertEqual(index['skus'], {'SKU-1': [program_offer.id]})
+        self.assertEqual(index['seat_types'], [])
+        self.assertEqual(index['wildcards'], [all_products_offer.id])
+
+    def test_build_offer_index_program_error(self):
+        """ Verify program offers are indexed as wildcards if the SKUs of their programs cannot be retrieved. """
+        program_offer = ProgramOfferFactory()
+
+        with mock.patch(GET_APPLICABLE_SKUS_PATH, side_effect=HttpNotFoundError):
+            index = build_offer_index(self.site)
+
+        self.assertEqual(index['skus'], {})
+        self.assertEqual(index['wildcards'], [program_offer.id])
+
+    def test_get_candidate_offer_ids(self):
+        """ Verify only the offers indexed for the lines of the basket, and wildcards, are candidates. """
+        index = {
+            'products': {self.product.id: [1], self.product.id + 1000: [2]},
+            'product_classes': {self.product.get_product_class().id: [3]},
+            'skus': {self.line.stockrecord.partner_sku: [4], 'other-sku': [5]},
+            'seat_types': [],
+            'wildcards': [6],
+        }
+        self.assertEqual(get_candidate_offer_ids(index, self.basket), {1, 3, 4, 6})
+
+    def test_get_offer_index_invalidated(self):
+        """ Verify the cached index is rebuilt after an offer, or the products of its range, change. """
+        _range = factories.RangeFactory()
+        offer = self.create_offer(_range=_range)
+
+        self.assertEqual(get_offer_index(self.site)['products'], {})
+
+        with mock.patch('ecommerce.extensions.offer.index.build_offer_index') as mock_build:
+            get_offer_index(self.site)
+            self.assertFalse(mock_build.called)
+
+        _range.add_product(self.product)
+        self.assertEqual(get_offer_index(self.site)['products'], {self.product.id: [offer.id]})
+
+        offer.status = ConditionalOffer.SUSPENDED
+        offer.save()
+        self.assertEqual(get_offer_index(self.site)['products'], {})
+
+    def test_applicator_site_offers(self):
+        """ Verify the Applicator only returns the site offers that may apply to the basket. """
+        applicable_offer = self.create_offer(_range=factories.RangeFactory(products=[self.product]))
+        self.create_offer(_range=factories.RangeFactory(products=[factories.create_product()]))
+
+        self.assertEqual(list(Applicator().get_site_offers(self.basket)), [applicable_offer])
+        self.assertEqual(len(Applicator().get_site_offers()), 2)
+
+    def test_applicator_applies_candidate_offers(self):
+        """ Verify offers returned by the index are applied to the basket. """
+        offer = self.create_offer(_range=factories.RangeFactory(products=[self.product]))
+
+        Applicator().apply(self.basket, self.basket.owner)
+
+        self.assertEqual(list(self.basket.applied_offers().values()), [offer])
@@ -79,6 +79,49 @@ class RangeTests(CouponMixin, CourseCatalogServiceMockMixin, CourseCatalogTestMi
         self.assertIn(self.product, self.range_with_catalog.all_products())
         self.assertEqual(len(self.range_with_catalog.all_products()), 1)
 
+    def test_range_iter_products(self):
+        """ iter_products() should yield the same products as all_products(), loading them in chunks. """
+        other_product = factories.create_product()
+        self.range_with_catalog.add_product(other_product)
+        self.catalog.stock_records.add(factories.create_stockrecord(factories.create_product(), num_in_stock=2))
+
+        products = list(self.range_with_catalog.iter_products(chunk_size=1))
+        self.assertEqual(len(products), 3)
+        self.assertEqual(set(products), set(self.range_with_catalog.all_products()))
+        self.assertEqual(self.range_with_catalog.num_products(), 3)
+
+    def test_catalog_contains_product_id(self):
+        """ Verify an existence query is used until the IDs of the catalog's products are cached. """
+        self.range_with_catalog.save()
+        product = factories.create_product()
+
+        with self.assertNumQueries(2):
+            self.assertTrue(self.range_with_catalog.catalog_contains_product_id(self.product.id))
+            self.assertFalse(self.range_with_catalog.catalog_contains_product_id(product.id))
+
+        self.assertEqual(self.range_with_catalog.catalog_product_ids(), frozenset([self.product.id]))
+
+        _range = Range.objects.get(id=self.range_with_catalog.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(_range.catalog_contains_product_id(self.product.id))
+            self.assertFalse(_range.catalog_contains_product_id(product.id))
+
+    def test_catalog_product_ids_invalidated(self):
+        """ Verify the cached IDs of the catalog's products are invalidated when the catalog's stock records change. """
+        self.range_with_catalog.save()
+        self.assertEqual(self.range_with_catalog.catalog_product_ids(), frozenset([self.product.id]))
+
+        product = factories.create_product()
+        stock_record = factories.create_stockrecord(product, num_in_stock=2)
+        self.catalog.stock_records.add(stock_record)
+        self.assertTrue(Range.objects.get(id=self.range_with_catalog.id).contains_product(product))
+
+        stock_record.catalogs.clear()
+        self.assertFalse(Range.objects.get(id=self.range_with_catalog.id).contains_product(product))
+
+        self.stock_record.delete()
+        self.assertEqual(Range.objects.get(id=self.range_with_catalog.id).catalog_product_ids(), frozenset())
+
     def test_large_query(self):
         """Verify the range can store large queries."""
         large_query = """
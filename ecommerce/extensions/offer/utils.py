@@ -6,6 +6,7 @@ from django.utils.translation import ugettext_lazy as _
 from oscar.core.loading import get_model
 
 from ecommerce.extensions.checkout.utils import add_currency
+from ecommerce.extensions.offer.applicator import Applicator  # pylint: disable=unused-import
 
 Benefit = get_model('offer', 'Benefit')
 
@@ -234,3 +234,24 @@ class UserAlreadyPlacedOrderTests(TestCase):
         refund_line.status = refund_line_status
         refund_line.save()
         self.assertEqual(UserAlreadyPlacedOrder.is_order_line_refunded(refund_line.order_line), is_refunded)
+
+    def test_get_already_purchased_products(self):
+        """
+        Verify the purchased, non-refunded, products are returned with a single query.
+        """
+        refund = RefundFactory(user=self.user)
+        refund_line = RefundLine.objects.get(refund=refund)
+        refund_line.status = 'Complete'
+        refund_line.save()
+        refunded_product = self.get_order_product(order=refund.order)
+        other_product = self.get_order_product(order=create_order(site=self.site))
+
+        products = [other_product, refunded_product, self.product]
+        # Warm the cache of the switch that disables this check.
+        UserAlreadyPlacedOrder.get_already_purchased_products(self.user, products)
+
+        with self.assertNumQueries(1):
+            purchased_products = UserAlreadyPlacedOrder.get_already_purchased_products(self.user, products)
+
+        self.assertEqual(purchased_products, [self.product])
+        self.assertEqual(UserAlreadyPlacedOrder.get_already_purchased_products(self.user, []), [])
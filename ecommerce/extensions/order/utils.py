@@ -144,16 +144,40 @@ class UserAlreadyPlacedOrder(object):
             If the switch with the name `ecommerce.extensions.order.constants.DISABLE_REPEAT_ORDER_SWITCH_NAME`
             is active this check will be disabled, and this method will already return `False`.
         """
-        if waffle.switch_is_active(DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME):
-            return False
+        return bool(UserAlreadyPlacedOrder.get_already_purchased_products(user, [product]))
 
-        orders_lines = OrderLine.objects.filter(product=product, order__user=user)
-        if orders_lines:
-            for order_line in orders_lines:
-                if not UserAlreadyPlacedOrder.is_order_line_refunded(order_line):
-                    return True
+    @staticmethod
+    def get_already_purchased_products(user, products):
+        """
+        Returns the products the user has already purchased.
+
+        A product is considered purchased if an OrderLine exists for the product,
+        and it has not been refunded. All of the products are checked with a single query.
+
+        Args:
+            user: (User)
+            products: (list of Product)
+
+        Returns:
+            list: The purchased products, in the order in which they were given.
 
-        return False
+        Notes:
+            If the switch with the name `ecommerce.extensions.order.constants.DISABLE_REPEAT_ORDER_SWITCH_NAME`
+            is active this check will be disabled, and this method will always return an empty list.
+        """
+        if not products or waffle.switch_is_active(DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME):
+            return []
+
+        purchased_product_ids = set(
+            OrderLine.objects.filter(
+                product_id__in=[product.id for product in products],
+                order__user=user
+            ).exclude(
+                refund_lines__status=REFUND_LINE.COMPLETE
+            ).order_by().values_list('product_id', flat=True).distinct()
+        )
+
+        return [product for product in products if product.id in purchased_product_ids]
 
     @staticmethod
     def is_order_line_refunded(order_line):
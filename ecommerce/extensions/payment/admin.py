@@ -7,6 +7,7 @@ from solo.admin import SingletonModelAdmin
 
 from ecommerce.extensions.payment.models import SDNCheckFailure
 
+PaymentNotification = get_model('payment', 'PaymentNotification')
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 PaypalProcessorConfiguration = get_model('payment', 'PaypalProcessorConfiguration')
 
@@ -37,6 +38,22 @@ class PaymentProcessorResponseAdmin(admin.ModelAdmin):
     formatted_response.allow_tags = True
 
 
+@admin.register(PaymentNotification)
+class PaymentNotificationAdmin(admin.ModelAdmin):
+    list_filter = ('processor_name', 'status',)
+    search_fields = ('id', 'transaction_id', 'order_number',)
+    list_display = ('id', 'processor_name', 'transaction_id', 'order_number', 'status', 'created', 'modified',)
+    fields = ('processor_name', 'transaction_id', 'order_number', 'site', 'status', 'formatted_notification',)
+    readonly_fields = ('processor_name', 'transaction_id', 'order_number', 'site', 'formatted_notification',)
+    show_full_result_count = False
+
+    def formatted_notification(self, obj):
+        pretty_notification = pformat(obj.notification)
+
+        # Use format_html() to escape user-provided inputs, avoiding an XSS vulnerability.
+        return format_html('<br><br><pre>{}</pre>', pretty_notification)
+
+
 @admin.register(SDNCheckFailure)
 class SDNCheckFailureAdmin(admin.ModelAdmin):
     search_fields = ('username', 'full_name')
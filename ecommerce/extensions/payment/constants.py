@@ -34,6 +34,9 @@ CYBERSOURCE_CARD_TYPE_MAP = {
 
 CLIENT_SIDE_CHECKOUT_FLAG_NAME = 'enable_client_side_checkout'
 
+# When active, accepted CyberSource notifications are queued for asynchronous order placement.
+CYBERSOURCE_NOTIFICATION_QUEUE_SWITCH = 'enable_cybersource_notification_queue'
+
 # Paypal only supports 4 languages, which are prioritized by country.
 # https://developer.paypal.com/docs/classic/api/locale_codes/
 PAYPAL_LOCALES = {
@@ -2,12 +2,22 @@
 import base64
 import hashlib
 import hmac
+import threading
+import time
 from importlib import import_module
 
 from django.conf import settings
 
 from ecommerce.extensions.payment import exceptions
 
+# Processor classes, keyed by name, in the order declared in the PAYMENT_PROCESSORS setting.
+_processor_classes = None
+
+# Ready-to-use processor instances, keyed by (site ID, processor name). Each value is a tuple of the
+# instance and the time at which it expires.
+_processor_instances = {}
+_processor_instances_lock = threading.Lock()
+
 
 def get_processor_class(path):
     """Return the payment processor class at the specified path.
@@ -29,6 +39,22 @@ def get_processor_class(path):
     return processor_class
 
 
+def get_processor_classes():
+    """Return the payment processor classes declared in the PAYMENT_PROCESSORS setting.
+
+    The classes are resolved once, and reused until the setting changes.
+
+    Returns:
+        list[class]: Payment processor classes, in the order in which they are declared.
+    """
+    global _processor_classes  # pylint: disable=global-statement
+
+    if _processor_classes is None:
+        _processor_classes = [get_processor_class(path) for path in settings.PAYMENT_PROCESSORS]
+
+    return list(_processor_classes)
+
+
 def get_default_processor_class():
     """Return the default payment processor class.
 
@@ -56,9 +82,7 @@ def get_processor_class_by_name(name):
     Raises:
         ProcessorNotFoundError: If no payment processor with the given name exists.
     """
-    for path in settings.PAYMENT_PROCESSORS:
-        processor_class = get_processor_class(path)
-
+    for processor_class in get_processor_classes():
         if name == processor_class.NAME:
             return processor_class
 
@@ -67,6 +91,56 @@ def get_processor_class_by_name(name):
     )
 
 
+def get_processor(site, name):
+    """Return an instance of the named payment processor, configured for the given site.
+
+    Processors are expensive to construct (e.g. they read settings and database-backed configuration, and may
+    build API clients that must obtain OAuth tokens), so instances are shared by all requests served by this process.
+    Instances are discarded when the site's configuration changes, and after PAYMENT_PROCESSOR_INSTANCE_CACHE_TIMEOUT
+    seconds, so that configuration changes made by other processes are eventually picked up.
+
+    Arguments:
+        site (Site): Site for which the processor should be configured.
+        name (string): The name of a payment processor.
+
+    Returns:
+        BasePaymentProcessor
+
+    Raises:
+        ProcessorNotFoundError: If no payment processor with the given name exists.
+    """
+    key = (site.id, name,)
+    entry = _processor_instances.get(key)
+
+    if entry is None or entry[1] <= time.time():
+        processor = get_processor_class_by_name(name)(site)
+        expires = time.time() + settings.PAYMENT_PROCESSOR_INSTANCE_CACHE_TIMEOUT
+
+        with _processor_instances_lock:
+            _processor_instances[key] = (processor, expires,)
+
+        return processor
+
+    return entry[0]
+
+
+def clear_processor_cache(site_id=None):
+    """Discard cached processor classes and instances.
+
+    Arguments:
+        site_id (int, optional): If specified, only the instances for this site are discarded.
+    """
+    global _processor_classes  # pylint: disable=global-statement
+
+    with _processor_instances_lock:
+        if site_id is None:
+            _processor_classes = None
+            _processor_instances.clear()
+        else:
+            for key in [key for key in _processor_instances if key[0] == site_id]:
+                del _processor_instances[key]
+
+
 def sign(message, secret):
     """Compute a Base64-encoded HMAC-SHA256.
 
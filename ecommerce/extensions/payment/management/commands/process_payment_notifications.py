@@ -0,0 +1,163 @@
+"""
+Management command that places orders for queued payment notifications.
+
+Notifications are queued by the CyberSource interstitial view when the notification queue switch is active. Only
+authentic notifications of accepted payments are queued, so each one should result in an order.
+
+Notifications whose worker stopped before finishing them are claimed again once they have been processing for
+PAYMENT_NOTIFICATION_PROCESSING_TIMEOUT seconds. Failed notifications are attempted again after
+PAYMENT_NOTIFICATION_RETRY_DELAY seconds, until they have been attempted PAYMENT_NOTIFICATION_MAX_ATTEMPTS times.
+"""
+from __future__ import unicode_literals
+
+import logging
+import time
+
+from django.core.management import BaseCommand
+from django.db.models import F
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+
+from ecommerce.core.utils import current_site
+from ecommerce.extensions.payment.exceptions import DuplicateReferenceNumber
+from ecommerce.extensions.payment.helpers import get_processor
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.payment.views.cybersource import CybersourceNotificationMixin
+
+logger = logging.getLogger(__name__)
+
+PaymentNotification = get_model('payment', 'PaymentNotification')
+
+
+class CybersourceNotificationHandler(CybersourceNotificationMixin):
+    """ Places orders for queued CyberSource notifications, outside of the request/response cycle. """
+
+    def __init__(self, site):
+        self.site = site
+        self.request = None
+        self.payment_processor = get_processor(site, Cybersource.NAME)
+
+    def handle_notification(self, notification):
+        # Offer conditions, and the helpers used to build LMS URLs, read the site from the current request.
+        with current_site(self.site) as request:
+            self.request = request
+
+            try:
+                basket = self.validate_notification(notification)
+            except DuplicateReferenceNumber:
+                # An order already exists for this basket.
+                return True
+            except:  # pylint: disable=bare-except
+                return False
+
+            try:
+                self.create_order(request, basket, self._get_billing_address(notification))
+                return True
+            except:  # pylint: disable=bare-except
+                return False
+
+
+class Command(BaseCommand):
+    help = 'Place orders for queued payment notifications.'
+
+    handlers = {
+        'cybersource': CybersourceNotificationHandler,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=100,
+                            type=int,
+                            help='Number of notifications to process in each batch.')
+        parser.add_argument('-m', '--max-batches',
+                            action='store',
+                            dest='max_batches',
+                            default=None,
+                            type=int,
+                            help='Maximum number of batches to process. By default, the queue is drained.')
+        parser.add_argument('-s', '--sleep-seconds',
+                            action='store',
+                            dest='sleep_seconds',
+                            default=0,
+                            type=float,
+                            help='Seconds to sleep between each batch.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        max_batches = options['max_batches']
+        sleep_seconds = options['sleep_seconds']
+
+        batches = 0
+        processed = 0
+        failed = 0
+
+        while max_batches is None or batches < max_batches:
+            notification_ids = list(
+                PaymentNotification.objects.claimable().order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+
+            if not notification_ids:
+                break
+
+            for notification_id in notification_ids:
+                status = self.process_notification(notification_id)
+                if status == PaymentNotification.PROCESSED:
+                    processed += 1
+                elif status == PaymentNotification.FAILED:
+                    failed += 1
+
+            batches += 1
+            if sleep_seconds:
+                time.sleep(sleep_seconds)
+
+        self.stderr.write(
+            'Processed [{processed}] payment notifications. [{failed}] notifications failed.'.format(
+                processed=processed, failed=failed
+            )
+        )
+
+    def process_notification(self, notification_id):
+        """
+        Place an order for a single queued notification.
+
+        The notification is claimed before it is processed so that concurrently-running
+        workers do not place the same order twice. Claiming a notification counts an attempt.
+
+        Returns:
+            str: Resulting status of the notification, or None if another worker claimed it.
+        """
+        # The conditions of claimable notifications are checked again by the update, so that only one of the workers
+        # racing to claim a notification succeeds.
+        claimed = PaymentNotification.objects.claimable().filter(id=notification_id).update(
+            status=PaymentNotification.PROCESSING,
+            attempts=F('attempts') + 1,
+            modified=now()
+        )
+
+        if not claimed:
+            return None
+
+        payment_notification = PaymentNotification.objects.get(id=notification_id)
+        handler_class = self.handlers.get(payment_notification.processor_name)
+
+        if handler_class and payment_notification.site:
+            handler = handler_class(payment_notification.site)
+            succeeded = handler.handle_notification(payment_notification.notification)
+        else:
+            logger.error('Unable to process payment notification [%d]. No handler or site is available.',
+                         payment_notification.id)
+            succeeded = False
+
+        if succeeded:
+            status = PaymentNotification.PROCESSED
+        else:
+            status = PaymentNotification.FAILED
+            logger.error('Failed to place an order for payment notification [%d], associated with order [%s], after '
+                         '[%d] attempts.', payment_notification.id, payment_notification.order_number,
+                         payment_notification.attempts)
+
+        payment_notification.status = status
+        payment_notification.save(update_fields=['status', 'modified'])
+        return status
@@ -0,0 +1,142 @@
+from __future__ import unicode_literals
+
+import datetime
+
+import mock
+from django.conf import settings
+from django.core.management import call_command
+from django.utils.timezone import now
+from factory.django import mute_signals
+from oscar.core.loading import get_class, get_model
+from oscar.test import factories
+
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.payment.tests.mixins import CybersourceMixin
+from ecommerce.extensions.test.factories import create_basket
+from ecommerce.tests.testcases import TestCase
+
+Basket = get_model('basket', 'Basket')
+Order = get_model('order', 'Order')
+PaymentNotification = get_model('payment', 'PaymentNotification')
+post_checkout = get_class('checkout.signals', 'post_checkout')
+
+
+class ProcessPaymentNotificationsTests(CybersourceMixin, TestCase):
+    command = 'process_payment_notifications'
+
+    def setUp(self):
+        super(ProcessPaymentNotificationsTests, self).setUp()
+        self.processor = Cybersource(self.site)
+        self.billing_address = self.make_billing_address()
+
+    def queue_notification(self, transaction_id='123456'):
+        basket = create_basket(owner=factories.UserFactory(), site=self.site)
+        basket.freeze()
+
+        notification = self.generate_notification(
+            basket, billing_address=self.billing_address, transaction_id=transaction_id
+        )
+
+        return basket, PaymentNotification.objects.create(
+            processor_name=self.processor.NAME,
+            transaction_id=transaction_id,
+            order_number=basket.order_number,
+            site=self.site,
+            notification=notification
+        )
+
+    def assert_status(self, payment_notification, expected):
+        payment_notification.refresh_from_db()
+        self.assertEqual(payment_notification.status, expected)
+
+    def age(self, payment_notification, seconds):
+        """ Makes the notification appear to have been last modified the given number of seconds ago. """
+        PaymentNotification.objects.filter(id=payment_notification.id).update(
+            modified=now() - datetime.timedelta(seconds=seconds)
+        )
+
+    @mute_signals(post_checkout)
+    def test_orders_placed(self):
+        """ Verify an order is placed for each queued notification, across multiple batches. """
+        queued = [self.queue_notification(transaction_id=str(index)) for index in range(3)]
+
+        call_command(self.command, batch_size=2)
+
+        for basket, payment_notification in queued:
+            self.assertTrue(Order.objects.filter(basket=basket).exists())
+            self.assertTrue(Basket.objects.get(id=basket.id).is_submitted)
+            self.assert_status(payment_notification, PaymentNotification.PROCESSED)
+
+    @mute_signals(post_checkout)
+    def test_max_batches(self):
+        """ Verify no more than the specified number of batches is processed. """
+        queued = [self.queue_notification(transaction_id=str(index)) for index in range(3)]
+
+        call_command(self.command, batch_size=1, max_batches=2)
+
+        statuses = [PaymentNotification.objects.get(id=notification.id).status for __, notification in queued]
+        self.assertEqual(statuses, [PaymentNotification.PROCESSED, PaymentNotification.PROCESSED,
+                                    PaymentNotification.PENDING])
+
+    def test_order_placement_failure(self):
+        """ Verify notifications whose orders cannot be placed are marked as failed. """
+        basket, payment_notification = self.queue_notification()
+
+        with mock.patch('ecommerce.extensions.payment.views.cybersource.OrderCreationMixin.create_order',
+                        side_effect=Exception):
+            call_command(self.command)
+
+        self.assertFalse(Order.objects.filter(basket=basket).exists())
+        self.assert_status(payment_notification, PaymentNotification.FAILED)
+        self.assertEqual(payment_notification.attempts, 1)
+
+    @mute_signals(post_checkout)
+    def test_failed_notifications_retried(self):
+        """ Verify failed notifications are attempted again after the retry delay, up to the maximum attempts. """
+        basket, payment_notification = self.queue_notification()
+        PaymentNotification.objects.filter(id=payment_notification.id).update(
+            status=PaymentNotification.FAILED, attempts=1
+        )
+
+        call_command(self.command)
+        self.assert_status(payment_notification, PaymentNotification.FAILED)
+
+        self.age(payment_notification, settings.PAYMENT_NOTIFICATION_RETRY_DELAY + 1)
+        call_command(self.command)
+        self.assertTrue(Order.objects.filter(basket=basket).exists())
+        self.assert_status(payment_notification, PaymentNotification.PROCESSED)
+        self.assertEqual(payment_notification.attempts, 2)
+
+    def test_failed_notifications_max_attempts(self):
+        """ Verify failed notifications are not attempted again once they are out of attempts. """
+        __, payment_notification = self.queue_notification()
+        PaymentNotification.objects.filter(id=payment_notification.id).update(
+            status=PaymentNotification.FAILED, attempts=settings.PAYMENT_NOTIFICATION_MAX_ATTEMPTS
+        )
+        self.age(payment_notification, settings.PAYMENT_NOTIFICATION_RETRY_DELAY + 1)
+
+        call_command(self.command)
+        self.assert_status(payment_notification, PaymentNotification.FAILED)
+        self.assertEqual(payment_notification.attempts, settings.PAYMENT_NOTIFICATION_MAX_ATTEMPTS)
+
+    def test_claimed_notifications_skipped(self):
+        """ Verify notifications claimed by another worker are not processed again. """
+        __, payment_notification = self.queue_notification()
+        payment_notification.status = PaymentNotification.PROCESSING
+        payment_notification.save()
+
+        call_command(self.command)
+        self.assert_status(payment_notification, PaymentNotification.PROCESSING)
+
+    @mute_signals(post_checkout)
+    def test_stale_notifications_reclaimed(self):
+        """ Verify notifications whose worker stopped before finishing them are claimed again. """
+        basket, payment_notification = self.queue_notification()
+        PaymentNotification.objects.filter(id=payment_notification.id).update(
+            status=PaymentNotification.PROCESSING, attempts=1
+        )
+        self.age(payment_notification, settings.PAYMENT_NOTIFICATION_PROCESSING_TIMEOUT + 1)
+
+        call_command(self.command)
+        self.assertTrue(Order.objects.filter(basket=basket).exists())
+        self.assert_status(payment_notification, PaymentNotification.PROCESSED)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import django.utils.timezone
+import django_extensions.db.fields
+import jsonfield.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+        ('payment', '0017_auto_20170328_1445'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentNotification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(default=django.utils.timezone.now, verbose_name='created', editable=False, blank=True)),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(default=django.utils.timezone.now, verbose_name='modified', editable=False, blank=True)),
+                ('processor_name', models.CharField(max_length=255, verbose_name='Payment Processor')),
+                ('transaction_id', models.CharField(max_length=255, verbose_name='Transaction ID')),
+                ('order_number', models.CharField(db_index=True, max_length=128, verbose_name='Order Number')),
+                ('notification', jsonfield.fields.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed')], db_index=True, default='pending', max_length=32)),
+                ('site', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='sites.Site', verbose_name='Site')),
+            ],
+            options={
+                'get_latest_by': 'created',
+                'verbose_name': 'Payment Notification',
+                'verbose_name_plural': 'Payment Notifications',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='paymentnotification',
+            unique_together=set([('processor_name', 'transaction_id')]),
+        ),
+    ]
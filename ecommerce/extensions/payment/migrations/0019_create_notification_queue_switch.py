@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from ecommerce.extensions.payment.constants import CYBERSOURCE_NOTIFICATION_QUEUE_SWITCH
+
+
+def create_switch(apps, schema_editor):
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.get_or_create(name=CYBERSOURCE_NOTIFICATION_QUEUE_SWITCH, defaults={'active': False})
+
+
+def delete_switch(apps, schema_editor):
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.filter(name=CYBERSOURCE_NOTIFICATION_QUEUE_SWITCH).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('payment', '0018_paymentnotification'),
+        ('waffle', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_switch, reverse_code=delete_switch),
+    ]
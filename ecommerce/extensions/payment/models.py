@@ -1,6 +1,11 @@
 from __future__ import unicode_literals
 
+import datetime
+
+from django.conf import settings
 from django.db import models
+from django.db.models import Q
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from jsonfield import JSONField
@@ -27,6 +32,64 @@ class PaymentProcessorResponse(models.Model):
         verbose_name_plural = _('Payment Processor Responses')
 
 
+class PaymentNotificationQuerySet(models.QuerySet):
+    def claimable(self):
+        """
+        Returns the notifications a worker may claim: pending notifications, notifications whose worker stopped before
+        finishing them, and failed notifications due for another attempt.
+        """
+        current_time = now()
+        stale_before = current_time - datetime.timedelta(seconds=settings.PAYMENT_NOTIFICATION_PROCESSING_TIMEOUT)
+        retry_before = current_time - datetime.timedelta(seconds=settings.PAYMENT_NOTIFICATION_RETRY_DELAY)
+
+        return self.filter(
+            Q(status=PaymentNotification.PENDING) |
+            Q(status=PaymentNotification.PROCESSING, modified__lt=stale_before) |
+            Q(
+                status=PaymentNotification.FAILED,
+                attempts__lt=settings.PAYMENT_NOTIFICATION_MAX_ATTEMPTS,
+                modified__lt=retry_before
+            )
+        )
+
+    def awaiting_placement(self):
+        """ Returns the notifications whose orders may still be placed. """
+        return self.filter(
+            Q(status__in=(PaymentNotification.PENDING, PaymentNotification.PROCESSING)) |
+            Q(status=PaymentNotification.FAILED, attempts__lt=settings.PAYMENT_NOTIFICATION_MAX_ATTEMPTS)
+        )
+
+
+class PaymentNotification(TimeStampedModel):
+    """ Verified payment processor notification, queued so that its order can be placed asynchronously. """
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    PROCESSED = 'processed'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (PROCESSING, _('Processing')),
+        (PROCESSED, _('Processed')),
+        (FAILED, _('Failed')),
+    )
+
+    processor_name = models.CharField(max_length=255, verbose_name=_('Payment Processor'))
+    transaction_id = models.CharField(max_length=255, verbose_name=_('Transaction ID'))
+    order_number = models.CharField(max_length=128, verbose_name=_('Order Number'), db_index=True)
+    site = models.ForeignKey('sites.Site', verbose_name=_('Site'), null=True, blank=True, on_delete=models.SET_NULL)
+    notification = JSONField()
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_('Attempts'))
+
+    objects = PaymentNotificationQuerySet.as_manager()
+
+    class Meta(object):
+        get_latest_by = 'created'
+        unique_together = ('processor_name', 'transaction_id')
+        verbose_name = _('Payment Notification')
+        verbose_name_plural = _('Payment Notifications')
+
+
 class Source(AbstractSource):
     card_type = models.CharField(max_length=255, choices=CARD_TYPE_CHOICES, null=True, blank=True)
 
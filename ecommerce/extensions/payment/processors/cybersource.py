@@ -5,15 +5,19 @@ import base64
 import datetime
 import json
 import logging
+import threading
 import uuid
 from decimal import Decimal
 
+import requests
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from oscar.apps.payment.exceptions import GatewayError, TransactionDeclined, UserCancelled
 from oscar.core.loading import get_class
 from zeep import Client
+from zeep.cache import InMemoryCache
 from zeep.helpers import serialize_object
+from zeep.transports import Transport
 from zeep.wsse import UsernameToken
 
 from ecommerce.core.constants import ISO_8601_FORMAT
@@ -32,6 +36,49 @@ logger = logging.getLogger(__name__)
 
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 
+# SOAP clients are expensive to build (the WSDL and its XSD imports must be downloaded and parsed), so a single
+# client is built per WSDL location and set of credentials, and shared by all processor instances in the process.
+_soap_clients = {}
+_soap_clients_lock = threading.Lock()
+
+
+def get_soap_client(wsdl, merchant_id, transaction_key):
+    """
+    Returns a SOAP client for the CyberSource Simple Order API, building it only if one does not already exist.
+
+    Clients are reused across calls, and share a pooled HTTP session. Parsed WSDL/XSD documents are held in
+    zeep's in-memory cache, so that clients for other credentials do not download them again.
+
+    Arguments:
+        wsdl (str): URL, or local path, of the WSDL describing the API.
+        merchant_id (str): CyberSource merchant ID.
+        transaction_key (str): CyberSource SOAP transaction key.
+
+    Returns:
+        zeep.Client
+    """
+    key = (wsdl, merchant_id, transaction_key,)
+    client = _soap_clients.get(key)
+
+    if client is None:
+        with _soap_clients_lock:
+            client = _soap_clients.get(key)
+            if client is None:
+                transport = Transport(
+                    cache=InMemoryCache(timeout=settings.CYBERSOURCE_WSDL_CACHE_TIMEOUT),
+                    session=requests.Session()
+                )
+                client = Client(wsdl, wsse=UsernameToken(merchant_id, transaction_key), transport=transport)
+                _soap_clients[key] = client
+
+    return client
+
+
+def clear_soap_client_cache():
+    """ Discards all cached SOAP clients. """
+    with _soap_clients_lock:
+        _soap_clients.clear()
+
 
 class Cybersource(BaseClientSidePaymentProcessor):
     """
@@ -55,6 +102,8 @@ class Cybersource(BaseClientSidePaymentProcessor):
         super(Cybersource, self).__init__(site)
         configuration = self.configuration
         self.soap_api_url = configuration['soap_api_url']
+        # A local copy of the WSDL (alongside its XSD) avoids downloading the service definition at runtime.
+        self.soap_api_wsdl_path = configuration.get('soap_api_wsdl_path')
         self.merchant_id = configuration['merchant_id']
         self.transaction_key = configuration['transaction_key']
         self.profile_id = configuration['profile_id']
@@ -321,9 +370,15 @@ class Cybersource(BaseClientSidePaymentProcessor):
         use_sop_profile = req_profile_id == self.sop_profile_id
         return response and (self._generate_signature(response, use_sop_profile) == response.get('signature'))
 
+    @property
+    def soap_client(self):
+        """ Returns the (shared) SOAP client used to call the CyberSource Simple Order API. """
+        wsdl = self.soap_api_wsdl_path or self.soap_api_url
+        return get_soap_client(wsdl, self.merchant_id, self.transaction_key)
+
     def issue_credit(self, order, reference_number, amount, currency):
         try:
-            client = Client(self.soap_api_url, wsse=UsernameToken(self.merchant_id, self.transaction_key))
+            client = self.soap_client
 
             credit_service = {
                 'captureRequestID': reference_number,
@@ -378,7 +433,7 @@ class Cybersource(BaseClientSidePaymentProcessor):
             GatewayError
         """
         try:
-            client = Client(self.soap_api_url, wsse=UsernameToken(self.merchant_id, self.transaction_key))
+            client = self.soap_client
             card_type = APPLE_PAY_CYBERSOURCE_CARD_TYPE_MAP[payment_token['paymentMethod']['network'].lower()]
             bill_to = {
                 'firstName': billing_address.first_name,
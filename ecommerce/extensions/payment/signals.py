@@ -2,11 +2,18 @@ import logging
 
 from django.conf import settings
 from django.core.cache import cache
+from django.core.signals import setting_changed
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from oscar.core.loading import get_model
 from waffle.models import Switch
 
+from ecommerce.core.models import SiteConfiguration
 from ecommerce.extensions.api.v2.views.payments import PAYMENT_PROCESSOR_CACHE_KEY
+from ecommerce.extensions.payment.helpers import clear_processor_cache
+
+Partner = get_model('partner', 'Partner')
+PaypalProcessorConfiguration = get_model('payment', 'PaypalProcessorConfiguration')
 
 logger = logging.getLogger(__name__)
 
@@ -24,3 +31,23 @@ def invalidate_processor_cache(*_args, **kwargs):
         logger.info('Switched payment processor [%s] %s.', processor, 'on' if switch.active else 'off')
         cache.delete(PAYMENT_PROCESSOR_CACHE_KEY)
         logger.info('Invalidated payment processor cache after toggling [%s].', switch.name)
+
+
+@receiver(post_save, sender=SiteConfiguration, dispatch_uid='payment.invalidate_site_processor_instances')
+def invalidate_site_processor_instances(*_args, **kwargs):
+    """ Discard the cached payment processor instances for a site when its configuration changes. """
+    clear_processor_cache(site_id=kwargs['instance'].site_id)
+
+
+@receiver(post_save, sender=Partner, dispatch_uid='payment.invalidate_processor_instances_for_partner')
+@receiver(post_save, sender=PaypalProcessorConfiguration, dispatch_uid='payment.invalidate_processor_instances')
+def invalidate_processor_instances(*_args, **_kwargs):
+    """ Discard all cached payment processor instances when configuration shared by processors changes. """
+    clear_processor_cache()
+
+
+@receiver(setting_changed, dispatch_uid='payment.invalidate_processor_instances_for_settings')
+def invalidate_processor_instances_for_settings(*_args, **kwargs):
+    """ Discard all cached payment processor classes and instances when their settings are changed. """
+    if kwargs['setting'] in ('LANGUAGE_CODE', 'PAYMENT_PROCESSORS', 'PAYMENT_PROCESSOR_CONFIG',):
+        clear_processor_cache()
@@ -181,7 +181,7 @@ class CybersourceMixin(PaymentEventsMixin):
             'decision': decision,
             'reason_code': reason_code,
             'req_reference_number': req_reference_number,
-            'transaction_id': '123456',
+            'transaction_id': kwargs.get('transaction_id', '123456'),
             'auth_amount': auth_amount,
             'req_amount': total,
             'req_tax_amount': '0.00',
@@ -3,6 +3,7 @@
 from __future__ import unicode_literals
 
 import copy
+import os
 from uuid import UUID
 
 import ddt
@@ -21,7 +22,7 @@ from ecommerce.extensions.payment.exceptions import (
     PartialAuthorizationError, PCIViolation, ProcessorMisconfiguredError
 )
 from ecommerce.extensions.payment.models import PaymentProcessorResponse
-from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.payment.processors.cybersource import Cybersource, clear_soap_client_cache
 from ecommerce.extensions.payment.tests.mixins import CybersourceMixin
 from ecommerce.extensions.payment.tests.processors.mixins import PaymentProcessorTestCaseMixin
 from ecommerce.extensions.test.factories import create_basket
@@ -37,6 +38,8 @@ class CybersourceTests(CybersourceMixin, PaymentProcessorTestCaseMixin, TestCase
     def setUp(self):
         super(CybersourceTests, self).setUp()
         self.basket.site = self.site
+        clear_soap_client_cache()
+        self.addCleanup(clear_soap_client_cache)
 
     def assert_processor_response_recorded(self, processor_name, transaction_id, response, basket=None):
         """ Ensures a PaymentProcessorResponse exists for the corresponding processor and response. """
@@ -269,6 +272,54 @@ class CybersourceTests(CybersourceMixin, PaymentProcessorTestCaseMixin, TestCase
         self.assert_processor_response_recorded(self.processor.NAME, transaction_id, response, basket)
         self.assertEqual(source.amount_refunded, 0)
 
+    @responses.activate
+    def test_issue_credit_reuses_soap_client(self):
+        """ Verify the SOAP client, and the WSDL it is built from, are reused for subsequent credits. """
+        transaction_id = 'request-1234'
+        refund = self.create_refund(self.processor_name)
+        order = refund.order
+        amount = refund.total_credit_excl_tax
+        currency = refund.currency
+        source = order.sources.first()
+
+        self.mock_cybersource_wsdl()
+        self.mock_refund_response(amount=amount, currency=currency, transaction_id=transaction_id,
+                                  basket_id=order.basket.id)
+
+        self.processor.issue_credit(order, source.reference, amount, currency)
+        client = self.processor.soap_client
+        wsdl_requests = len([call for call in responses.calls if call.request.method == 'GET'])
+
+        for __ in range(3):
+            processor = self.processor_class(self.site)
+            self.assertEqual(processor.issue_credit(order, source.reference, amount, currency), transaction_id)
+            self.assertIs(processor.soap_client, client)
+
+        self.assertEqual(len([call for call in responses.calls if call.request.method == 'GET']), wsdl_requests)
+
+    @responses.activate
+    def test_issue_credit_with_local_wsdl(self):
+        """ Verify a locally-stored WSDL is used, instead of downloading it, when configured. """
+        transaction_id = 'request-1234'
+        refund = self.create_refund(self.processor_name)
+        order = refund.order
+        amount = refund.total_credit_excl_tax
+        currency = refund.currency
+        source = order.sources.first()
+
+        payment_processor_config = copy.deepcopy(settings.PAYMENT_PROCESSOR_CONFIG)
+        payment_processor_config['edx'][self.processor_name]['soap_api_wsdl_path'] = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), 'CyberSourceTransaction_1.115.wsdl'
+        )
+        self.mock_refund_response(amount=amount, currency=currency, transaction_id=transaction_id,
+                                  basket_id=order.basket.id)
+
+        with override_settings(PAYMENT_PROCESSOR_CONFIG=payment_processor_config):
+            processor = self.processor_class(self.site)
+            self.assertEqual(processor.issue_credit(order, source.reference, amount, currency), transaction_id)
+
+        self.assertFalse([call for call in responses.calls if call.request.method == 'GET'])
+
     def test_client_side_payment_url(self):
         """ Verify the property returns the Silent Order POST URL. """
         processor_config = settings.PAYMENT_PROCESSOR_CONFIG[self.partner.name.lower()][self.processor.NAME.lower()]
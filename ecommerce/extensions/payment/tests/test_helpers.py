@@ -1,9 +1,12 @@
 import ddt
+import mock
 from django.test import override_settings
+from freezegun import freeze_time
 
 from ecommerce.extensions.payment import helpers
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
 from ecommerce.extensions.payment.tests.processors import AnotherDummyProcessor, DummyProcessor
+from ecommerce.tests.factories import SiteConfigurationFactory
 from ecommerce.tests.testcases import TestCase
 
 
@@ -34,6 +37,52 @@ class HelperTests(TestCase):
         """
         self.assertRaises(ProcessorNotFoundError, helpers.get_processor_class_by_name, 'foo')
 
+    def test_get_processor(self):
+        """ Verify the function returns a processor instance, which is reused for subsequent calls for the site. """
+        processor = helpers.get_processor(self.site, DummyProcessor.NAME)
+        self.assertIsInstance(processor, DummyProcessor)
+        self.assertEqual(processor.site, self.site)
+
+        with mock.patch.object(DummyProcessor, '__init__') as mock_init:
+            self.assertIs(helpers.get_processor(self.site, DummyProcessor.NAME), processor)
+            self.assertFalse(mock_init.called)
+
+        self.assertIsInstance(helpers.get_processor(self.site, AnotherDummyProcessor.NAME), AnotherDummyProcessor)
+
+        other_site = SiteConfigurationFactory(partner__short_code='other').site
+        self.assertIsNot(helpers.get_processor(other_site, DummyProcessor.NAME), processor)
+
+    def test_get_processor_not_found(self):
+        """ Verify the function raises ProcessorNotFoundError if no processor with the given name exists. """
+        self.assertRaises(ProcessorNotFoundError, helpers.get_processor, self.site, 'foo')
+
+    def test_get_processor_expiration(self):
+        """ Verify processor instances are rebuilt once they expire. """
+        with freeze_time('2017-01-01 00:00:00'):
+            processor = helpers.get_processor(self.site, DummyProcessor.NAME)
+
+        with freeze_time('2017-01-01 00:04:59'):
+            self.assertIs(helpers.get_processor(self.site, DummyProcessor.NAME), processor)
+
+        with freeze_time('2017-01-01 00:05:00'):
+            self.assertIsNot(helpers.get_processor(self.site, DummyProcessor.NAME), processor)
+
+    def test_get_processor_invalidation(self):
+        """ Verify processor instances are discarded when the site configuration changes. """
+        processor = helpers.get_processor(self.site, DummyProcessor.NAME)
+
+        self.site.siteconfiguration.save()
+        self.assertIsNot(helpers.get_processor(self.site, DummyProcessor.NAME), processor)
+
+    def test_get_processor_classes(self):
+        """ Verify the function returns the processor classes declared in settings, and honors setting changes. """
+        self.assertEqual(helpers.get_processor_classes(), [DummyProcessor, AnotherDummyProcessor])
+
+        with override_settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor']):
+            self.assertEqual(helpers.get_processor_classes(), [DummyProcessor])
+
+        self.assertEqual(helpers.get_processor_classes(), [DummyProcessor, AnotherDummyProcessor])
+
     def test_sign(self):
         """ Verify the function returns a valid HMAC SHA-256 signature. """
         message = "This is a super-secret message!"
@@ -11,8 +11,11 @@ from oscar.test import factories
 from requests.exceptions import HTTPError, Timeout
 
 from ecommerce.core.models import User
+from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.payment.models import SDNCheckFailure
-from ecommerce.extensions.payment.utils import SDNClient, clean_field_value, middle_truncate
+from ecommerce.extensions.payment.utils import (
+    SDNClient, clean_field_value, embargo_check, embargo_circuit_breaker, middle_truncate
+)
 from ecommerce.tests.testcases import TestCase
 
 
@@ -186,3 +189,69 @@ class EmbargoCheckTests(TestCase):
         self.mock_embargo_response(json.dumps(embargo_response))
         response = self.site.siteconfiguration.embargo_api_client.course_access.get(**self.params)
         self.assertEqual(response, embargo_response)
+
+    @httpretty.activate
+    def test_embargo_api_timeout(self):
+        """ Verify the embargo API is called with a timeout. """
+        self.mock_access_token_response()
+        client = self.site.siteconfiguration.embargo_api_client
+
+        with mock.patch('requests.Session.request', side_effect=Timeout) as mock_request:
+            with self.assertRaises(Timeout):
+                client.course_access.get(**self.params)
+        self.assertEqual(mock_request.call_args[1]['timeout'], settings.EMBARGO_API_TIMEOUT)
+
+
+class EmbargoCheckCacheTests(TestCase):
+    """ Tests for the caching of embargo decisions. """
+
+    def setUp(self):
+        super(EmbargoCheckCacheTests, self).setUp()
+        self.user = self.create_user()
+        self.seats = [
+            CourseFactory().create_or_update_seat('verified', True, 100, self.partner) for __ in range(2)
+        ]
+
+        patcher = mock.patch(
+            'ecommerce.core.models.SiteConfiguration.embargo_api_client', new_callable=mock.PropertyMock
+        )
+        self.mock_get = patcher.start().return_value.course_access.get
+        self.addCleanup(patcher.stop)
+
+    def test_allowed_decisions_cached_per_course(self):
+        """ Verify allowed decisions are cached for the basket, and for each of its courses. """
+        self.mock_get.return_value = {'access': True}
+
+        self.assertTrue(embargo_check(self.user, self.site, self.seats))
+        self.assertTrue(embargo_check(self.user, self.site, self.seats[:1]))
+        self.assertTrue(embargo_check(self.user, self.site, self.seats[1:]))
+        self.assertEqual(self.mock_get.call_count, 1)
+
+    def test_denied_decisions_cached(self):
+        """ Verify denied decisions are cached for the basket only. """
+        self.mock_get.return_value = {'access': False}
+
+        self.assertFalse(embargo_check(self.user, self.site, self.seats))
+        self.assertFalse(embargo_check(self.user, self.site, self.seats))
+        self.assertEqual(self.mock_get.call_count, 1)
+
+        self.mock_get.return_value = {'access': True}
+        self.assertTrue(embargo_check(self.user, self.site, self.seats[:1]))
+        self.assertEqual(self.mock_get.call_count, 2)
+
+        with override_settings(EMBARGO_DENIED_CACHE_TIMEOUT=0):
+            self.mock_get.return_value = {'access': False}
+            self.assertFalse(embargo_check(self.user, self.site, self.seats[1:]))
+            self.assertFalse(embargo_check(self.user, self.site, self.seats[1:]))
+            self.assertEqual(self.mock_get.call_count, 4)
+
+    def test_circuit_breaker(self):
+        """ Verify the API is not called while the circuit is open, and that purchases are allowed. """
+        self.mock_get.side_effect = Timeout
+
+        for __ in range(embargo_circuit_breaker.failure_threshold):
+            self.assertTrue(embargo_check(self.user, self.site, self.seats))
+        self.assertTrue(embargo_circuit_breaker.is_open())
+
+        self.assertTrue(embargo_check(self.user, self.site, self.seats))
+        self.assertEqual(self.mock_get.call_count, embargo_circuit_breaker.failure_threshold)
@@ -13,9 +13,11 @@ from oscar.apps.payment.exceptions import TransactionDeclined
 from oscar.core.loading import get_class, get_model
 from oscar.test import factories
 
+from ecommerce.core.tests import toggle_switch
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.extensions.api.serializers import OrderSerializer
 from ecommerce.extensions.order.constants import PaymentEventTypeName
+from ecommerce.extensions.payment.constants import CYBERSOURCE_NOTIFICATION_QUEUE_SWITCH
 from ecommerce.extensions.payment.exceptions import InvalidBasketError, InvalidSignatureError
 from ecommerce.extensions.payment.processors.cybersource import Cybersource
 from ecommerce.extensions.payment.tests.mixins import CybersourceMixin, CybersourceNotificationTestsMixin
@@ -29,6 +31,7 @@ Basket = get_model('basket', 'Basket')
 Order = get_model('order', 'Order')
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 PaymentEvent = get_model('order', 'PaymentEvent')
+PaymentNotification = get_model('payment', 'PaymentNotification')
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 Selector = get_class('partner.strategy', 'Selector')
 Source = get_model('payment', 'Source')
@@ -253,6 +256,45 @@ class CybersourceInterstitialViewTests(CybersourceNotificationTestsMixin, TestCa
             response = self.client.post(self.path, notification)
             self.assertRedirects(response, self.get_full_url(path=reverse('payment_error')), status_code=302)
 
+    def test_queued_notification(self):
+        """
+        Verify accepted notifications are queued, without placing an order, when the notification queue is enabled.
+        Replayed notifications should not be queued again.
+        """
+        toggle_switch(CYBERSOURCE_NOTIFICATION_QUEUE_SWITCH, True)
+        notification = self.generate_notification(self.basket, billing_address=self.billing_address)
+
+        for __ in range(2):
+            response = self.client.post(self.path, notification)
+            self.assertEqual(response.status_code, 302)
+            self.assertIn(self.basket.order_number, response['Location'])
+
+        payment_notification = PaymentNotification.objects.get()
+        self.assertEqual(payment_notification.transaction_id, notification['transaction_id'])
+        self.assertEqual(payment_notification.order_number, self.basket.order_number)
+        self.assertEqual(payment_notification.status, PaymentNotification.PENDING)
+        self.assertEqual(payment_notification.notification, notification)
+        self.assertFalse(Order.objects.filter(basket=self.basket).exists())
+
+    @ddt.data('DECLINE', 'ERROR')
+    def test_queue_skipped_for_unaccepted_notifications(self, decision):
+        """ Verify notifications for payments that were not accepted are handled synchronously. """
+        toggle_switch(CYBERSOURCE_NOTIFICATION_QUEUE_SWITCH, True)
+        notification = self.generate_notification(self.basket, decision=decision, billing_address=self.billing_address)
+
+        self.client.post(self.path, notification)
+        self.assertFalse(PaymentNotification.objects.exists())
+
+    def test_queue_skipped_for_invalid_signature(self):
+        """ Verify notifications with invalid signatures are never queued. """
+        toggle_switch(CYBERSOURCE_NOTIFICATION_QUEUE_SWITCH, True)
+        notification = self.generate_notification(self.basket, billing_address=self.billing_address)
+        notification['signature'] = 'Tampered'
+
+        response = self.client.post(self.path, notification)
+        self.assertRedirects(response, self.get_full_url(reverse('payment_error')))
+        self.assertFalse(PaymentNotification.objects.exists())
+
 
 class ApplePayMerchantDomainAssociationViewTests(LoginMixin, TestCase):
     url = reverse('apple_pay_domain_association')
@@ -5,16 +5,25 @@ from urllib import urlencode
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 from oscar.core.loading import get_model
 
+from ecommerce.core.circuit_breaker import CircuitBreaker
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.utils import get_cache_key
 from ecommerce.extensions.analytics.utils import parse_tracking_context
 from ecommerce.extensions.payment.models import SDNCheckFailure
 
 logger = logging.getLogger(__name__)
 Basket = get_model('basket', 'Basket')
 
+embargo_circuit_breaker = CircuitBreaker(
+    'embargo_api',
+    settings.EMBARGO_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    settings.EMBARGO_CIRCUIT_BREAKER_RESET_TIMEOUT
+)
+
 
 def middle_truncate(string, chars):
     """Truncate the provided string, if necessary.
@@ -68,11 +77,30 @@ def clean_field_value(value):
     return re.sub(r'[\^:"\']', '', value)
 
 
+def get_embargo_decision_cache_key(user, site, ip, course_ids):
+    return get_cache_key(
+        site_domain=site.domain,
+        resource='embargo_decision',
+        username=user.username,
+        ip=ip,
+        course_ids=','.join(sorted(course_ids))
+    )
+
+
 def embargo_check(user, site, products):
     """ Checks if the user has access to purchase products by calling the LMS embargo API.
 
+    Decisions only depend on the user, their IP address, and the courses, so they are cached. Baskets are allowed
+    for ``settings.EMBARGO_ALLOWED_CACHE_TIMEOUT`` seconds, and blocked for ``settings.EMBARGO_DENIED_CACHE_TIMEOUT``
+    seconds. A user with access to several courses has access to each one of them, so allowed decisions are also
+    cached for each course, and a basket is allowed without calling the API if all of its courses are.
+
+    Failed calls are counted by a circuit breaker. While the LMS is degraded, the API is not called, and purchases
+    are allowed.
+
     Args:
-        request (object): The current request
+        user (User): The user purchasing the products.
+        site (Site): The site on which the products are purchased.
         products (list): A list of products to check access against
 
     Returns:
@@ -86,21 +114,48 @@ def embargo_check(user, site, products):
         if product.get_product_class().name == SEAT_PRODUCT_CLASS_NAME:
             courses.append(product.course.id)
 
-    if courses:
-        params = {
-            'user': user,
-            'ip_address': ip,
-            'course_ids': courses
-        }
+    if not courses:
+        return True
 
-        try:
-            response = site.siteconfiguration.embargo_api_client.course_access.get(**params)
-            return response.get('access', True)
-        except:  # pylint: disable=bare-except
-            # We are going to allow purchase if the API is un-reachable.
-            pass
+    cache_key = get_embargo_decision_cache_key(user, site, ip, courses)
+    course_cache_keys = [get_embargo_decision_cache_key(user, site, ip, [course]) for course in courses]
+    decisions = cache.get_many([cache_key] + course_cache_keys)
+
+    if cache_key in decisions:
+        return decisions[cache_key]
+
+    if all(decisions.get(course_cache_key) for course_cache_key in course_cache_keys):
+        return True
+
+    if embargo_circuit_breaker.is_open():
+        logger.info('Skipped the embargo check for user [%s], the embargo API is unavailable.', user.username)
+        return True
+
+    params = {
+        'user': user,
+        'ip_address': ip,
+        'course_ids': courses
+    }
+
+    try:
+        response = site.siteconfiguration.embargo_api_client.course_access.get(**params)
+    except:  # pylint: disable=bare-except
+        # We are going to allow purchase if the API is un-reachable.
+        embargo_circuit_breaker.record_failure()
+        return True
+
+    embargo_circuit_breaker.record_success()
+    access = response.get('access', True)
+
+    if access:
+        cache.set_many(
+            {key: True for key in [cache_key] + course_cache_keys},
+            settings.EMBARGO_ALLOWED_CACHE_TIMEOUT
+        )
+    else:
+        cache.set(cache_key, False, settings.EMBARGO_DENIED_CACHE_TIMEOUT)
 
-    return True
+    return access
 
 
 class SDNClient(object):
@@ -4,6 +4,7 @@ import logging
 
 import requests
 import six
+import waffle
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ObjectDoesNotExist
@@ -28,8 +29,10 @@ from rest_framework.views import APIView
 from ecommerce.extensions.api.serializers import OrderSerializer
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
+from ecommerce.extensions.payment.constants import CYBERSOURCE_NOTIFICATION_QUEUE_SWITCH
 from ecommerce.extensions.payment.exceptions import DuplicateReferenceNumber, InvalidBasketError, InvalidSignatureError
 from ecommerce.extensions.payment.forms import PaymentForm
+from ecommerce.extensions.payment.helpers import get_processor
 from ecommerce.extensions.payment.processors.cybersource import Cybersource
 from ecommerce.extensions.payment.utils import clean_field_value
 
@@ -43,12 +46,13 @@ NoShippingRequired = get_class('shipping.methods', 'NoShippingRequired')
 Order = get_model('order', 'Order')
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 OrderTotalCalculator = get_class('checkout.calculators', 'OrderTotalCalculator')
+PaymentNotification = get_model('payment', 'PaymentNotification')
 
 
 class CyberSourceProcessorMixin(object):
     @cached_property
     def payment_processor(self):
-        return Cybersource(self.request.site)
+        return get_processor(self.request.site, Cybersource.NAME)
 
 
 class OrderCreationMixin(EdxOrderPlacementMixin):
@@ -170,7 +174,7 @@ class CybersourceSubmitView(FormView):
         for source, destination in six.iteritems(self.FIELD_MAPPINGS):
             extra_parameters[destination] = clean_field_value(data[source])
 
-        parameters = Cybersource(self.request.site).get_transaction_parameters(
+        parameters = get_processor(self.request.site, Cybersource.NAME).get_transaction_parameters(
             basket,
             use_client_side_checkout=True,
             extra_parameters=extra_parameters
@@ -314,14 +318,73 @@ class CybersourceNotificationMixin(CyberSourceProcessorMixin, OrderCreationMixin
 
         return basket
 
+    def should_queue_notification(self, notification):
+        """
+        Determine if the notification should be queued for asynchronous order placement.
+
+        Only authentic notifications of accepted payments are queued. Everything else is handled synchronously,
+        so that learners can be told right away that their payment did not go through.
+        """
+        return (
+            waffle.switch_is_active(CYBERSOURCE_NOTIFICATION_QUEUE_SWITCH) and
+            bool(notification.get('transaction_id')) and
+            notification.get('decision', '').lower() == 'accept' and
+            self.payment_processor.is_signature_valid(notification)
+        )
+
+    def queue_notification(self, notification):
+        """
+        Durably record the notification so that an order can be placed for it by the
+        `process_payment_notifications` management command.
+
+        Notifications are deduplicated by transaction ID; replays of a queued notification are ignored.
+
+        Returns:
+            PaymentNotification
+        """
+        transaction_id = notification['transaction_id']
+        order_number = notification.get('req_reference_number')
+
+        payment_notification, created = PaymentNotification.objects.get_or_create(
+            processor_name=self.payment_processor.NAME,
+            transaction_id=transaction_id,
+            defaults={
+                'order_number': order_number,
+                'site': self.request.site,
+                'notification': notification,
+            }
+        )
+
+        if created:
+            logger.info(
+                'Queued CyberSource payment notification for transaction [%s], associated with order [%s].',
+                transaction_id,
+                order_number
+            )
+        else:
+            logger.info(
+                'Ignored duplicate CyberSource payment notification for transaction [%s], associated with order [%s].',
+                transaction_id,
+                order_number
+            )
+
+        return payment_notification
+
 
 class CybersourceInterstitialView(CybersourceNotificationMixin, View):
     """ Interstitial view for Cybersource Payments. """
 
     def post(self, request, *args, **kwargs):  # pylint: disable=unused-argument
         """Process a CyberSource merchant notification and place an order for paid products as appropriate."""
+        notification = request.POST.dict()
+
+        if self.should_queue_notification(notification):
+            # The order will be placed asynchronously. The receipt page displays a
+            # pending message until that happens.
+            self.queue_notification(notification)
+            return self.redirect_to_receipt_page(notification)
+
         try:
-            notification = request.POST.dict()
             basket = self.validate_notification(notification)
         except DuplicateReferenceNumber:
             # CyberSource has told us that they've declined an attempt to pay
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from oscar.core.loading import get_model
 
+QueuedRefund = get_model('refund', 'QueuedRefund')
 Refund = get_model('refund', 'Refund')
 RefundLine = get_model('refund', 'RefundLine')
 
@@ -21,3 +22,13 @@ class RefundAdmin(admin.ModelAdmin):
     fields = ('order', 'user', 'status', 'total_credit_excl_tax', 'currency', 'created', 'modified',)
     readonly_fields = ('order', 'user', 'total_credit_excl_tax', 'currency', 'created', 'modified',)
     inlines = (RefundLineInline,)
+
+
+@admin.register(QueuedRefund)
+class QueuedRefundAdmin(admin.ModelAdmin):
+    list_display = ('id', 'refund', 'action', 'status', 'requested_by', 'created', 'modified',)
+    list_filter = ('action', 'status',)
+    show_full_result_count = False
+
+    fields = ('refund', 'action', 'status', 'requested_by', 'created', 'modified',)
+    readonly_fields = ('refund', 'action', 'requested_by', 'created', 'modified',)
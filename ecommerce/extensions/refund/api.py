@@ -1,7 +1,23 @@
+import logging
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.timezone import now
 from oscar.core.loading import get_model
+from threadlocals.threadlocals import get_current_request
 
+from ecommerce.core.utils import current_site, map_concurrently
 from ecommerce.extensions.fulfillment.status import ORDER
 
+logger = logging.getLogger(__name__)
+
+APPROVE = 'approve'
+APPROVE_PAYMENT_ONLY = 'approve_payment_only'
+DENY = 'deny'
+REFUND_ACTIONS = (APPROVE, APPROVE_PAYMENT_ONLY, DENY,)
+
+Line = get_model('order', 'Line')
+QueuedRefund = get_model('refund', 'QueuedRefund')
 Refund = get_model('refund', 'Refund')
 RefundLine = get_model('refund', 'RefundLine')
 
@@ -24,14 +40,11 @@ def find_orders_associated_with_course(user, course_id):
     if not course_id or not course_id.strip():
         raise ValueError('"{}" is not a valid course ID.'.format(course_id))
 
-    # If the user has no orders, we cannot possibly return a list of orders eligible for refund.
-    if not user.orders.exists():
-        return []
-
-    # Find all complete orders associated with the course.
+    # Find all complete orders associated with the course. Orders with multiple lines for the course are joined
+    # once per line, hence the call to distinct().
     orders = user.orders.filter(status=ORDER.COMPLETE,
                                 lines__product__attribute_values__attribute__code='course_key',
-                                lines__product__attribute_values__value_text=course_id)
+                                lines__product__attribute_values__value_text=course_id).distinct()
 
     return list(orders)
 
@@ -48,15 +61,192 @@ def create_refunds(orders, course_id):
         list: refunds created
     """
     refunds = []
+    orders = list(orders)
+
+    # Find the lines, of all orders, associated with the course and not refunded.
+    lines_by_order = {}
+    lines = Line.objects.filter(order__in=orders,
+                                refund_lines__id__isnull=True,
+                                product__attribute_values__attribute__code='course_key',
+                                product__attribute_values__value_text=course_id).order_by('id')
+    for line in lines:
+        lines_by_order.setdefault(line.order_id, []).append(line)
 
     for order in orders:
-        # Find lines associated with the course and not refunded.
-        lines = order.lines.filter(refund_lines__id__isnull=True,
-                                   product__attribute_values__attribute__code='course_key',
-                                   product__attribute_values__value_text=course_id)
+        order_lines = lines_by_order.get(order.id)
+        if not order_lines:
+            continue
 
-        refund = Refund.create_with_lines(order, lines)
+        refund = Refund.create_with_lines(order, order_lines)
         if refund is not None:
             refunds.append(refund)
 
     return refunds
+
+
+def process_refund(refund, action):
+    """
+    Approves, or denies, a single refund.
+
+    Arguments:
+        refund (Refund): refund to be processed
+        action (str): one of approve, approve_payment_only, or deny
+
+    Returns:
+        bool: True if the refund was processed successfully; otherwise, False.
+    """
+    if action in (APPROVE, APPROVE_PAYMENT_ONLY):
+        return refund.approve(revoke_fulfillment=action == APPROVE)
+    elif action == DENY:
+        return refund.deny()
+
+    raise ValueError('The action [{}] is not valid.'.format(action))
+
+
+def _process_refund_in_site(refund, action):
+    """ Processes the refund within a request for the site of its order, if no request is being handled. """
+    if get_current_request() is not None:
+        return process_refund(refund, action)
+
+    # Worker threads, and management commands, have no request. Revoking fulfillment, and issuing credits, build
+    # URLs, and read configuration, from the site of the current request.
+    with current_site(refund.order.site):
+        return process_refund(refund, action)
+
+
+def _process_refund_by_id(refund_id, action):
+    """ Processes the refund with the given ID, and summarizes the result. """
+    result = {'id': refund_id, 'success': False, 'status': None}
+
+    try:
+        refund = Refund.objects.select_related('order__site').get(id=refund_id)
+        result['success'] = bool(_process_refund_in_site(refund, action))
+        result['status'] = refund.status
+    except Refund.DoesNotExist:
+        logger.warning('Unable to %s refund [%d]. The refund does not exist.', action, refund_id)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('Failed to %s refund [%d].', action, refund_id)
+        result['status'] = Refund.objects.filter(id=refund_id).values_list('status', flat=True).first()
+
+    return result
+
+
+def _get_processor_name(refund):
+    # NOTE: Update this if we ever support multiple payment sources for a single order.
+    sources = refund.order.sources.all()
+    return sources[0].source_type.name if sources else None
+
+
+def process_refunds(refund_ids, action, max_workers=None):
+    """
+    Approves, or denies, many refunds.
+
+    Refunds are grouped by the payment processor used to pay for their orders. The refunds in each group are processed
+    concurrently by at most `max_workers` threads, so that no processor receives more than `max_workers` credit
+    requests at a time. Each refund is processed with the same status transitions as a single refund.
+
+    Arguments:
+        refund_ids (list): IDs of the refunds to be processed
+        action (str): one of approve, approve_payment_only, or deny
+        max_workers (int): maximum number of refunds processed concurrently for each payment processor. Defaults to
+            the REFUND_PROCESSING_MAX_WORKERS setting.
+
+    Returns:
+        list: one dict per refund, in the order of the given IDs, with the refund's ID, final status, and a boolean
+            indicating if the refund was processed successfully. Unknown refunds have a status of None.
+    """
+    if action not in REFUND_ACTIONS:
+        raise ValueError('The action [{}] is not valid.'.format(action))
+
+    max_workers = max_workers or settings.REFUND_PROCESSING_MAX_WORKERS
+    refund_ids = list(OrderedDict.fromkeys(refund_ids))
+    refunds = Refund.objects.filter(id__in=refund_ids).prefetch_related('order__sources__source_type')
+
+    groups = {}
+    for refund in refunds:
+        groups.setdefault(_get_processor_name(refund), []).append(refund.id)
+
+    def process_group(group):
+        return map_concurrently(lambda refund_id: _process_refund_by_id(refund_id, action), group, max_workers)
+
+    results = {refund_id: {'id': refund_id, 'success': False, 'status': None} for refund_id in refund_ids}
+    group_workers = len(groups) if max_workers > 1 else 1
+    for group_results in map_concurrently(process_group, groups.values(), group_workers):
+        for result in group_results:
+            results[result['id']] = result
+
+    return [results[refund_id] for refund_id in refund_ids]
+
+
+def queue_refunds(refund_ids, action, user=None):
+    """
+    Queues many refunds to be approved, or denied, by the process_refunds command.
+
+    Arguments:
+        refund_ids (list): IDs of the refunds to be processed
+        action (str): one of approve, approve_payment_only, or deny
+        user (User): user requesting the refunds be processed
+
+    Returns:
+        list: IDs of the queued refunds, in the given order. Unknown refunds are not queued.
+    """
+    if action not in REFUND_ACTIONS:
+        raise ValueError('The action [{}] is not valid.'.format(action))
+
+    refund_ids = list(OrderedDict.fromkeys(refund_ids))
+    existing_ids = set(Refund.objects.filter(id__in=refund_ids).values_list('id', flat=True))
+    refund_ids = [refund_id for refund_id in refund_ids if refund_id in existing_ids]
+
+    QueuedRefund.objects.bulk_create(
+        [QueuedRefund(refund_id=refund_id, action=action, requested_by=user) for refund_id in refund_ids]
+    )
+    return refund_ids
+
+
+def process_queued_refunds(batch_size, max_batches=None, max_workers=None):
+    """
+    Approves, or denies, queued refunds, in batches of at most `batch_size` refunds.
+
+    Each queued refund is claimed before it is processed so that concurrently-running commands do not process the
+    same refund twice. Refunds whose worker stopped before finishing them are claimed again after
+    REFUND_QUEUE_PROCESSING_TIMEOUT seconds.
+
+    Returns:
+        list: one dict per processed refund, as returned by process_refunds.
+    """
+    results = []
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        queued_refunds = list(QueuedRefund.objects.claimable().order_by('id')[:batch_size])
+        if not queued_refunds:
+            break
+
+        claimed_by_action = OrderedDict()
+        for queued_refund in queued_refunds:
+            # The conditions of claimable refunds are checked again by the update, so that only one of the workers
+            # racing to claim a refund succeeds.
+            claimed = QueuedRefund.objects.claimable().filter(id=queued_refund.id).update(
+                status=QueuedRefund.PROCESSING,
+                modified=now()
+            )
+            if claimed:
+                claimed_by_action.setdefault(queued_refund.action, []).append(queued_refund)
+
+        for action, claimed_refunds in claimed_by_action.items():
+            action_results = process_refunds(
+                [queued_refund.refund_id for queued_refund in claimed_refunds], action, max_workers=max_workers
+            )
+            succeeded = {result['id'] for result in action_results if result['success']}
+
+            for queued_refund in claimed_refunds:
+                queued_refund.status = (
+                    QueuedRefund.PROCESSED if queued_refund.refund_id in succeeded else QueuedRefund.FAILED
+                )
+                queued_refund.save(update_fields=['status', 'modified'])
+
+            results += action_results
+
+        batches += 1
+
+    return results
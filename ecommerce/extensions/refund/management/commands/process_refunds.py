@@ -0,0 +1,105 @@
+"""
+This command approves, or denies, refunds in bulk.
+
+Refunds are either specified as arguments, or, with the --queued option, read from the queue of refunds filled by the
+bulk processing endpoint for requests too large to be processed while the request is handled.
+"""
+from __future__ import unicode_literals
+
+import logging
+import os
+
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.extensions.refund.api import APPROVE, REFUND_ACTIONS, process_queued_refunds, process_refunds
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Approve, or deny, refunds in bulk."""
+
+    help = 'Approve, or deny, refunds in bulk. Refunds are processed concurrently for each payment processor.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('refund_ids',
+                            nargs='*',
+                            type=int,
+                            help='IDs of the refunds to process.')
+        parser.add_argument('--refund_ids_file',
+                            action='store',
+                            dest='refund_ids_file',
+                            default=None,
+                            help='Path to file to read refund IDs from, one per line.')
+        parser.add_argument('--action',
+                            action='store',
+                            dest='action',
+                            default=APPROVE,
+                            choices=REFUND_ACTIONS,
+                            help='Action to take for each refund.')
+        parser.add_argument('--max_workers',
+                            action='store',
+                            dest='max_workers',
+                            default=None,
+                            type=int,
+                            help='Maximum number of refunds processed concurrently for each payment processor.')
+        parser.add_argument('--queued',
+                            action='store_true',
+                            dest='queued',
+                            default=False,
+                            help='Process the queued refunds, rather than the specified refunds.')
+        parser.add_argument('--batch_size',
+                            action='store',
+                            dest='batch_size',
+                            default=100,
+                            type=int,
+                            help='Number of queued refunds to process in each batch.')
+        parser.add_argument('--max_batches',
+                            action='store',
+                            dest='max_batches',
+                            default=None,
+                            type=int,
+                            help='Maximum number of batches of queued refunds to process. By default, the queue is '
+                                 'drained.')
+
+    def handle(self, *args, **options):
+        if options['queued']:
+            logger.info('Processing queued refunds.')
+            results = process_queued_refunds(
+                options['batch_size'], max_batches=options['max_batches'], max_workers=options['max_workers']
+            )
+            self.log_results(results)
+            return
+
+        refund_ids = list(options['refund_ids'])
+        refund_ids_file = options['refund_ids_file']
+
+        if refund_ids_file:
+            if not os.path.exists(refund_ids_file):
+                raise CommandError('Pass the correct absolute path to refund ids file as --refund_ids_file argument.')
+
+            with open(refund_ids_file, 'r') as file_handler:
+                refund_ids += [int(line) for line in file_handler if line.strip()]
+
+        if not refund_ids:
+            raise CommandError('No refund IDs were specified.')
+
+        action = options['action']
+        logger.info('Processing [%d] refunds with action [%s].', len(refund_ids), action)
+
+        results = process_refunds(refund_ids, action, max_workers=options['max_workers'])
+        self.log_results(results)
+
+    def log_results(self, results):
+        failed = 0
+        for result in results:
+            if result['success']:
+                logger.info('Refund [%d] was processed. Its status is [%s].', result['id'], result['status'])
+            else:
+                failed += 1
+                logger.error('Failed to process refund [%d]. Its status is [%s].', result['id'], result['status'])
+
+        if failed:
+            logger.error('Completed processing refunds. %d of %d failed.', failed, len(results))
+        else:
+            logger.info('All %d refunds successfully processed.', len(results))
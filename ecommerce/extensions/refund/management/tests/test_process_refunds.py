@@ -0,0 +1,59 @@
+from __future__ import unicode_literals
+
+import tempfile
+
+import mock
+from django.core.management import CommandError, call_command
+
+from ecommerce.extensions.refund.status import REFUND
+from ecommerce.extensions.refund.tests.factories import RefundFactory
+from ecommerce.tests.testcases import TestCase
+
+
+class ProcessRefundsTests(TestCase):
+    command = 'process_refunds'
+
+    def setUp(self):
+        super(ProcessRefundsTests, self).setUp()
+        self.refunds = RefundFactory.create_batch(2)
+        self.refund_ids = [refund.id for refund in self.refunds]
+
+    def assert_statuses(self, expected):
+        for refund in self.refunds:
+            refund.refresh_from_db()
+            self.assertEqual(refund.status, expected)
+
+    def test_no_refund_ids(self):
+        """ Verify an error is raised if no refund IDs are specified. """
+        with self.assertRaisesMessage(CommandError, 'No refund IDs were specified.'):
+            call_command(self.command)
+
+    def test_missing_refund_ids_file(self):
+        """ Verify an error is raised if the refund IDs file does not exist. """
+        with self.assertRaises(CommandError):
+            call_command(self.command, refund_ids_file='/tmp/does-not-exist.txt')
+
+    def test_deny(self):
+        """ Verify the refunds specified as arguments are denied. """
+        call_command(self.command, *[str(refund_id) for refund_id in self.refund_ids], action='deny')
+        self.assert_statuses(REFUND.DENIED)
+
+    def test_refund_ids_file(self):
+        """ Verify the refunds listed in the file are processed. """
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt') as refund_ids_file:
+            refund_ids_file.write('\n'.join(str(refund_id) for refund_id in self.refund_ids))
+            refund_ids_file.flush()
+
+            with mock.patch('ecommerce.extensions.refund.management.commands.process_refunds.process_refunds',
+                            return_value=[]) as mock_process_refunds:
+                call_command(self.command, refund_ids_file=refund_ids_file.name, max_workers=2)
+
+        mock_process_refunds.assert_called_once_with(self.refund_ids, 'approve', max_workers=2)
+
+    def test_queued(self):
+        """ Verify the queued refunds are processed, rather than the specified refunds. """
+        with mock.patch('ecommerce.extensions.refund.management.commands.process_refunds.process_queued_refunds',
+                        return_value=[]) as mock_process_queued_refunds:
+            call_command(self.command, queued=True, batch_size=10, max_batches=2)
+
+        mock_process_queued_refunds.assert_called_once_with(10, max_batches=2, max_workers=None)
@@ -1,9 +1,11 @@
 from __future__ import unicode_literals
 
+import datetime
 import logging
 
 from django.conf import settings
 from django.db import models
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from ecommerce_worker.sailthru.v1.tasks import send_course_refund_email
@@ -17,7 +19,7 @@ from ecommerce.extensions.analytics.utils import audit_log
 from ecommerce.extensions.checkout.utils import format_currency, get_receipt_page_url
 from ecommerce.extensions.fulfillment.api import revoke_fulfillment_for_refund
 from ecommerce.extensions.order.constants import PaymentEventTypeName
-from ecommerce.extensions.payment.helpers import get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import get_processor
 from ecommerce.extensions.refund.exceptions import InvalidStatus
 from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
 
@@ -28,6 +30,40 @@ PaymentEventType = get_model('order', 'PaymentEventType')
 post_refund = get_class('refund.signals', 'post_refund')
 
 
+def create_historical_records(instances, history_type):
+    """Bulk-creates django-simple-history records for instances saved without signals (e.g. via bulk_create).
+
+    Arguments:
+        instances (iterable): Saved instances of a single model with ``HistoricalRecords``.
+        history_type (str): One of '+' (created), '~' (changed), or '-' (deleted).
+    """
+    history_date = now()
+    history_user = None
+    try:
+        if HistoricalRecords.thread.request.user.is_authenticated():
+            history_user = HistoricalRecords.thread.request.user
+    except AttributeError:
+        pass
+
+    records = []
+    for instance in instances:
+        # django-simple-history 1.8 has no public API to build historical records without saving them, so the fields
+        # are copied from the instance as HistoricalRecords.create_historical_record() does.
+        fields = {
+            field.attname: getattr(instance, field.attname)
+            for field in instance._meta.fields  # pylint: disable=protected-access
+        }
+        records.append(instance.history.model(
+            history_date=history_date,
+            history_type=history_type,
+            history_user=history_user,
+            **fields
+        ))
+
+    if records:
+        records[0].__class__.objects.bulk_create(records)
+
+
 class StatusMixin(object):
     pipeline_setting = None
 
@@ -105,7 +141,15 @@ class Refund(StatusMixin, TimeStampedModel):
             None: If no unrefunded order lines have been provided.
             Refund: With RefundLines corresponding to each given unrefunded order line.
         """
-        unrefunded_lines = [line for line in lines if not line.refund_lines.exclude(status=REFUND_LINE.DENIED).exists()]
+        lines = list(lines)
+        refunded_line_ids = set(
+            RefundLine.objects.filter(
+                order_line__in=lines
+            ).exclude(
+                status=REFUND_LINE.DENIED
+            ).values_list('order_line_id', flat=True)
+        )
+        unrefunded_lines = [line for line in lines if line.id not in refunded_line_ids]
 
         if unrefunded_lines:
             status = getattr(settings, 'OSCAR_INITIAL_REFUND_STATUS', REFUND.OPEN)
@@ -127,14 +171,19 @@ class Refund(StatusMixin, TimeStampedModel):
             )
 
             status = getattr(settings, 'OSCAR_INITIAL_REFUND_LINE_STATUS', REFUND_LINE.OPEN)
-            for line in unrefunded_lines:
-                RefundLine.objects.create(
+            RefundLine.objects.bulk_create([
+                RefundLine(
                     refund=refund,
                     order_line=line,
                     line_credit_excl_tax=line.line_price_excl_tax,
                     quantity=line.quantity,
                     status=status
-                )
+                ) for line in unrefunded_lines
+            ])
+
+            # bulk_create() does not send the post_save signal used to record history. Not all databases return the
+            # IDs of bulk-created rows, so the new lines are read back before their history is recorded.
+            create_historical_records(refund.lines.all(), '+')
 
             if total_credit_excl_tax == 0:
                 refund.approve(notify_purchaser=False)
@@ -164,7 +213,7 @@ class Refund(StatusMixin, TimeStampedModel):
         try:
             # NOTE: Update this if we ever support multiple payment sources for a single order.
             source = self.order.sources.first()
-            processor = get_processor_class_by_name(source.source_type.name)(self.order.site)
+            processor = get_processor(self.order.site, source.source_type.name)
             amount = self.total_credit_excl_tax
 
             refund_reference_number = processor.issue_credit(self.order, source.reference, amount, self.currency)
@@ -315,3 +364,45 @@ class RefundLine(StatusMixin, TimeStampedModel):
     def deny(self):
         self.set_status(REFUND_LINE.DENIED)
         return True
+
+
+class QueuedRefundQuerySet(models.QuerySet):
+    def claimable(self):
+        """
+        Returns the queued refunds a worker may claim: pending refunds, and refunds whose worker stopped before
+        finishing them.
+        """
+        stale_before = now() - datetime.timedelta(seconds=settings.REFUND_QUEUE_PROCESSING_TIMEOUT)
+        return self.filter(
+            models.Q(status=QueuedRefund.PENDING) |
+            models.Q(status=QueuedRefund.PROCESSING, modified__lt=stale_before)
+        )
+
+
+class QueuedRefund(TimeStampedModel):
+    """ Refund queued, by the bulk processing endpoint, to be approved or denied by the process_refunds command. """
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    PROCESSED = 'processed'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (PROCESSING, _('Processing')),
+        (PROCESSED, _('Processed')),
+        (FAILED, _('Failed')),
+    )
+
+    refund = models.ForeignKey(
+        'refund.Refund', related_name='queued_actions', verbose_name=_('Refund'), on_delete=models.CASCADE
+    )
+    action = models.CharField(max_length=32, verbose_name=_('Action'))
+    requested_by = models.ForeignKey(
+        'core.User', null=True, blank=True, verbose_name=_('Requested By'), on_delete=models.SET_NULL
+    )
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+
+    objects = QueuedRefundQuerySet.as_manager()
+
+    class Meta(object):
+        verbose_name = _('Queued Refund')
+        verbose_name_plural = _('Queued Refunds')
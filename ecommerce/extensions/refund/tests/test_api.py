@@ -1,16 +1,34 @@
+import datetime
+import threading
+from multiprocessing.pool import ThreadPool
+
 import ddt
+import httpretty
+import mock
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
 from oscar.core.loading import get_model
 from oscar.test.newfactories import UserFactory
+from threadlocals.threadlocals import set_thread_variable
 
+from ecommerce.core.url_utils import get_lms_enrollment_api_url
 from ecommerce.extensions.fulfillment.status import ORDER
-from ecommerce.extensions.refund.api import create_refunds, find_orders_associated_with_course
+from ecommerce.extensions.payment.tests.processors import DummyProcessor
+from ecommerce.extensions.refund.api import (
+    _process_refund_by_id, create_refunds, find_orders_associated_with_course, process_queued_refunds, process_refunds,
+    queue_refunds
+)
+from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
 from ecommerce.extensions.refund.tests.factories import RefundLineFactory
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
 from ecommerce.tests.testcases import TestCase
 
 ProductAttribute = get_model("catalogue", "ProductAttribute")
 ProductClass = get_model("catalogue", "ProductClass")
+QueuedRefund = get_model('refund', 'QueuedRefund')
 Refund = get_model('refund', 'Refund')
 
 OSCAR_INITIAL_REFUND_STATUS = 'REFUND_OPEN'
@@ -77,3 +95,192 @@ class ApiTests(RefundTestMixin, TestCase):
 
         actual = create_refunds([order], self.course.id)
         self.assertEqual(actual, [])
+
+    def test_create_refunds_num_queries(self):
+        """ The number of queries executed should not depend on the number of lines being refunded. """
+        query_counts = []
+
+        for multiple_lines in (False, True):
+            order = self.create_order(user=UserFactory(), multiple_lines=multiple_lines)
+            orders = find_orders_associated_with_course(order.user, self.course.id)
+
+            with CaptureQueriesContext(connection) as context:
+                refunds = create_refunds(orders, self.course.id)
+
+            self.assertEqual(refunds[0].lines.count(), order.lines.count())
+            query_counts.append(len(context.captured_queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+
+@override_settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor'])
+class ProcessRefundsTests(RefundTestMixin, TestCase):
+    def test_process_refunds(self):
+        """ Verify each refund is approved, and a summary of each refund is returned in the order of the given IDs. """
+        refunds = [self.create_refund() for __ in range(3)]
+        refund_ids = [refund.id for refund in reversed(refunds)]
+
+        with mock.patch('ecommerce.extensions.refund.models.revoke_fulfillment_for_refund', return_value=True):
+            results = process_refunds(refund_ids + refund_ids[:1], 'approve')
+
+        self.assertEqual(
+            results,
+            [{'id': refund_id, 'success': True, 'status': REFUND.COMPLETE} for refund_id in refund_ids]
+        )
+
+    def test_process_refunds_invalid_action(self):
+        """ Verify ValueError is raised if the action is invalid. """
+        self.assertRaises(ValueError, process_refunds, [1], 'reject')
+
+    def test_process_refunds_concurrently(self):
+        """ Verify refunds are grouped by payment processor, and each group is processed by a bounded thread pool. """
+        dummy_refunds = [self.create_refund() for __ in range(3)]
+        other_refund = self.create_refund(processor_name='other')
+        refund_ids = [refund.id for refund in dummy_refunds + [other_refund]]
+
+        def process_refund_by_id(refund_id, action):
+            return {'id': refund_id, 'success': action == 'approve', 'status': REFUND.COMPLETE}
+
+        with mock.patch('ecommerce.core.utils.ThreadPool', wraps=ThreadPool) as mock_pool:
+            with mock.patch('ecommerce.extensions.refund.api._process_refund_by_id',
+                            side_effect=process_refund_by_id):
+                results = process_refunds(refund_ids, 'approve', max_workers=2)
+
+        # One thread per processor, and at most two threads for the refunds of the dummy processor. The single
+        # refund of the other processor is processed by the thread of its group.
+        self.assertEqual([call[0][0] for call in mock_pool.call_args_list], [2, 2])
+        self.assertEqual(
+            results,
+            [{'id': refund_id, 'success': True, 'status': REFUND.COMPLETE} for refund_id in refund_ids]
+        )
+
+    def test_process_refunds_with_dummy_processor(self):
+        """ Verify credits are issued via the payment processor of each order. """
+        refund = self.create_refund(processor_name=DummyProcessor.NAME)
+
+        with mock.patch.object(DummyProcessor, 'issue_credit', return_value='refund-1') as mock_issue_credit:
+            results = process_refunds([refund.id], 'approve_payment_only')
+
+        self.assertTrue(mock_issue_credit.called)
+        self.assertEqual(results, [{'id': refund.id, 'success': True, 'status': REFUND.COMPLETE}])
+
+    def test_process_refunds_without_request(self):
+        """ Verify refunds processed outside of requests are processed within a request for the site of their order. """
+        refund = self.create_refund()
+        set_thread_variable('request', None)
+
+        def revoke_fulfillment_for_refund(refund):
+            self.assertEqual(get_lms_enrollment_api_url(), refund.order.site.siteconfiguration.build_lms_url(
+                '/api/enrollment/v1/enrollment'
+            ))
+            return True
+
+        with mock.patch('ecommerce.extensions.refund.models.revoke_fulfillment_for_refund',
+                        side_effect=revoke_fulfillment_for_refund):
+            results = process_refunds([refund.id], 'approve')
+
+        self.assertEqual(results, [{'id': refund.id, 'success': True, 'status': REFUND.COMPLETE}])
+
+
+@override_settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor'])
+class ProcessRefundsConcurrencyTests(RefundTestMixin, TestCase):
+    def process_refunds_with_shared_connection(self, refund_ids, action, max_workers):
+        """
+        Processes refunds with worker threads sharing the database connection of the test, which is the only
+        connection able to read the test's data. Workers take turns using the connection, since a connection cannot
+        be used by multiple threads at once.
+        """
+        test_connection = connections[DEFAULT_DB_ALIAS]
+        lock = threading.Lock()
+
+        def process_refund_by_id(*args):
+            with lock:
+                connections[DEFAULT_DB_ALIAS] = test_connection
+                return _process_refund_by_id(*args)
+
+        test_connection.allow_thread_sharing = True
+        try:
+            with mock.patch('ecommerce.extensions.refund.api._process_refund_by_id', side_effect=process_refund_by_id):
+                return process_refunds(refund_ids, action, max_workers=max_workers)
+        finally:
+            test_connection.allow_thread_sharing = False
+
+    @httpretty.activate
+    def test_process_refunds_revokes_fulfillment(self):
+        """ Verify refunds approved by worker threads revoke the enrollments of their lines with the LMS. """
+        httpretty.register_uri(
+            httpretty.POST, get_lms_enrollment_api_url(), status=200, body='{}', content_type='application/json'
+        )
+        refunds = []
+        for __ in range(3):
+            user = UserFactory()
+            refunds.append(self.create_refund(user=user, order=self.create_order(user=user)))
+        refund_ids = [refund.id for refund in refunds]
+
+        results = self.process_refunds_with_shared_connection(refund_ids, 'approve', max_workers=2)
+
+        self.assertEqual(
+            results,
+            [{'id': refund_id, 'success': True, 'status': REFUND.COMPLETE} for refund_id in refund_ids]
+        )
+        for refund in refunds:
+            self.assertEqual({line.status for line in refund.lines.all()}, {REFUND_LINE.COMPLETE})
+        self.assertEqual(len(httpretty.httpretty.latest_requests), len(refunds))
+
+
+@override_settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor'])
+class QueuedRefundsTests(RefundTestMixin, TestCase):
+    def setUp(self):
+        super(QueuedRefundsTests, self).setUp()
+        self.refunds = [self.create_refund() for __ in range(3)]
+        self.refund_ids = [refund.id for refund in self.refunds]
+
+    def test_queue_refunds(self):
+        """ Verify each existing refund is queued once. """
+        missing_refund_id = max(self.refund_ids) + 1
+        queued_refund_ids = queue_refunds(self.refund_ids + self.refund_ids[:1] + [missing_refund_id], 'deny')
+
+        self.assertEqual(queued_refund_ids, self.refund_ids)
+        self.assertEqual(
+            list(QueuedRefund.objects.order_by('id').values_list('refund_id', 'action', 'status')),
+            [(refund_id, 'deny', QueuedRefund.PENDING) for refund_id in self.refund_ids]
+        )
+
+    def test_process_queued_refunds(self):
+        """ Verify queued refunds are processed in batches, and marked with the result of their processing. """
+        self.refunds[1].status = REFUND.COMPLETE
+        self.refunds[1].save()
+        queue_refunds(self.refund_ids, 'deny')
+
+        results = process_queued_refunds(batch_size=2)
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(
+            list(QueuedRefund.objects.order_by('id').values_list('status', flat=True)),
+            [QueuedRefund.PROCESSED, QueuedRefund.FAILED, QueuedRefund.PROCESSED]
+        )
+        self.assertEqual(Refund.objects.get(id=self.refund_ids[0]).status, REFUND.DENIED)
+
+    def test_process_queued_refunds_max_batches(self):
+        """ Verify no more than the specified number of batches is processed. """
+        queue_refunds(self.refund_ids, 'deny')
+        process_queued_refunds(batch_size=2, max_batches=1)
+
+        self.assertEqual(
+            list(QueuedRefund.objects.order_by('id').values_list('status', flat=True)),
+            [QueuedRefund.PROCESSED, QueuedRefund.PROCESSED, QueuedRefund.PENDING]
+        )
+
+    def test_claimed_refunds_skipped(self):
+        """ Verify refunds claimed by another worker are only processed once their worker is assumed to be lost. """
+        queue_refunds(self.refund_ids[:1], 'deny')
+        QueuedRefund.objects.update(status=QueuedRefund.PROCESSING)
+
+        self.assertEqual(process_queued_refunds(batch_size=10), [])
+
+        stale = now() - datetime.timedelta(seconds=settings.REFUND_QUEUE_PROCESSING_TIMEOUT + 1)
+        QueuedRefund.objects.update(modified=stale)
+        self.assertEqual(
+            process_queued_refunds(batch_size=10),
+            [{'id': self.refund_ids[0], 'success': True, 'status': REFUND.DENIED}]
+        )
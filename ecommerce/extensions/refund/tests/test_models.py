@@ -105,6 +105,17 @@ class RefundTests(RefundTestMixin, StatusTestsMixin, TestCase):
 
         self.assert_refund_matches_order(refund, order)
 
+    def test_create_with_lines_history(self):
+        """ Refund.create_with_lines should record the creation of each RefundLine, despite bulk-creating them. """
+        order = self.create_order(user=UserFactory(), multiple_lines=True)
+        refund = Refund.create_with_lines(order, order.lines.all())
+
+        for refund_line in refund.lines.all():
+            history = refund_line.history.all()
+            self.assertEqual(len(history), 1)
+            self.assertEqual(history[0].history_type, '+')
+            self.assertEqual(history[0].status, refund_line.status)
+
     def assert_refund_creation_logged(self, l, refund, order):
         """
         Asserts that refund creation is logged.
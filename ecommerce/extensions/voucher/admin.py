@@ -1 +1,15 @@
+from django.contrib import admin
 from oscar.apps.voucher.admin import *  # pylint: disable=unused-import,wildcard-import,unused-wildcard-import
+from oscar.core.loading import get_model
+
+CouponOfferUpdate = get_model('voucher', 'CouponOfferUpdate')
+
+
+@admin.register(CouponOfferUpdate)
+class CouponOfferUpdateAdmin(admin.ModelAdmin):
+    list_display = ('id', 'coupon', 'offer', 'status', 'created', 'modified',)
+    list_filter = ('status',)
+    show_full_result_count = False
+
+    fields = ('coupon', 'offer', 'status', 'created', 'modified',)
+    readonly_fields = ('coupon', 'offer', 'created', 'modified',)
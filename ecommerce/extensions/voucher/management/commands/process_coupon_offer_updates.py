@@ -0,0 +1,37 @@
+"""
+This command replaces the offers of the vouchers of coupons, as queued by the coupon update endpoint for coupons with
+too many vouchers to be updated while the request is handled.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.core.management import BaseCommand
+
+from ecommerce.extensions.voucher.utils import process_coupon_offer_updates
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Process queued coupon offer updates."""
+
+    help = ('Link the vouchers of coupons to the offers queued by coupon updates. Updates interrupted by a restart '
+            'are resumed. This command should be run periodically.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max_updates',
+                            action='store',
+                            dest='max_updates',
+                            default=None,
+                            type=int,
+                            help='Maximum number of updates to process. By default, the queue is drained.')
+
+    def handle(self, *args, **options):
+        logger.info('Processing queued coupon offer updates.')
+        processed, failed = process_coupon_offer_updates(max_updates=options['max_updates'])
+
+        if failed:
+            logger.error('Completed processing coupon offer updates. %d of %d failed.', failed, processed + failed)
+        else:
+            logger.info('All %d coupon offer updates successfully processed.', processed)
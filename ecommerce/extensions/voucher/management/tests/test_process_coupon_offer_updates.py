@@ -0,0 +1,52 @@
+from __future__ import unicode_literals
+
+import mock
+from django.core.management import call_command
+from factory.fuzzy import FuzzyText
+from oscar.core.loading import get_model
+from oscar.test.factories import ConditionalOfferFactory
+from testfixtures import LogCapture
+
+from ecommerce.coupons.tests.mixins import CouponMixin
+from ecommerce.extensions.voucher.utils import queue_coupon_offer_update
+from ecommerce.tests.testcases import TestCase
+
+CouponOfferUpdate = get_model('voucher', 'CouponOfferUpdate')
+
+LOGGER_NAME = 'ecommerce.extensions.voucher.management.commands.process_coupon_offer_updates'
+
+
+class ProcessCouponOfferUpdatesTests(CouponMixin, TestCase):
+    command = 'process_coupon_offer_updates'
+
+    def test_process(self):
+        """ Verify the queued updates are processed, and the results logged. """
+        coupon = self.create_coupon(quantity=2)
+        offer = ConditionalOfferFactory(name=FuzzyText().fuzz())
+        update = queue_coupon_offer_update(coupon, offer)
+
+        with LogCapture(LOGGER_NAME) as logs:
+            call_command(self.command)
+
+        logs.check(
+            (LOGGER_NAME, 'INFO', 'Processing queued coupon offer updates.'),
+            (LOGGER_NAME, 'INFO', 'All 1 coupon offer updates successfully processed.'),
+        )
+        self.assertEqual(CouponOfferUpdate.objects.get(id=update.id).status, CouponOfferUpdate.PROCESSED)
+        for voucher in coupon.attr.coupon_vouchers.vouchers.all():
+            self.assertEqual(list(voucher.offers.all()), [offer])
+
+    def test_max_updates(self):
+        """ Verify at most the given number of updates are processed, and failures are logged. """
+        for __ in range(2):
+            queue_coupon_offer_update(self.create_coupon(quantity=1), ConditionalOfferFactory(name=FuzzyText().fuzz()))
+
+        with mock.patch('ecommerce.extensions.voucher.utils.replace_voucher_offers', side_effect=Exception):
+            with LogCapture(LOGGER_NAME) as logs:
+                call_command(self.command, max_updates=1)
+
+        logs.check(
+            (LOGGER_NAME, 'INFO', 'Processing queued coupon offer updates.'),
+            (LOGGER_NAME, 'ERROR', 'Completed processing coupon offer updates. 1 of 1 failed.'),
+        )
+        self.assertEqual(CouponOfferUpdate.objects.filter(status=CouponOfferUpdate.PENDING).count(), 1)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0024_fix_enrollment_code_slug'),
+        ('voucher', '0004_auto_20160517_0930'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CouponSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offer_id', models.PositiveIntegerField(db_index=True, null=True)),
+                ('range_id', models.PositiveIntegerField(db_index=True, null=True)),
+                ('invoice_id', models.PositiveIntegerField(db_index=True, null=True)),
+                ('benefit_type', models.CharField(max_length=128, null=True)),
+                ('benefit_value', models.DecimalField(decimal_places=2, max_digits=12, null=True)),
+                ('catalog_query', models.TextField(null=True)),
+                ('category_id', models.PositiveIntegerField(null=True)),
+                ('category_name', models.CharField(max_length=255, null=True)),
+                ('client', models.CharField(max_length=255, null=True)),
+                ('code', models.CharField(max_length=128, null=True)),
+                ('course_catalog', models.PositiveIntegerField(null=True)),
+                ('course_seat_types', models.CharField(max_length=255, null=True)),
+                ('email_domains', models.CharField(max_length=255, null=True)),
+                ('end_datetime', models.DateTimeField(null=True)),
+                ('enterprise_customer', models.UUIDField(null=True)),
+                ('is_enrollment_code', models.BooleanField(default=False)),
+                ('last_edited_by', models.CharField(max_length=255, null=True)),
+                ('last_edited', models.DateTimeField(null=True)),
+                ('max_uses', models.PositiveIntegerField(null=True)),
+                ('program_uuid', models.UUIDField(null=True)),
+                ('quantity', models.PositiveIntegerField(default=0)),
+                ('start_datetime', models.DateTimeField(null=True)),
+                ('voucher_type', models.CharField(max_length=128, null=True)),
+                ('coupon', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='coupon_summary', to='catalogue.Product')),
+            ],
+        ),
+    ]
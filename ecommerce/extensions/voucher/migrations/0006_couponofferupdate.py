@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import django.utils.timezone
+import django_extensions.db.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer', '0012_condition_program_uuid'),
+        ('catalogue', '0024_fix_enrollment_code_slug'),
+        ('voucher', '0005_couponsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CouponOfferUpdate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(blank=True, default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(blank=True, default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed')], db_index=True, default='pending', max_length=32)),
+                ('coupon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='offer_updates', to='catalogue.Product', verbose_name='Coupon')),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='coupon_updates', to='offer.ConditionalOffer', verbose_name='Offer')),
+            ],
+            options={
+                'verbose_name': 'Coupon Offer Update',
+                'verbose_name_plural': 'Coupon Offer Updates',
+            },
+        ),
+    ]
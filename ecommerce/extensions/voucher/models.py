@@ -1,7 +1,11 @@
 import datetime
 import logging
 
+from django.conf import settings
 from django.db import models
+from django.utils.timezone import now
+from django.utils.translation import ugettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
 from oscar.apps.voucher.abstract_models import AbstractVoucher  # pylint: disable=ungrouped-imports
 
 from ecommerce.core.utils import log_message_and_raise_validation_error
@@ -19,6 +23,86 @@ class CouponVouchers(models.Model):
     vouchers = models.ManyToManyField('voucher.Voucher', blank=True, related_name='coupon_vouchers')
 
 
+class CouponSummary(models.Model):
+    """
+    Denormalized summary of a coupon, served by the coupon list and detail endpoints.
+
+    Summaries are built from the vouchers, offer, range, category, and invoice of the coupon when they are first
+    read, and deleted by the receivers in ``ecommerce.extensions.voucher.signals`` whenever any of these change.
+    """
+    coupon = models.OneToOneField('catalogue.Product', related_name='coupon_summary', on_delete=models.CASCADE)
+
+    # IDs of the objects the summary is built from, used to find the summaries to delete when they change.
+    offer_id = models.PositiveIntegerField(null=True, db_index=True)
+    range_id = models.PositiveIntegerField(null=True, db_index=True)
+    invoice_id = models.PositiveIntegerField(null=True, db_index=True)
+
+    benefit_type = models.CharField(max_length=128, null=True)
+    benefit_value = models.DecimalField(decimal_places=2, max_digits=12, null=True)
+    catalog_query = models.TextField(null=True)
+    category_id = models.PositiveIntegerField(null=True)
+    category_name = models.CharField(max_length=255, null=True)
+    client = models.CharField(max_length=255, null=True)
+    code = models.CharField(max_length=128, null=True)
+    course_catalog = models.PositiveIntegerField(null=True)
+    course_seat_types = models.CharField(max_length=255, null=True)
+    email_domains = models.CharField(max_length=255, null=True)
+    end_datetime = models.DateTimeField(null=True)
+    enterprise_customer = models.UUIDField(null=True)
+    is_enrollment_code = models.BooleanField(default=False)
+    last_edited_by = models.CharField(max_length=255, null=True)
+    last_edited = models.DateTimeField(null=True)
+    max_uses = models.PositiveIntegerField(null=True)
+    program_uuid = models.UUIDField(null=True)
+    quantity = models.PositiveIntegerField(default=0)
+    start_datetime = models.DateTimeField(null=True)
+    voucher_type = models.CharField(max_length=128, null=True)
+
+
+class CouponOfferUpdateQuerySet(models.QuerySet):
+    def claimable(self):
+        """
+        Returns the updates a worker may claim: pending updates, and updates whose worker stopped before finishing
+        them.
+        """
+        stale_before = now() - datetime.timedelta(seconds=settings.COUPON_OFFER_UPDATE_PROCESSING_TIMEOUT)
+        return self.filter(
+            models.Q(status=CouponOfferUpdate.PENDING) |
+            models.Q(status=CouponOfferUpdate.PROCESSING, modified__lt=stale_before)
+        )
+
+
+class CouponOfferUpdate(TimeStampedModel):
+    """
+    Replacement of the offer of the vouchers of a coupon, queued when a coupon has too many vouchers to be updated
+    while the request is handled, and processed by the process_coupon_offer_updates command.
+    """
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    PROCESSED = 'processed'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (PROCESSING, _('Processing')),
+        (PROCESSED, _('Processed')),
+        (FAILED, _('Failed')),
+    )
+
+    coupon = models.ForeignKey(
+        'catalogue.Product', related_name='offer_updates', verbose_name=_('Coupon'), on_delete=models.CASCADE
+    )
+    offer = models.ForeignKey(
+        'offer.ConditionalOffer', related_name='coupon_updates', verbose_name=_('Offer'), on_delete=models.CASCADE
+    )
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+
+    objects = CouponOfferUpdateQuerySet.as_manager()
+
+    class Meta(object):
+        verbose_name = _('Coupon Offer Update')
+        verbose_name_plural = _('Coupon Offer Updates')
+
+
 class OrderLineVouchers(models.Model):
     line = models.ForeignKey('order.Line', related_name='order_line_vouchers', on_delete=models.CASCADE)
     vouchers = models.ManyToManyField('voucher.Voucher', related_name='order_line_vouchers')
@@ -54,6 +138,37 @@ class Voucher(AbstractVoucher):
                 'Failed to create Voucher. Voucher start and end datetime fields must be type datetime.'
             )
 
+    def record_usage(self, order, user):
+        """
+        Records a usage of this voucher in an order.
+
+        Single-use vouchers record their usage exactly, on their row. The rows of other vouchers, which may be
+        redeemed by many concurrent orders, are not updated. Their counts are reconciled from voucher applications by
+        the reconcile_offer_usage management command.
+        """
+        if user and user.is_authenticated():
+            self.applications.create(voucher=self, order=order, user=user)
+        else:
+            self.applications.create(voucher=self, order=order)
+        self.num_orders += 1
+
+        if self.usage == self.SINGLE_USE:
+            # Only the usage fields are saved, so that the cached snapshot, and coupon summary, of the voucher are kept.
+            self.save(update_fields=['num_orders'])
+    record_usage.alters_data = True
+
+    def record_discount(self, discount):
+        """
+        Record a discount that this voucher has given.
+
+        As with usage, only single-use vouchers record their discounts on their row.
+        """
+        self.total_discount += discount['discount']
+
+        if self.usage == self.SINGLE_USE:
+            self.save(update_fields=['total_discount'])
+    record_discount.alters_data = True
+
     @classmethod
     def does_exist(cls, code):
         try:
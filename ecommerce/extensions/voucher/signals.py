@@ -0,0 +1,244 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.core.models import BusinessClient
+from ecommerce.extensions.voucher.snapshots import invalidate_product_snapshots, invalidate_voucher_snapshots
+from ecommerce.extensions.voucher.summaries import invalidate_coupon_summaries
+from ecommerce.invoice.models import Invoice
+
+Benefit = get_model('offer', 'Benefit')
+Catalog = get_model('catalogue', 'Catalog')
+Category = get_model('catalogue', 'Category')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+CouponVouchers = get_model('voucher', 'CouponVouchers')
+Line = get_model('order', 'Line')
+Product = get_model('catalogue', 'Product')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+Range = get_model('offer', 'Range')
+RangeProduct = get_model('offer', 'RangeProduct')
+StockRecord = get_model('partner', 'StockRecord')
+Voucher = get_model('voucher', 'Voucher')
+
+# Saves which only record the usage of a voucher do not change its snapshot.
+VOUCHER_USAGE_FIELDS = frozenset(('num_basket_additions', 'num_orders', 'total_discount',))
+
+
+def _invalidate(invalidate, *args):
+    # Snapshots are invalidated immediately, and again once the transaction is committed, so that a snapshot built
+    # from the uncommitted state by another process is not kept.
+    invalidate(*args)
+    transaction.on_commit(lambda: invalidate(*args))
+
+
+def _invalidate_voucher_snapshots(voucher_ids):
+    voucher_ids = list(voucher_ids)
+    if voucher_ids:
+        _invalidate(invalidate_voucher_snapshots, voucher_ids)
+
+
+def _get_range_voucher_ids(range_id):
+    return Voucher.objects.filter(
+        Q(offers__benefit__range_id=range_id) | Q(offers__condition__range_id=range_id)
+    ).values_list('id', flat=True).distinct()
+
+
+@receiver(post_save, sender=Voucher, dispatch_uid='voucher.invalidate_snapshots_on_voucher_save')
+def invalidate_voucher_snapshots_on_voucher_save(sender, instance, update_fields=None,
+                                                 **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate the snapshot of a voucher when it changes, unless only its usage was recorded. """
+    if not (update_fields and VOUCHER_USAGE_FIELDS.issuperset(update_fields)):
+        _invalidate_voucher_snapshots([instance.id])
+
+
+@receiver(pre_delete, sender=Voucher, dispatch_uid='voucher.invalidate_snapshots_on_voucher_delete')
+def invalidate_voucher_snapshots_on_voucher_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    _invalidate_voucher_snapshots([instance.id])
+
+
+def _get_senders(*models):
+    """
+    Returns the given models, and their proxy models (e.g. program conditions, and percentage benefits), which are
+    the senders of their own signals.
+    """
+    return [model for model in apps.get_models() if issubclass(model, models)]
+
+
+def _connect(signal, receiver_function, models, dispatch_uid):
+    """ Connects the receiver to the signal sent by each of the given models, and their proxy models. """
+    for sender in _get_senders(*models):
+        signal.connect(receiver_function, sender=sender, dispatch_uid='{}.{}'.format(dispatch_uid, sender.__name__))
+
+
+# The vouchers of deleted objects are found before their relations are deleted.
+def invalidate_voucher_snapshots_on_offer_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate the snapshots of the vouchers of an offer when the offer, or its benefit or condition, change. """
+    if kwargs.get('created'):
+        # New objects are not used by any voucher yet.
+        return
+
+    if isinstance(instance, ConditionalOffer):
+        _invalidate_voucher_snapshots(Voucher.objects.filter(offers=instance.id).values_list('id', flat=True))
+    elif isinstance(instance, Benefit):
+        _invalidate_voucher_snapshots(
+            Voucher.objects.filter(offers__benefit_id=instance.id).values_list('id', flat=True).distinct()
+        )
+    elif isinstance(instance, Condition):
+        _invalidate_voucher_snapshots(
+            Voucher.objects.filter(offers__condition_id=instance.id).values_list('id', flat=True).distinct()
+        )
+
+
+@receiver(post_save, sender=Range, dispatch_uid='voucher.invalidate_snapshots_on_range_save')
+@receiver(pre_delete, sender=Range, dispatch_uid='voucher.invalidate_snapshots_on_range_delete')
+def invalidate_voucher_snapshots_on_range_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate the snapshots of the vouchers whose offers use a range when the range changes. """
+    _invalidate_voucher_snapshots(_get_range_voucher_ids(instance.id))
+
+
+@receiver(post_save, sender=RangeProduct, dispatch_uid='voucher.invalidate_snapshots_on_range_product_save')
+@receiver(post_delete, sender=RangeProduct, dispatch_uid='voucher.invalidate_snapshots_on_range_product_delete')
+def invalidate_voucher_snapshots_on_range_product_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate the snapshots of the vouchers whose offers use a range when products are added to, or removed
+    from, the range. """
+    _invalidate_voucher_snapshots(_get_range_voucher_ids(instance.range_id))
+
+
+@receiver(post_save, sender=Product, dispatch_uid='voucher.invalidate_snapshots_on_product_save')
+@receiver(post_delete, sender=Product, dispatch_uid='voucher.invalidate_snapshots_on_product_delete')
+@receiver(post_save, sender=ProductCategory, dispatch_uid='voucher.invalidate_snapshots_on_product_category_save')
+@receiver(post_delete, sender=ProductCategory, dispatch_uid='voucher.invalidate_snapshots_on_product_category_delete')
+@receiver(post_save, sender=StockRecord, dispatch_uid='voucher.invalidate_snapshots_on_stock_record_save')
+@receiver(post_delete, sender=StockRecord, dispatch_uid='voucher.invalidate_snapshots_on_stock_record_delete')
+def invalidate_voucher_snapshots_on_product_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate all voucher snapshots when a product, its categories, or its stock records, change. """
+    _invalidate(invalidate_product_snapshots)
+
+
+@receiver(m2m_changed, sender=Voucher.offers.through, dispatch_uid='voucher.snapshot_voucher_offers')
+def invalidate_voucher_snapshots_on_voucher_offers_change(sender, instance, action, reverse, pk_set,
+                                                          **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate the snapshots of vouchers when their offers change. """
+    if action in ('post_add', 'post_remove', 'pre_clear'):
+        if not reverse:
+            _invalidate_voucher_snapshots([instance.id])
+        elif pk_set:
+            _invalidate_voucher_snapshots(pk_set)
+        else:
+            _invalidate_voucher_snapshots(Voucher.objects.filter(offers=instance.id).values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=Range.classes.through, dispatch_uid='voucher.snapshot_range_classes')
+@receiver(m2m_changed, sender=Range.included_categories.through, dispatch_uid='voucher.snapshot_range_categories')
+def invalidate_voucher_snapshots_on_range_membership_change(sender, instance, action, reverse,
+                                                            **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate voucher snapshots when the product classes, or categories, of a range change. """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        if reverse:
+            # The ranges of a product class, or category, changed.
+            _invalidate(invalidate_product_snapshots)
+        else:
+            _invalidate_voucher_snapshots(_get_range_voucher_ids(instance.id))
+
+
+@receiver(m2m_changed, sender=Catalog.stock_records.through, dispatch_uid='voucher.snapshot_catalog_stock_records')
+def invalidate_voucher_snapshots_on_catalog_change(sender, action, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate all voucher snapshots when the products of a catalog change. """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _invalidate(invalidate_product_snapshots)
+
+
+def _get_coupon_summary_lookups(instance):
+    """ Returns the lookups matching the summaries of the coupons built from the given instance. """
+    if isinstance(instance, Product):
+        return {'coupon_id': instance.id}
+    if isinstance(instance, Voucher):
+        return {'coupon__coupon_vouchers__vouchers': instance.id}
+    if isinstance(instance, ConditionalOffer):
+        return {'offer_id': instance.id}
+    if isinstance(instance, Benefit):
+        return {'offer_id__in': ConditionalOffer.objects.filter(benefit_id=instance.id).values('id')}
+    if isinstance(instance, Condition):
+        return {'offer_id__in': ConditionalOffer.objects.filter(condition_id=instance.id).values('id')}
+    if isinstance(instance, Range):
+        return {'range_id': instance.id}
+    if isinstance(instance, ProductCategory):
+        return {'coupon_id': instance.product_id}
+    if isinstance(instance, Invoice):
+        if instance.order_id is None:
+            return {'invoice_id': instance.id}
+        return {'coupon_id__in': Line.objects.filter(order_id=instance.order_id).values('product_id')}
+    return {'invoice_id__in': Invoice.objects.filter(business_client_id=instance.id).values('id')}
+
+
+def invalidate_coupon_summaries_on_change(sender, instance, created=False, update_fields=None,
+                                          **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate coupon summaries when a coupon, or its vouchers, offer, range, category, or invoice, change. """
+    if created and not isinstance(instance, (ProductCategory, Invoice)):
+        # New objects are not part of any summary yet, unlike the categories, and invoices, of existing coupons.
+        return
+
+    if isinstance(instance, Product) and (instance.is_child or not instance.is_coupon_product):
+        # Only coupons have summaries. Coupons are never child products, whose class is read from their parents.
+        return
+
+    if isinstance(instance, Voucher) and update_fields and VOUCHER_USAGE_FIELDS.issuperset(update_fields):
+        # Summaries do not include the usage of vouchers.
+        return
+
+    invalidate_coupon_summaries(**_get_coupon_summary_lookups(instance))
+
+
+@receiver(post_save, sender=Category, dispatch_uid='voucher.invalidate_coupon_summaries_on_category_save')
+@receiver(pre_delete, sender=Category, dispatch_uid='voucher.invalidate_coupon_summaries_on_category_delete')
+def invalidate_coupon_summaries_on_category_change(sender, instance, created=False,
+                                                   **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate the summaries of the coupons of a category when it changes. New categories have no coupons. """
+    if not created:
+        invalidate_coupon_summaries(
+            coupon_id__in=ProductCategory.objects.filter(category_id=instance.id).values('product_id')
+        )
+
+
+@receiver(m2m_changed, sender=CouponVouchers.vouchers.through, dispatch_uid='voucher.summary_coupon_vouchers')
+def invalidate_coupon_summaries_on_coupon_vouchers_change(sender, instance, action, reverse, pk_set,
+                                                          **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate coupon summaries when vouchers are added to, or removed from, a coupon. """
+    if action in ('post_add', 'post_remove', 'pre_clear'):
+        if not reverse:
+            invalidate_coupon_summaries(coupon_id=instance.coupon_id)
+        elif pk_set:
+            invalidate_coupon_summaries(coupon__coupon_vouchers__id__in=pk_set)
+        else:
+            invalidate_coupon_summaries(coupon__coupon_vouchers__vouchers=instance.id)
+
+
+@receiver(m2m_changed, sender=Voucher.offers.through, dispatch_uid='voucher.summary_voucher_offers')
+def invalidate_coupon_summaries_on_voucher_offers_change(sender, instance, action, reverse, pk_set,
+                                                         **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate coupon summaries when the offers of a voucher change. """
+    if action in ('post_add', 'post_remove', 'pre_clear'):
+        if not reverse:
+            invalidate_coupon_summaries(coupon__coupon_vouchers__vouchers=instance.id)
+        elif pk_set:
+            invalidate_coupon_summaries(coupon__coupon_vouchers__vouchers__in=pk_set)
+        else:
+            invalidate_coupon_summaries(offer_id=instance.id)
+
+
+_connect(post_save, invalidate_voucher_snapshots_on_offer_change, (ConditionalOffer, Benefit, Condition,),
+         'voucher.invalidate_snapshots_on_offer_save')
+_connect(pre_delete, invalidate_voucher_snapshots_on_offer_change, (ConditionalOffer, Benefit, Condition,),
+         'voucher.invalidate_snapshots_on_offer_delete')
+
+COUPON_SUMMARY_SOURCES = (
+    Product, Voucher, ConditionalOffer, Benefit, Condition, Range, ProductCategory, Invoice, BusinessClient,
+)
+_connect(post_save, invalidate_coupon_summaries_on_change, COUPON_SUMMARY_SOURCES,
+         'voucher.invalidate_coupon_summaries_on_save')
+_connect(pre_delete, invalidate_coupon_summaries_on_change, COUPON_SUMMARY_SOURCES,
+         'voucher.invalidate_coupon_summaries_on_delete')
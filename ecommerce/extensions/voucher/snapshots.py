@@ -0,0 +1,231 @@
+"""
+Two-tier cache of voucher snapshots.
+
+Coupon pages look up the same codes over and over, e.g. when an enterprise shares a code with thousands of learners.
+Each lookup needs the voucher, its offer, the offer's benefit and range, and the products of the range. These are
+loaded once, stored as a ``VoucherSnapshot`` in the shared cache, and kept in a bounded LRU cache in each process.
+Products cannot be pickled, so the shared cache holds their IDs, and a process loads them with a single query.
+
+Snapshots are versioned per voucher, with version numbers stored in the shared cache. Receivers in
+``ecommerce.extensions.voucher.signals`` invalidate the snapshots of the vouchers affected by changes to a voucher, or
+to its offer, benefit, condition, or range, so that redeeming, or updating, one voucher does not discard the snapshots
+of every other voucher. Changes to products invalidate every snapshot, since the vouchers whose ranges hold a product
+cannot be determined cheaply.
+
+Snapshots cached by a process are only checked against the shared versions every
+VOUCHER_CACHE_REVALIDATION_INTERVAL seconds, so that lookups of hot codes do not read the shared cache each time.
+Snapshots are shared by the requests served by a process, so lookups return copies of them.
+"""
+from __future__ import unicode_literals
+
+import copy
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from oscar.core.loading import get_model
+
+from ecommerce.core.utils import get_cache_key
+
+Product = get_model('catalogue', 'Product')
+Voucher = get_model('voucher', 'Voucher')
+
+VOUCHER_SNAPSHOT_VERSION_KEY_PREFIX = 'voucher_snapshot_version'
+PRODUCT_SNAPSHOT_VERSION_KEY = 'voucher_snapshot_product_version'
+
+VoucherSnapshot = namedtuple('VoucherSnapshot', ['voucher', 'offer', 'benefit', 'range', 'products'])
+
+# Entry of the cache of a process. Versions are those of the voucher, and of the products, the snapshot was built from.
+_LocalEntry = namedtuple('_LocalEntry', ['voucher_id', 'versions', 'snapshot', 'validated'])
+
+
+class LRUCache(object):
+    """ Thread-safe, size-bounded cache whose entries expire after a timeout. """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+
+            value, expires = entry
+            if expires < time.time():
+                return None
+
+            # Re-insert the entry to mark it as the most recently used.
+            self._entries[key] = entry
+            return value
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.time() + timeout)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, predicate):
+        """ Removes the entries whose values match the predicate. """
+        with self._lock:
+            for key in [key for key, (value, __) in self._entries.items() if predicate(value)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local_snapshots = LRUCache(settings.VOUCHER_CACHE_MAX_SIZE)
+
+
+def _get_voucher_version_key(voucher_id):
+    return '{prefix}_{voucher_id}'.format(prefix=VOUCHER_SNAPSHOT_VERSION_KEY_PREFIX, voucher_id=voucher_id)
+
+
+def _seed_version(key):
+    # Versions are seeded with the current time, rather than reset to a constant, so that snapshots built from an
+    # invalidated, or evicted, version are never mistaken for current ones.
+    version = int(time.time() * 1000)
+    cache.add(key, version, None)
+    return cache.get(key, version)
+
+
+def get_voucher_snapshot_versions(voucher_id):
+    """
+    Returns the current versions of the snapshot of the given voucher, and of the products of all snapshots, read
+    from the shared cache at once. Snapshots of previous versions are ignored.
+    """
+    keys = (_get_voucher_version_key(voucher_id), PRODUCT_SNAPSHOT_VERSION_KEY)
+    versions = cache.get_many(keys)
+    return tuple(versions[key] if key in versions else _seed_version(key) for key in keys)
+
+
+def invalidate_voucher_snapshots(voucher_ids):
+    """ Invalidates the snapshots of the given vouchers, held by the shared cache and by every process. """
+    voucher_ids = set(voucher_ids)
+    if not voucher_ids:
+        return
+
+    # Deleted versions are re-seeded on the next lookup.
+    cache.delete_many([_get_voucher_version_key(voucher_id) for voucher_id in voucher_ids])
+    _local_snapshots.discard(lambda entry: entry.voucher_id in voucher_ids)
+
+
+def invalidate_product_snapshots():
+    """ Invalidates all snapshots, held by the shared cache and by every process, as their products may have changed.
+    """
+    try:
+        cache.incr(PRODUCT_SNAPSHOT_VERSION_KEY)
+    except ValueError:
+        # The version has been evicted, or was never set. It will be re-seeded on the next lookup.
+        pass
+    _local_snapshots.clear()
+
+
+def clear_local_voucher_snapshots():
+    """ Clears the snapshots cached by this process. """
+    _local_snapshots.clear()
+
+
+def _copy_instance(instance):
+    field_names = [field.attname for field in instance._meta.concrete_fields]  # pylint: disable=protected-access
+    return instance.from_db(
+        instance._state.db, field_names, [getattr(instance, name) for name in field_names]  # pylint: disable=protected-access
+    )
+
+
+def _copy_snapshot(snapshot):
+    # The voucher, offer, benefit, and range are copied together, so that the copies of the objects they share, such
+    # as the benefit of the offer, are the same objects. Products cannot be deep-copied, so each one is copied from
+    # its field values.
+    voucher, offer, benefit, voucher_range = copy.deepcopy(snapshot[:4])
+    return VoucherSnapshot(
+        voucher=voucher,
+        offer=offer,
+        benefit=benefit,
+        range=voucher_range,
+        products=tuple(_copy_instance(product) for product in snapshot.products)
+    )
+
+
+def build_voucher_snapshot(voucher):
+    """
+    Loads the objects needed to redeem the given voucher.
+
+    Arguments:
+        voucher (Voucher): A coupon voucher.
+
+    Returns:
+        VoucherSnapshot
+    """
+    offer = voucher.offers.select_related('benefit__range', 'condition__range').first()
+    benefit = offer.benefit if offer else None
+    voucher_range = benefit.range if benefit else None
+    products = tuple(voucher_range.all_products()) if voucher_range else ()
+
+    return VoucherSnapshot(voucher=voucher, offer=offer, benefit=benefit, range=voucher_range, products=products)
+
+
+def _load_snapshot(code):
+    """ Returns the voucher ID, versions, and snapshot of the voucher with the given code, from the shared cache. """
+    cache_key = get_cache_key(resource='voucher_snapshot', code=code)
+
+    shared_entry = cache.get(cache_key)
+    if shared_entry is not None:
+        voucher_id, versions, shared_snapshot = shared_entry
+        if versions == get_voucher_snapshot_versions(voucher_id):
+            products = Product.objects.in_bulk(shared_snapshot.products)
+            snapshot = shared_snapshot._replace(
+                products=tuple(
+                    products[product_id] for product_id in shared_snapshot.products if product_id in products
+                )
+            )
+            return voucher_id, versions, snapshot
+
+    voucher = Voucher.objects.get(code=code)
+    # The versions are read before the snapshot is built, so that changes made while it is built invalidate it.
+    versions = get_voucher_snapshot_versions(voucher.id)
+    snapshot = build_voucher_snapshot(voucher)
+
+    shared_snapshot = snapshot._replace(products=tuple(product.id for product in snapshot.products))
+    cache.set(cache_key, (voucher.id, versions, shared_snapshot), settings.VOUCHER_CACHE_TIMEOUT)
+    return voucher.id, versions, snapshot
+
+
+def get_voucher_snapshot(code):
+    """
+    Returns a copy of the snapshot of the voucher with the given code.
+
+    The snapshot is read from the cache of this process, then from the shared cache. If neither holds a snapshot of
+    the current version, it is built from the database and stored in both.
+
+    Arguments:
+        code (str): The code of a coupon voucher.
+
+    Returns:
+        VoucherSnapshot
+
+    Raises:
+        Voucher.DoesNotExist: When no vouchers with provided code exist.
+    """
+    entry = _local_snapshots.get(code)
+    if entry is not None:
+        if entry.validated + settings.VOUCHER_CACHE_REVALIDATION_INTERVAL > time.time():
+            return _copy_snapshot(entry.snapshot)
+
+        if entry.versions == get_voucher_snapshot_versions(entry.voucher_id):
+            _local_snapshots.set(code, entry._replace(validated=time.time()), settings.VOUCHER_CACHE_TIMEOUT)
+            return _copy_snapshot(entry.snapshot)
+
+    voucher_id, versions, snapshot = _load_snapshot(code)
+    _local_snapshots.set(
+        code, _LocalEntry(voucher_id, versions, snapshot, time.time()), settings.VOUCHER_CACHE_TIMEOUT
+    )
+    return _copy_snapshot(snapshot)
@@ -0,0 +1,98 @@
+"""
+Denormalized summaries of coupons.
+
+The coupon list and detail endpoints show, for each coupon, data spread over its vouchers, offer, benefit, condition,
+range, category, invoice, and history, which takes about a dozen queries per coupon to load. This data is instead
+stored in a ``CouponSummary`` per coupon. A summary is built the first time its coupon is read, and deleted by the
+receivers in ``ecommerce.extensions.voucher.signals`` whenever any of these objects change, so that it is rebuilt on
+the next read.
+"""
+from __future__ import unicode_literals
+
+from django.db import transaction
+from oscar.core.loading import get_model
+
+from ecommerce.invoice.models import Invoice
+from ecommerce.programs.constants import BENEFIT_PROXY_CLASS_MAP
+
+Benefit = get_model('offer', 'Benefit')
+CouponSummary = get_model('voucher', 'CouponSummary')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+
+
+def build_coupon_summary(coupon):
+    """
+    Builds, and stores, the summary of the given coupon.
+
+    Arguments:
+        coupon (Product): Coupon to summarize.
+
+    Returns:
+        CouponSummary
+    """
+    vouchers = coupon.attr.coupon_vouchers.vouchers
+    voucher = vouchers.first()
+    quantity = vouchers.count()
+    offer = voucher.offers.select_related('benefit', 'condition__range').first() if voucher else None
+    benefit = offer.benefit if offer else None
+    offer_range = offer.condition.range if offer else None
+    product_category = ProductCategory.objects.filter(product=coupon).select_related('category').first()
+    invoice = Invoice.objects.filter(order__lines__product=coupon).select_related('business_client').first()
+    history = coupon.history.select_related('history_user').order_by('-history_date').first()
+
+    values = {
+        'offer_id': offer.id if offer else None,
+        'range_id': offer_range.id if offer_range else None,
+        'invoice_id': invoice.id if invoice else None,
+        'benefit_type': (benefit.type or BENEFIT_PROXY_CLASS_MAP[benefit.proxy_class]) if benefit else None,
+        'benefit_value': benefit.value if benefit else None,
+        'catalog_query': offer_range.catalog_query if offer_range else None,
+        'category_id': product_category.category.id if product_category else None,
+        'category_name': product_category.category.name if product_category else None,
+        'client': invoice.business_client.name if invoice and invoice.business_client else None,
+        'code': voucher.code if voucher and quantity == 1 else None,
+        'course_catalog': offer_range.course_catalog if offer_range else None,
+        'course_seat_types': offer_range.course_seat_types if offer_range else None,
+        'email_domains': offer.email_domains if offer else None,
+        'end_datetime': voucher.end_datetime if voucher else None,
+        'enterprise_customer': offer_range.enterprise_customer if offer_range else None,
+        'is_enrollment_code': bool(benefit and benefit.type == Benefit.PERCENTAGE and benefit.value == 100),
+        'last_edited_by': history.history_user.username if history and history.history_user else None,
+        'last_edited': history.history_date if history else None,
+        'max_uses': offer.max_global_applications if offer else None,
+        'program_uuid': offer.condition.program_uuid if offer else None,
+        'quantity': quantity,
+        'start_datetime': voucher.start_datetime if voucher else None,
+        'voucher_type': voucher.usage if voucher else None,
+    }
+
+    summary, __ = CouponSummary.objects.update_or_create(coupon=coupon, defaults=values)
+    coupon.coupon_summary = summary
+    return summary
+
+
+def get_coupon_summary(coupon):
+    """
+    Returns the summary of the given coupon, building it if needed.
+
+    Summaries are loaded along with their coupons by querysets using ``select_related('coupon_summary')``.
+    """
+    try:
+        return coupon.coupon_summary
+    except CouponSummary.DoesNotExist:
+        return build_coupon_summary(coupon)
+
+
+def _delete_coupon_summaries(lookups):
+    CouponSummary.objects.filter(**lookups).delete()
+
+
+def invalidate_coupon_summaries(**lookups):
+    """
+    Deletes the summaries matching the given lookups (e.g. ``offer_id=1``), so that they are rebuilt when next read.
+
+    Summaries are deleted immediately, and again once the transaction is committed, so that a summary built from the
+    uncommitted state by another request is not kept.
+    """
+    _delete_coupon_summaries(lookups)
+    transaction.on_commit(lambda: _delete_coupon_summaries(lookups))
@@ -0,0 +1,139 @@
+from __future__ import unicode_literals
+
+import mock
+from oscar.core.loading import get_model
+from oscar.test.factories import create_product
+
+from ecommerce.extensions.test.factories import prepare_voucher
+from ecommerce.extensions.voucher.snapshots import (
+    LRUCache,
+    get_voucher_snapshot,
+    get_voucher_snapshot_versions,
+    invalidate_product_snapshots,
+    invalidate_voucher_snapshots
+)
+from ecommerce.extensions.voucher.utils import get_voucher_and_products_from_code
+from ecommerce.tests.testcases import TestCase
+
+Voucher = get_model('voucher', 'Voucher')
+
+
+class VoucherSnapshotTests(TestCase):
+    def setUp(self):
+        super(VoucherSnapshotTests, self).setUp()
+        self.voucher, self.product = prepare_voucher(code='SNAPSHOT')
+
+    def test_snapshot(self):
+        """ Verify the snapshot contains the voucher, its offer, benefit, range, and products. """
+        snapshot = get_voucher_snapshot(self.voucher.code)
+        offer = self.voucher.offers.first()
+
+        self.assertEqual(snapshot.voucher, self.voucher)
+        self.assertEqual(snapshot.offer, offer)
+        self.assertEqual(snapshot.benefit, offer.benefit)
+        self.assertEqual(snapshot.range, offer.benefit.range)
+        self.assertEqual(snapshot.products, (self.product,))
+
+    def test_snapshot_cached(self):
+        """ Verify snapshots are read from the cache of the process, then from the shared cache. """
+        get_voucher_snapshot(self.voucher.code)
+
+        with self.assertNumQueries(0):
+            voucher, products = get_voucher_and_products_from_code(self.voucher.code)
+            self.assertEqual(voucher, self.voucher)
+            self.assertEqual(products, (self.product,))
+
+        with mock.patch('ecommerce.extensions.voucher.snapshots._local_snapshots', LRUCache(10)):
+            # Only the products are loaded from the database.
+            with self.assertNumQueries(1):
+                snapshot = get_voucher_snapshot(self.voucher.code)
+                self.assertEqual(snapshot.voucher, self.voucher)
+                self.assertEqual(snapshot.products, (self.product,))
+
+    def test_snapshot_copied(self):
+        """ Verify each lookup returns copies of the cached objects, so that requests cannot change them. """
+        first = get_voucher_snapshot(self.voucher.code)
+        first.voucher.name = 'Changed'
+        first.products[0].title = 'Changed'
+
+        second = get_voucher_snapshot(self.voucher.code)
+        self.assertIsNot(second.voucher, first.voucher)
+        self.assertIsNot(second.offer, first.offer)
+        self.assertIsNot(second.products[0], first.products[0])
+        self.assertEqual(second.voucher.name, self.voucher.name)
+        self.assertEqual(second.products[0].title, self.product.title)
+        self.assertIs(second.offer.benefit, second.benefit)
+
+    def test_snapshot_revalidated(self):
+        """ Verify snapshots cached by the process are only checked against the shared versions once the
+        revalidation interval has passed. """
+        get_voucher_snapshot(self.voucher.code)
+
+        with mock.patch('ecommerce.extensions.voucher.snapshots.cache') as mock_cache:
+            get_voucher_snapshot(self.voucher.code)
+            self.assertFalse(mock_cache.get_many.called)
+
+        with self.settings(VOUCHER_CACHE_REVALIDATION_INTERVAL=0):
+            with self.assertNumQueries(0):
+                self.assertEqual(get_voucher_snapshot(self.voucher.code).voucher, self.voucher)
+
+    def test_snapshot_invalidated(self):
+        """ Verify snapshots are invalidated when the voucher, or its range, change. """
+        versions = get_voucher_snapshot_versions(self.voucher.id)
+        get_voucher_snapshot(self.voucher.code)
+
+        self.voucher.name = 'Updated'
+        self.voucher.save()
+        self.assertEqual(get_voucher_snapshot(self.voucher.code).voucher.name, 'Updated')
+
+        product = create_product()
+        self.voucher.offers.first().benefit.range.add_product(product)
+        self.assertIn(product, get_voucher_snapshot(self.voucher.code).products)
+        self.assertNotEqual(get_voucher_snapshot_versions(self.voucher.id), versions)
+
+    def test_invalidation_scoped(self):
+        """ Verify invalidating the snapshot of one voucher, or recording its usage, leaves other snapshots cached. """
+        other_voucher, __ = prepare_voucher(code='OTHER', _range=self.voucher.offers.first().benefit.range)
+        get_voucher_snapshot(self.voucher.code)
+        get_voucher_snapshot(other_voucher.code)
+        other_versions = get_voucher_snapshot_versions(other_voucher.id)
+
+        invalidate_voucher_snapshots([self.voucher.id])
+        self.voucher.num_orders += 1
+        self.voucher.save(update_fields=['num_orders'])
+        self.voucher.offers.first().record_usage({'discount': 1, 'freq': 1})
+
+        self.assertEqual(get_voucher_snapshot_versions(other_voucher.id), other_versions)
+        with self.assertNumQueries(0):
+            get_voucher_snapshot(other_voucher.code)
+
+    def test_product_invalidation(self):
+        """ Verify invalidating the products of snapshots invalidates every snapshot. """
+        versions = get_voucher_snapshot_versions(self.voucher.id)
+        invalidate_product_snapshots()
+        self.assertNotEqual(get_voucher_snapshot_versions(self.voucher.id), versions)
+
+    def test_missing_voucher(self):
+        """ Verify an exception is raised, and nothing is cached, if no voucher exists with the code. """
+        with self.assertRaises(Voucher.DoesNotExist):
+            get_voucher_snapshot('MISSING')
+
+
+class LRUCacheTests(TestCase):
+    def test_eviction(self):
+        """ Verify the least recently used entry is evicted when the cache is full. """
+        lru_cache = LRUCache(2)
+        lru_cache.set('a', 1, 60)
+        lru_cache.set('b', 2, 60)
+        self.assertEqual(lru_cache.get('a'), 1)
+
+        lru_cache.set('c', 3, 60)
+        self.assertIsNone(lru_cache.get('b'))
+        self.assertEqual(lru_cache.get('a'), 1)
+        self.assertEqual(lru_cache.get('c'), 3)
+
+    def test_expiration(self):
+        """ Verify expired entries are not returned. """
+        lru_cache = LRUCache(2)
+        lru_cache.set('a', 1, -1)
+        self.assertIsNone(lru_cache.get('a'))
@@ -0,0 +1,113 @@
+from __future__ import unicode_literals
+
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from oscar.core.loading import get_model
+from oscar.test.factories import OrderFactory
+
+from ecommerce.coupons.tests.mixins import CouponMixin
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.voucher.summaries import build_coupon_summary, get_coupon_summary
+from ecommerce.invoice.models import Invoice
+from ecommerce.tests.testcases import TestCase
+
+Benefit = get_model('offer', 'Benefit')
+CouponSummary = get_model('voucher', 'CouponSummary')
+Product = get_model('catalogue', 'Product')
+Voucher = get_model('voucher', 'Voucher')
+
+
+class CouponSummaryTests(CouponMixin, TestCase):
+    def setUp(self):
+        super(CouponSummaryTests, self).setUp()
+        self.coupon = self.create_coupon(
+            benefit_type=Benefit.FIXED, benefit_value=10, partner=self.partner, quantity=1, code='SUMMARY'
+        )
+        self.voucher = self.coupon.attr.coupon_vouchers.vouchers.first()
+        self.offer = self.voucher.offers.first()
+
+    def assert_summary_invalidated(self):
+        self.assertFalse(CouponSummary.objects.filter(coupon=self.coupon).exists())
+
+    def test_summary(self):
+        """ Verify the summary contains the data of the vouchers, offer, range, category, and invoice of a coupon. """
+        summary = build_coupon_summary(self.coupon)
+        invoice = Invoice.objects.get(order__lines__product=self.coupon)
+
+        self.assertEqual(summary.offer_id, self.offer.id)
+        self.assertEqual(summary.range_id, self.offer.condition.range.id)
+        self.assertEqual(summary.invoice_id, invoice.id)
+        self.assertEqual(summary.benefit_type, Benefit.FIXED)
+        self.assertEqual(summary.benefit_value, Decimal(10))
+        self.assertEqual(summary.category_name, self.category.name)
+        self.assertEqual(summary.client, invoice.business_client.name)
+        self.assertEqual(summary.code, 'SUMMARY')
+        self.assertFalse(summary.is_enrollment_code)
+        self.assertEqual(summary.quantity, 1)
+        self.assertEqual(summary.start_datetime, self.voucher.start_datetime)
+        self.assertEqual(summary.end_datetime, self.voucher.end_datetime)
+        self.assertEqual(summary.voucher_type, self.voucher.usage)
+
+    def test_summary_stored(self):
+        """ Verify summaries are built once, and loaded along with their coupons. """
+        get_coupon_summary(self.coupon)
+        coupon = Product.objects.select_related('coupon_summary').get(id=self.coupon.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_coupon_summary(coupon).code, 'SUMMARY')
+
+    def test_invalidated_on_voucher_change(self):
+        """ Verify the summary is deleted when a voucher of the coupon changes. """
+        build_coupon_summary(self.coupon)
+        self.voucher.name = 'Changed'
+        self.voucher.save()
+        self.assert_summary_invalidated()
+
+    def test_invalidated_on_offer_change(self):
+        """ Verify the summary is deleted when the offer, or its benefit, condition, or range, change. """
+        for instance in (self.offer, self.offer.benefit, self.offer.condition, self.offer.condition.range):
+            build_coupon_summary(self.coupon)
+            instance.save()
+            self.assert_summary_invalidated()
+
+    def test_invalidated_on_category_change(self):
+        """ Verify the summary is deleted when the category of the coupon changes. """
+        build_coupon_summary(self.coupon)
+        self.category.name = 'Changed'
+        self.category.save()
+        self.assert_summary_invalidated()
+
+    def test_invalidated_on_invoice_change(self):
+        """ Verify the summary is deleted when the invoice, or its client, change. """
+        invoice = Invoice.objects.get(order__lines__product=self.coupon)
+
+        for instance in (invoice, invoice.business_client):
+            build_coupon_summary(self.coupon)
+            instance.save()
+            self.assert_summary_invalidated()
+
+    def test_invalidated_on_voucher_offers_change(self):
+        """ Verify the summary is deleted when the offers of a voucher change. """
+        build_coupon_summary(self.coupon)
+        self.voucher.offers.clear()
+        self.assert_summary_invalidated()
+
+    def assert_summaries_not_deleted(self, func):
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        self.assertFalse([query for query in queries if 'voucher_couponsummary' in query['sql']])
+
+    def test_not_invalidated_on_other_changes(self):
+        """ Verify summaries are not deleted when products which are not coupons change, when objects are created,
+        or when the usage of a voucher is recorded. """
+        build_coupon_summary(self.coupon)
+        course = CourseFactory()
+
+        self.assert_summaries_not_deleted(lambda: course.create_or_update_seat('verified', True, 100, self.partner))
+        seat = course.seat_products.first()
+        self.assert_summaries_not_deleted(seat.save)
+        self.assert_summaries_not_deleted(seat.parent.save)
+        self.assert_summaries_not_deleted(lambda: self.voucher.record_usage(OrderFactory(), self.create_user()))
+        self.assertTrue(CouponSummary.objects.filter(coupon=self.coupon).exists())
@@ -1,17 +1,22 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import datetime
 import uuid
 
 import ddt
 import httpretty
+import mock
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from django.test import override_settings
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 from factory.fuzzy import FuzzyText
 from oscar.templatetags.currency_filters import currency
 from oscar.test.factories import *  # pylint:disable=wildcard-import,unused-wildcard-import
+from testfixtures import LogCapture
 
 from ecommerce.core.tests.decorators import mock_course_catalog_api_client
 from ecommerce.core.url_utils import get_ecommerce_url
@@ -23,8 +28,8 @@ from ecommerce.extensions.fulfillment.modules import CouponFulfillmentModule
 from ecommerce.extensions.fulfillment.status import LINE
 from ecommerce.extensions.test.factories import create_order, prepare_voucher
 from ecommerce.extensions.voucher.utils import (
-    create_vouchers, generate_coupon_report, get_voucher_and_products_from_code,
-    get_voucher_discount_info, update_voucher_offer
+    create_vouchers, generate_coupon_report, get_voucher_and_products_from_code, get_voucher_discount_info,
+    process_coupon_offer_updates, queue_coupon_offer_update, replace_voucher_offers, update_voucher_offer
 )
 from ecommerce.tests.mixins import LmsApiMockMixin
 from ecommerce.tests.testcases import TestCase
@@ -32,6 +37,7 @@ from ecommerce.tests.testcases import TestCase
 Basket = get_model('basket', 'Basket')
 Benefit = get_model('offer', 'Benefit')
 Catalog = get_model('catalogue', 'Catalog')
+CouponOfferUpdate = get_model('voucher', 'CouponOfferUpdate')
 CouponVouchers = get_model('voucher', 'CouponVouchers')
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
@@ -602,6 +608,92 @@ class UtilTests(CouponMixin, CourseCatalogMockMixin, CourseCatalogTestMixin, Lms
         self.assertEqual(new_offer.benefit.range.catalog, self.catalog)
         self.assertEqual(new_offer.email_domains, new_email_domains)
 
+    def _create_vouchers_with_offers(self, num_vouchers):
+        vouchers = [VoucherFactory(code=FuzzyText().fuzz()) for __ in range(num_vouchers)]
+        for voucher in vouchers:
+            voucher.offers.add(ConditionalOfferFactory(name=FuzzyText().fuzz()))
+        return vouchers
+
+    def test_replace_voucher_offers(self):
+        """ Verify the offers of all vouchers are replaced, in batches, by the new offer. """
+        vouchers = self._create_vouchers_with_offers(5)
+        offer = ConditionalOfferFactory(name=FuzzyText().fuzz())
+        vouchers[0].offers.add(offer)
+        untouched = self._create_vouchers_with_offers(1)[0]
+        untouched_offers = list(untouched.offers.all())
+
+        replace_voucher_offers([voucher.id for voucher in vouchers], offer.id, batch_size=2)
+
+        for voucher in vouchers:
+            self.assertEqual(list(voucher.offers.all()), [offer])
+        self.assertEqual(list(untouched.offers.all()), untouched_offers)
+
+    @ddt.data(1, 10)
+    def test_replace_voucher_offers_queries(self, num_vouchers):
+        """ Verify the number of queries does not depend on the number of vouchers in a batch. """
+        vouchers = self._create_vouchers_with_offers(num_vouchers)
+        offer = ConditionalOfferFactory(name=FuzzyText().fuzz())
+
+        # A delete, a select, a bulk insert, and the deletion of coupon summaries, within a savepoint.
+        with self.assertNumQueries(6):
+            replace_voucher_offers([voucher.id for voucher in vouchers], offer.id, batch_size=10)
+
+    def test_replace_voucher_offers_invalidates_snapshots(self):
+        """ Verify voucher snapshots, and the offer index, are invalidated, as no m2m_changed signals are sent. """
+        voucher = self._create_vouchers_with_offers(1)[0]
+        offer = ConditionalOfferFactory(name=FuzzyText().fuzz())
+
+        with mock.patch('ecommerce.extensions.voucher.utils.invalidate_voucher_snapshots') as mock_invalidate, \
+                mock.patch('ecommerce.extensions.voucher.utils.invalidate_offer_index') as mock_invalidate_index:
+            replace_voucher_offers([voucher.id], offer.id)
+        mock_invalidate.assert_called_once_with([voucher.id])
+        self.assertTrue(mock_invalidate_index.called)
+
+    def assert_coupon_offer(self, coupon, offer):
+        for voucher in coupon.attr.coupon_vouchers.vouchers.all():
+            self.assertEqual(list(voucher.offers.all()), [offer])
+
+    def test_process_coupon_offer_updates(self):
+        """ Verify queued updates replace the offers of the vouchers of their coupons, once processed. """
+        coupon = self.create_coupon(quantity=2)
+        offer = ConditionalOfferFactory(name=FuzzyText().fuzz())
+
+        update = queue_coupon_offer_update(coupon, offer)
+        self.assertEqual(update.status, CouponOfferUpdate.PENDING)
+        self.assertNotEqual(list(coupon.attr.coupon_vouchers.vouchers.first().offers.all()), [offer])
+
+        self.assertEqual(process_coupon_offer_updates(), (1, 0))
+        self.assert_coupon_offer(coupon, offer)
+        self.assertEqual(CouponOfferUpdate.objects.get(id=update.id).status, CouponOfferUpdate.PROCESSED)
+        self.assertEqual(process_coupon_offer_updates(), (0, 0))
+
+    def test_process_coupon_offer_updates_failure(self):
+        """ Verify updates which fail are logged, and not processed again. """
+        update = queue_coupon_offer_update(self.create_coupon(quantity=1), ConditionalOfferFactory())
+
+        with mock.patch('ecommerce.extensions.voucher.utils.replace_voucher_offers', side_effect=IntegrityError):
+            with LogCapture('ecommerce.extensions.voucher.utils') as logs:
+                self.assertEqual(process_coupon_offer_updates(), (0, 1))
+
+        self.assertEqual(CouponOfferUpdate.objects.get(id=update.id).status, CouponOfferUpdate.FAILED)
+        self.assertEqual(logs.records[0].levelname, 'ERROR')
+        self.assertEqual(process_coupon_offer_updates(), (0, 0))
+
+    def test_process_coupon_offer_updates_resumed(self):
+        """ Verify updates abandoned by their worker, e.g. on a restart, are claimed again once they are stale. """
+        coupon = self.create_coupon(quantity=2)
+        offer = ConditionalOfferFactory(name=FuzzyText().fuzz())
+        update = queue_coupon_offer_update(coupon, offer)
+        update.status = CouponOfferUpdate.PROCESSING
+        update.save()
+
+        self.assertEqual(process_coupon_offer_updates(), (0, 0))
+
+        stale = now() - datetime.timedelta(seconds=settings.COUPON_OFFER_UPDATE_PROCESSING_TIMEOUT + 1)
+        CouponOfferUpdate.objects.filter(id=update.id).update(modified=stale)
+        self.assertEqual(process_coupon_offer_updates(max_updates=1), (1, 0))
+        self.assert_coupon_offer(coupon, offer)
+
     def test_get_voucher_and_products_from_code(self):
         """ Verify that get_voucher_and_products_from_code() returns products and voucher. """
         original_voucher, original_product = prepare_voucher(code=VOUCHER_CODE)
@@ -9,8 +9,9 @@ from decimal import Decimal, DecimalException
 import dateutil.parser
 import pytz
 from django.conf import settings
-from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.db import transaction
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
@@ -19,7 +20,10 @@ from oscar.templatetags.currency_filters import currency
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.extensions.api import exceptions
+from ecommerce.extensions.offer.index import invalidate_offer_index
 from ecommerce.extensions.offer.utils import get_discount_percentage, get_discount_value
+from ecommerce.extensions.voucher.snapshots import get_voucher_snapshot, invalidate_voucher_snapshots
+from ecommerce.extensions.voucher.summaries import invalidate_coupon_summaries
 from ecommerce.invoice.models import Invoice
 from ecommerce.programs.conditions import ProgramCourseRunSeatsCondition
 from ecommerce.programs.constants import BENEFIT_MAP, BENEFIT_PROXY_CLASS_MAP
@@ -31,6 +35,7 @@ Basket = get_model('basket', 'Basket')
 Benefit = get_model('offer', 'Benefit')
 Condition = get_model('offer', 'Condition')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
+CouponOfferUpdate = get_model('voucher', 'CouponOfferUpdate')
 CouponVouchers = get_model('voucher', 'CouponVouchers')
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
@@ -170,7 +175,7 @@ def _get_voucher_info_for_coupon_report(voucher):
     # which don't have the max global applications limit set,
     # set the max_uses_count to 10000 which is the arbitrary limit Oscar sets:
     # https://github.com/django-oscar/django-oscar/blob/master/src/oscar/apps/offer/abstract_models.py#L253
-    redemption_count = offer.num_applications
+    redemption_count = offer.get_num_applications()
     if voucher.usage == Voucher.SINGLE_USE:
         max_uses_count = 1
         redemption_count = voucher.num_orders
@@ -642,10 +647,128 @@ def update_voucher_offer(offer, benefit_value, benefit_type, coupon, max_uses=No
     )
 
 
+def replace_voucher_offers(voucher_ids, offer_id, batch_size=None):
+    """
+    Replace the offers of the given vouchers with a single offer.
+
+    The voucher-offer relations are rewritten with one delete, one select, and one bulk insert per batch of vouchers,
+    inside a single transaction, instead of two queries per voucher. Vouchers already linked to the offer keep their
+    relation. No m2m_changed signals are sent, so voucher snapshots, the cached offers of the vouchers, coupon
+    summaries, and the offer index are invalidated explicitly.
+
+    Args:
+        voucher_ids (list): IDs of the vouchers to update.
+        offer_id (int): ID of the offer the vouchers are linked to.
+
+    Kwargs:
+        batch_size (int): Number of vouchers updated per batch. Defaults to settings.VOUCHER_OFFER_UPDATE_BATCH_SIZE.
+    """
+    VoucherOffers = Voucher.offers.through
+    batch_size = batch_size or settings.VOUCHER_OFFER_UPDATE_BATCH_SIZE
+    voucher_ids = list(voucher_ids)
+
+    with transaction.atomic():
+        for start in range(0, len(voucher_ids), batch_size):
+            batch = voucher_ids[start:start + batch_size]
+            stale = VoucherOffers.objects.filter(voucher_id__in=batch).exclude(conditionaloffer_id=offer_id)
+            # QuerySet.delete() fetches every row to send delete signals, as receivers listen to all models.
+            stale._raw_delete(stale.db)  # pylint: disable=protected-access
+
+            linked = set(
+                VoucherOffers.objects.filter(voucher_id__in=batch, conditionaloffer_id=offer_id).values_list(
+                    'voucher_id', flat=True
+                )
+            )
+            VoucherOffers.objects.bulk_create([
+                VoucherOffers(voucher_id=voucher_id, conditionaloffer_id=offer_id)
+                for voucher_id in batch if voucher_id not in linked
+            ])
+            invalidate_coupon_summaries(coupon__coupon_vouchers__vouchers__in=batch)
+
+        _invalidate_voucher_offers(voucher_ids)
+        transaction.on_commit(lambda: _invalidate_voucher_offers(voucher_ids))
+
+
+def _invalidate_voucher_offers(voucher_ids):
+    # The snapshots of the vouchers, which also version the cached offers of the vouchers, and the offer index.
+    invalidate_voucher_snapshots(voucher_ids)
+    invalidate_offer_index()
+
+
+def queue_coupon_offer_update(coupon, offer):
+    """
+    Queues the replacement of the offers of the vouchers of a coupon, to be processed by the
+    process_coupon_offer_updates command.
+
+    Used for coupons with too many vouchers to update within a request. The vouchers stay linked to their previous
+    offers until the update is processed.
+
+    Args:
+        coupon (Product): Coupon whose vouchers are updated.
+        offer (ConditionalOffer): Offer the vouchers are linked to.
+
+    Returns:
+        CouponOfferUpdate
+    """
+    return CouponOfferUpdate.objects.create(coupon=coupon, offer=offer)
+
+
+def process_coupon_offer_updates(max_updates=None):
+    """
+    Replaces the offers of the vouchers of queued coupon offer updates, in the order they were queued.
+
+    Each update is claimed before it is processed, so that concurrently-running commands do not process the same
+    update twice. Updates whose worker stopped before finishing them are claimed again after
+    COUPON_OFFER_UPDATE_PROCESSING_TIMEOUT seconds, and, since vouchers already linked to the offer keep their
+    relation, are resumed where they were left.
+
+    Kwargs:
+        max_updates (int): Maximum number of updates to process. By default, the queue is drained.
+
+    Returns:
+        tuple: Numbers of updates processed, and of updates which failed.
+    """
+    processed = failed = 0
+
+    while max_updates is None or processed + failed < max_updates:
+        update = CouponOfferUpdate.objects.claimable().order_by('id').first()
+        if update is None:
+            break
+
+        # The conditions of claimable updates are checked again by the update, so that only one of the workers
+        # racing to claim an update succeeds.
+        claimed = CouponOfferUpdate.objects.claimable().filter(id=update.id).update(
+            status=CouponOfferUpdate.PROCESSING,
+            modified=now()
+        )
+        if not claimed:
+            continue
+
+        voucher_ids = list(
+            Voucher.objects.filter(coupon_vouchers__coupon_id=update.coupon_id).values_list('id', flat=True)
+        )
+        try:
+            replace_voucher_offers(voucher_ids, update.offer_id)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Failed to link the [%d] vouchers of coupon [%d] to offer [%d].',
+                             len(voucher_ids), update.coupon_id, update.offer_id)
+            update.status = CouponOfferUpdate.FAILED
+            failed += 1
+        else:
+            logger.info('Linked the [%d] vouchers of coupon [%d] to offer [%d].',
+                        len(voucher_ids), update.coupon_id, update.offer_id)
+            update.status = CouponOfferUpdate.PROCESSED
+            processed += 1
+
+        update.save(update_fields=['status', 'modified'])
+
+    return processed, failed
+
+
 def get_cached_voucher(code):
     """
-    Returns a voucher from cache if one is stored to cache, if not the voucher
-    is retrieved from database and stored to cache.
+    Returns a voucher from the voucher snapshot cache. If no snapshot is cached,
+    the voucher is retrieved from database and cached.
 
     Arguments:
         code (str): The code of a coupon voucher.
@@ -656,36 +779,31 @@ def get_cached_voucher(code):
     Raises:
         Voucher.DoesNotExist: When no vouchers with provided code exist.
     """
-    cache_key = 'voucher_{code}'.format(code=code)
-    cache_key = hashlib.md5(cache_key).hexdigest()
-    voucher = cache.get(cache_key)
-    if not voucher:
-        voucher = Voucher.objects.get(code=code)
-        cache.set(cache_key, voucher, settings.VOUCHER_CACHE_TIMEOUT)
-    return voucher
+    return get_voucher_snapshot(code).voucher
 
 
 def get_voucher_and_products_from_code(code):
     """
     Returns a voucher and product for a given code.
 
+    The voucher and its products are read from the voucher snapshot cache.
+
     Arguments:
         code (str): The code of a coupon voucher.
 
     Returns:
         voucher (Voucher): The Voucher for the passed code.
-        products (list): List of Products associated with the Voucher.
+        products (tuple): Products associated with the Voucher.
 
     Raises:
         Voucher.DoesNotExist: When no vouchers with provided code exist.
         ProductNotFoundError: When no products are associated with the voucher.
     """
-    voucher = get_cached_voucher(code)
-    voucher_range = voucher.offers.first().benefit.range
-    products = voucher_range.all_products()
+    snapshot = get_voucher_snapshot(code)
+    voucher_range = snapshot.range
 
-    if products or voucher_range.catalog_query or voucher_range.course_catalog:
+    if voucher_range and (snapshot.products or voucher_range.catalog_query or voucher_range.course_catalog):
         # List of products is empty in case of Multi-course coupon
-        return voucher, products
+        return snapshot.voucher, snapshot.products
     else:
         raise exceptions.ProductNotFoundError()
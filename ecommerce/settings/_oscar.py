@@ -253,6 +253,11 @@ OSCAR_DASHBOARD_NAVIGATION = [
         'icon': 'icon-bar-chart',
         'url_name': 'dashboard:reports-index',
     },
+    {
+        'label': _('Profiles'),
+        'icon': 'icon-time',
+        'url_name': 'dashboard:profiles:list',
+    },
 ]
 # END DASHBOARD NAVIGATION MENU
 
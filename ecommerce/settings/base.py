@@ -2,6 +2,7 @@
 import datetime
 import os
 import platform
+import tempfile
 from logging.handlers import SysLogHandler
 from os.path import abspath, basename, dirname, join, normpath
 from sys import path
@@ -213,12 +214,15 @@ TEMPLATES = [
 # MIDDLEWARE CONFIGURATION
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#middleware-classes
 MIDDLEWARE_CLASSES = (
+    # NOTE: This middleware MUST appear first, so that the calls made by the other middleware are accounted for.
+    'ecommerce.core.middleware.PerformanceInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.auth.middleware.SessionAuthenticationMiddleware',
+    'ecommerce.core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django_sites_extensions.middleware.CurrentSiteWithDefaultMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -230,12 +234,53 @@ MIDDLEWARE_CLASSES = (
     'social_django.middleware.SocialAuthExceptionMiddleware',
     'simple_history.middleware.HistoryRequestMiddleware',
     'threadlocals.middleware.ThreadLocalMiddleware',
+    'ecommerce.extensions.analytics.middleware.SegmentEventMiddleware',
     'ecommerce.theming.middleware.CurrentSiteThemeMiddleware',
     'ecommerce.theming.middleware.ThemePreviewMiddleware',
 )
 # END MIDDLEWARE CONFIGURATION
 
 
+# PERFORMANCE INSTRUMENTATION CONFIGURATION
+# Count and time the database queries, cache calls, and outbound HTTP calls made by each request.
+PERFORMANCE_INSTRUMENTATION_ENABLED = False
+
+# Requests making more queries, or taking more seconds, are logged as warnings. Budgets set to None are not enforced.
+PERFORMANCE_QUERY_BUDGET = 100
+PERFORMANCE_LATENCY_BUDGET = 2
+# Budgets of specific endpoints, keyed by view name, e.g. {'basket:summary': {'queries': 50, 'latency': 1}}.
+PERFORMANCE_ENDPOINT_BUDGETS = {}
+
+# Names of the services called by ecommerce, keyed by host. The hosts of the LMS, Discovery, and Enterprise services
+# are read from the site configuration, and settings.
+PERFORMANCE_INSTRUMENTATION_SERVICE_HOSTS = {
+    'api.sailthru.com': 'sailthru',
+    'api.segment.io': 'segment',
+    'ics2wsa.ic3.com': 'cybersource',
+    'ics2wstesta.ic3.com': 'cybersource',
+    'api.paypal.com': 'paypal',
+    'api.sandbox.paypal.com': 'paypal',
+}
+# END PERFORMANCE INSTRUMENTATION CONFIGURATION
+
+
+# PROFILING CONFIGURATION
+# Requests are profiled if the waffle flag is active for them, if they are sampled at the given rate, or if they are
+# made by staff users with the header set. Checking the flag reads it on every request, so the flag is only checked if
+# its name is set (e.g. to 'profile_requests').
+PROFILING_FLAG_NAME = None
+PROFILING_SAMPLE_RATE = 0
+PROFILING_HEADER = 'X-Profile-Request'
+
+# Seconds between samples of the stack of profiled requests.
+PROFILING_SAMPLE_INTERVAL = 0.005
+
+# Directory profiles are written to, and number of profiles kept in it.
+PROFILING_DIRECTORY = os.path.join(tempfile.gettempdir(), 'ecommerce-profiles')
+PROFILING_MAX_PROFILES = 100
+# END PROFILING CONFIGURATION
+
+
 # URL CONFIGURATION
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#root-urlconf
 ROOT_URLCONF = '{}.urls'.format(SITE_NAME)
@@ -252,10 +297,93 @@ PROVIDER_DATA_PROCESSING_TIMEOUT = 15  # Value is in seconds.
 CREDIT_PROVIDER_CACHE_TIMEOUT = 600
 # END URL CONFIGURATION
 
-VOUCHER_CACHE_TIMEOUT = 10  # Value is in seconds.
+# Cache timeout for snapshots of vouchers, and their offers and products. Snapshots are invalidated when any of these
+# change, so they can be kept for a long time.
+VOUCHER_CACHE_TIMEOUT = 60 * 60  # Value is in seconds.
+
+# Snapshots kept in the memory of a process are checked against the shared cache at most this often, so changes made
+# by other processes may take this long to be seen.
+VOUCHER_CACHE_REVALIDATION_INTERVAL = 5  # Value is in seconds.
+
+# Maximum number of voucher snapshots kept in the memory of each process.
+VOUCHER_CACHE_MAX_SIZE = 1000
+
+# Cache timeout for the shared counters of offer applications. Expired counters are re-seeded from order discounts.
+OFFER_APPLICATION_COUNTER_TIMEOUT = 60 * 60  # Value is in seconds.
+
+# Number of vouchers whose offers are replaced per batch when a coupon is updated.
+VOUCHER_OFFER_UPDATE_BATCH_SIZE = 1000
+
+# Coupons with more vouchers than this have their offers replaced by the process_coupon_offer_updates command, after
+# the update is committed, rather than within the request.
+COUPON_OFFER_UPDATE_ASYNC_THRESHOLD = 5000
+
+# Seconds after which queued coupon offer updates still being processed are assumed to have been abandoned by their
+# worker, and may be claimed again.
+COUPON_OFFER_UPDATE_PROCESSING_TIMEOUT = 30 * 60
+
+# Cache timeout for the per-site index of offers, used to determine which offers may apply to a basket.
+OFFER_INDEX_CACHE_TIMEOUT = 60 * 60  # Value is in seconds.
+
+# Cache timeout for pages of the courses offered by a voucher. Pages are invalidated along with voucher snapshots, but
+# seats may expire, so pages are only kept briefly.
+VOUCHER_OFFERS_CACHE_TIMEOUT = 5 * 60  # Value is in seconds.
+
+# Cache timeout for the IDs of the products in the catalog of a range.
+RANGE_CATALOG_CACHE_TIMEOUT = 60 * 60  # Value is in seconds.
 
 SDN_CHECK_REQUEST_TIMEOUT = 5  # Value is in seconds.
 
+# Timeout for requests to the LMS verification status API.
+VERIFICATION_STATUS_API_TIMEOUT = 3  # Value is in seconds.
+
+# Cache timeout for the status of users who are not verified. Statuses of verified users are cached until their
+# verifications expire.
+VERIFICATION_STATUS_NEGATIVE_CACHE_TIMEOUT = 60  # Value is in seconds.
+
+# Cache timeout for the order details rendered on receipt pages. Cached details are discarded when orders change.
+RECEIPT_CACHE_TIMEOUT = 60 * 60  # Value is in seconds.
+
+# Queued payment notifications still being processed after this long are assumed to have lost their worker, and are
+# claimed again. Failed notifications are attempted again after a delay, up to a maximum number of attempts.
+PAYMENT_NOTIFICATION_PROCESSING_TIMEOUT = 15 * 60  # Value is in seconds.
+PAYMENT_NOTIFICATION_RETRY_DELAY = 5 * 60  # Value is in seconds.
+PAYMENT_NOTIFICATION_MAX_ATTEMPTS = 3
+
+# Number of times the receipt page of a queued order refreshes itself before asking the learner to contact support.
+RECEIPT_PENDING_MAX_POLLS = 20
+
+# Cache timeouts for decisions of the LMS embargo API. Blocked baskets are re-checked sooner than allowed ones.
+EMBARGO_ALLOWED_CACHE_TIMEOUT = 5 * 60  # Value is in seconds.
+EMBARGO_DENIED_CACHE_TIMEOUT = 60  # Value is in seconds.
+
+# Calls to the LMS embargo API are skipped for EMBARGO_CIRCUIT_BREAKER_RESET_TIMEOUT seconds after this many of them
+# have failed.
+EMBARGO_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+EMBARGO_CIRCUIT_BREAKER_RESET_TIMEOUT = 60  # Value is in seconds.
+
+# Timeout for requests to the LMS embargo API.
+EMBARGO_API_TIMEOUT = 3  # Value is in seconds.
+
+# Payment processor instances are shared by requests for this long before they are rebuilt.
+PAYMENT_PROCESSOR_INSTANCE_CACHE_TIMEOUT = 5 * 60  # Value is in seconds.
+
+# Maximum number of refunds processed concurrently, per payment processor, when refunds are processed in bulk.
+REFUND_PROCESSING_MAX_WORKERS = 4
+
+# Bulk refund requests for more refunds than this are queued, and processed by the process_refunds command, rather than
+# processed while the request is handled.
+REFUND_BULK_PROCESSING_MAX_SYNC_REFUNDS = 100
+
+# Queued refunds still being processed after this long are assumed to have lost their worker, and are claimed again.
+REFUND_QUEUE_PROCESSING_TIMEOUT = 30 * 60  # Value is in seconds.
+
+# Maximum number of courses saved, and published to the LMS, concurrently when courses are published in bulk.
+COURSE_PUBLICATION_MAX_WORKERS = 4
+
+# Parsed CyberSource WSDL/XSD documents are cached in-process for this long.
+CYBERSOURCE_WSDL_CACHE_TIMEOUT = 24 * 60 * 60  # Value is in seconds.
+
 # APP CONFIGURATION
 DJANGO_APPS = [
     'django.contrib.admin',
@@ -67,6 +67,10 @@ PASSWORD_HASHERS = (
 
 # ORDER PROCESSING
 EDX_API_KEY = 'replace-me'
+
+# Data created by a test is not visible to other threads, since each test runs within a transaction.
+REFUND_PROCESSING_MAX_WORKERS = 1
+COURSE_PUBLICATION_MAX_WORKERS = 1
 # END ORDER PROCESSING
 
 
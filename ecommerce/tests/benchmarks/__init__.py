@@ -0,0 +1,10 @@
+"""
+Benchmarks of the code run for every purchase.
+
+Benchmarks are skipped unless the ENABLE_BENCHMARKS environment variable is set to True. Run them with:
+
+    make benchmark
+
+Each scenario reports its wall time, number of queries, and allocations, and fails if these exceed the baselines
+stored in baselines.json. Set UPDATE_BENCHMARK_BASELINES to True to store the results of a run as the new baselines.
+"""
@@ -0,0 +1,83 @@
+from __future__ import unicode_literals
+
+import urllib
+
+from django.core.urlresolvers import reverse
+from oscar.core.loading import get_class, get_model
+from oscar.test.factories import BenefitFactory, ConditionalOfferFactory, ConditionFactory, RangeFactory
+
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.basket.utils import prepare_basket
+from ecommerce.extensions.catalogue.models import Catalog
+from ecommerce.extensions.test.factories import create_basket, prepare_voucher
+from ecommerce.tests.benchmarks.testcases import BenchmarkTestCase
+
+Applicator = get_class('offer.utils', 'Applicator')
+Benefit = get_model('offer', 'Benefit')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+
+
+class BasketBenchmarks(BenchmarkTestCase):
+    """ Benchmarks of basket preparation, and of the application of offers to baskets. """
+    num_seats = 5
+    num_site_offers = 10
+
+    def setUp(self):
+        super(BasketBenchmarks, self).setUp()
+        self.user = self.create_user()
+        self.request.user = self.user
+
+        self.seats = [
+            CourseFactory(site=self.site).create_or_update_seat('verified', True, 100, self.partner)
+            for __ in range(self.num_seats)
+        ]
+
+        catalog = Catalog.objects.create(partner=self.partner)
+        for seat in self.seats[::2]:
+            catalog.stock_records.add(seat.stockrecords.first())
+
+        # Site offers whose ranges contain some of the seats, either through a catalog or a list of products.
+        for index in range(self.num_site_offers):
+            if index % 2:
+                offer_range = RangeFactory(products=self.seats[index % self.num_seats:][:2])
+            else:
+                offer_range = RangeFactory(catalog=catalog)
+
+            ConditionalOfferFactory(
+                name='Site offer {}'.format(index),
+                offer_type=ConditionalOffer.SITE,
+                benefit=BenefitFactory(type=Benefit.PERCENTAGE, range=offer_range, value=1),
+                condition=ConditionFactory(type=Condition.COUNT, range=offer_range, value=1),
+            )
+
+        self.voucher, __ = prepare_voucher(code='BENCHMARK', _range=RangeFactory(products=self.seats), benefit_value=10)
+
+    def test_prepare_basket(self):
+        self.benchmark('prepare_basket', lambda: prepare_basket(self.request, self.seats, self.voucher))
+
+    def test_applicator(self):
+        basket = create_basket(owner=self.user, site=self.site, empty=True)
+        for seat in self.seats:
+            basket.add_product(seat)
+
+        self.benchmark(
+            'applicator', lambda: Applicator().apply(basket, self.user, self.request),
+            setup=basket.reset_offer_applications
+        )
+
+    def test_basket_calculate_view(self):
+        self.client.login(username=self.user.username, password=self.password)
+        url = '{path}?{qs}'.format(
+            path=reverse('api:v2:baskets:calculate'),
+            qs=urllib.urlencode({
+                'sku': [seat.stockrecords.first().partner_sku for seat in self.seats],
+                'code': self.voucher.code,
+            }, True)
+        )
+
+        def calculate():
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+        self.benchmark('basket_calculate_view', calculate)
@@ -0,0 +1,58 @@
+from __future__ import unicode_literals
+
+import httpretty
+from oscar.core.loading import get_class, get_model
+from oscar.test.factories import RangeFactory
+
+from ecommerce.core.url_utils import get_lms_enrollment_api_url
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.api.serializers import OrderSerializer
+from ecommerce.extensions.fulfillment.modules import EnrollmentFulfillmentModule
+from ecommerce.extensions.test.factories import create_basket, create_order, prepare_voucher
+from ecommerce.tests.benchmarks.testcases import BenchmarkTestCase
+
+Applicator = get_class('offer.utils', 'Applicator')
+Order = get_model('order', 'Order')
+
+
+class OrderBenchmarks(BenchmarkTestCase):
+    """ Benchmarks of the serialization, and fulfillment, of placed orders. """
+    num_seats = 5
+
+    def setUp(self):
+        super(OrderBenchmarks, self).setUp()
+        self.user = self.create_user()
+        self.request.user = self.user
+
+        seats = [
+            CourseFactory(site=self.site).create_or_update_seat('verified', True, 100, self.partner)
+            for __ in range(self.num_seats)
+        ]
+        voucher, __ = prepare_voucher(code='BENCHMARK', _range=RangeFactory(products=seats), benefit_value=10)
+
+        basket = create_basket(owner=self.user, site=self.site, empty=True)
+        for seat in seats:
+            basket.add_product(seat)
+        basket.vouchers.add(voucher)
+        Applicator().apply(basket, self.user, self.request)
+
+        self.order = create_order(basket=basket, user=self.user)
+
+    def test_order_serializer(self):
+        def serialize():
+            order = Order.objects.get(id=self.order.id)
+            return OrderSerializer(order, context={'request': self.request}).data
+
+        self.benchmark('order_serializer', serialize)
+
+    @httpretty.activate
+    def test_enrollment_fulfillment(self):
+        httpretty.register_uri(
+            httpretty.POST, get_lms_enrollment_api_url(), status=200, body='{}', content_type='application/json'
+        )
+
+        def fulfill():
+            order = Order.objects.get(id=self.order.id)
+            EnrollmentFulfillmentModule().fulfill_product(order, list(order.lines.all()))
+
+        self.benchmark('enrollment_fulfillment', fulfill)
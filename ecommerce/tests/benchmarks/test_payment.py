@@ -0,0 +1,32 @@
+from __future__ import unicode_literals
+
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.payment.tests.mixins import CybersourceMixin
+from ecommerce.extensions.test.factories import create_basket
+from ecommerce.tests.benchmarks.testcases import BenchmarkTestCase
+
+
+class CybersourceBenchmarks(CybersourceMixin, BenchmarkTestCase):
+    """ Benchmarks of the signing, and verification, of CyberSource messages. """
+    iterations = 200
+
+    def setUp(self):
+        super(CybersourceBenchmarks, self).setUp()
+        self.processor = Cybersource(self.site)
+
+        basket = create_basket(owner=self.create_user(), site=self.site, empty=True)
+        basket.add_product(CourseFactory(site=self.site).create_or_update_seat('verified', True, 100, self.partner))
+        self.notification = self.generate_notification(basket, billing_address=self.make_billing_address())
+
+    def test_generate_signature(self):
+        self.benchmark(
+            'cybersource_generate_signature',
+            lambda: self.processor._generate_signature(self.notification, False)  # pylint: disable=protected-access
+        )
+
+    def test_is_signature_valid(self):
+        self.benchmark(
+            'cybersource_is_signature_valid',
+            lambda: self.assertTrue(self.processor.is_signature_valid(self.notification))
+        )
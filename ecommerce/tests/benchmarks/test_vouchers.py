@@ -0,0 +1,73 @@
+from __future__ import unicode_literals
+
+import datetime
+
+from oscar.core.loading import get_model
+from oscar.test.factories import ConditionalOfferFactory
+
+from ecommerce.coupons.tests.mixins import CouponMixin
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue.models import Catalog
+from ecommerce.extensions.voucher.models import CouponVouchers
+from ecommerce.extensions.voucher.utils import create_vouchers, generate_coupon_report, replace_voucher_offers
+from ecommerce.tests.benchmarks.testcases import BenchmarkTestCase
+
+Benefit = get_model('offer', 'Benefit')
+Voucher = get_model('voucher', 'Voucher')
+
+
+class VoucherBenchmarks(CouponMixin, BenchmarkTestCase):
+    """ Benchmarks of the creation of vouchers, of the replacement of their offers, and of coupon reports. """
+    iterations = 5
+    quantity = 50
+    # Numbers of vouchers whose offers are replaced, to measure how the update time grows with the size of coupons.
+    offer_update_quantities = (10, 100, 1000)
+
+    def setUp(self):
+        super(VoucherBenchmarks, self).setUp()
+        self.catalog = Catalog.objects.create(partner=self.partner)
+        for __ in range(3):
+            seat = CourseFactory(site=self.site).create_or_update_seat('verified', True, 100, self.partner)
+            self.catalog.stock_records.add(seat.stockrecords.first())
+
+    def test_create_vouchers(self):
+        coupon = self.create_coupon(catalog=self.catalog, quantity=1)
+
+        self.benchmark('create_vouchers', lambda: create_vouchers(
+            benefit_type=Benefit.PERCENTAGE,
+            benefit_value=50,
+            catalog=self.catalog,
+            coupon=coupon,
+            end_datetime=datetime.datetime.now() + datetime.timedelta(days=30),
+            enterprise_customer=None,
+            name='Benchmark',
+            quantity=self.quantity,
+            start_datetime=datetime.datetime.now(),
+            voucher_type=Voucher.SINGLE_USE,
+        ))
+
+    def test_generate_coupon_report(self):
+        coupon = self.create_coupon(catalog=self.catalog, quantity=self.quantity)
+        coupon.history.all().update(history_user=self.create_user(full_name='Benchmark User'))
+        coupon_vouchers = CouponVouchers.objects.filter(coupon=coupon)
+
+        self.benchmark('generate_coupon_report', lambda: generate_coupon_report(coupon_vouchers))
+
+    def benchmark_replace_voucher_offers(self, quantity):
+        coupon = self.create_coupon(catalog=self.catalog, quantity=quantity, title='Benchmark {}'.format(quantity))
+        vouchers = coupon.attr.coupon_vouchers.vouchers
+        voucher_ids = list(vouchers.values_list('id', flat=True))
+        old_offer_id = vouchers.first().offers.first().id
+        new_offer = ConditionalOfferFactory(name='Benchmark {}'.format(quantity))
+
+        # The vouchers are linked back to their original offer before each run, so that every run replaces it.
+        self.benchmark(
+            'replace_voucher_offers_{}'.format(quantity),
+            lambda: replace_voucher_offers(voucher_ids, new_offer.id),
+            setup=lambda: replace_voucher_offers(voucher_ids, old_offer_id),
+            iterations=20,
+        )
+
+    def test_replace_voucher_offers(self):
+        for quantity in self.offer_update_quantities:
+            self.benchmark_replace_voucher_offers(quantity)
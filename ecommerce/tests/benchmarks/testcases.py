@@ -0,0 +1,144 @@
+from __future__ import unicode_literals
+
+import gc
+import json
+import os
+import sys
+import time
+from unittest import SkipTest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ecommerce.tests.testcases import TestCase
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+
+def _get_tolerance(name, default):
+    return float(os.environ.get(name, default))
+
+
+class BenchmarkTestCase(TestCase):
+    """
+    Base test case for benchmarks.
+
+    Wall time varies between machines, so scenarios only fail if they are several times slower than their baseline,
+    as set by the BENCHMARK_TIME_TOLERANCE environment variable. Query counts are exact, and must not increase.
+    """
+    # Number of timed runs of each scenario. The median run time is reported.
+    iterations = 20
+
+    # Results of the scenarios run by this class, keyed by scenario name.
+    results = None
+
+    @classmethod
+    def setUpClass(cls):
+        if os.environ.get('ENABLE_BENCHMARKS') != 'True':
+            raise SkipTest('Benchmarks are only run if ENABLE_BENCHMARKS is True.')
+
+        cls.results = {}
+        super(BenchmarkTestCase, cls).setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(BenchmarkTestCase, cls).tearDownClass()
+
+        if os.environ.get('UPDATE_BENCHMARK_BASELINES') == 'True':
+            baselines = cls.load_baselines()
+            baselines.update(cls.results)
+
+            with open(BASELINES_PATH, 'w') as baselines_file:
+                json.dump(baselines, baselines_file, indent=4, sort_keys=True, separators=(',', ': '))
+                baselines_file.write('\n')
+
+    @classmethod
+    def load_baselines(cls):
+        if not os.path.exists(BASELINES_PATH):
+            return {}
+
+        with open(BASELINES_PATH, 'r') as baselines_file:
+            return json.load(baselines_file)
+
+    def measure_allocations(self, func):
+        """
+        Returns the number of objects allocated by the given function which outlive it, or which can only be freed by
+        the garbage collector.
+
+        Python 2 has no tracemalloc, so allocations are measured with the garbage collector's count of the container
+        objects it tracks.
+        """
+        gc.collect()
+        gc.disable()
+        try:
+            allocated = gc.get_count()[0]
+            func()
+            return gc.get_count()[0] - allocated
+        finally:
+            gc.enable()
+
+    def benchmark(self, scenario, func, setup=None, iterations=None):
+        """
+        Runs, and measures, the given scenario, and verifies it has not regressed from its baseline.
+
+        The scenario is run once to warm up caches and lazily-loaded modules before it is measured.
+
+        Arguments:
+            scenario (str): unique name of the scenario, used to look up its baseline
+            func (callable): runs the scenario
+            setup (callable): called before each run of the scenario, without being measured
+            iterations (int): number of timed runs. Defaults to the iterations attribute of the class.
+
+        Returns:
+            dict: the median wall time in milliseconds, the number of queries, and the number of allocations.
+        """
+        setup = setup or (lambda: None)
+
+        setup()
+        func()
+
+        setup()
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        # Queries are counted now, since requests made by later runs clear the query log.
+        num_queries = len(queries)
+
+        setup()
+        allocations = self.measure_allocations(func)
+
+        durations = []
+        for __ in range(iterations or self.iterations):
+            setup()
+            started = time.time()
+            func()
+            durations.append(time.time() - started)
+
+        result = {
+            'time': round(sorted(durations)[len(durations) // 2] * 1000, 3),
+            'queries': num_queries,
+            'allocations': allocations,
+        }
+        self.results[scenario] = result
+
+        sys.stderr.write('\n{scenario}: {time} ms, {queries} queries, {allocations} allocations\n'.format(
+            scenario=scenario, **result
+        ))
+
+        baseline = self.load_baselines().get(scenario)
+        if baseline and os.environ.get('UPDATE_BENCHMARK_BASELINES') != 'True':
+            self.assertLessEqual(
+                result['queries'], baseline['queries'],
+                'Scenario [{}] ran more queries than its baseline.'.format(scenario)
+            )
+            self.assertLessEqual(
+                result['time'], baseline['time'] * _get_tolerance('BENCHMARK_TIME_TOLERANCE', 3),
+                'Scenario [{}] was slower than its baseline.'.format(scenario)
+            )
+            # Objects allocated by other threads are also counted, so small scenarios are given some leeway.
+            self.assertLessEqual(
+                result['allocations'],
+                baseline['allocations'] * _get_tolerance('BENCHMARK_ALLOCATION_TOLERANCE', 1.5) + 250,
+                'Scenario [{}] allocated more objects than its baseline.'.format(scenario)
+            )
+
+        return result
@@ -0,0 +1,19 @@
+"""
+Load tests of the purchase flows, run against local stand-ins for the LMS, Discovery, Enterprise, and CyberSource.
+
+Load tests are skipped unless the ENABLE_LOAD_TESTS environment variable is set to True. Run them with:
+
+    make load_test
+
+Each scenario reports its throughput, the latency percentiles of its iterations and steps, and the number of database
+queries they make. The load is set with the following environment variables:
+
+    LOAD_TEST_USERS: number of concurrent virtual users (default: 1)
+    LOAD_TEST_ITERATIONS: number of iterations run by each virtual user (default: 10)
+    LOAD_TEST_LATENCY: seconds each stub takes to respond (default: 0.05)
+    LOAD_TEST_FAILURE_RATE: share, between 0 and 1, of the stub responses which fail (default: 0)
+    LOAD_TEST_REPORT: path of a JSON file the reports are written to
+
+Concurrent virtual users need a database shared by threads, e.g. MySQL, selected with the DB_ENGINE, DB_NAME,
+DB_USER, DB_PASSWORD, DB_HOST, and DB_PORT environment variables, since the in-memory SQLite test database is not.
+"""
@@ -0,0 +1,198 @@
+"""
+Runs load test scenarios, and reports their throughput, latency, and database queries.
+"""
+from __future__ import unicode_literals
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from ecommerce.core.utils import map_concurrently
+
+PERCENTILES = (50, 90, 95, 99,)
+
+
+class ScenarioError(Exception):
+    """ Raised when a step of a scenario does not have the expected outcome. """
+    pass
+
+
+def percentile(values, percent):
+    """ Returns the given percentile of the values, using the nearest-rank method. """
+    if not values:
+        return None
+
+    values = sorted(values)
+    rank = max(1, int(round(percent / 100.0 * len(values))))
+    return values[rank - 1]
+
+
+def summarize_latencies(latencies):
+    """ Returns the percentiles, and maximum, of the given latencies, in milliseconds. """
+    summary = {'p{}'.format(percent): percentile(latencies, percent) for percent in PERCENTILES}
+    summary['max'] = max(latencies) if latencies else None
+    return {key: round(value * 1000, 1) if value is not None else None for key, value in summary.items()}
+
+
+class Statistics(object):
+    """ Measurements of the requests and iterations of a scenario, shared by all virtual users. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Steps are reported in the order in which they are first run.
+        self.steps = OrderedDict()
+        self.iterations = []
+        self.errors = {}
+
+    def record_request(self, step, latency, num_queries):
+        with self._lock:
+            measurements = self.steps.setdefault(step, {'latencies': [], 'queries': 0})
+            measurements['latencies'].append(latency)
+            measurements['queries'] += num_queries
+
+    def record_iteration(self, latency, error=None):
+        with self._lock:
+            if error:
+                message = '{}: {}'.format(error.__class__.__name__, error)
+                self.errors[message] = self.errors.get(message, 0) + 1
+            else:
+                self.iterations.append(latency)
+
+
+class Session(object):
+    """
+    A learner's browser session.
+
+    Each request made to ecommerce is timed, and its database queries are counted. Requests are handled in the thread
+    making them, so only the queries made on behalf of the learner are counted.
+    """
+
+    def __init__(self, site, user, password, statistics):
+        self.client = Client(SERVER_NAME=site.domain)
+        self.client.login(username=user.username, password=password)
+        self.statistics = statistics
+
+    def request(self, step, method, path, data=None, expected_status=200):
+        """
+        Makes a request to ecommerce.
+
+        Arguments:
+            step (str): name of the step, under which the request is reported
+            method (str): HTTP method
+            path (str): path, and query string, of the URL
+            data (dict): data posted
+            expected_status (int): status of a successful response
+
+        Returns:
+            HttpResponse
+
+        Raises:
+            ScenarioError: if the response does not have the expected status
+        """
+        with CaptureQueriesContext(connection) as queries:
+            started = time.time()
+            response = getattr(self.client, method)(path, data or {})
+            latency = time.time() - started
+        self.statistics.record_request(step, latency, len(queries))
+
+        if response.status_code != expected_status:
+            raise ScenarioError('[{step}] responded with HTTP {status}.'.format(
+                step=step, status=response.status_code
+            ))
+
+        return response
+
+
+def _run_user(scenario, contexts, statistics):
+    """ Runs the iterations of a single virtual user, one after the other. """
+    for context in contexts:
+        session = Session(scenario.site, context['user'], scenario.password, statistics)
+
+        started = time.time()
+        try:
+            scenario.run(session, context)
+        except Exception as error:  # pylint: disable=broad-except
+            statistics.record_iteration(time.time() - started, error=error)
+        else:
+            statistics.record_iteration(time.time() - started)
+
+
+def run_scenario(scenario, users=1, iterations=10):
+    """
+    Runs a scenario with concurrent virtual users, and reports its performance.
+
+    Fixtures are created before the scenario starts, and are not measured.
+
+    Arguments:
+        scenario (Scenario): scenario to run
+        users (int): number of virtual users running the scenario concurrently
+        iterations (int): number of times each virtual user runs the scenario
+
+    Returns:
+        dict: the number of iterations completed, and of errors by message, the throughput in iterations per
+            second, the latency percentiles of iterations in milliseconds, the total number of queries, and the
+            number of requests, latency percentiles, and queries of each step.
+    """
+    contexts = scenario.prepare(users * iterations)
+    statistics = Statistics()
+
+    started = time.time()
+    map_concurrently(
+        lambda user_contexts: _run_user(scenario, user_contexts, statistics),
+        [contexts[index::users] for index in range(users)],
+        users
+    )
+    duration = time.time() - started
+
+    total_queries = sum(measurements['queries'] for measurements in statistics.steps.values())
+
+    return {
+        'scenario': scenario.name,
+        'users': users,
+        'iterations': len(statistics.iterations),
+        'errors': statistics.errors,
+        'duration': round(duration, 3),
+        'throughput': round(len(statistics.iterations) / duration, 2) if duration else None,
+        'latency': summarize_latencies(statistics.iterations),
+        'queries': total_queries,
+        'queries_per_iteration': round(total_queries / float(len(contexts)), 1) if contexts else None,
+        'steps': OrderedDict(
+            (step, dict(
+                requests=len(measurements['latencies']),
+                queries=measurements['queries'],
+                **summarize_latencies(measurements['latencies'])
+            ))
+            for step, measurements in statistics.steps.items()
+        ),
+    }
+
+
+def format_report(report):
+    """ Returns a human-readable summary of the given scenario report. """
+    lines = [
+        'Scenario [{scenario}]: {iterations} iterations by {users} users in {duration} seconds, '
+        '{throughput} iterations per second, {queries} queries ({queries_per_iteration} per iteration).'.format(
+            **report
+        ),
+        '    {:<20}{:>10}{:>10}{:>10}{:>10}{:>10}{:>10}{:>10}'.format(
+            'step', 'requests', 'p50 ms', 'p90 ms', 'p95 ms', 'p99 ms', 'max ms', 'queries'
+        ),
+    ]
+
+    rows = list(report['steps'].items())
+    rows.append(('(iteration)', dict(requests=report['iterations'], queries=report['queries'], **report['latency'])))
+    for step, measurements in rows:
+        # Latencies are missing if no request, or iteration, completed.
+        measurements = {key: '-' if value is None else value for key, value in measurements.items()}
+        lines.append('    {:<20}{requests:>10}{p50:>10}{p90:>10}{p95:>10}{p99:>10}{max:>10}{queries:>10}'.format(
+            step, **measurements
+        ))
+
+    for message, count in sorted(report['errors'].items()):
+        lines.append('    {count} errors: {message}'.format(count=count, message=message))
+
+    return '\n'.join(lines)
@@ -0,0 +1,215 @@
+"""
+Scenarios run by load tests.
+
+Each scenario creates its fixtures ahead of time, then runs the requests a learner's browser would make to complete
+a purchase, one iteration per learner.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import json
+import urllib
+import uuid
+
+from django.core.urlresolvers import reverse
+from oscar.core.loading import get_model
+from oscar.test.factories import CountryFactory, UserFactory
+
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue.utils import create_coupon_product
+from ecommerce.extensions.test.factories import PercentageDiscountBenefitWithoutRangeFactory, ProgramOfferFactory
+from ecommerce.tests.load.runner import ScenarioError
+
+Basket = get_model('basket', 'Basket')
+Benefit = get_model('offer', 'Benefit')
+Category = get_model('catalogue', 'Category')
+Voucher = get_model('voucher', 'Voucher')
+
+BILLING_ADDRESS = {
+    'first_name': 'Load',
+    'last_name': 'Tester',
+    'address_line1': '141 Portland Ave.',
+    'address_line2': 'Floor 9',
+    'city': 'Cambridge',
+    'state': 'MA',
+    'postal_code': '02139',
+    'country': 'US',
+}
+
+
+class Scenario(object):
+    """ Base class of the load test scenarios. """
+    name = None
+    password = 'load-test'
+
+    # Number of courses whose seats are purchased.
+    num_courses = 5
+
+    def __init__(self, site, partner):
+        self.site = site
+        self.partner = partner
+        self.seats = []
+
+    def create_seats(self):
+        self.seats = [
+            CourseFactory(site=self.site).create_or_update_seat('verified', True, 100, self.partner)
+            for __ in range(self.num_courses)
+        ]
+        return self.seats
+
+    def create_learner(self):
+        return UserFactory(password=self.password)
+
+    def prepare(self, count):
+        """
+        Creates the fixtures used by the given number of iterations.
+
+        Returns:
+            list: one dict per iteration, with the learner running the iteration, and the data it uses.
+        """
+        raise NotImplementedError
+
+    def run(self, session, context):
+        """
+        Runs a single iteration.
+
+        Arguments:
+            session (Session): the learner's browser session
+            context (dict): data used by the iteration
+
+        Raises:
+            ScenarioError: if the purchase is not completed
+        """
+        raise NotImplementedError
+
+    def get_sku(self, index):
+        return self.seats[index % len(self.seats)].stockrecords.first().partner_sku
+
+    def assert_redirected_to_receipt(self, response):
+        location = response['Location']
+        if reverse('checkout:receipt') not in location:
+            raise ScenarioError('Redirected to [{}] instead of the receipt page.'.format(location))
+        return location
+
+
+class CheckoutScenario(Scenario):
+    """
+    A learner adds a seat to their basket, pays for it with CyberSource, and views their receipt. Their order is
+    fulfilled by enrolling them in the course.
+
+    The seats are part of a program, whose offer is evaluated, but not applied, as baskets only contain a single seat.
+    """
+    name = 'checkout'
+
+    def __init__(self, site, partner, cybersource, discovery):
+        """
+        Arguments:
+            cybersource (CybersourceStub): stand-in for CyberSource, paying for baskets
+            discovery (DiscoveryStub): stand-in for Discovery, serving the program of the seats
+        """
+        super(CheckoutScenario, self).__init__(site, partner)
+        self.cybersource = cybersource
+        self.discovery = discovery
+
+    def prepare(self, count):
+        CountryFactory(iso_3166_1_a2=BILLING_ADDRESS['country'], printable_name='United States')
+
+        seats = self.create_seats()
+        program_uuid = str(uuid.uuid4())
+        self.discovery.programs[program_uuid] = {
+            'uuid': program_uuid,
+            'title': 'Load Test Program',
+            'type': 'MicroMasters',
+            'courses': [
+                {'course_runs': [{
+                    'key': seat.course_id,
+                    'seats': [{'type': 'verified', 'sku': seat.stockrecords.first().partner_sku}],
+                }]}
+                for seat in seats
+            ],
+            'applicable_seat_types': ['verified'],
+        }
+        ProgramOfferFactory(
+            benefit=PercentageDiscountBenefitWithoutRangeFactory(value=10),
+            condition__program_uuid=program_uuid
+        )
+
+        return [{'user': self.create_learner(), 'sku': self.get_sku(index)} for index in range(count)]
+
+    def run(self, session, context):
+        session.request(
+            'add_to_basket', 'get', '{}?{}'.format(reverse('basket:single-item'), urllib.urlencode({
+                'sku': context['sku']
+            })),
+            expected_status=303
+        )
+        session.request('basket', 'get', reverse('basket:summary'))
+
+        basket_id = Basket.objects.filter(
+            owner=context['user'], site=self.site, status=Basket.OPEN
+        ).values_list('id', flat=True).latest('id')
+        data = dict(BILLING_ADDRESS, basket=basket_id)
+        response = session.request('submit_payment', 'post', reverse('cybersource:submit'), data)
+
+        notification = self.cybersource.pay(json.loads(response.content)['form_fields'])
+        response = session.request(
+            'payment_notification', 'post', reverse('cybersource:redirect'), notification, expected_status=302
+        )
+
+        session.request('receipt', 'get', self.assert_redirected_to_receipt(response))
+
+
+class CouponRedemptionScenario(Scenario):
+    """
+    A learner views the offer of a coupon, redeems it for a free seat, and views their receipt. Their order is
+    fulfilled by enrolling them in the course.
+
+    The coupon is dynamic: its seats are found by a catalog query run by Discovery.
+    """
+    name = 'coupon_redemption'
+
+    def prepare(self, count):
+        self.create_seats()
+
+        coupon = create_coupon_product(
+            benefit_type=Benefit.PERCENTAGE,
+            benefit_value=100,
+            catalog=None,
+            catalog_query='*:*',
+            category=Category.add_root(name='Load Test Coupons'),
+            code='',
+            course_catalog=None,
+            course_seat_types='verified',
+            email_domains=None,
+            end_datetime=datetime.datetime.now() + datetime.timedelta(days=30),
+            enterprise_customer=None,
+            max_uses=None,
+            note=None,
+            partner=self.partner,
+            price=100,
+            program_uuid=None,
+            quantity=count,
+            start_datetime=datetime.datetime.now() - datetime.timedelta(days=1),
+            title='Load Test Coupon',
+            voucher_type=Voucher.SINGLE_USE,
+        )
+        codes = list(coupon.attr.coupon_vouchers.vouchers.order_by('id').values_list('code', flat=True))
+
+        return [
+            {'user': self.create_learner(), 'code': code, 'sku': self.get_sku(index)}
+            for index, code in enumerate(codes)
+        ]
+
+    def run(self, session, context):
+        session.request(
+            'offer', 'get', '{}?{}'.format(reverse('coupons:offer'), urllib.urlencode({'code': context['code']}))
+        )
+        response = session.request(
+            'redeem', 'get', '{}?{}'.format(reverse('coupons:redeem'), urllib.urlencode({
+                'code': context['code'],
+                'sku': context['sku'],
+            })),
+            expected_status=302
+        )
+
+        session.request('receipt', 'get', self.assert_redirected_to_receipt(response))
@@ -0,0 +1,300 @@
+"""
+Local stand-ins for the services called by ecommerce.
+
+Each stub is a small HTTP server, listening on an ephemeral local port, which implements the endpoints ecommerce calls
+with canned, but well-formed, responses. Every response can be delayed, and a share of them can fail, to reproduce
+slow or unreliable services.
+"""
+from __future__ import unicode_literals
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+from urllib import unquote
+from urlparse import parse_qs, urlparse
+
+from ecommerce.extensions.payment.helpers import sign
+
+
+class _ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, stub):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), _StubRequestHandler)
+        self.stub = stub
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else ''
+
+        status, data = self.server.stub.handle(self.command, unquote(url.path), parse_qs(url.query), body)
+        content = json.dumps(data)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_DELETE = do_GET = do_PATCH = do_POST = do_PUT = _respond
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        # Stubs serve thousands of requests during a load test; logging each of them would drown the report.
+        pass
+
+
+class StubServer(object):
+    """
+    Base class of the stub servers.
+
+    Subclasses list their endpoints in ``routes``, as tuples of an HTTP method, a regular expression matched against
+    the path of the request, and the name of the method returning the status and data of the response. Named groups of
+    the expression are passed to the method as keyword arguments, along with the query and body of the request.
+    """
+    routes = ()
+
+    def __init__(self, latency=0, failure_rate=0):
+        """
+        Arguments:
+            latency (float): seconds each response is delayed by
+            failure_rate (float): share, between 0 and 1, of the requests answered with an HTTP 503 error
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._routes = [(method, re.compile(pattern), handler) for method, pattern, handler in self.routes]
+        self._server = None
+
+    @property
+    def url(self):
+        """ Root URL of the server. """
+        host, port = self._server.server_address
+        return 'http://{host}:{port}'.format(host=host, port=port)
+
+    def start(self):
+        self._server = _ThreadedHTTPServer(self)
+
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def handle(self, method, path, query, body):
+        """
+        Returns the status, and the data, of the response to the given request.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                with self._lock:
+                    self.requests[handler] = self.requests.get(handler, 0) + 1
+
+                if random.random() < self.failure_rate:
+                    return 503, {'detail': 'Service unavailable.'}
+
+                return getattr(self, handler)(query=query, body=body, **match.groupdict())
+
+        return 404, {'detail': 'Not found.'}
+
+
+class LmsStub(StubServer):
+    """
+    Stands in for the LMS: its OAuth 2.0 provider, and its enrollment, embargo, credit, course, and user APIs.
+    """
+    routes = (
+        ('POST', r'^/oauth2/access_token/?$', 'access_token'),
+        ('POST', r'^/api/enrollment/v1/enrollment/?$', 'enroll'),
+        ('GET', r'^/api/embargo/v1/course_access/?$', 'course_access'),
+        ('GET', r'^/api/credit/v1/providers/?$', 'list_credit_providers'),
+        ('GET', r'^/api/credit/v1/providers/(?P<provider_id>[^/]+)/?$', 'credit_provider'),
+        ('GET', r'^/api/courses/v1/courses/?$', 'list_courses'),
+        ('GET', r'^/api/courses/v1/courses/(?P<course_id>[^/]+)/?$', 'course'),
+        ('GET', r'^/api/user/v1/accounts/(?P<username>[^/]+)/?$', 'account'),
+    )
+
+    def __init__(self, credit_providers=None, courses=None, **kwargs):
+        """
+        Arguments:
+            credit_providers (list): credit providers, as returned by the Credit API
+            courses (list): courses, as returned by the Course API
+        """
+        super(LmsStub, self).__init__(**kwargs)
+        self.credit_providers = credit_providers or []
+        self.courses = courses or []
+
+    def access_token(self, **kwargs):  # pylint: disable=unused-argument
+        return 200, {'access_token': 'load-test-token', 'expires_in': 3600, 'token_type': 'JWT'}
+
+    def enroll(self, body, **kwargs):  # pylint: disable=unused-argument
+        return 200, json.loads(body or '{}')
+
+    def account(self, username, **kwargs):  # pylint: disable=unused-argument
+        return 200, {'username': username, 'is_active': True}
+
+    def course_access(self, **kwargs):  # pylint: disable=unused-argument
+        return 200, {'access': True}
+
+    def list_credit_providers(self, **kwargs):  # pylint: disable=unused-argument
+        return 200, self.credit_providers
+
+    def credit_provider(self, provider_id, **kwargs):  # pylint: disable=unused-argument
+        for provider in self.credit_providers:
+            if provider['id'] == provider_id:
+                return 200, provider
+        return 404, {'detail': 'Not found.'}
+
+    def list_courses(self, **kwargs):  # pylint: disable=unused-argument
+        return 200, {'results': self.courses, 'pagination': {'count': len(self.courses), 'next': None, 'num_pages': 1}}
+
+    def course(self, course_id, **kwargs):  # pylint: disable=unused-argument
+        for course in self.courses:
+            if course['course_id'] == course_id:
+                return 200, course
+
+        # Unknown courses are described with placeholders, so that any course can be purchased.
+        return 200, {
+            'course_id': course_id,
+            'name': 'Course {}'.format(course_id),
+            'short_description': 'Load test course',
+            'media': {'image': {'raw': ''}},
+            'start': '2013-02-05T05:00:00Z',
+            'enrollment_end': None,
+        }
+
+
+class DiscoveryStub(StubServer):
+    """
+    Stands in for the Discovery (course catalog) service. Every course run belongs to every catalog, and to every
+    catalog query.
+    """
+    routes = (
+        ('GET', r'^/course_runs/contains/?$', 'course_runs_contains'),
+        ('GET', r'^/catalogs/?$', 'catalogs'),
+        ('GET', r'^/catalogs/(?P<catalog_id>\d+)/?$', 'catalog'),
+        ('GET', r'^/catalogs/(?P<catalog_id>\d+)/contains/?$', 'catalog_contains'),
+        ('GET', r'^/programs/(?P<program_uuid>[^/]+)/?$', 'program'),
+    )
+
+    def __init__(self, programs=None, **kwargs):
+        """
+        Arguments:
+            programs (dict): programs, as returned by the Programs API, keyed by UUID
+        """
+        super(DiscoveryStub, self).__init__(**kwargs)
+        self.programs = programs or {}
+
+    def _get_ids(self, query, name):
+        return [course_id for value in query.get(name, []) for course_id in value.split(',') if course_id]
+
+    def course_runs_contains(self, query, **kwargs):  # pylint: disable=unused-argument
+        return 200, {'course_runs': {course_id: True for course_id in self._get_ids(query, 'course_run_ids')}}
+
+    def catalogs(self, **kwargs):  # pylint: disable=unused-argument
+        catalog = self.catalog('1')[1]
+        return 200, {'count': 1, 'next': None, 'previous': None, 'results': [catalog]}
+
+    def catalog(self, catalog_id, **kwargs):  # pylint: disable=unused-argument
+        return 200, {'id': int(catalog_id), 'name': 'Catalog {}'.format(catalog_id), 'query': '*:*'}
+
+    def catalog_contains(self, query, **kwargs):  # pylint: disable=unused-argument
+        return 200, {'courses': {course_id: True for course_id in self._get_ids(query, 'course_run_id')}}
+
+    def program(self, program_uuid, **kwargs):  # pylint: disable=unused-argument
+        if program_uuid in self.programs:
+            return 200, self.programs[program_uuid]
+        return 404, {'detail': 'Not found.'}
+
+
+class EnterpriseStub(StubServer):
+    """
+    Stands in for the Enterprise service. Learners are not linked to any enterprise.
+    """
+    routes = (
+        ('GET', r'^/enterprise-learner/?$', 'learners'),
+        ('POST', r'^/enterprise-learner/?$', 'create_learner'),
+        ('GET', r'^/enterprise-customer/(?P<customer_uuid>[^/]+)/?$', 'customer'),
+    )
+
+    def learners(self, **kwargs):  # pylint: disable=unused-argument
+        return 200, {'count': 0, 'num_pages': 1, 'current_page': 1, 'results': [], 'next': None, 'start': 0,
+                     'previous': None}
+
+    def create_learner(self, body, **kwargs):  # pylint: disable=unused-argument
+        return 201, json.loads(body or '{}')
+
+    def customer(self, **kwargs):  # pylint: disable=unused-argument
+        return 404, {'detail': 'Not found.'}
+
+
+class CybersourceStub(object):
+    """
+    Stands in for CyberSource Secure Acceptance.
+
+    The learner's browser posts the signed transaction parameters returned by ecommerce to CyberSource, which posts
+    a signed notification of the outcome of the payment back to ecommerce. This stub turns the transaction parameters
+    into the notification CyberSource would send. Failed payments are declined.
+    """
+    DECLINED_REASON_CODE = '203'
+
+    def __init__(self, processor, latency=0, failure_rate=0):
+        """
+        Arguments:
+            processor (Cybersource): payment processor whose keys are used to sign notifications
+            latency (float): seconds each payment takes
+            failure_rate (float): share, between 0 and 1, of the payments declined
+        """
+        self.processor = processor
+        self.latency = latency
+        self.failure_rate = failure_rate
+
+    def pay(self, parameters):
+        """
+        Returns the notification of the payment of the given transaction parameters.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        accepted = random.random() >= self.failure_rate
+        # Request fields are echoed with a prefix. Some of their names end with spaces, which do not survive
+        # form encoding, so they are stripped.
+        notification = {
+            'req_{}'.format(key.strip()): value for key, value in parameters.items()
+            if key not in ('signature', 'signed_field_names', 'unsigned_field_names')
+        }
+        notification.update({
+            'decision': 'ACCEPT' if accepted else 'DECLINE',
+            'reason_code': '100' if accepted else self.DECLINED_REASON_CODE,
+            'transaction_id': uuid.uuid4().hex,
+            'auth_amount': notification.get('req_amount'),
+            'req_card_number': 'xxxxxxxxxxxx1111',
+            'req_card_type': '001',
+        })
+
+        keys = sorted(notification)
+        notification['signed_field_names'] = ','.join(keys)
+
+        use_sop_profile = notification.get('req_profile_id') == self.processor.sop_profile_id
+        secret_key = self.processor.sop_secret_key if use_sop_profile else self.processor.secret_key
+        message = ','.join('{key}={value}'.format(key=key, value=notification[key]) for key in keys)
+        notification['signature'] = sign(message, secret_key)
+
+        return notification
@@ -0,0 +1,106 @@
+from __future__ import unicode_literals
+
+import json
+import os
+import sys
+from unittest import SkipTest
+
+from django.conf import settings
+
+from ecommerce.core.tests import toggle_switch
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.tests.load.runner import format_report, run_scenario
+from ecommerce.tests.load.scenarios import CheckoutScenario, CouponRedemptionScenario
+from ecommerce.tests.load.stubs import CybersourceStub, DiscoveryStub, EnterpriseStub, LmsStub
+from ecommerce.tests.testcases import TransactionTestCase
+
+
+def _get_setting(name, default, cast):
+    return cast(os.environ.get(name, default))
+
+
+class LoadTests(TransactionTestCase):
+    """
+    Load tests of the purchase flows.
+
+    Scenarios are run by LOAD_TEST_USERS concurrent virtual users, each running LOAD_TEST_ITERATIONS iterations.
+    Stubs respond after LOAD_TEST_LATENCY seconds, and fail LOAD_TEST_FAILURE_RATE of the requests they receive.
+    """
+    # Restores the data created by migrations, e.g. product classes, which is flushed after each test.
+    serialized_rollback = True
+
+    users = _get_setting('LOAD_TEST_USERS', 1, int)
+    iterations = _get_setting('LOAD_TEST_ITERATIONS', 10, int)
+    latency = _get_setting('LOAD_TEST_LATENCY', 0.05, float)
+    failure_rate = _get_setting('LOAD_TEST_FAILURE_RATE', 0, float)
+
+    @classmethod
+    def setUpClass(cls):
+        if os.environ.get('ENABLE_LOAD_TESTS') != 'True':
+            raise SkipTest('Load tests are only run if ENABLE_LOAD_TESTS is True.')
+
+        super(LoadTests, cls).setUpClass()
+
+        cls.lms = LmsStub(latency=cls.latency, failure_rate=cls.failure_rate)
+        cls.discovery = DiscoveryStub(latency=cls.latency, failure_rate=cls.failure_rate)
+        cls.enterprise = EnterpriseStub(latency=cls.latency, failure_rate=cls.failure_rate)
+        for stub in (cls.lms, cls.discovery, cls.enterprise):
+            stub.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        for stub in (cls.lms, cls.discovery, cls.enterprise):
+            stub.stop()
+
+        super(LoadTests, cls).tearDownClass()
+
+    def setUp(self):
+        super(LoadTests, self).setUp()
+
+        self.site_configuration.lms_url_root = self.lms.url
+        self.site_configuration.discovery_api_url = self.discovery.url + '/'
+        self.site_configuration.enable_embargo_check = True
+        self.site_configuration.client_side_payment_processor = Cybersource.NAME
+        self.site_configuration.save()
+
+        toggle_switch('use_multi_tenant_discovery_api_urls', True)
+        toggle_switch(settings.ENABLE_ENTERPRISE_ON_RUNTIME_SWITCH, True)
+
+        overridden_settings = self.settings(
+            COURSE_CATALOG_API_URL=self.discovery.url + '/',
+            ENTERPRISE_API_URL=self.enterprise.url + '/',
+        )
+        overridden_settings.enable()
+        self.addCleanup(overridden_settings.disable)
+
+        self.cybersource = CybersourceStub(
+            Cybersource(self.site), latency=self.latency, failure_rate=self.failure_rate
+        )
+
+    def run_scenario(self, scenario):
+        report = run_scenario(scenario, users=self.users, iterations=self.iterations)
+        sys.stderr.write('\n{}\n'.format(format_report(report)))
+
+        report_path = os.environ.get('LOAD_TEST_REPORT')
+        if report_path:
+            reports = {}
+            if os.path.exists(report_path):
+                with open(report_path, 'r') as report_file:
+                    reports = json.load(report_file)
+
+            reports[scenario.name] = report
+            with open(report_path, 'w') as report_file:
+                json.dump(reports, report_file, indent=4, separators=(',', ': '))
+
+        # Without injected failures, every iteration must complete.
+        if not self.failure_rate:
+            self.assertEqual(report['errors'], {})
+            self.assertEqual(report['iterations'], self.users * self.iterations)
+
+        return report
+
+    def test_checkout(self):
+        self.run_scenario(CheckoutScenario(self.site, self.partner, self.cybersource, self.discovery))
+
+    def test_coupon_redemption(self):
+        self.run_scenario(CouponRedemptionScenario(self.site, self.partner))
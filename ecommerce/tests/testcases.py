@@ -4,16 +4,22 @@ from django.test import TestCase as DjangoTestCase
 from django.test import TransactionTestCase as DjangoTransactionTestCase
 
 from ecommerce.core.tests import toggle_switch
+from ecommerce.credit.directory import clear_credit_provider_directories
+from ecommerce.extensions.voucher.snapshots import clear_local_voucher_snapshots
 from ecommerce.tests.mixins import SiteMixin, TestServerUrlMixin, UserMixin
 
 
 class CacheMixin(object):
     def setUp(self):
         cache.clear()
+        clear_credit_provider_directories()
+        clear_local_voucher_snapshots()
         super(CacheMixin, self).setUp()
 
     def tearDown(self):
         cache.clear()
+        clear_credit_provider_directories()
+        clear_local_voucher_snapshots()
         super(CacheMixin, self).tearDown()
 
 
@@ -57,6 +57,7 @@ urlpatterns = AUTH_URLS + WELL_KNOWN_URLS + [
     url(r'^health/$', core_views.health, name='health'),
     url(r'^i18n/', include('django.conf.urls.i18n')),
     url(r'^jsi18n/$', JavaScriptCatalog.as_view(packages=['courses']), name='javascript-catalog'),
+    url(r'^performance/metrics/$', core_views.PerformanceMetricsView.as_view(), name='performance_metrics'),
     url(r'^programs/', include('ecommerce.programs.urls', namespace='programs')),
 ]
 